@@ -1,37 +1,66 @@
 
+import json
 import streamlit as st
-import pandas as pd
+import time
+
+from snapshot_store import lấy_kho_mặc_định
 
 st.set_page_config(page_title="Chi tiết Sentiment", layout="wide")
 st.title("🧠 Chi tiết Tâm lý & Tin tức")
 
-if "kq_df" not in st.session_state:
+if "kq_bảng" not in st.session_state:
     st.warning("⚠️ Vui lòng chạy phân tích ở trang Tổng quan trước.")
     st.stop()
 
-df = st.session_state["kq_df"]
-mã_chi_tiết = st.selectbox("🔍 Chọn mã coin để xem chi tiết:", df["mã"].tolist())
-
-chi_tiết = df[df["mã"] == mã_chi_tiết].iloc[0]
-thành_phần = chi_tiết["thành_phần"]
+bảng = st.session_state["kq_bảng"]
+số_xong, tổng_số = st.session_state.get("tiến_độ", (len(bảng), len(bảng)))
+if số_xong < tổng_số:
+    st.info(f"⏳ Phân tích chưa xong: đang hiển thị {số_xong}/{tổng_số} coin đã có kết quả.")
+# Chỉ mục dựng cùng kq_bảng (pyarrow.Table, có thể ánh xạ từ file kết quả chung) ở trang Tổng quan: lọc theo nhóm và tra mã không quét DataFrame
+chỉ_mục = st.session_state["chỉ_mục"]
+lọc_tín_hiệu = st.radio("Lọc theo tín hiệu:", ["Tất cả", "MUA", "BÁN", "TRUNG_LẬP"], horizontal=True)
+các_dòng = chỉ_mục.nhóm(tín_hiệu_chính=None if lọc_tín_hiệu == "Tất cả" else lọc_tín_hiệu)
+if not các_dòng:
+    st.info("Không có coin nào trong nhóm này.")
+    st.stop()
+mã_chi_tiết = st.selectbox("🔍 Chọn mã coin để xem chi tiết:", chỉ_mục.mã_của(các_dòng))
 
-mạng_xã_hội = thành_phần["mạng_xã_hội"]
-tin_tức = thành_phần["tin_tức"]
+# Chỉ chuyển một dòng sang Python, không dựng DataFrame của cả bảng
+chi_tiết = bảng.slice(chỉ_mục.vị_trí(mã_chi_tiết), 1).to_pylist()[0]
 
 st.markdown("### 💬 Tâm lý mạng xã hội (LunarCrush)")
-st.write(f"**Điểm Galaxy**: {mạng_xã_hội['điểm_galaxy']}")
-st.write(f"**AltRank**: #{mạng_xã_hội['xếp_hạng_alt']}")
-st.write(f"**Tâm lý Twitter**: {mạng_xã_hội['tâm_lý_twitter']}")
-st.write(f"**Tâm lý Reddit**: {mạng_xã_hội['tâm_lý_reddit']}")
-st.write(f"**Tâm lý Influencer**: {mạng_xã_hội['tâm_lý_influencer']}")
-st.write(f"**Tổng tương tác xã hội**: {mạng_xã_hội['lượng_tương_tác_xã_hội']}")
+st.write(f"**Điểm Galaxy**: {chi_tiết['mxh_điểm_galaxy']}")
+st.write(f"**AltRank**: #{chi_tiết['mxh_xếp_hạng_alt']}")
+st.write(f"**Tâm lý Twitter**: {chi_tiết['mxh_tâm_lý_twitter']}")
+st.write(f"**Tâm lý Reddit**: {chi_tiết['mxh_tâm_lý_reddit']}")
+st.write(f"**Tâm lý Influencer**: {chi_tiết['mxh_tâm_lý_influencer']}")
+st.write(f"**Tổng tương tác xã hội**: {chi_tiết['mxh_lượng_tương_tác_xã_hội']}")
 
 st.markdown("### 📰 Tin tức (NewsAPI / CryptoPanic)")
-st.write(f"**Số tin tích cực**: {tin_tức['số_tin_tích_cực']}")
-st.write(f"**Số tin tiêu cực**: {tin_tức['số_tin_tiêu_cực']}")
-st.write(f"**Tâm lý trung bình**: {tin_tức['tâm_lý_tin_tức_trung_bình']}")
+st.write(f"**Số tin tích cực**: {chi_tiết['tt_số_tin_tích_cực']}")
+st.write(f"**Số tin tiêu cực**: {chi_tiết['tt_số_tin_tiêu_cực']}")
+st.write(f"**Tâm lý trung bình**: {chi_tiết['tt_tâm_lý_tin_tức_trung_bình']}")
 
-if len(tin_tức["tin_nóng"]) > 0:
+tin_nóng = chi_tiết["tt_tin_nóng"] or []
+if isinstance(tin_nóng, str):
+    # Cột kiểu lẫn lộn được lưu dạng chuỗi JSON (result_table._mảng_arrow)
+    tin_nóng = json.loads(tin_nóng)
+if len(tin_nóng) > 0:
     st.markdown("**🧨 Tin nóng nổi bật:**")
-    for tin in tin_tức["tin_nóng"][:3]:
+    for tin in tin_nóng[:3]:
         st.write(f"➡️ {tin['tiêu_đề']} (Tâm lý: {tin['tâm_lý']}, Tác động: {tin['tác_động']})")
+
+kho = lấy_kho_mặc_định()
+if kho is not None:
+    st.markdown("### 📈 Lịch sử điểm")
+    số_ngày = st.slider("Số ngày gần nhất:", 1, 90, 7)
+    import pandas as pd  # chỉ cần cho biểu đồ lịch sử
+    lịch_sử = pd.DataFrame(kho.lịch_sử(mã_chi_tiết, từ=time.time() - số_ngày * 86400))
+    if lịch_sử.empty:
+        st.caption("Chưa có lịch sử cho mã này.")
+    else:
+        lịch_sử.index = pd.to_datetime(lịch_sử.pop("thời_gian"), unit="s")
+        st.line_chart(lịch_sử[["điểm_mua", "điểm_bán", "điểm_ròng"]])
+        st.line_chart(lịch_sử[["đà_dòng_tiền"]])
+        if lịch_sử["giá"].notna().any():
+            st.line_chart(lịch_sử[["giá"]])
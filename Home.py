@@ -1,132 +1,250 @@
 
 import streamlit as st
-import pandas as pd
+import sys
+import time
 from alpha_signal_checker_plus import (
-    lấy_tâm_lý_mạng_xã_hội,
-    lấy_tác_động_tin_tức,
-    lấy_chỉ_số_kinh_tế_vĩ_mô,
-    chấm_điểm_tâm_lý_mạng_xã_hội,
-    chấm_điểm_tác_động_tin_tức,
-    chấm_điểm_môi_trường_vĩ_mô,
-    chấm_điểm_fear_greed,
-    chấm_điểm_tvl_defi,
-    lấy_chỉ_số_fear_greed,
-    lấy_tvl_tổng_defi,
+    tạo_ngữ_cảnh_chạy,
+    tạo_ảnh_chụp,
+    chấm_điểm_ảnh_chụp,
+    ẢnhChụpThànhPhần,
+    DữLiệuHợpĐồngTươngLai,
     KếtQuảTínHiệu,
-    asdict
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    BỘ_NHỚ_ĐỆM,
+    CẤU_HÌNH,
+    lấy_thị_trường_top_coin,
+    thống_kê_bổ_sung,
 )
-import requests
-from typing import List
+from result_table import ĐỘ_TIN_CẬY, BảngKếtQuả
+from result_index import ChỉMụcKếtQuả
+from metrics import ĐO_LƯỜNG
+from rate_limiter import lấy_thống_kê as lấy_thống_kê_giới_hạn
+from shared_results import KếtQuảChung, công_bố_kết_quả_chung, phiên_bản_tệp
+from snapshot_store import lấy_kho_mặc_định
+from typing import Iterator, List, Optional, Tuple
 
 st.set_page_config(page_title="Tổng Quan Tín Hiệu", layout="wide")
 st.title("📊 Dashboard Tín Hiệu Crypto – Tổng Quan")
 
+# Dashboard dùng mọi thành phần đã đăng ký: lõi + Fear & Greed, TVL DeFi
+THÀNH_PHẦN_DASHBOARD = tuple(SỔ_ĐĂNG_KÝ_THÀNH_PHẦN)
+
 số_lượng = st.slider("🔢 Chọn số lượng coin top để phân tích:", 10, 500, 50, 10)
 mức_điểm_ròng = st.slider("🎯 Điểm ròng tối thiểu:", 0.0, 5.0, 2.0, 0.1)
 
-@st.cache_data(show_spinner=False)
 def lấy_top_500_coin() -> List[str]:
-    danh_sách = []
-    for page in [1, 2]:
-        url = "https://api.coingecko.com/api/v3/coins/markets"
-        params = {
-            "vs_currency": "usd",
-            "order": "market_cap_desc",
-            "per_page": 250,
-            "page": page,
-        }
-        try:
-            resp = requests.get(url, params=params, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
-                danh_sách.extend([coin["symbol"].upper() for coin in data])
-        except:
-            pass
-    return danh_sách
-
+    return [coin["mã"] for coin in lấy_thị_trường_top_coin()]
+
+with st.sidebar.expander("⚖️ Trọng số thành phần"):
+    trọng_số = {
+        tên: st.slider(tên, 0.0, 1.0, SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].trọng_số, 0.05, key=f"trọng_số_{tên}")
+        for tên in THÀNH_PHẦN_DASHBOARD
+    }
+
+# Khung đo lường tạo sớm để lựa chọn đo từng coin có hiệu lực ngay trong lần chạy này; nội dung vẽ ở cuối trang
+khung_đo_lường = st.sidebar.expander("⏱️ Đo lường pipeline")
+ĐO_LƯỜNG.chi_tiết = khung_đo_lường.checkbox("Đo thời gian từng coin", value=ĐO_LƯỜNG.chi_tiết)
+
+def lặp_kết_quả(danh_sách_coin: List[str], ngữ_cảnh) -> Iterator[Tuple[int, ẢnhChụpThànhPhần, KếtQuảTínHiệu]]:
+    """Sinh (hạng, ảnh chụp, kết quả) của từng coin ngay khi dữ liệu của coin đó về"""
+    # Nạp khi thật sự lấy dữ liệu: phiên chỉ đọc kết quả tiến trình nền không cần requests
+    from fetch_engine import lặp_đồng_thời, nhà_cung_cấp_mặc_định
+    các_nhà_cung_cấp = nhà_cung_cấp_mặc_định(ngữ_cảnh.các_thành_phần)
+    lúc_chờ = time.perf_counter()
+    for vị_trí, mã, dữ_liệu_mã in lặp_đồng_thời(danh_sách_coin, các_nhà_cung_cấp):
+        # Thời gian chờ coin kế tiếp về (mạng) tách khỏi thời gian chấm điểm
+        bắt_đầu = time.perf_counter()
+        ĐO_LƯỜNG.ghi("chờ_dữ_liệu", bắt_đầu - lúc_chờ)
+        ảnh_chụp = tạo_ảnh_chụp(mã, dữ_liệu_mã, DữLiệuHợpĐồngTươngLai(mã=mã), ngữ_cảnh)
+        kết_quả_mã = chấm_điểm_ảnh_chụp(ảnh_chụp, mức_điểm_ròng, trọng_số)
+        giây = time.perf_counter() - bắt_đầu
+        ĐO_LƯỜNG.ghi("chấm_điểm", giây)
+        if ĐO_LƯỜNG.chi_tiết:
+            ĐO_LƯỜNG.ghi_mã(mã, giây)
+        yield vị_trí, ảnh_chụp, kết_quả_mã
+        lúc_chờ = time.perf_counter()
+
+bảng_hiển_thị = st.empty()
+
+# Giai đoạn 1: lấy dữ liệu thô (I/O mạng), chỉ chạy khi bấm nút; kết quả hiện dần theo từng coin
 if st.button("🚀 Bắt đầu phân tích"):
-    danh_sách_coin = lấy_top_500_coin()[:số_lượng]
-    kết_quả = []
-
-    vĩ_mô = lấy_chỉ_số_kinh_tế_vĩ_mô()
-    fear_greed = lấy_chỉ_số_fear_greed()
-    tvl_defi = lấy_tvl_tổng_defi()
-
-    with st.spinner("🔍 Đang phân tích..."):
-        for mã in danh_sách_coin:
-            mạng_xã_hội = lấy_tâm_lý_mạng_xã_hội(mã)
-            tin_tức = lấy_tác_động_tin_tức(mã)
-
-            thành_phần = {
-                "mạng_xã_hội": asdict(mạng_xã_hội),
-                "tin_tức": asdict(tin_tức),
-                "vĩ_mô": asdict(vĩ_mô),
-            }
-
-            tổng_điểm_mua, tổng_điểm_bán = 0.0, 0.0
-            tất_cả_tín_hiệu, tất_cả_cảnh_báo = [], []
-            hệ_số_kích_thước = 1.0
-
-            m_mua, m_bán, m_tín_hiệu, m_cảnh_báo = chấm_điểm_tâm_lý_mạng_xã_hội(mạng_xã_hội)
-            tổng_điểm_mua += m_mua * 0.2
-            tổng_điểm_bán += m_bán * 0.2
-            tất_cả_tín_hiệu.extend(m_tín_hiệu)
-            tất_cả_cảnh_báo.extend(m_cảnh_báo)
-
-            t_mua, t_bán, t_tín_hiệu, t_cảnh_báo = chấm_điểm_tác_động_tin_tức(tin_tức)
-            tổng_điểm_mua += t_mua * 0.25
-            tổng_điểm_bán += t_bán * 0.25
-            tất_cả_tín_hiệu.extend(t_tín_hiệu)
-            tất_cả_cảnh_báo.extend(t_cảnh_báo)
-
-            v_mua, v_bán, v_hệ_số, v_cảnh_báo = chấm_điểm_môi_trường_vĩ_mô(vĩ_mô)
-            tổng_điểm_mua += v_mua * 0.2
-            tổng_điểm_bán += v_bán * 0.2
-            hệ_số_kích_thước *= v_hệ_số
-            tất_cả_cảnh_báo.extend(v_cảnh_báo)
-
-            if fear_greed is not None:
-                fg_mua, fg_ban, fg_tín_hiệu = chấm_điểm_fear_greed(fear_greed)
-                tổng_điểm_mua += fg_mua * 0.05
-                tổng_điểm_bán += fg_ban * 0.05
-                tất_cả_tín_hiệu.extend(fg_tín_hiệu)
-
-            if tvl_defi is not None:
-                defi_mua, defi_ban, defi_tín_hiệu = chấm_điểm_tvl_defi(tvl_defi)
-                tổng_điểm_mua += defi_mua * 0.05
-                tổng_điểm_bán += defi_ban * 0.05
-                tất_cả_tín_hiệu.extend(defi_tín_hiệu)
-
-            điểm_ròng = tổng_điểm_mua - tổng_điểm_bán
-            hệ_số_vị_thế = max(0.1, min(2.0, hệ_số_kích_thước))
-
-            if abs(điểm_ròng) >= 3.0:
-                độ_tin_cậy = "CAO"
-            elif abs(điểm_ròng) >= 1.5:
-                độ_tin_cậy = "TRUNG_BÌNH"
-            else:
-                độ_tin_cậy = "THẤP"
-
-            if điểm_ròng >= mức_điểm_ròng:
-                tín_hiệu_chính = "MUA"
-            elif điểm_ròng <= -mức_điểm_ròng:
-                tín_hiệu_chính = "BÁN"
-            else:
-                tín_hiệu_chính = "TRUNG_LẬP"
-
-            kết_quả.append(KếtQuảTínHiệu(
-                mã=mã,
-                điểm_mua=round(tổng_điểm_mua, 2),
-                điểm_bán=round(tổng_điểm_bán, 2),
-                điểm_ròng=round(điểm_ròng, 2),
-                hệ_số_kích_thước_vị_thế=round(hệ_số_vị_thế, 2),
-                độ_tin_cậy=độ_tin_cậy,
-                tín_hiệu_chính=tín_hiệu_chính,
-                cảnh_báo=tất_cả_cảnh_báo,
-                tín_hiệu=tất_cả_tín_hiệu,
-                thành_phần=thành_phần
-            ))
-
-    df = pd.DataFrame([asdict(kq) for kq in kết_quả])
-    st.session_state["kq_df"] = df
+    with ĐO_LƯỜNG.đo("top_coin"):
+        danh_sách_coin = lấy_top_500_coin()[:số_lượng]
+
+    # Thành phần toàn cục (vĩ mô, Fear & Greed, TVL DeFi): lấy và chấm điểm một lần cho mọi coin
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy(THÀNH_PHẦN_DASHBOARD)
+    st.session_state["ngữ_cảnh"] = ngữ_cảnh
+
+    thanh_tiến_độ = st.progress(0.0, text="🔍 Đang lấy dữ liệu...")
+    ảnh_chụp_theo_hạng: List[Optional[ẢnhChụpThànhPhần]] = [None] * len(danh_sách_coin)
+    kết_quả_theo_hạng: List[Optional[KếtQuảTínHiệu]] = [None] * len(danh_sách_coin)
+    bảng = BảngKếtQuả()
+    chỉ_mục = ChỉMụcKếtQuả(bảng)
+    bắt_đầu = time.perf_counter()
+    lần_vẽ_cuối = 0.0
+    st.session_state["ảnh_chụp"] = []
+    st.session_state["tiến_độ"] = (0, len(danh_sách_coin))
+
+    for số_xong, (vị_trí, ảnh_chụp, kết_quả_mã) in enumerate(lặp_kết_quả(danh_sách_coin, ngữ_cảnh), 1):
+        ảnh_chụp_theo_hạng[vị_trí] = ảnh_chụp
+        bảng.thêm(kết_quả_mã)
+        kết_quả_theo_hạng[vị_trí] = kết_quả_mã
+
+        # Vẽ lại tối đa ~4 lần/giây để bảng không làm chậm vòng lấy dữ liệu
+        bây_giờ = time.perf_counter()
+        if bây_giờ - lần_vẽ_cuối < 0.25 and số_xong < len(danh_sách_coin):
+            continue
+        lần_vẽ_cuối = bây_giờ
+        tốc_độ = số_xong / max(bây_giờ - bắt_đầu, 1e-9)
+        còn_lại = (len(danh_sách_coin) - số_xong) / tốc_độ
+        thanh_tiến_độ.progress(
+            số_xong / len(danh_sách_coin),
+            text=f"🔍 {số_xong}/{len(danh_sách_coin)} coin · {tốc_độ:.1f} coin/s · còn ~{còn_lại:.0f}s",
+        )
+
+        # Kết quả dở dang vào session state để trang chi tiết dùng được giữa chừng
+        with ĐO_LƯỜNG.đo("vẽ_bảng"):
+            st.session_state["ảnh_chụp"] = [a for a in ảnh_chụp_theo_hạng if a is not None]
+            st.session_state["kq_bảng"] = bảng.sang_arrow()
+            chỉ_mục.cập_nhật()
+            st.session_state["chỉ_mục"] = chỉ_mục
+            st.session_state["tiến_độ"] = (số_xong, len(danh_sách_coin))
+            bảng_hiển_thị.dataframe(st.session_state["kq_bảng"])
+
+    thanh_tiến_độ.empty()
+
+    # Lưu lần chạy vào kho lịch sử theo thứ tự hạng: trang chi tiết vẽ diễn biến điểm, phiên khác dùng lại kết quả
+    kho = lấy_kho_mặc_định()
+    if kho is not None:
+        try:
+            with ĐO_LƯỜNG.đo("ghi_lịch_sử"):
+                giá = {coin["mã"]: coin["giá"] for coin in lấy_thị_trường_top_coin() if coin.get("giá") is not None}
+                các_kết_quả = [kq for kq in kết_quả_theo_hạng if kq is not None]
+                lần_chạy = kho.ghi_lần_chạy(các_kết_quả, ngữ_cảnh, giá=giá, điểm_ròng_tối_thiểu=mức_điểm_ròng)
+            # Công bố kèm ngưỡng / trọng số của phiên: phiên khác cùng tham số hiển thị thẳng, không chấm lại
+            if CẤU_HÌNH["SHARED_RESULTS_FILE"]:
+                with ĐO_LƯỜNG.đo("công_bố_arrow"):
+                    công_bố_kết_quả_chung(BảngKếtQuả.từ_kết_quả(các_kết_quả), CẤU_HÌNH["SHARED_RESULTS_FILE"],
+                                          lần_chạy=lần_chạy, điểm_ròng_tối_thiểu=mức_điểm_ròng, trọng_số=trọng_số)
+        except Exception as e:
+            st.warning(f"Không lưu được lịch sử: {e}")
     st.success("✅ Hoàn tất! Vào các trang bên trái để xem chi tiết.")
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def đọc_lần_chạy_chung(lần_chạy: int):
+    """Ngữ cảnh và ảnh chụp của một lần chạy đã công bố, dựng một lần cho mọi phiên"""
+    return lấy_kho_mặc_định().ảnh_chụp_lần_chạy(lần_chạy, THÀNH_PHẦN_DASHBOARD)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def gắn_kết_quả_chung(đường_dẫn: str, phiên_bản: Tuple[int, int]) -> KếtQuảChung:
+    """Ánh xạ file kết quả công bố một lần cho mọi phiên; phiên_bản (inode, mtime) đổi khi có lần công bố mới"""
+    return KếtQuảChung.mở(đường_dẫn)
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def chỉ_mục_kết_quả_chung(đường_dẫn: str, phiên_bản: Tuple[int, int], số_dòng: int):
+    """N dòng đầu của kết quả chung (không sao chép) và chỉ mục của chúng, dùng chung giữa các phiên"""
+    kết_quả_chung = gắn_kết_quả_chung(đường_dẫn, phiên_bản).cắt(số_dòng)
+    return kết_quả_chung, ChỉMụcKếtQuả(kết_quả_chung)
+
+# Kết quả mới nhất do tiến trình nền (--chạy-nền) hoặc phiên khác công bố: đọc từ kho thay vì lấy lại dữ liệu
+kho = lấy_kho_mặc_định()
+lần_mới_nhất = kho.lần_chạy_mới_nhất() if kho is not None else None
+if lần_mới_nhất is not None and time.time() - lần_mới_nhất["thời_gian"] <= CẤU_HÌNH["WORKER_MAX_AGE"]:
+    ngữ_cảnh_chung, ảnh_chụp_chung = đọc_lần_chạy_chung(lần_mới_nhất["id"])
+    if ảnh_chụp_chung:
+        st.session_state["ngữ_cảnh"] = ngữ_cảnh_chung
+        st.session_state["ảnh_chụp"] = ảnh_chụp_chung[:số_lượng]
+        st.session_state["tiến_độ"] = (len(st.session_state["ảnh_chụp"]), len(st.session_state["ảnh_chụp"]))
+        st.caption(f"📡 Dữ liệu của lần chạy #{lần_mới_nhất['id']} "
+                   f"({(time.time() - lần_mới_nhất['thời_gian']) / 60:.0f} phút trước)")
+
+# Kết quả chung (Arrow IPC) của đúng lần chạy mới nhất, cùng ngưỡng và trọng số với phiên này: dùng thẳng
+kết_quả_chung = None
+đường_dẫn_chung = CẤU_HÌNH["SHARED_RESULTS_FILE"]
+phiên_bản_chung = phiên_bản_tệp(đường_dẫn_chung) if đường_dẫn_chung and "ảnh_chụp" in st.session_state else None
+if phiên_bản_chung is not None and lần_mới_nhất is not None:
+    try:
+        kết_quả_chung, chỉ_mục_chung = chỉ_mục_kết_quả_chung(đường_dẫn_chung, phiên_bản_chung, số_lượng)
+    except Exception as e:
+        st.caption(f"Không đọc được kết quả chung: {e}")
+    else:
+        if (kết_quả_chung.thông_tin.get("lần_chạy") != lần_mới_nhất["id"]
+                or not kết_quả_chung.khớp(mức_điểm_ròng, trọng_số, CẤU_HÌNH["WORKER_MAX_AGE"])):
+            kết_quả_chung = None
+
+# Giai đoạn 2: chấm điểm lại từ ảnh chụp mỗi khi ngưỡng/trọng số đổi, không có I/O mạng
+if kết_quả_chung is not None:
+    # Bảng Arrow ánh xạ từ file và chỉ mục dùng chung: phiên không giữ bản sao nào
+    with ĐO_LƯỜNG.đo("vẽ_bảng"):
+        bảng, chỉ_mục = kết_quả_chung, chỉ_mục_chung
+        st.session_state["kq_bảng"] = bảng.bảng
+        st.session_state["chỉ_mục"] = chỉ_mục
+        bảng_hiển_thị.dataframe(bảng.bảng)
+    st.caption(f"🔗 Dùng kết quả chung của {len(bảng)} coin (cùng ngưỡng và trọng số), không chấm lại")
+elif "ảnh_chụp" in st.session_state:
+    bắt_đầu = time.perf_counter()
+    kết_quả = [
+        chấm_điểm_ảnh_chụp(ảnh_chụp, mức_điểm_ròng, trọng_số)
+        for ảnh_chụp in st.session_state["ảnh_chụp"]
+    ]
+    ĐO_LƯỜNG.ghi("chấm_lại", time.perf_counter() - bắt_đầu)
+
+    # Bảng dạng cột với thành phần đã làm phẳng (mxh_*, tt_*, vm_*...), chỉ mục theo mã và nhóm tín hiệu
+    with ĐO_LƯỜNG.đo("vẽ_bảng"):
+        bảng = BảngKếtQuả.từ_kết_quả(kết_quả)
+        chỉ_mục = ChỉMụcKếtQuả(bảng)
+        st.session_state["kq_bảng"] = bảng.sang_arrow()
+        st.session_state["chỉ_mục"] = chỉ_mục
+        bảng_hiển_thị.dataframe(st.session_state["kq_bảng"])
+    st.caption(f"⚡ Chấm điểm lại {len(kết_quả)} coin trong {(time.perf_counter() - bắt_đầu) * 1000:.1f} ms")
+
+if "ảnh_chụp" in st.session_state:
+    cột_mua, cột_bán = st.columns(2)
+    with cột_mua:
+        st.markdown(f"**🔴 Top MUA** ({chỉ_mục.đếm(tín_hiệu_chính='MUA')} coin)")
+        for i in chỉ_mục.top_mua(5):
+            st.write(f"{bảng.mã[i]}: điểm ròng {bảng.điểm_ròng[i]:.2f} · tin cậy {ĐỘ_TIN_CẬY[bảng.độ_tin_cậy[i]]}")
+    with cột_bán:
+        st.markdown(f"**🔵 Top BÁN** ({chỉ_mục.đếm(tín_hiệu_chính='BÁN')} coin)")
+        for i in chỉ_mục.top_bán(5):
+            st.write(f"{bảng.mã[i]}: điểm ròng {bảng.điểm_ròng[i]:.2f} · tin cậy {ĐỘ_TIN_CẬY[bảng.độ_tin_cậy[i]]}")
+
+with st.sidebar.expander("🗄️ Bộ nhớ đệm nhà cung cấp"):
+    st.json(BỘ_NHỚ_ĐỆM.lấy_thống_kê())
+    if st.button("Xóa bộ nhớ đệm"):
+        BỘ_NHỚ_ĐỆM.xóa()
+
+with st.sidebar.expander("🌐 Thống kê HTTP"):
+    # Chỉ đọc khi phiên HTTP đã được nạp, tránh kéo requests vào lúc khởi động
+    http_session = sys.modules.get("http_session")
+    if http_session is None:
+        st.caption("Chưa có yêu cầu HTTP nào trong tiến trình này.")
+    else:
+        st.json(http_session.lấy_thống_kê())
+
+with st.sidebar.expander("🌍 Universe thị trường"):
+    universe = sys.modules.get("universe")
+    if universe is None:
+        st.caption("Chưa lấy danh sách coin trong tiến trình này.")
+    else:
+        st.json(universe.UNIVERSE.lấy_thống_kê())
+
+with st.sidebar.expander("🚦 Giới hạn tốc độ nhà cung cấp"):
+    st.json(lấy_thống_kê_giới_hạn())
+
+with khung_đo_lường:
+    số_liệu_đo = ĐO_LƯỜNG.ảnh_chụp()
+    if số_liệu_đo["giai_đoạn"]:
+        # Độ trễ theo giai đoạn; giai đoạn http có nhãn là nhà cung cấp
+        st.dataframe(sorted(số_liệu_đo["giai_đoạn"], key=lambda m: -m["tổng_giây"]), hide_index=True)
+    if số_liệu_đo["bộ_đếm"]:
+        st.dataframe(số_liệu_đo["bộ_đếm"], hide_index=True)
+    if số_liệu_đo["lỗi_gần_nhất"]:
+        st.json(số_liệu_đo["lỗi_gần_nhất"])
+    if số_liệu_đo["mã_chậm_nhất"]:
+        st.markdown("**Coin chậm nhất**")
+        st.dataframe(số_liệu_đo["mã_chậm_nhất"], hide_index=True)
+    st.download_button("Tải số liệu Prometheus", ĐO_LƯỜNG.sang_prometheus(thống_kê_bổ_sung()),
+                       file_name="tin_hieu.prom", mime="text/plain")
+    if st.button("Đặt lại số liệu đo"):
+        ĐO_LƯỜNG.đặt_lại()
@@ -13,10 +13,15 @@ Dữ liệu được lấy từ file JSON đầu vào với thông tin coin.
 
 import os
 import json
-import argparse
-from dataclasses import dataclass, asdict, field
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+import time
+from operator import attrgetter
+from dataclasses import dataclass, asdict, field, fields, is_dataclass
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple, Iterable, Iterator
+
+from json_stream import lặp_bản_ghi
+from metrics import ĐO_LƯỜNG
+from provider_cache import BộNhớĐệmNhàCungCấp
+from score_memo import BộGhiNhớĐiểm
 
 CẤU_HÌNH = {
     "LUNARCRUSH_API_KEY": os.getenv("LUNARCRUSH_API_KEY", ""),
@@ -27,9 +32,102 @@ CẤU_HÌNH = {
     "NEWSAPI_BASE": "https://newsapi.org/v2/everything",
     "FRED_API_KEY": os.getenv("FRED_API_KEY", ""),
     "FRED_BASE": "https://api.stlouisfed.org/fred/series/observations",
+    "FEAR_GREED_URL": "https://api.alternative.me/fng/",
+    "DEFILLAMA_TVL_URL": "https://api.llama.fi/v2/historicalChainTvl",
+    "COINGECKO_MARKETS_URL": "https://api.coingecko.com/api/v3/coins/markets",
+    # Universe thị trường (xem universe.py): số trang x số coin mỗi trang, số trang lấy đồng thời
+    "UNIVERSE_PAGES": int(os.getenv("UNIVERSE_PAGES", "2")),
+    "UNIVERSE_PER_PAGE": int(os.getenv("UNIVERSE_PER_PAGE", "250")),
+    "UNIVERSE_CONCURRENCY": int(os.getenv("UNIVERSE_CONCURRENCY", "2")),
+    # Sàng trước khi lấy dữ liệu theo mã, 0 để tắt
+    "UNIVERSE_MIN_VOLUME": float(os.getenv("UNIVERSE_MIN_VOLUME", "0")),
+    "UNIVERSE_MIN_MARKET_CAP": float(os.getenv("UNIVERSE_MIN_MARKET_CAP", "0")),
     "OUTPUT_JSON": "./ket_qua_tin_hieu_chi_tiet.json",
+    # Giới hạn số lệnh gọi đồng thời cho mỗi nhà cung cấp
+    "LUNARCRUSH_CONCURRENCY": int(os.getenv("LUNARCRUSH_CONCURRENCY", "8")),
+    "CRYPTOPANIC_CONCURRENCY": int(os.getenv("CRYPTOPANIC_CONCURRENCY", "8")),
+    # Số mã mỗi yêu cầu của endpoint theo lô; CryptoPanic phân trang nên giới hạn thêm số trang mỗi lô
+    "LUNARCRUSH_BATCH_SIZE": int(os.getenv("LUNARCRUSH_BATCH_SIZE", "50")),
+    "CRYPTOPANIC_BATCH_SIZE": int(os.getenv("CRYPTOPANIC_BATCH_SIZE", "20")),
+    "CRYPTOPANIC_MAX_PAGES": int(os.getenv("CRYPTOPANIC_MAX_PAGES", "5")),
+    # Phiên HTTP dùng chung (xem http_session.py)
+    "HTTP_POOL_HOSTS": int(os.getenv("HTTP_POOL_HOSTS", "10")),
+    "HTTP_POOL_MAXSIZE": int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+    "HTTP_RETRY_TOTAL": int(os.getenv("HTTP_RETRY_TOTAL", "3")),
+    "HTTP_RETRY_BACKOFF": float(os.getenv("HTTP_RETRY_BACKOFF", "0.5")),
+    # Bộ nhớ đệm phản hồi nhà cung cấp: TTL (giây) theo nguồn, 0 để tắt
+    "CACHE_TTL": {
+        "mạng_xã_hội": float(os.getenv("CACHE_TTL_SOCIAL", "900")),
+        "tin_tức": float(os.getenv("CACHE_TTL_NEWS", "300")),
+        "vĩ_mô": float(os.getenv("CACHE_TTL_MACRO", "21600")),
+        "top_coin": float(os.getenv("CACHE_TTL_TOP_COINS", "3600")),
+        "fear_greed": float(os.getenv("CACHE_TTL_FEAR_GREED", "3600")),
+        "tvl_defi": float(os.getenv("CACHE_TTL_TVL_DEFI", "3600")),
+    },
+    # Giới hạn tốc độ theo nhà cung cấp (xem rate_limiter.py): số yêu cầu mỗi phút, 0 để tắt
+    "RATE_LIMITS": {
+        "coingecko": {"tiền_tố": ["https://api.coingecko.com/"],
+                      "mỗi_phút": float(os.getenv("COINGECKO_RPM", "30")), "tức_thời": 2},
+        "lunarcrush": {"tiền_tố": ["https://lunarcrush.com/"],
+                       "mỗi_phút": float(os.getenv("LUNARCRUSH_RPM", "60")), "tức_thời": 5},
+        "cryptopanic": {"tiền_tố": ["https://cryptopanic.com/"],
+                        "mỗi_phút": float(os.getenv("CRYPTOPANIC_RPM", "300")), "tức_thời": 5},
+        "newsapi": {"tiền_tố": ["https://newsapi.org/"],
+                    "mỗi_phút": float(os.getenv("NEWSAPI_RPM", "60")), "tức_thời": 2},
+        "fred": {"tiền_tố": ["https://api.stlouisfed.org/"],
+                 "mỗi_phút": float(os.getenv("FRED_RPM", "120")), "tức_thời": 5},
+        "alternative_me": {"tiền_tố": ["https://api.alternative.me/"],
+                           "mỗi_phút": float(os.getenv("FEAR_GREED_RPM", "60")), "tức_thời": 2},
+        "defillama": {"tiền_tố": ["https://api.llama.fi/"],
+                      "mỗi_phút": float(os.getenv("DEFILLAMA_RPM", "300")), "tức_thời": 5},
+    },
+    "CACHE_MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "5000")),
+    "CACHE_DB": os.getenv("CACHE_DB", ""),
+    # Số kết quả chấm điểm thành phần được ghi nhớ theo dấu vân tay đầu vào (xem score_memo.py), 0 để tắt
+    "SCORE_MEMO_SIZE": int(os.getenv("SCORE_MEMO_SIZE", "4096")),
+    # Kho lịch sử ảnh chụp của dashboard (xem snapshot_store.py), rỗng để tắt
+    "SNAPSHOT_DB": os.getenv("SNAPSHOT_DB", "./lich_su_tin_hieu.db"),
+    # Tiến trình nền (--chạy-nền, xem signal_worker.py): chu kỳ làm mới (giây) theo nguồn
+    "WORKER_INTERVAL": {
+        "top_coin": float(os.getenv("WORKER_INTERVAL_TOP_COINS", "3600")),
+        "mạng_xã_hội": float(os.getenv("WORKER_INTERVAL_SOCIAL", "900")),
+        "tin_tức": float(os.getenv("WORKER_INTERVAL_NEWS", "300")),
+        "vĩ_mô": float(os.getenv("WORKER_INTERVAL_MACRO", "21600")),
+        "fear_greed": float(os.getenv("WORKER_INTERVAL_FEAR_GREED", "3600")),
+        "tvl_defi": float(os.getenv("WORKER_INTERVAL_TVL_DEFI", "3600")),
+        # Đọc lại file dữ liệu hợp đồng tương lai (--file-đầu-vào)
+        "hợp_đồng": float(os.getenv("WORKER_INTERVAL_FUTURES", "300")),
+    },
+    "WORKER_TOP_N": int(os.getenv("WORKER_TOP_N", "500")),
+    # Dashboard chỉ hiển thị lần chạy đã công bố trong khoảng này (giây)
+    "WORKER_MAX_AGE": float(os.getenv("WORKER_MAX_AGE", "3600")),
+    # Kết quả công bố dạng Arrow IPC để mọi phiên dashboard ánh xạ chung (xem shared_results.py), rỗng để tắt
+    "SHARED_RESULTS_FILE": os.getenv("SHARED_RESULTS_FILE", "./ket_qua_chung.arrow"),
+    # Chế độ nghe sự kiện (--nghe-sự-kiện, xem event_ingest.py): nhịp kiểm tra dòng mới khi đọc đuôi file (giây)
+    "EVENT_TAIL_INTERVAL": float(os.getenv("EVENT_TAIL_INTERVAL", "0.05")),
+    # File văn bản Prometheus ghi sau mỗi lần chạy CLI / mỗi vòng tiến trình nền (xem metrics.py), rỗng để tắt
+    "METRICS_PROM_FILE": os.getenv("METRICS_PROM_FILE", ""),
+}
+
+def _có_slots(cls):
+    """Tạo lại dataclass với __slots__ (tương đương dataclass(slots=True) của Python 3.10+)"""
+    tên_trường = tuple(f.name for f in fields(cls))
+    thuộc_tính = dict(cls.__dict__)
+    # Giá trị mặc định đã nằm trong __init__, bỏ khỏi lớp để không xung đột với slots
+    for tên in tên_trường + ("__dict__", "__weakref__"):
+        thuộc_tính.pop(tên, None)
+    thuộc_tính["__slots__"] = tên_trường
+    return type(cls)(cls.__name__, cls.__bases__, thuộc_tính)
+
+# Tiền tố cột khi làm phẳng thành phần thành dạng cột (bộ chấm điểm theo lô, bảng kết quả)
+TIỀN_TỐ_THÀNH_PHẦN = {
+    "mạng_xã_hội": "mxh",
+    "tin_tức": "tt",
+    "hợp_đồng": "hd",
+    "vĩ_mô": "vm",
 }
 
+@_có_slots
 @dataclass
 class TâmLýMạngXãHội:
     lượt_nhắc_twitter: int = 0
@@ -43,6 +141,7 @@ class TâmLýMạngXãHội:
     lượng_tương_tác_xã_hội: int = 0
     mức_độ_tương_tác: float = 0.0
 
+@_có_slots
 @dataclass
 class TácĐộngTinTức:
     tin_nóng: List[Dict[str, Any]] = field(default_factory=list)
@@ -53,6 +152,7 @@ class TácĐộngTinTức:
     số_tin_trung_tính: int = 0
     tin_tác_động_cao: int = 0
 
+@_có_slots
 @dataclass
 class DữLiệuHợpĐồngTươngLai:
     mã: str
@@ -67,6 +167,7 @@ class DữLiệuHợpĐồngTươngLai:
     xu_hướng_dòng_tiền: str = "TRUNG_LẬP"
     đà_dòng_tiền: float = 0.0
 
+@_có_slots
 @dataclass
 class ChỉSốKinhTếVĩMô:
     vix_hiện_tại: float = 0.0
@@ -80,6 +181,19 @@ class ChỉSốKinhTếVĩMô:
     mức_độ_chấp_nhận_rủi_ro: str = "TRUNG_LẬP"
     tương_quan_crypto: float = 0.0
 
+@_có_slots
+@dataclass
+class ChỉSốFearGreed:
+    giá_trị: int = 50
+    phân_loại: str = "Neutral"
+
+@_có_slots
+@dataclass
+class TVLDeFi:
+    tvl_hiện_tại: float = 0.0
+    thay_đổi_7ngày: float = 0.0  # phần trăm
+
+@_có_slots
 @dataclass
 class KếtQuảTínHiệu:
     mã: str
@@ -93,26 +207,64 @@ class KếtQuảTínHiệu:
     tín_hiệu: List[str] = field(default_factory=list)
     thành_phần: Dict[str, Any] = field(default_factory=dict)
 
+BỘ_NHỚ_ĐỆM = BộNhớĐệmNhàCungCấp(
+    CẤU_HÌNH["CACHE_TTL"],
+    dung_lượng_tối_đa=CẤU_HÌNH["CACHE_MAX_ENTRIES"],
+    đường_dẫn_đĩa=CẤU_HÌNH["CACHE_DB"],
+)
+BỘ_GHI_NHỚ_ĐIỂM = BộGhiNhớĐiểm(CẤU_HÌNH["SCORE_MEMO_SIZE"])
+
+def tên_nhà_cung_cấp(url: str) -> str:
+    """Tên nhà cung cấp trong RATE_LIMITS theo tiền tố URL, không khớp thì dùng host"""
+    for tên, cấu_hình in CẤU_HÌNH["RATE_LIMITS"].items():
+        if any(url.startswith(tiền_tố) for tiền_tố in cấu_hình["tiền_tố"]):
+            return tên
+    return url.split("://", 1)[-1].split("/", 1)[0]
+
 def _yêu_cầu_an_toàn(url: str, tham_số: Dict[str, Any] = None, headers: Dict[str, str] = None, thời_gian_chờ: int = 10) -> Optional[Dict[str, Any]]:
-    """Yêu cầu API an toàn với xử lý lỗi"""
-    try:
-        import requests
-        phản_hồi = requests.get(url, params=tham_số, headers=headers, timeout=thời_gian_chờ)
-        if phản_hồi.status_code == 200:
-            return phản_hồi.json()
-        return None
-    except Exception as e:
-        print(f"Lỗi yêu cầu API: {e}")
-        return None
+    """Yêu cầu API an toàn với xử lý lỗi; độ trễ và lỗi được ghi theo nhà cung cấp"""
+    nhà_cung_cấp = tên_nhà_cung_cấp(url)
+    with ĐO_LƯỜNG.đo("http", nhà_cung_cấp):
+        try:
+            from http_session import gửi_get
+            phản_hồi = gửi_get(url, tham_số=tham_số, headers=headers, thời_gian_chờ=thời_gian_chờ)
+            if phản_hồi.status_code == 200:
+                return phản_hồi.json()
+            ĐO_LƯỜNG.ghi_lỗi(nhà_cung_cấp, f"HTTP {phản_hồi.status_code}")
+            return None
+        except Exception as e:
+            ĐO_LƯỜNG.ghi_lỗi(nhà_cung_cấp, f"{type(e).__name__}: {e}")
+            return None
 
 # ========== TRÌNH LẤY DỮ LIỆU NÂNG CAO ==========
 
-def lấy_tâm_lý_mạng_xã_hội(mã: str) -> TâmLýMạngXãHội:
+# Trường của TâmLýMạngXãHội -> trường trong phản hồi LunarCrush
+TRƯỜNG_LUNARCRUSH = {
+    "lượt_nhắc_twitter": "social_mentions_24h",
+    "tâm_lý_twitter": "tweet_sentiment",
+    "bài_đăng_reddit": "reddit_posts_24h",
+    "tâm_lý_reddit": "reddit_sentiment",
+    "thay_đổi_tâm_lý_24h": "sentiment_change_24h",
+    "tâm_lý_influencer": "influencer_sentiment",
+    "điểm_galaxy": "galaxy_score",
+    "xếp_hạng_alt": "alt_rank",
+    "lượng_tương_tác_xã_hội": "interactions_24h",
+    "mức_độ_tương_tác": "social_engagement",
+}
+
+def _chia_lô(các_mã: List[str], kích_thước: int) -> Iterator[List[str]]:
+    kích_thước = max(1, kích_thước)
+    for i in range(0, len(các_mã), kích_thước):
+        yield các_mã[i:i + kích_thước]
+
+@BỘ_NHỚ_ĐỆM.bọc("mạng_xã_hội", lambda d: TâmLýMạngXãHội(**d))
+def lấy_tâm_lý_mạng_xã_hội(mã: str) -> Optional[TâmLýMạngXãHội]:
     """Lấy dữ liệu tâm lý mạng xã hội từ LunarCrush với các chỉ số nâng cao"""
     tâm_lý = TâmLýMạngXãHội()
     
     if not CẤU_HÌNH["LUNARCRUSH_API_KEY"]:
         # Dữ liệu mẫu để minh họa
+        ĐO_LƯỜNG.đếm("dữ_liệu_mẫu", "mạng_xã_hội")
         tâm_lý.lượt_nhắc_twitter = 1500
         tâm_lý.tâm_lý_twitter = 0.65
         tâm_lý.bài_đăng_reddit = 320
@@ -125,15 +277,52 @@ def lấy_tâm_lý_mạng_xã_hội(mã: str) -> TâmLýMạngXãHội:
         tâm_lý.mức_độ_tương_tác = 0.85
         return tâm_lý
     
-    # TODO: Triển khai các lệnh gọi API LunarCrush thực tế
+    # Lô một mã: cùng endpoint và cách phân tích với lấy_tâm_lý_mạng_xã_hội_lô
+    return lấy_tâm_lý_mạng_xã_hội_lô.bỏ_qua_bộ_nhớ_đệm([mã]).get(mã)
+
+def _phân_tích_coin_lunarcrush(mục: Dict[str, Any]) -> TâmLýMạngXãHội:
+    tâm_lý = TâmLýMạngXãHội()
+    for trường, khóa_api in TRƯỜNG_LUNARCRUSH.items():
+        giá_trị = mục.get(khóa_api)
+        if giá_trị is None:
+            continue
+        # Qua float trước để "45.0" / 45.0 đọc được cho trường int; giá trị hỏng giữ mặc định, không làm hỏng cả lô
+        try:
+            số = float(giá_trị)
+            setattr(tâm_lý, trường, int(số) if isinstance(getattr(tâm_lý, trường), int) else số)
+        except (TypeError, ValueError, OverflowError):
+            continue
     return tâm_lý
 
-def lấy_tác_động_tin_tức(mã: str) -> TácĐộngTinTức:
+@BỘ_NHỚ_ĐỆM.bọc_lô("mạng_xã_hội", lambda d: TâmLýMạngXãHội(**d))
+def lấy_tâm_lý_mạng_xã_hội_lô(các_mã: List[str]) -> Dict[str, Optional[TâmLýMạngXãHội]]:
+    """Lấy tâm lý mạng xã hội cho nhiều mã, mỗi yêu cầu LunarCrush một lô LUNARCRUSH_BATCH_SIZE mã"""
+    if not CẤU_HÌNH["LUNARCRUSH_API_KEY"]:
+        return {mã: lấy_tâm_lý_mạng_xã_hội.bỏ_qua_bộ_nhớ_đệm(mã) for mã in các_mã}
+    
+    kết_quả: Dict[str, Optional[TâmLýMạngXãHội]] = {}
+    headers = {"Authorization": f"Bearer {CẤU_HÌNH['LUNARCRUSH_API_KEY']}"}
+    for lô in _chia_lô(các_mã, CẤU_HÌNH["LUNARCRUSH_BATCH_SIZE"]):
+        dữ_liệu = _yêu_cầu_an_toàn(f"{CẤU_HÌNH['LUNARCRUSH_BASE']}coins", {"symbol": ",".join(lô)}, headers)
+        if dữ_liệu is None:
+            # Lỗi yêu cầu: None để không lưu bộ nhớ đệm, lần sau thử lại
+            kết_quả.update(dict.fromkeys(lô))
+            continue
+        theo_mã = {str(mục.get("symbol", "")).upper(): mục for mục in dữ_liệu.get("data") or []}
+        for mã in lô:
+            mục = theo_mã.get(mã.upper())
+            # Mã không được LunarCrush theo dõi: dữ liệu rỗng như khi không có API
+            kết_quả[mã] = _phân_tích_coin_lunarcrush(mục) if mục is not None else TâmLýMạngXãHội()
+    return kết_quả
+
+@BỘ_NHỚ_ĐỆM.bọc("tin_tức", lambda d: TácĐộngTinTức(**d))
+def lấy_tác_động_tin_tức(mã: str) -> Optional[TácĐộngTinTức]:
     """Lấy tác động tin tức với phân tích tâm lý"""
     tin_tức = TácĐộngTinTức()
     
     if not CẤU_HÌNH["CRYPTOPANIC_TOKEN"] and not CẤU_HÌNH["NEWSAPI_KEY"]:
         # Dữ liệu mẫu để minh họa
+        ĐO_LƯỜNG.đếm("dữ_liệu_mẫu", "tin_tức")
         tin_tức.lượng_tin_24h = 25
         tin_tức.tâm_lý_tin_tức_trung_bình = 0.42
         tin_tức.số_tin_tích_cực = 8
@@ -148,46 +337,169 @@ def lấy_tác_động_tin_tức(mã: str) -> TácĐộngTinTức:
         ]
         return tin_tức
     
-    # TODO: Triển khai tích hợp CryptoPanic/NewsAPI
+    if CẤU_HÌNH["CRYPTOPANIC_TOKEN"]:
+        return lấy_tác_động_tin_tức_lô.bỏ_qua_bộ_nhớ_đệm([mã]).get(mã)
+
+    return _lấy_tin_newsapi(mã)
+
+def _lấy_tin_newsapi(mã: str) -> Optional[TácĐộngTinTức]:
+    """Lượng tin 24h từ NewsAPI; NewsAPI không có bình chọn nên mọi bài được tính là trung tính"""
+    từ_lúc = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - 86400))
+    tham_số = {"q": mã, "from": từ_lúc, "sortBy": "publishedAt", "language": "en", "pageSize": 100}
+    dữ_liệu = _yêu_cầu_an_toàn(CẤU_HÌNH["NEWSAPI_BASE"], tham_số, {"X-Api-Key": CẤU_HÌNH["NEWSAPI_KEY"]})
+    if dữ_liệu is None:
+        # Lỗi yêu cầu: None để không lưu bộ nhớ đệm, lần sau thử lại
+        return None
+    các_bài = dữ_liệu.get("articles") or []
+    số_bài = int(dữ_liệu.get("totalResults") or len(các_bài))
+    return TácĐộngTinTức(
+        lượng_tin_24h=số_bài,
+        tâm_lý_tin_tức_trung_bình=0.5,
+        số_tin_trung_tính=số_bài,
+        tin_nóng=[{"tiêu_đề": bài.get("title") or "", "tâm_lý": 0.0, "tác_động": 0} for bài in các_bài[:3]],
+    )
+
+def _tổng_hợp_tin_cryptopanic(các_bài: List[Dict[str, Any]]) -> TácĐộngTinTức:
+    """Gộp các bài CryptoPanic của một mã theo lượt bình chọn"""
+    tin_tức = TácĐộngTinTức(lượng_tin_24h=len(các_bài))
+    tổng_tích_cực = tổng_tiêu_cực = 0
+    các_tin = []
+    for bài in các_bài:
+        bình_chọn = bài.get("votes") or {}
+        tích_cực = int(bình_chọn.get("positive", 0) or 0)
+        tiêu_cực = int(bình_chọn.get("negative", 0) or 0)
+        quan_trọng = int(bình_chọn.get("important", 0) or 0)
+        tổng_tích_cực += tích_cực
+        tổng_tiêu_cực += tiêu_cực
+        if tích_cực > tiêu_cực:
+            tin_tức.số_tin_tích_cực += 1
+        elif tiêu_cực > tích_cực:
+            tin_tức.số_tin_tiêu_cực += 1
+        else:
+            tin_tức.số_tin_trung_tính += 1
+        tác_động = min(10, quan_trọng)
+        if tác_động >= 7:
+            tin_tức.tin_tác_động_cao += 1
+        các_tin.append({
+            "tiêu_đề": bài.get("title", ""),
+            "tâm_lý": round((tích_cực - tiêu_cực) / (tích_cực + tiêu_cực), 3) if tích_cực + tiêu_cực else 0.0,
+            "tác_động": tác_động,
+        })
+    # Thang 0..1 như dữ liệu mẫu; không có bình chọn thì trung lập
+    tổng = tổng_tích_cực + tổng_tiêu_cực
+    tin_tức.tâm_lý_tin_tức_trung_bình = round(tổng_tích_cực / tổng, 3) if tổng else 0.5
+    # Sắp xếp xác định để kết quả không phụ thuộc cách chia lô
+    tin_tức.tin_nóng = sorted(các_tin, key=lambda t: (-t["tác_động"], t["tiêu_đề"]))[:3]
     return tin_tức
 
-def phân_tích_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu_đầu_vào: List[Dict]) -> Dict[str, DữLiệuHợpĐồngTươngLai]:
-    """Phân tích dữ liệu hợp đồng tương lai từ JSON đầu vào"""
-    bản_đồ_hợp_đồng = {}
+@BỘ_NHỚ_ĐỆM.bọc_lô("tin_tức", lambda d: TácĐộngTinTức(**d))
+def lấy_tác_động_tin_tức_lô(các_mã: List[str]) -> Dict[str, Optional[TácĐộngTinTức]]:
+    """Lấy tác động tin tức cho nhiều mã, mỗi lô CRYPTOPANIC_BATCH_SIZE mã qua tham số currencies"""
+    if not CẤU_HÌNH["CRYPTOPANIC_TOKEN"]:
+        return {mã: lấy_tác_động_tin_tức.bỏ_qua_bộ_nhớ_đệm(mã) for mã in các_mã}
     
-    for mục in dữ_liệu_đầu_vào:
-        mã = trích_xuất_mã_từ_cặp(mục.get("p", ""))
-        if not mã:
-            continue
-            
-        dữ_liệu_hợp_đồng = DữLiệuHợpĐồngTươngLai(mã=mã)
-        
-        # Phân tích dữ liệu dòng tiền
-        dữ_liệu_sm = mục.get("sm", {})
-        dữ_liệu_hợp_đồng.dòng_tiền_ròng_24h = dữ_liệu_sm.get("24h", 0)
-        dữ_liệu_hợp_đồng.dòng_tiền_ròng_7ngày = dữ_liệu_sm.get("7d", 0)
-        dữ_liệu_hợp_đồng.dòng_tiền_ròng_30ngày = dữ_liệu_sm.get("30d", 0)
-        
-        # Phân tích dữ liệu tiền gửi/rút
-        dữ_liệu_cin = mục.get("cin", {})
-        dữ_liệu_cout = mục.get("cout", {})
-        dữ_liệu_hợp_đồng.tiền_gửi_24h = dữ_liệu_cin.get("24h", 0)
-        dữ_liệu_hợp_đồng.tiền_rút_24h = dữ_liệu_cout.get("24h", 0)
-        
-        # Phân tích tâm lý thị trường
-        dữ_liệu_st = mục.get("st", {})
-        dữ_liệu_hợp_đồng.tâm_lý_thị_trường = dữ_liệu_st.get("24h", "TRUNG_LẬP").upper()
-        
-        # Phân tích khối lượng cân bằng
-        dữ_liệu_bv = mục.get("bv", {})
-        dữ_liệu_hợp_đồng.khối_lượng_cân_bằng = dữ_liệu_bv.get("24h", 0)
-        
-        # Tính toán các chỉ số phái sinh
-        dữ_liệu_hợp_đồng.đà_dòng_tiền = tính_đà_dòng_tiền(dữ_liệu_hợp_đồng)
-        dữ_liệu_hợp_đồng.xu_hướng_dòng_tiền = xác_định_xu_hướng_dòng_tiền(dữ_liệu_hợp_đồng)
+    kết_quả: Dict[str, Optional[TácĐộngTinTức]] = {}
+    for lô in _chia_lô(các_mã, CẤU_HÌNH["CRYPTOPANIC_BATCH_SIZE"]):
+        theo_mã: Dict[str, List[Dict[str, Any]]] = {mã.upper(): [] for mã in lô}
+        url = f"{CẤU_HÌNH['CRYPTOPANIC_BASE']}posts/"
+        tham_số = {"auth_token": CẤU_HÌNH["CRYPTOPANIC_TOKEN"], "currencies": ",".join(lô), "public": "true"}
+        thành_công = False
+        for _ in range(max(1, CẤU_HÌNH["CRYPTOPANIC_MAX_PAGES"])):
+            dữ_liệu = _yêu_cầu_an_toàn(url, tham_số)
+            if dữ_liệu is None:
+                break
+            thành_công = True
+            # Một bài có thể nhắc nhiều mã trong lô: chia cho từng mã được nhắc
+            for bài in dữ_liệu.get("results") or []:
+                for tiền_tệ in bài.get("currencies") or []:
+                    các_bài = theo_mã.get(str(tiền_tệ.get("code", "")).upper())
+                    if các_bài is not None:
+                        các_bài.append(bài)
+            # Trang tiếp theo đã chứa đủ tham số truy vấn
+            url, tham_số = dữ_liệu.get("next"), None
+            if not url:
+                break
+        for mã in lô:
+            kết_quả[mã] = _tổng_hợp_tin_cryptopanic(theo_mã[mã.upper()]) if thành_công else None
+    return kết_quả
+
+def phân_tích_mục_hợp_đồng(mục: Dict) -> Optional[DữLiệuHợpĐồngTươngLai]:
+    """Phân tích một bản ghi hợp đồng tương lai; None nếu không trích được mã"""
+    mã = trích_xuất_mã_từ_cặp(mục.get("p", ""))
+    if not mã:
+        return None
         
-        bản_đồ_hợp_đồng[mã] = dữ_liệu_hợp_đồng
+    dữ_liệu_hợp_đồng = DữLiệuHợpĐồngTươngLai(mã=mã)
     
+    # Phân tích dữ liệu dòng tiền
+    dữ_liệu_sm = mục.get("sm", {})
+    dữ_liệu_hợp_đồng.dòng_tiền_ròng_24h = dữ_liệu_sm.get("24h", 0)
+    dữ_liệu_hợp_đồng.dòng_tiền_ròng_7ngày = dữ_liệu_sm.get("7d", 0)
+    dữ_liệu_hợp_đồng.dòng_tiền_ròng_30ngày = dữ_liệu_sm.get("30d", 0)
+    
+    # Phân tích dữ liệu tiền gửi/rút
+    dữ_liệu_cin = mục.get("cin", {})
+    dữ_liệu_cout = mục.get("cout", {})
+    dữ_liệu_hợp_đồng.tiền_gửi_24h = dữ_liệu_cin.get("24h", 0)
+    dữ_liệu_hợp_đồng.tiền_rút_24h = dữ_liệu_cout.get("24h", 0)
+    
+    # Phân tích tâm lý thị trường
+    dữ_liệu_st = mục.get("st", {})
+    dữ_liệu_hợp_đồng.tâm_lý_thị_trường = dữ_liệu_st.get("24h", "TRUNG_LẬP").upper()
+    
+    # Phân tích khối lượng cân bằng
+    dữ_liệu_bv = mục.get("bv", {})
+    dữ_liệu_hợp_đồng.khối_lượng_cân_bằng = dữ_liệu_bv.get("24h", 0)
+    
+    # Tính toán các chỉ số phái sinh
+    dữ_liệu_hợp_đồng.đà_dòng_tiền = tính_đà_dòng_tiền(dữ_liệu_hợp_đồng)
+    dữ_liệu_hợp_đồng.xu_hướng_dòng_tiền = xác_định_xu_hướng_dòng_tiền(dữ_liệu_hợp_đồng)
+    
+    return dữ_liệu_hợp_đồng
+
+def lặp_dữ_liệu_hợp_đồng_tương_lai(các_mục: Iterable[Dict]) -> Iterator[DữLiệuHợpĐồngTươngLai]:
+    """Sinh từng DữLiệuHợpĐồngTươngLai từ một nguồn bản ghi bất kỳ (list hoặc luồng)"""
+    for mục in các_mục:
+        dữ_liệu_hợp_đồng = phân_tích_mục_hợp_đồng(mục)
+        if dữ_liệu_hợp_đồng is not None:
+            yield dữ_liệu_hợp_đồng
+
+def đọc_hợp_đồng_theo_luồng(đường_dẫn: str) -> Iterator[DữLiệuHợpĐồngTươngLai]:
+    """Đọc file theo luồng hai lượt; mã trùng lặp ở vị trí đầu tiên với bản ghi cuối như phân_tích_dữ_liệu_hợp_đồng_tương_lai"""
+    # Lượt đầu chạy ngay khi gọi nên lỗi định dạng được báo trước khi chấm điểm. Chỉ giữ vị trí đầu của
+    # mỗi mã và bản ghi cuối (đã phân tích) của mã trùng lặp: bộ nhớ tăng theo số mã, không theo kích thước file
+    vị_trí_đầu: Dict[str, int] = {}
+    thay_thế: Dict[int, DữLiệuHợpĐồngTươngLai] = {}
+    bỏ_qua = set()
+    with open(đường_dẫn, 'r', encoding='utf-8') as tệp:
+        for i, mục in enumerate(lặp_bản_ghi(tệp)):
+            mã = trích_xuất_mã_từ_cặp(mục.get("p", ""))
+            if not mã:
+                continue
+            đầu = vị_trí_đầu.setdefault(mã, i)
+            if đầu != i:
+                thay_thế[đầu] = phân_tích_mục_hợp_đồng(mục)
+                bỏ_qua.add(i)
+    del vị_trí_đầu
+
+    def lượt_sau() -> Iterator[DữLiệuHợpĐồngTươngLai]:
+        with open(đường_dẫn, 'r', encoding='utf-8') as tệp:
+            if not thay_thế:
+                yield from lặp_dữ_liệu_hợp_đồng_tương_lai(lặp_bản_ghi(tệp))
+                return
+            for i, mục in enumerate(lặp_bản_ghi(tệp)):
+                if i in bỏ_qua:
+                    continue
+                dữ_liệu_hợp_đồng = thay_thế.get(i) or phân_tích_mục_hợp_đồng(mục)
+                if dữ_liệu_hợp_đồng is not None:
+                    yield dữ_liệu_hợp_đồng
+    return lượt_sau()
+
+def phân_tích_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu_đầu_vào: Iterable[Dict]) -> Dict[str, DữLiệuHợpĐồngTươngLai]:
+    """Phân tích dữ liệu hợp đồng tương lai từ JSON đầu vào"""
+    bản_đồ_hợp_đồng = {}
+    for dữ_liệu_hợp_đồng in lặp_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu_đầu_vào):
+        bản_đồ_hợp_đồng[dữ_liệu_hợp_đồng.mã] = dữ_liệu_hợp_đồng
     return bản_đồ_hợp_đồng
 
 def trích_xuất_mã_từ_cặp(chuỗi_cặp: str) -> str:
@@ -231,12 +543,14 @@ def xác_định_xu_hướng_dòng_tiền(dữ_liệu_hợp_đồng: DữLiệuH
     else:
         return "TRUNG_LẬP"
 
+@BỘ_NHỚ_ĐỆM.bọc("vĩ_mô", lambda d: ChỉSốKinhTếVĩMô(**d))
 def lấy_chỉ_số_kinh_tế_vĩ_mô() -> ChỉSốKinhTếVĩMô:
     """Lấy chỉ số kinh tế vĩ mô"""
     vĩ_mô = ChỉSốKinhTếVĩMô()
     
     if not CẤU_HÌNH["FRED_API_KEY"]:
         # Dữ liệu mẫu để minh họa
+        ĐO_LƯỜNG.đếm("dữ_liệu_mẫu", "vĩ_mô")
         vĩ_mô.vix_hiện_tại = 18.5
         vĩ_mô.xu_hướng_vix = "GIẢM"
         vĩ_mô.dxy_hiện_tại = 103.2
@@ -252,8 +566,63 @@ def lấy_chỉ_số_kinh_tế_vĩ_mô() -> ChỉSốKinhTếVĩMô:
     # TODO: Triển khai tích hợp API FRED
     return vĩ_mô
 
+@BỘ_NHỚ_ĐỆM.bọc("fear_greed", lambda d: ChỉSốFearGreed(**d))
+def lấy_chỉ_số_fear_greed() -> Optional[ChỉSốFearGreed]:
+    """Lấy chỉ số Fear & Greed mới nhất (alternative.me, không cần khóa API)"""
+    dữ_liệu = _yêu_cầu_an_toàn(CẤU_HÌNH["FEAR_GREED_URL"], tham_số={"limit": 1})
+    try:
+        mới_nhất = dữ_liệu["data"][0]
+        return ChỉSốFearGreed(giá_trị=int(mới_nhất["value"]), phân_loại=mới_nhất.get("value_classification", ""))
+    except (TypeError, KeyError, IndexError, ValueError):
+        return None
+
+@BỘ_NHỚ_ĐỆM.bọc("tvl_defi", lambda d: TVLDeFi(**d))
+def lấy_tvl_tổng_defi() -> Optional[TVLDeFi]:
+    """Lấy tổng TVL DeFi và thay đổi 7 ngày từ DefiLlama"""
+    dữ_liệu = _yêu_cầu_an_toàn(CẤU_HÌNH["DEFILLAMA_TVL_URL"], thời_gian_chờ=15)
+    if not dữ_liệu or len(dữ_liệu) < 8:
+        return None
+    try:
+        hiện_tại = float(dữ_liệu[-1]["tvl"])
+        tuần_trước = float(dữ_liệu[-8]["tvl"])
+    except (TypeError, KeyError, ValueError):
+        return None
+    thay_đổi = (hiện_tại - tuần_trước) / tuần_trước * 100 if tuần_trước else 0.0
+    return TVLDeFi(tvl_hiện_tại=hiện_tại, thay_đổi_7ngày=round(thay_đổi, 2))
+
+@BỘ_NHỚ_ĐỆM.bọc("top_coin")
+def lấy_thị_trường_top_coin() -> List[Dict[str, Any]]:
+    """Top coin theo vốn hóa từ CoinGecko: [{"mã", "giá"}] theo hạng, đã sàng theo UNIVERSE_MIN_*"""
+    from universe import UNIVERSE
+    # Hạn của danh sách do bộ nhớ đệm "top_coin" quản lý: tới đây là lấy lại mọi trang
+    UNIVERSE.làm_mới(bắt_buộc=True)
+    return UNIVERSE.top_coin(
+        khối_lượng_tối_thiểu=CẤU_HÌNH["UNIVERSE_MIN_VOLUME"] or None,
+        vốn_hóa_tối_thiểu=CẤU_HÌNH["UNIVERSE_MIN_MARKET_CAP"] or None,
+    )
+
 # ========== BỘ CHẤM ĐIỂM NÂNG CAO ==========
 
+# Mẫu văn bản có giá trị; bộ chấm điểm theo lô (batch_scorer.py) dùng chung các mẫu này
+MẪU_ALTRANK_TỐT = "AltRank tốt #{} → tài sản đang hot"
+MẪU_ALTRANK_KÉM = "AltRank kém #{} → ít tương tác xã hội"
+MẪU_SỢ_HÃI_TỘT_ĐỘ = "Sợ hãi tột độ ({}) → cơ hội mua ngược xu hướng"
+MẪU_SỢ_HÃI = "Thị trường sợ hãi ({}) → giá có thể bị bán quá mức"
+MẪU_THAM_LAM_TỘT_ĐỘ = "Tham lam tột độ ({}) → rủi ro điều chỉnh cao"
+MẪU_THAM_LAM = "Thị trường tham lam ({}) → thận trọng khi mua đuổi"
+MẪU_TVL_TĂNG = "TVL DeFi tăng {:.1f}% trong 7 ngày → vốn đang vào on-chain"
+MẪU_TVL_GIẢM = "TVL DeFi giảm {:.1f}% trong 7 ngày → vốn rời on-chain"
+
+# Dấu vân tay đầu vào của bộ chấm điểm được ghi nhớ: đúng các trường hàm chấm đọc. attrgetter dựng
+# tuple phẳng trong C; trường được in ra văn bản kèm kiểu (".__class__") để 45 và 45.0 không dùng chung mục.
+# Tin tức và hợp đồng không ghi nhớ: chấm điểm (~0.4 µs, chỉ chuỗi hằng) rẻ hơn dựng dấu vân tay
+_DẤU_VÂN_TAY_MẠNG_XÃ_HỘI = attrgetter("điểm_galaxy", "xếp_hạng_alt", "xếp_hạng_alt.__class__", "thay_đổi_tâm_lý_24h",
+                                      "tâm_lý_twitter", "tâm_lý_reddit", "tâm_lý_influencer")
+_DẤU_VÂN_TAY_VĨ_MÔ = attrgetter("vix_hiện_tại", "xu_hướng_vix", "dxy_hiện_tại", "xu_hướng_dxy",
+                                "lợi_suất_trái_phiếu_mỹ_10năm", "xu_hướng_lợi_suất", "thay_đổi_sp500",
+                                "thay_đổi_nasdaq", "mức_độ_chấp_nhận_rủi_ro")
+
+@BỘ_GHI_NHỚ_ĐIỂM.bọc("mạng_xã_hội", _DẤU_VÂN_TAY_MẠNG_XÃ_HỘI)
 def chấm_điểm_tâm_lý_mạng_xã_hội(tâm_lý: TâmLýMạngXãHội) -> Tuple[float, float, List[str], List[str]]:
     """Chấm điểm tâm lý mạng xã hội với trọng số tác động 20%"""
     điểm_mua, điểm_bán = 0.0, 0.0
@@ -270,10 +639,10 @@ def chấm_điểm_tâm_lý_mạng_xã_hội(tâm_lý: TâmLýMạngXãHội) ->
     # Trọng số xếp hạng Alt (thấp hơn là tốt hơn)
     if tâm_lý.xếp_hạng_alt <= 50:
         điểm_mua += 1.0
-        tín_hiệu.append(f"AltRank tốt #{tâm_lý.xếp_hạng_alt} → tài sản đang hot")
+        tín_hiệu.append(MẪU_ALTRANK_TỐT.format(tâm_lý.xếp_hạng_alt))
     elif tâm_lý.xếp_hạng_alt >= 200:
         điểm_bán += 0.5
-        cảnh_báo.append(f"AltRank kém #{tâm_lý.xếp_hạng_alt} → ít tương tác xã hội")
+        cảnh_báo.append(MẪU_ALTRANK_KÉM.format(tâm_lý.xếp_hạng_alt))
     
     # Đà tâm lý
     if tâm_lý.thay_đổi_tâm_lý_24h > 0.15:
@@ -380,11 +749,12 @@ def chấm_điểm_dữ_liệu_hợp_đồng_tương_lai(hợp_đồng: DữLi
     
     return điểm_mua, điểm_bán, tín_hiệu, cảnh_báo
 
-def chấm_điểm_môi_trường_vĩ_mô(vĩ_mô: ChỉSốKinhTếVĩMô) -> Tuple[float, float, float, List[str]]:
+@BỘ_GHI_NHỚ_ĐIỂM.bọc("vĩ_mô", _DẤU_VÂN_TAY_VĨ_MÔ)
+def chấm_điểm_môi_trường_vĩ_mô(vĩ_mô: ChỉSốKinhTếVĩMô) -> Tuple[float, float, float, List[str], List[str]]:
     """Chấm điểm môi trường vĩ mô với trọng số tác động 20%"""
     điểm_mua, điểm_bán = 0.0, 0.0
     hệ_số_kích_thước = 1.0
-    cảnh_báo = []
+    tín_hiệu, cảnh_báo = [], []
     
     # Phân tích VIX (chỉ số sợ hãi)
     if vĩ_mô.vix_hiện_tại > 25 and vĩ_mô.xu_hướng_vix == "TĂNG":
@@ -423,66 +793,277 @@ def chấm_điểm_môi_trường_vĩ_mô(vĩ_mô: ChỉSốKinhTếVĩMô) -> T
     elif vĩ_mô.mức_độ_chấp_nhận_rủi_ro == "THẤP":
         hệ_số_kích_thước *= 0.8
     
-    return điểm_mua, điểm_bán, hệ_số_kích_thước, cảnh_báo
+    return điểm_mua, điểm_bán, hệ_số_kích_thước, tín_hiệu, cảnh_báo
 
-# ========== PIPELINE PHÂN TÍCH CHÍNH ==========
+@BỘ_GHI_NHỚ_ĐIỂM.bọc("fear_greed", attrgetter("giá_trị", "giá_trị.__class__"))
+def chấm_điểm_fear_greed(fear_greed: ChỉSốFearGreed) -> Tuple[float, float, List[str], List[str]]:
+    """Chấm điểm Fear & Greed theo hướng ngược đám đông"""
+    điểm_mua, điểm_bán = 0.0, 0.0
+    tín_hiệu, cảnh_báo = [], []
+    
+    if fear_greed.giá_trị <= 20:
+        điểm_mua += 2.0
+        tín_hiệu.append(MẪU_SỢ_HÃI_TỘT_ĐỘ.format(fear_greed.giá_trị))
+    elif fear_greed.giá_trị <= 40:
+        điểm_mua += 1.0
+        tín_hiệu.append(MẪU_SỢ_HÃI.format(fear_greed.giá_trị))
+    elif fear_greed.giá_trị >= 80:
+        điểm_bán += 2.0
+        cảnh_báo.append(MẪU_THAM_LAM_TỘT_ĐỘ.format(fear_greed.giá_trị))
+    elif fear_greed.giá_trị >= 60:
+        điểm_bán += 1.0
+        cảnh_báo.append(MẪU_THAM_LAM.format(fear_greed.giá_trị))
+    
+    return điểm_mua, điểm_bán, tín_hiệu, cảnh_báo
 
-def phân_tích_mã(mã: str, dữ_liệu_hợp_đồng: Dict[str, DữLiệuHợpĐồngTươngLai], 
-                  điểm_ròng_tối_thiểu: float = 2.0) -> KếtQuảTínHiệu:
-    """Pipeline phân tích nâng cao cho một mã"""
+@BỘ_GHI_NHỚ_ĐIỂM.bọc("tvl_defi", attrgetter("thay_đổi_7ngày"))
+def chấm_điểm_tvl_defi(tvl: TVLDeFi) -> Tuple[float, float, List[str], List[str]]:
+    """Chấm điểm xu hướng tổng TVL DeFi 7 ngày"""
+    điểm_mua, điểm_bán = 0.0, 0.0
+    tín_hiệu, cảnh_báo = [], []
     
-    thành_phần = {}
+    if tvl.thay_đổi_7ngày >= 5:
+        điểm_mua += 1.5
+        tín_hiệu.append(MẪU_TVL_TĂNG.format(tvl.thay_đổi_7ngày))
+    elif tvl.thay_đổi_7ngày >= 2:
+        điểm_mua += 0.5
+    elif tvl.thay_đổi_7ngày <= -5:
+        điểm_bán += 1.5
+        cảnh_báo.append(MẪU_TVL_GIẢM.format(abs(tvl.thay_đổi_7ngày)))
+    elif tvl.thay_đổi_7ngày <= -2:
+        điểm_bán += 0.5
     
-    # Lấy tất cả nguồn dữ liệu
-    mạng_xã_hội = lấy_tâm_lý_mạng_xã_hội(mã)
-    tin_tức = lấy_tác_động_tin_tức(mã)
-    hợp_đồng = dữ_liệu_hợp_đồng.get(mã, DữLiệuHợpĐồngTươngLai(mã=mã))
-    vĩ_mô = lấy_chỉ_số_kinh_tế_vĩ_mô()
+    return điểm_mua, điểm_bán, tín_hiệu, cảnh_báo
+
+# ========== SỔ ĐĂNG KÝ THÀNH PHẦN ==========
+
+# (điểm_mua, điểm_bán, hệ_số_kích_thước, tín_hiệu, cảnh_báo); bộ chấm điểm đã ghi nhớ trả tín hiệu dạng tuple
+ĐiểmThànhPhần = Tuple[float, float, float, Sequence[str], Sequence[str]]
+
+@dataclass
+class ThànhPhầnChấmĐiểm:
+    """Một nguồn điểm: hàm lấy dữ liệu, hàm chấm điểm và trọng số mặc định"""
+    tên: str
+    hàm_chấm: Callable[[Any], tuple]
+    trọng_số: float
+    # "theo_mã": lấy và chấm cho từng mã; "toàn_cục": lấy và chấm một lần cho cả lần chạy
+    phạm_vi: str = "theo_mã"
+    # theo_mã: hàm_lấy(mã); toàn_cục: hàm_lấy(). None khi dữ liệu đến từ file đầu vào
+    hàm_lấy: Optional[Callable[..., Any]] = None
+    giới_hạn_đồng_thời: int = 8
+    # Biến thể theo lô của thành phần theo mã: hàm_lấy_lô([mã...]) -> {mã: dữ liệu}
+    hàm_lấy_lô: Optional[Callable[[List[str]], Dict[str, Any]]] = None
+    kích_thước_lô: int = 1
+    # Dataclass của dữ liệu, để dựng lại từ dict đã lưu (kho lịch sử, backtest)
+    kiểu_dữ_liệu: Optional[type] = None
+    # Thành phần lõi được CLI dùng mặc định; còn lại chỉ dùng khi được chọn
+    lõi: bool = True
+
+SỔ_ĐĂNG_KÝ_THÀNH_PHẦN: Dict[str, ThànhPhầnChấmĐiểm] = {}
+
+def đăng_ký_thành_phần(thành_phần: ThànhPhầnChấmĐiểm) -> ThànhPhầnChấmĐiểm:
+    """Thêm (hoặc thay) một thành phần; thứ tự đăng ký là thứ tự cộng điểm"""
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[thành_phần.tên] = thành_phần
+    return thành_phần
+
+def chuẩn_hóa_điểm(điểm: tuple) -> ĐiểmThànhPhần:
+    """Bộ chấm điểm trả về 4 giá trị (không có hệ số kích thước) hoặc đủ 5 giá trị"""
+    if len(điểm) == 4:
+        mua, bán, tín_hiệu, cảnh_báo = điểm
+        return mua, bán, 1.0, tín_hiệu, cảnh_báo
+    return điểm
+
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("mạng_xã_hội", chấm_điểm_tâm_lý_mạng_xã_hội, 0.2,
+                                     hàm_lấy=lấy_tâm_lý_mạng_xã_hội,
+                                     giới_hạn_đồng_thời=CẤU_HÌNH["LUNARCRUSH_CONCURRENCY"],
+                                     hàm_lấy_lô=lấy_tâm_lý_mạng_xã_hội_lô,
+                                     kích_thước_lô=CẤU_HÌNH["LUNARCRUSH_BATCH_SIZE"],
+                                     kiểu_dữ_liệu=TâmLýMạngXãHội))
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("tin_tức", chấm_điểm_tác_động_tin_tức, 0.25,
+                                     hàm_lấy=lấy_tác_động_tin_tức,
+                                     giới_hạn_đồng_thời=CẤU_HÌNH["CRYPTOPANIC_CONCURRENCY"],
+                                     hàm_lấy_lô=lấy_tác_động_tin_tức_lô,
+                                     kích_thước_lô=CẤU_HÌNH["CRYPTOPANIC_BATCH_SIZE"],
+                                     kiểu_dữ_liệu=TácĐộngTinTức))
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("hợp_đồng", chấm_điểm_dữ_liệu_hợp_đồng_tương_lai, 0.3,
+                                     kiểu_dữ_liệu=DữLiệuHợpĐồngTươngLai))
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("vĩ_mô", chấm_điểm_môi_trường_vĩ_mô, 0.2,
+                                     phạm_vi="toàn_cục", hàm_lấy=lấy_chỉ_số_kinh_tế_vĩ_mô,
+                                     kiểu_dữ_liệu=ChỉSốKinhTếVĩMô))
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("fear_greed", chấm_điểm_fear_greed, 0.05,
+                                     phạm_vi="toàn_cục", hàm_lấy=lấy_chỉ_số_fear_greed, lõi=False,
+                                     kiểu_dữ_liệu=ChỉSốFearGreed))
+đăng_ký_thành_phần(ThànhPhầnChấmĐiểm("tvl_defi", chấm_điểm_tvl_defi, 0.05,
+                                     phạm_vi="toàn_cục", hàm_lấy=lấy_tvl_tổng_defi, lõi=False,
+                                     kiểu_dữ_liệu=TVLDeFi))
+
+def thành_phần_lõi() -> Tuple[str, ...]:
+    return tuple(tên for tên, tp in SỔ_ĐĂNG_KÝ_THÀNH_PHẦN.items() if tp.lõi)
+
+def thành_phần_theo_mã(các_tên: Iterable[str] = None) -> List[ThànhPhầnChấmĐiểm]:
+    """Các thành phần theo mã có hàm lấy (phần cần I/O cho từng mã)"""
+    các_tên = thành_phần_lõi() if các_tên is None else các_tên
+    return [SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên] for tên in các_tên
+            if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].phạm_vi == "theo_mã" and SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].hàm_lấy is not None]
+
+# ========== PIPELINE PHÂN TÍCH CHÍNH ==========
+
+@dataclass
+class NgữCảnhChạy:
+    """Đầu vào toàn cục của một lần chạy: lấy và chấm điểm một lần, dùng chung cho mọi mã"""
+    vĩ_mô: ChỉSốKinhTếVĩMô
+    điểm_vĩ_mô: Tuple[float, float, float, List[str], List[str]]
+    thành_phần_vĩ_mô: Dict[str, Any]
+    # Dữ liệu thô của các thành phần toàn cục khác (fear & greed, TVL DeFi...) theo tên
+    toàn_cục: Dict[str, Any] = field(default_factory=dict)
+    # Tên các thành phần được cộng điểm trong lần chạy, theo thứ tự đăng ký
+    các_thành_phần: Tuple[str, ...] = field(default_factory=thành_phần_lõi)
+    # Điểm đã chấm sẵn của thành phần toàn cục; thiếu dữ liệu thì không có mặt
+    điểm_toàn_cục: Dict[str, ĐiểmThànhPhần] = field(default_factory=dict)
+
+def tạo_ngữ_cảnh_chạy(các_thành_phần: Iterable[str] = None) -> NgữCảnhChạy:
+    """Lấy và chấm điểm các thành phần toàn cục đúng một lần cho cả lần chạy"""
+    các_thành_phần = thành_phần_lõi() if các_thành_phần is None else tuple(các_thành_phần)
+    with ĐO_LƯỜNG.đo("ngữ_cảnh"):
+        toàn_cục = {
+            tên: SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].hàm_lấy() if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].hàm_lấy is not None else None
+            for tên in các_thành_phần if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].phạm_vi == "toàn_cục"
+        }
+        # Vĩ mô luôn có mặt trong ảnh chụp và kết quả, kể cả khi không cộng điểm
+        if toàn_cục.get("vĩ_mô") is None:
+            toàn_cục["vĩ_mô"] = lấy_chỉ_số_kinh_tế_vĩ_mô()
+        return dựng_ngữ_cảnh_chạy(toàn_cục, các_thành_phần)
+
+def dựng_ngữ_cảnh_chạy(dữ_liệu_toàn_cục: Dict[str, Any], các_thành_phần: Iterable[str] = None) -> NgữCảnhChạy:
+    """Chấm điểm dữ liệu toàn cục đã có sẵn (tiến trình nền, kho lịch sử) thành ngữ cảnh lần chạy, không I/O mạng"""
+    các_thành_phần = thành_phần_lõi() if các_thành_phần is None else tuple(các_thành_phần)
+    toàn_cục = {tên: dữ_liệu_toàn_cục.get(tên) for tên in các_thành_phần
+                if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].phạm_vi == "toàn_cục"}
+    điểm_toàn_cục: Dict[str, ĐiểmThànhPhần] = {}
+    for tên, dữ_liệu in toàn_cục.items():
+        tp = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên]
+        if dữ_liệu is not None:
+            điểm_toàn_cục[tên] = chuẩn_hóa_điểm(tp.hàm_chấm(dữ_liệu))
     
-    thành_phần["mạng_xã_hội"] = asdict(mạng_xã_hội)
-    thành_phần["tin_tức"] = asdict(tin_tức)
-    thành_phần["hợp_đồng"] = asdict(hợp_đồng)
-    thành_phần["vĩ_mô"] = asdict(vĩ_mô)
+    # Chưa có dữ liệu vĩ mô thì dùng giá trị mặc định; việc lấy thuộc về người gọi (tạo_ngữ_cảnh_chạy, làm_mới)
+    vĩ_mô = toàn_cục.pop("vĩ_mô", None) or dữ_liệu_toàn_cục.get("vĩ_mô") or ChỉSốKinhTếVĩMô()
+    return NgữCảnhChạy(
+        vĩ_mô=vĩ_mô,
+        điểm_vĩ_mô=điểm_toàn_cục.get("vĩ_mô") or chấm_điểm_môi_trường_vĩ_mô(vĩ_mô),
+        thành_phần_vĩ_mô=asdict(vĩ_mô),
+        toàn_cục=toàn_cục,
+        các_thành_phần=các_thành_phần,
+        điểm_toàn_cục=điểm_toàn_cục,
+    )
+
+@_có_slots
+@dataclass
+class ẢnhChụpThànhPhần:
+    """Dữ liệu thô của mọi thành phần cho một mã, tách khỏi bước chấm điểm"""
+    mã: str
+    mạng_xã_hội: TâmLýMạngXãHội
+    tin_tức: TácĐộngTinTức
+    hợp_đồng: DữLiệuHợpĐồngTươngLai
+    vĩ_mô: ChỉSốKinhTếVĩMô
+    ngữ_cảnh: Optional[NgữCảnhChạy] = field(default=None, repr=False, compare=False)
+    # Dữ liệu của thành phần theo mã đăng ký thêm, theo tên
+    thêm: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _thành_phần: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    def thành_phần(self) -> Dict[str, Any]:
+        """Dạng dict của các thành phần, chỉ tính một lần cho mỗi ảnh chụp"""
+        if self._thành_phần is None:
+            self._thành_phần = {
+                "mạng_xã_hội": asdict(self.mạng_xã_hội),
+                "tin_tức": asdict(self.tin_tức),
+                "hợp_đồng": asdict(self.hợp_đồng),
+                # Tham chiếu tới dict dùng chung của lần chạy thay vì bản sao cho mỗi mã
+                "vĩ_mô": self.ngữ_cảnh.thành_phần_vĩ_mô if self.ngữ_cảnh is not None else asdict(self.vĩ_mô),
+            }
+            for tên, giá_trị in self.thêm.items():
+                self._thành_phần[tên] = asdict(giá_trị) if is_dataclass(giá_trị) else giá_trị
+        return self._thành_phần
+
+    def dữ_liệu(self, tên: str) -> Any:
+        """Dữ liệu thô của một thành phần theo mã"""
+        if tên in ("mạng_xã_hội", "tin_tức", "hợp_đồng", "vĩ_mô"):
+            return getattr(self, tên)
+        return self.thêm.get(tên)
+
+# Trọng số ưu tiên của từng thành phần lõi
+TRỌNG_SỐ_MẶC_ĐỊNH = {tên: SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].trọng_số for tên in thành_phần_lõi()}
+
+def thu_thập_ảnh_chụp(mã: str, dữ_liệu_hợp_đồng: Dict[str, DữLiệuHợpĐồngTươngLai],
+                      ngữ_cảnh: NgữCảnhChạy = None) -> ẢnhChụpThànhPhần:
+    """Lấy tất cả nguồn dữ liệu cho một mã (bước duy nhất có I/O mạng)"""
+    if ngữ_cảnh is None:
+        ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    dữ_liệu_theo_mã = {tp.tên: tp.hàm_lấy(mã) for tp in thành_phần_theo_mã(ngữ_cảnh.các_thành_phần)}
+    return tạo_ảnh_chụp(mã, dữ_liệu_theo_mã, dữ_liệu_hợp_đồng.get(mã, DữLiệuHợpĐồngTươngLai(mã=mã)), ngữ_cảnh)
+
+def lấy_dữ_liệu_lô(các_mã: List[str], ngữ_cảnh: NgữCảnhChạy) -> Dict[str, Dict[str, Any]]:
+    """Lấy dữ liệu theo mã cho nhiều mã một lúc, dùng endpoint theo lô khi thành phần có; trả về {tên: {mã: dữ liệu}}"""
+    dữ_liệu: Dict[str, Dict[str, Any]] = {}
+    for tp in thành_phần_theo_mã(ngữ_cảnh.các_thành_phần):
+        if tp.hàm_lấy_lô is not None:
+            dữ_liệu[tp.tên] = tp.hàm_lấy_lô(các_mã)
+        else:
+            dữ_liệu[tp.tên] = {mã: tp.hàm_lấy(mã) for mã in dict.fromkeys(các_mã)}
+    return dữ_liệu
+
+def tạo_ảnh_chụp(mã: str, dữ_liệu_theo_mã: Dict[str, Any], hợp_đồng: DữLiệuHợpĐồngTươngLai,
+                 ngữ_cảnh: NgữCảnhChạy) -> ẢnhChụpThànhPhần:
+    """Dựng ảnh chụp từ dữ liệu đã lấy của các thành phần theo mã"""
+    dữ_liệu_theo_mã = dict(dữ_liệu_theo_mã)
+    mạng_xã_hội = dữ_liệu_theo_mã.pop("mạng_xã_hội", None)
+    tin_tức = dữ_liệu_theo_mã.pop("tin_tức", None)
+    # Thành phần được chọn nhưng lấy thất bại: chấm điểm trên dữ liệu rỗng, đếm để thấy trong báo cáo
+    for tên, dữ_liệu in (("mạng_xã_hội", mạng_xã_hội), ("tin_tức", tin_tức)):
+        if dữ_liệu is None and tên in ngữ_cảnh.các_thành_phần:
+            ĐO_LƯỜNG.đếm("thiếu_dữ_liệu", tên)
+    return ẢnhChụpThànhPhần(
+        mã=mã,
+        mạng_xã_hội=mạng_xã_hội or TâmLýMạngXãHội(),
+        tin_tức=tin_tức or TácĐộngTinTức(),
+        hợp_đồng=hợp_đồng,
+        vĩ_mô=ngữ_cảnh.vĩ_mô,
+        ngữ_cảnh=ngữ_cảnh,
+        thêm=dữ_liệu_theo_mã,
+    )
+
+def tổng_hợp_điểm(ảnh_chụp: ẢnhChụpThànhPhần, trọng_số: Dict[str, float] = None) -> Tuple[float, float, float, List[str], List[str]]:
+    """Chạy bộ chấm điểm của từng thành phần đã đăng ký và cộng theo trọng số"""
+    if trọng_số is None:
+        trọng_số = TRỌNG_SỐ_MẶC_ĐỊNH
+    ngữ_cảnh = ảnh_chụp.ngữ_cảnh
     
-    # Khởi tạo chấm điểm
     tổng_điểm_mua, tổng_điểm_bán = 0.0, 0.0
     tất_cả_tín_hiệu, tất_cả_cảnh_báo = [], []
     hệ_số_kích_thước = 1.0
     
-    # Áp dụng chấm điểm với trọng số ưu tiên
-    # Mạng xã hội: 20%
-    m_mua, m_bán, m_tín_hiệu, m_cảnh_báo = chấm_điểm_tâm_lý_mạng_xã_hội(mạng_xã_hội)
-    tổng_điểm_mua += m_mua * 0.2
-    tổng_điểm_bán += m_bán * 0.2
-    tất_cả_tín_hiệu.extend(m_tín_hiệu)
-    tất_cả_cảnh_báo.extend(m_cảnh_báo)
-    
-    # Tin tức: 25%
-    t_mua, t_bán, t_tín_hiệu, t_cảnh_báo = chấm_điểm_tác_động_tin_tức(tin_tức)
-    tổng_điểm_mua += t_mua * 0.25
-    tổng_điểm_bán += t_bán * 0.25
-    tất_cả_tín_hiệu.extend(t_tín_hiệu)
-    tất_cả_cảnh_báo.extend(t_cảnh_báo)
-    
-    # Hợp đồng tương lai: 30%
-    h_mua, h_bán, h_tín_hiệu, h_cảnh_báo = chấm_điểm_dữ_liệu_hợp_đồng_tương_lai(hợp_đồng)
-    tổng_điểm_mua += h_mua * 0.3
-    tổng_điểm_bán += h_bán * 0.3
-    tất_cả_tín_hiệu.extend(h_tín_hiệu)
-    tất_cả_cảnh_báo.extend(h_cảnh_báo)
-    
-    # Vĩ mô: 20% + điều chỉnh kích thước
-    v_mua, v_bán, v_hệ_số, v_cảnh_báo = chấm_điểm_môi_trường_vĩ_mô(vĩ_mô)
-    tổng_điểm_mua += v_mua * 0.2
-    tổng_điểm_bán += v_bán * 0.2
-    hệ_số_kích_thước *= v_hệ_số
-    tất_cả_cảnh_báo.extend(v_cảnh_báo)
-    
-    # Tính điểm cuối cùng
-    điểm_ròng = tổng_điểm_mua - tổng_điểm_bán
-    hệ_số_vị_thế = max(0.1, min(2.0, hệ_số_kích_thước))
+    for tên in (ngữ_cảnh.các_thành_phần if ngữ_cảnh is not None else thành_phần_lõi()):
+        tp = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên]
+        if tp.phạm_vi == "toàn_cục" and ngữ_cảnh is not None:
+            # Điểm toàn cục đã tính sẵn một lần cho cả lần chạy
+            điểm = ngữ_cảnh.điểm_toàn_cục.get(tên)
+        else:
+            dữ_liệu = ảnh_chụp.dữ_liệu(tên)
+            điểm = chuẩn_hóa_điểm(tp.hàm_chấm(dữ_liệu)) if dữ_liệu is not None else None
+        if điểm is None:
+            continue
+        
+        mua, bán, hệ_số, tín_hiệu, cảnh_báo = điểm
+        w = trọng_số.get(tên, tp.trọng_số)
+        tổng_điểm_mua += mua * w
+        tổng_điểm_bán += bán * w
+        hệ_số_kích_thước *= hệ_số
+        tất_cả_tín_hiệu.extend(tín_hiệu)
+        tất_cả_cảnh_báo.extend(cảnh_báo)
     
-    # Xác định độ tin cậy và tín hiệu chính
+    return tổng_điểm_mua, tổng_điểm_bán, hệ_số_kích_thước, tất_cả_tín_hiệu, tất_cả_cảnh_báo
+
+def phân_loại_tín_hiệu(điểm_ròng: float, điểm_ròng_tối_thiểu: float = 2.0) -> Tuple[str, str]:
+    """Xác định độ tin cậy và tín hiệu chính từ điểm ròng"""
     if abs(điểm_ròng) >= 3.0:
         độ_tin_cậy = "CAO"
     elif abs(điểm_ròng) >= 1.5:
@@ -497,6 +1078,16 @@ def phân_tích_mã(mã: str, dữ_liệu_hợp_đồng: Dict[str, DữLiệuH
     else:
         tín_hiệu_chính = "TRUNG_LẬP"
     
+    return độ_tin_cậy, tín_hiệu_chính
+
+def tạo_kết_quả(mã: str, tổng_điểm_mua: float, tổng_điểm_bán: float, hệ_số_kích_thước: float,
+                 tín_hiệu: List[str], cảnh_báo: List[str], thành_phần: Dict[str, Any],
+                 điểm_ròng_tối_thiểu: float = 2.0) -> KếtQuảTínHiệu:
+    """Tính điểm cuối cùng, phân loại và đóng gói kết quả"""
+    điểm_ròng = tổng_điểm_mua - tổng_điểm_bán
+    hệ_số_vị_thế = max(0.1, min(2.0, hệ_số_kích_thước))
+    độ_tin_cậy, tín_hiệu_chính = phân_loại_tín_hiệu(điểm_ròng, điểm_ròng_tối_thiểu)
+    
     return KếtQuảTínHiệu(
         mã=mã,
         điểm_mua=round(tổng_điểm_mua, 2),
@@ -505,55 +1096,331 @@ def phân_tích_mã(mã: str, dữ_liệu_hợp_đồng: Dict[str, DữLiệuH
         hệ_số_kích_thước_vị_thế=round(hệ_số_vị_thế, 2),
         độ_tin_cậy=độ_tin_cậy,
         tín_hiệu_chính=tín_hiệu_chính,
-        cảnh_báo=tất_cả_cảnh_báo,
-        tín_hiệu=tất_cả_tín_hiệu,
+        cảnh_báo=cảnh_báo,
+        tín_hiệu=tín_hiệu,
         thành_phần=thành_phần
     )
 
+def chấm_điểm_ảnh_chụp(ảnh_chụp: ẢnhChụpThànhPhần, điểm_ròng_tối_thiểu: float = 2.0,
+                        trọng_số: Dict[str, float] = None) -> KếtQuảTínHiệu:
+    """Chấm điểm lại một ảnh chụp đã lấy sẵn, không có I/O mạng"""
+    mua, bán, hệ_số, tín_hiệu, cảnh_báo = tổng_hợp_điểm(ảnh_chụp, trọng_số)
+    return tạo_kết_quả(ảnh_chụp.mã, mua, bán, hệ_số, tín_hiệu, cảnh_báo,
+                       ảnh_chụp.thành_phần(), điểm_ròng_tối_thiểu)
+
+def phân_tích_mã(mã: str, dữ_liệu_hợp_đồng: Dict[str, DữLiệuHợpĐồngTươngLai], 
+                  điểm_ròng_tối_thiểu: float = 2.0, ngữ_cảnh: NgữCảnhChạy = None) -> KếtQuảTínHiệu:
+    """Pipeline phân tích nâng cao cho một mã"""
+    bắt_đầu = time.perf_counter()
+    ảnh_chụp = thu_thập_ảnh_chụp(mã, dữ_liệu_hợp_đồng, ngữ_cảnh)
+    kết_quả = chấm_điểm_ảnh_chụp(ảnh_chụp, điểm_ròng_tối_thiểu)
+    if ĐO_LƯỜNG.chi_tiết:
+        ĐO_LƯỜNG.ghi_mã(mã, time.perf_counter() - bắt_đầu)
+    return kết_quả
+
+# ========== CHẤM ĐIỂM SONG SONG ĐA TIẾN TRÌNH ==========
+
+_NGỮ_CẢNH_TIẾN_TRÌNH: Optional[Tuple[NgữCảnhChạy, float]] = None
+
+def _khởi_tạo_tiến_trình(ngữ_cảnh: NgữCảnhChạy, điểm_ròng_tối_thiểu: float, đo_chi_tiết: bool = False):
+    """Nhận ngữ cảnh chạy một lần cho mỗi tiến trình con thay vì gửi theo từng khối"""
+    global _NGỮ_CẢNH_TIẾN_TRÌNH
+    _NGỮ_CẢNH_TIẾN_TRÌNH = (ngữ_cảnh, điểm_ròng_tối_thiểu)
+    ĐO_LƯỜNG.chi_tiết = đo_chi_tiết
+
+def _chấm_điểm_lô(khối: List[DữLiệuHợpĐồngTươngLai], điểm_ròng_tối_thiểu: float,
+                  ngữ_cảnh: NgữCảnhChạy) -> List[KếtQuảTínHiệu]:
+    """Lấy dữ liệu của cả khối bằng yêu cầu theo lô rồi chấm điểm từng mã theo thứ tự"""
+    with ĐO_LƯỜNG.đo("lấy_dữ_liệu"):
+        dữ_liệu = lấy_dữ_liệu_lô([hợp_đồng.mã for hợp_đồng in khối], ngữ_cảnh)
+    def chấm(hợp_đồng: DữLiệuHợpĐồngTươngLai) -> KếtQuảTínHiệu:
+        return chấm_điểm_ảnh_chụp(tạo_ảnh_chụp(hợp_đồng.mã, {tên: theo_mã.get(hợp_đồng.mã) for tên, theo_mã in dữ_liệu.items()},
+                                               hợp_đồng, ngữ_cảnh), điểm_ròng_tối_thiểu)
+    bắt_đầu = time.perf_counter()
+    if not ĐO_LƯỜNG.chi_tiết:
+        kết_quả = [chấm(hợp_đồng) for hợp_đồng in khối]
+    else:
+        kết_quả = []
+        for hợp_đồng in khối:
+            bắt_đầu_mã = time.perf_counter()
+            kết_quả.append(chấm(hợp_đồng))
+            ĐO_LƯỜNG.ghi_mã(hợp_đồng.mã, time.perf_counter() - bắt_đầu_mã)
+    ĐO_LƯỜNG.ghi("chấm_điểm", time.perf_counter() - bắt_đầu)
+    return kết_quả
+
+def _chấm_điểm_khối(khối: List[DữLiệuHợpĐồngTươngLai]) -> Tuple[List[KếtQuảTínHiệu], Dict[str, Any]]:
+    ngữ_cảnh, điểm_ròng_tối_thiểu = _NGỮ_CẢNH_TIẾN_TRÌNH
+    # Số liệu đo của riêng khối này, tiến trình chính gộp lại
+    ĐO_LƯỜNG.đặt_lại()
+    kết_quả = _chấm_điểm_lô(khối, điểm_ròng_tối_thiểu, ngữ_cảnh)
+    return kết_quả, ĐO_LƯỜNG.xuất()
+
+def chấm_điểm_hợp_đồng(nguồn_hợp_đồng: Iterable[DữLiệuHợpĐồngTươngLai], điểm_ròng_tối_thiểu: float,
+                        ngữ_cảnh: NgữCảnhChạy, số_tiến_trình: int = 1,
+                        kích_thước_khối: int = 256) -> Iterator[KếtQuảTínHiệu]:
+    """Chấm điểm từng mã theo đúng thứ tự đầu vào, tùy chọn chia khối cho nhiều tiến trình"""
+    from itertools import islice
+    
+    if số_tiến_trình <= 1:
+        # Vẫn chia khối để dữ liệu mạng xã hội/tin tức được lấy theo lô
+        lặp = iter(nguồn_hợp_đồng)
+        while True:
+            khối = list(islice(lặp, kích_thước_khối))
+            if not khối:
+                return
+            yield from _chấm_điểm_lô(khối, điểm_ròng_tối_thiểu, ngữ_cảnh)
+    
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # Khối nhỏ hơn khi biết trước số mã để mọi tiến trình đều có việc
+    if hasattr(nguồn_hợp_đồng, "__len__"):
+        kích_thước_khối = max(1, min(kích_thước_khối, -(-len(nguồn_hợp_đồng) // (số_tiến_trình * 4))))
+    
+    lặp = iter(nguồn_hợp_đồng)
+    with ProcessPoolExecutor(max_workers=số_tiến_trình, initializer=_khởi_tạo_tiến_trình,
+                             initargs=(ngữ_cảnh, điểm_ròng_tối_thiểu, ĐO_LƯỜNG.chi_tiết)) as pool:
+        # Chỉ giữ một cửa sổ khối đang chạy để không nạp hết nguồn luồng vào bộ nhớ
+        đang_chạy = deque()
+        hết_nguồn = False
+        while True:
+            while not hết_nguồn and len(đang_chạy) < 2 * số_tiến_trình:
+                khối = list(islice(lặp, kích_thước_khối))
+                if not khối:
+                    hết_nguồn = True
+                    break
+                đang_chạy.append(pool.submit(_chấm_điểm_khối, khối))
+            if not đang_chạy:
+                return
+            kết_quả, số_liệu_đo = đang_chạy.popleft().result()
+            ĐO_LƯỜNG.gộp(số_liệu_đo)
+            yield from kết_quả
+
+def thống_kê_bổ_sung() -> Dict[str, Dict[str, Any]]:
+    """Bộ đếm của bộ nhớ đệm và phiên HTTP (nếu đã dùng) để xuất cùng số liệu đo lường"""
+    import sys
+    bổ_sung = {"bo_nho_dem": BỘ_NHỚ_ĐỆM.lấy_thống_kê(), "ghi_nho_diem": BỘ_GHI_NHỚ_ĐIỂM.lấy_thống_kê()}
+    if "http_session" in sys.modules:
+        bổ_sung["http"] = sys.modules["http_session"].lấy_thống_kê()
+    return bổ_sung
+
+def chạy_nghe_sự_kiện(args):
+    """Chế độ --nghe-sự-kiện: in tín hiệu mới của từng mã bị ảnh hưởng, khi dừng ghi trạng thái cuối vào --file-đầu-ra"""
+    import asyncio
+    from event_ingest import BộNạpSựKiện, nghe_sự_kiện, tóm_tắt_độ_trễ
+    
+    hợp_đồng_ban_đầu: Dict[str, DữLiệuHợpĐồngTươngLai] = {}
+    if os.path.exists(args.file_đầu_vào):
+        with ĐO_LƯỜNG.đo("đọc_đầu_vào"), open(args.file_đầu_vào, 'r', encoding='utf-8') as f:
+            hợp_đồng_ban_đầu = phân_tích_dữ_liệu_hợp_đồng_tương_lai(lặp_bản_ghi(f))
+    
+    def in_tín_hiệu(kết_quả_mã: KếtQuảTínHiệu, độ_trễ: float):
+        tín_hiệu_hàng_đầu = kết_quả_mã.tín_hiệu[0] if kết_quả_mã.tín_hiệu else "Không có tín hiệu"
+        print(f"[{time.strftime('%H:%M:%S')}] {kết_quả_mã.mã:<12} {kết_quả_mã.điểm_ròng:>6.2f} "
+              f"{kết_quả_mã.độ_tin_cậy:>10} {kết_quả_mã.tín_hiệu_chính:>10} {độ_trễ * 1000:>9.2f} ms | {tín_hiệu_hàng_đầu}")
+    
+    bộ_nạp = BộNạpSựKiện(tạo_ngữ_cảnh_chạy(), args.điểm_ròng_tối_thiểu, in_tín_hiệu)
+    bộ_nạp.nạp_ban_đầu(hợp_đồng_ban_đầu.values())
+    del hợp_đồng_ban_đầu
+    print(f"Nghe sự kiện từ {', '.join(args.nghe_sự_kiện)}: {len(bộ_nạp.kết_quả)} mã ban đầu (Ctrl+C để dừng)")
+    print(f"{'Giờ':<10} {'Mã':<12} {'Ròng':>6} {'Tin cậy':>10} {'Tín hiệu':>10} {'Độ trễ':>12} | Tín hiệu hàng đầu")
+    try:
+        asyncio.run(nghe_sự_kiện(bộ_nạp, args.nghe_sự_kiện, args.sự_kiện_từ_đầu, args.file_prometheus))
+    except KeyboardInterrupt:
+        print("Dừng nghe sự kiện")
+    finally:
+        from result_writers import tạo_bộ_ghi
+        bộ_ghi = tạo_bộ_ghi(args.file_đầu_ra, args.định_dạng_đầu_ra, args.gọn)
+        try:
+            for kết_quả_mã in bộ_nạp.kết_quả.values():
+                bộ_ghi.ghi(kết_quả_mã)
+        finally:
+            bộ_ghi.đóng()
+        print(f"Kết quả mới nhất của {bộ_ghi.số_mục} mã đã lưu vào: {args.file_đầu_ra}")
+        độ_trễ = tóm_tắt_độ_trễ()
+        if độ_trễ:
+            print("Độ trễ sự kiện -> tín hiệu:\n" + độ_trễ)
+        if args.profile:
+            print(ĐO_LƯỜNG.báo_cáo())
+        if args.file_prometheus:
+            ĐO_LƯỜNG.ghi_prometheus(args.file_prometheus, thống_kê_bổ_sung())
+
 def main():
+    import argparse  # chỉ cần cho CLI, không nạp khi dashboard/tiến trình nền import module
     parser = argparse.ArgumentParser(description="Trình Phân Tích Tín Hiệu Crypto Nâng Cao")
     parser.add_argument("--file-đầu-vào", type=str, default="input_data_long.json", help="File JSON đầu vào với dữ liệu coin (mặc định: input_data_long.json)")
     parser.add_argument("--điểm-ròng-tối-thiểu", type=float, default=2.0, help="Điểm ròng tối thiểu cho tín hiệu")
-    parser.add_argument("--file-đầu-ra", type=str, default=CẤU_HÌNH["OUTPUT_JSON"], help="File JSON đầu ra")
+    parser.add_argument("--file-đầu-ra", type=str, default=CẤU_HÌNH["OUTPUT_JSON"], help="File kết quả đầu ra")
+    parser.add_argument("--định-dạng-đầu-ra", choices=["json", "ndjson", "parquet", "arrow"], default=None,
+                        help="Định dạng file đầu ra (mặc định: theo đuôi file, không rõ thì json)")
+    parser.add_argument("--gọn", action="store_true",
+                        help="Lưu thành phần toàn cục (vĩ mô) một lần thay vì lặp lại ở mỗi kết quả")
+    parser.add_argument("--đọc-luồng", action="store_true",
+                        help="Đọc và chấm điểm từng bản ghi (mảng JSON hoặc NDJSON) mà không nạp cả file; "
+                             "mã trùng lặp giữ vị trí đầu tiên với bản ghi cuối như khi nạp cả file")
+    parser.add_argument("--số-tiến-trình", "--workers", type=int, default=1, dest="số_tiến_trình",
+                        help="Số tiến trình chấm điểm song song (mặc định: 1, chạy tuần tự)")
+    parser.add_argument("--file-trạng-thái", type=str, default="",
+                        help="File trạng thái của lần chạy trước; chỉ chấm điểm lại mã mới hoặc có dữ liệu thay đổi")
+    parser.add_argument("--file-lịch-sử", type=str, default="",
+                        help="Kho SQLite lưu thêm kết quả của lần chạy này vào lịch sử (xem snapshot_store.py)")
+    parser.add_argument("--chạy-nền", action="store_true",
+                        help="Chạy liên tục: làm mới dữ liệu theo chu kỳ từng nguồn và công bố kết quả vào kho "
+                             "--file-lịch-sử (mặc định SNAPSHOT_DB) cho dashboard đọc (xem signal_worker.py)")
+    parser.add_argument("--nghe-sự-kiện", action="append", default=[], metavar="NGUỒN",
+                        help="Chạy liên tục: nhận bản ghi hợp đồng (NDJSON) từ file ghi nối tiếp, named pipe hoặc "
+                             "unix:/đường/dẫn.sock và chấm điểm lại mã bị ảnh hưởng (xem event_ingest.py); "
+                             "--file-đầu-vào nếu có là trạng thái ban đầu; lặp lại để nghe nhiều nguồn")
+    parser.add_argument("--sự-kiện-từ-đầu", action="store_true",
+                        help="Đọc file sự kiện từ đầu thay vì chỉ các dòng ghi thêm sau khi khởi động")
+    parser.add_argument("--profile", action="store_true",
+                        help="In báo cáo thời gian theo giai đoạn/nhà cung cấp, sự kiện lỗi và các mã chậm nhất")
+    parser.add_argument("--file-prometheus", type=str, default=CẤU_HÌNH["METRICS_PROM_FILE"],
+                        help="Ghi số liệu đo lường dạng văn bản Prometheus vào file này (mặc định: METRICS_PROM_FILE)")
     
     args = parser.parse_args()
+    ĐO_LƯỜNG.chi_tiết = args.profile
+    bắt_đầu_chạy = time.perf_counter()
     
-    # Tải dữ liệu đầu vào
-    try:
-        with open(args.file_đầu_vào, 'r', encoding='utf-8') as f:
-            dữ_liệu_đầu_vào = json.load(f)
-    except Exception as e:
-        print(f"Lỗi tải file đầu vào: {e}")
+    if args.chạy_nền:
+        from signal_worker import TiếnTrìnhNền
+        from snapshot_store import KhoẢnhChụp
+        đường_dẫn_kho = args.file_lịch_sử or CẤU_HÌNH["SNAPSHOT_DB"]
+        if not đường_dẫn_kho:
+            print("--chạy-nền cần --file-lịch-sử hoặc SNAPSHOT_DB")
+            return
+        kho = KhoẢnhChụp(đường_dẫn_kho)
+        # Dữ liệu hợp đồng tương lai chỉ có từ file đầu vào; không có file thì bỏ thành phần này
+        file_hợp_đồng = args.file_đầu_vào if os.path.exists(args.file_đầu_vào) else None
+        print(f"Tiến trình nền: top {CẤU_HÌNH['WORKER_TOP_N']} coin, công bố vào {đường_dẫn_kho}; "
+              + (f"hợp đồng tương lai từ {file_hợp_đồng}" if file_hợp_đồng
+                 else f"không có {args.file_đầu_vào}, bỏ thành phần hợp đồng tương lai"))
+        try:
+            TiếnTrìnhNền(kho, điểm_ròng_tối_thiểu=args.điểm_ròng_tối_thiểu, file_hợp_đồng=file_hợp_đồng).chạy()
+        except KeyboardInterrupt:
+            print("Dừng tiến trình nền")
+        finally:
+            kho.đóng()
         return
     
-    # Phân tích dữ liệu hợp đồng tương lai
-    dữ_liệu_hợp_đồng = phân_tích_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu_đầu_vào)
-    các_mã = list(dữ_liệu_hợp_đồng.keys())
+    if args.nghe_sự_kiện:
+        chạy_nghe_sự_kiện(args)
+        return
     
-    if not các_mã:
-        print("Không tìm thấy mã hợp lệ trong dữ liệu đầu vào")
+    if args.đọc_luồng and args.file_trạng_thái:
+        print("--file-trạng-thái cần so sánh theo mã nên không dùng cùng --đọc-luồng")
         return
     
+    ngữ_cảnh = None
+    nguồn_kết_quả = None
+    trạng_thái_mới = None
+    if args.đọc_luồng:
+        # Chế độ luồng: bộ nhớ không tăng theo kích thước file đầu vào
+        try:
+            with ĐO_LƯỜNG.đo("đọc_đầu_vào"):
+                nguồn_hợp_đồng = đọc_hợp_đồng_theo_luồng(args.file_đầu_vào)
+        except Exception as e:
+            print(f"Lỗi tải file đầu vào: {e}")
+            return
+    else:
+        # Tải dữ liệu đầu vào
+        try:
+            with ĐO_LƯỜNG.đo("đọc_đầu_vào"), open(args.file_đầu_vào, 'r', encoding='utf-8') as f:
+                dữ_liệu_đầu_vào = json.load(f)
+        except Exception as e:
+            print(f"Lỗi tải file đầu vào: {e}")
+            return
+        
+        if args.file_trạng_thái:
+            from incremental import chấm_điểm_tăng_dần, đọc_trạng_thái
+            
+            # Chế độ tăng dần: chỉ chấm điểm lại mã mới/thay đổi so với file trạng thái
+            ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+            nguồn_kết_quả, trạng_thái_mới, tập_thay_đổi = chấm_điểm_tăng_dần(
+                dữ_liệu_đầu_vào, đọc_trạng_thái(args.file_trạng_thái),
+                args.điểm_ròng_tối_thiểu, ngữ_cảnh, args.số_tiến_trình,
+            )
+            del dữ_liệu_đầu_vào
+            if not nguồn_kết_quả:
+                print("Không tìm thấy mã hợp lệ trong dữ liệu đầu vào")
+                return
+            print(f"Thay đổi so với lần chạy trước: {tập_thay_đổi.tóm_tắt()}")
+            for nhãn, các_mã in (("Mới", tập_thay_đổi.mới), ("Thay đổi", tập_thay_đổi.thay_đổi), ("Bị xóa", tập_thay_đổi.bị_xóa)):
+                if các_mã:
+                    phần_thêm = f" ... (+{len(các_mã) - 20})" if len(các_mã) > 20 else ""
+                    print(f"   {nhãn}: {', '.join(các_mã[:20])}{phần_thêm}")
+        else:
+            # Phân tích dữ liệu hợp đồng tương lai
+            with ĐO_LƯỜNG.đo("phân_tích_đầu_vào"):
+                dữ_liệu_hợp_đồng = phân_tích_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu_đầu_vào)
+            del dữ_liệu_đầu_vào
+            
+            if not dữ_liệu_hợp_đồng:
+                print("Không tìm thấy mã hợp lệ trong dữ liệu đầu vào")
+                return
+            nguồn_hợp_đồng = dữ_liệu_hợp_đồng.values()
+    
     print("=" * 120)
     print(f"{'Mã':<12} {'Mua':>6} {'Bán':>6} {'Ròng':>6} {'Kích thước':>10} {'Tin cậy':>10} {'Tín hiệu':>10} | Tín hiệu hàng đầu")
     print("-" * 120)
     
-    kết_quả = []
-    for mã in các_mã:
-        kết_quả_mã = phân_tích_mã(mã, dữ_liệu_hợp_đồng, args.điểm_ròng_tối_thiểu)
-        kết_quả.append(kết_quả_mã)
-        
-        # Hiển thị tóm tắt
-        tín_hiệu_hàng_đầu = kết_quả_mã.tín_hiệu[0] if kết_quả_mã.tín_hiệu else "Không có tín hiệu"
-        print(f"{kết_quả_mã.mã:<12} {kết_quả_mã.điểm_mua:>6.2f} {kết_quả_mã.điểm_bán:>6.2f} {kết_quả_mã.điểm_ròng:>6.2f} "
-              f"{kết_quả_mã.hệ_số_kích_thước_vị_thế:>10.2f} {kết_quả_mã.độ_tin_cậy:>10} {kết_quả_mã.tín_hiệu_chính:>10} | {tín_hiệu_hàng_đầu}")
+    if nguồn_kết_quả is None:
+        # Dữ liệu vĩ mô lấy và chấm điểm một lần cho mọi mã
+        ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+        nguồn_kết_quả = chấm_điểm_hợp_đồng(nguồn_hợp_đồng, args.điểm_ròng_tối_thiểu, ngữ_cảnh, args.số_tiến_trình)
     
-    print("=" * 120)
+    # Chỉ giữ top 5 tín hiệu mạnh cho phần đề xuất, kết quả chi tiết được ghi ngay vào file
+    from result_index import ĐỉnhK
+    mua_mạnh = ĐỉnhK(5, khóa=lambda x: x.điểm_ròng)
+    bán_mạnh = ĐỉnhK(5, khóa=lambda x: x.điểm_ròng, lớn_nhất=False)
+    from result_writers import tạo_bộ_ghi
+    bộ_ghi = tạo_bộ_ghi(args.file_đầu_ra, args.định_dạng_đầu_ra, args.gọn)
+    kho_lịch_sử = bộ_ghi_lịch_sử = None
+    if args.file_lịch_sử:
+        from snapshot_store import KhoẢnhChụp
+        kho_lịch_sử = KhoẢnhChụp(args.file_lịch_sử)
+        bộ_ghi_lịch_sử = kho_lịch_sử.mở_lần_chạy(ngữ_cảnh, điểm_ròng_tối_thiểu=args.điểm_ròng_tối_thiểu)
+    đã_xong = False
+    try:
+        for kết_quả_mã in nguồn_kết_quả:
+            bắt_đầu_ghi = time.perf_counter()
+            bộ_ghi.ghi(kết_quả_mã)
+            if bộ_ghi_lịch_sử is not None:
+                bộ_ghi_lịch_sử.ghi(kết_quả_mã)
+            ĐO_LƯỜNG.ghi("ghi_kết_quả", time.perf_counter() - bắt_đầu_ghi)
+            
+            if kết_quả_mã.độ_tin_cậy == "CAO":
+                if kết_quả_mã.tín_hiệu_chính == "MUA":
+                    mua_mạnh.thêm(kết_quả_mã)
+                elif kết_quả_mã.tín_hiệu_chính == "BÁN":
+                    bán_mạnh.thêm(kết_quả_mã)
+            
+            # Hiển thị tóm tắt
+            bắt_đầu_in = time.perf_counter()
+            tín_hiệu_hàng_đầu = kết_quả_mã.tín_hiệu[0] if kết_quả_mã.tín_hiệu else "Không có tín hiệu"
+            print(f"{kết_quả_mã.mã:<12} {kết_quả_mã.điểm_mua:>6.2f} {kết_quả_mã.điểm_bán:>6.2f} {kết_quả_mã.điểm_ròng:>6.2f} "
+                  f"{kết_quả_mã.hệ_số_kích_thước_vị_thế:>10.2f} {kết_quả_mã.độ_tin_cậy:>10} {kết_quả_mã.tín_hiệu_chính:>10} | {tín_hiệu_hàng_đầu}")
+            ĐO_LƯỜNG.ghi("in_màn_hình", time.perf_counter() - bắt_đầu_in)
+        đã_xong = True
+    finally:
+        with ĐO_LƯỜNG.đo("đóng_file_kết_quả"):
+            bộ_ghi.đóng()
+            if kho_lịch_sử is not None:
+                # Lỗi giữa chừng: lần chạy dở dang không được đánh dấu hoàn tất nên không ai đọc tới
+                if đã_xong:
+                    bộ_ghi_lịch_sử.đóng()
+                kho_lịch_sử.đóng()
     
-    # Lưu kết quả chi tiết
-    dữ_liệu_đầu_ra = [asdict(kq) for kq in kết_quả]
-    with open(args.file_đầu_ra, 'w', encoding='utf-8') as f:
-        json.dump(dữ_liệu_đầu_ra, f, ensure_ascii=False, indent=2)
+    if trạng_thái_mới is not None:
+        from incremental import ghi_trạng_thái
+        ghi_trạng_thái(args.file_trạng_thái, trạng_thái_mới)
+    
+    if args.đọc_luồng:
+        if bộ_ghi.số_mục == 0:
+            print("Không tìm thấy mã hợp lệ trong dữ liệu đầu vào")
+            return
+    
+    print("=" * 120)
     
     print(f"Kết quả chi tiết đã lưu vào: {args.file_đầu_ra}")
     
@@ -562,18 +1429,25 @@ def main():
     print("ĐỀ XUẤT GIAO DỊCH")
     print("=" * 70)
     
-    mua_mạnh = [kq for kq in kết_quả if kq.tín_hiệu_chính == "MUA" and kq.độ_tin_cậy == "CAO"]
-    bán_mạnh = [kq for kq in kết_quả if kq.tín_hiệu_chính == "BÁN" and kq.độ_tin_cậy == "CAO"]
-    
-    if mua_mạnh:
-        print(f"\n🔴 TÍN HIỆU MUA MẠNH ({len(mua_mạnh)}):")
-        for đề_xuất in sorted(mua_mạnh, key=lambda x: x.điểm_ròng, reverse=True)[:5]:
+    if mua_mạnh.số_mục:
+        print(f"\n🔴 TÍN HIỆU MUA MẠNH ({mua_mạnh.số_mục}):")
+        for đề_xuất in mua_mạnh.kết_quả():
             print(f"   {đề_xuất.mã}: Điểm ròng {đề_xuất.điểm_ròng:.2f}, Hệ số kích thước {đề_xuất.hệ_số_kích_thước_vị_thế:.2f}x")
     
-    if bán_mạnh:
-        print(f"\n🔵 TÍN HIỆU BÁN MẠNH ({len(bán_mạnh)}):")
-        for đề_xuất in sorted(bán_mạnh, key=lambda x: x.điểm_ròng)[:5]:
+    if bán_mạnh.số_mục:
+        print(f"\n🔵 TÍN HIỆU BÁN MẠNH ({bán_mạnh.số_mục}):")
+        for đề_xuất in bán_mạnh.kết_quả():
             print(f"   {đề_xuất.mã}: Điểm ròng {đề_xuất.điểm_ròng:.2f}, Hệ số kích thước {đề_xuất.hệ_số_kích_thước_vị_thế:.2f}x")
+    
+    tổng_giây = time.perf_counter() - bắt_đầu_chạy
+    if args.profile:
+        print("\n" + "=" * 100)
+        print(f"BÁO CÁO THỜI GIAN ({bộ_ghi.số_mục} mã, tổng {tổng_giây:.3f}s; % theo tổng thời gian chạy, "
+              f"http nằm trong ngữ_cảnh/lấy_dữ_liệu, từng_mã nằm trong chấm_điểm)")
+        print("=" * 100)
+        print(ĐO_LƯỜNG.báo_cáo(tổng_giây))
+    if args.file_prometheus:
+        ĐO_LƯỜNG.ghi_prometheus(args.file_prometheus, thống_kê_bổ_sung())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Backtest Trọng Số Và Ngưỡng Trên Kho Ảnh Chụp
+--------------------
+Phát lại các ảnh chụp đã lưu (snapshot_store.py) qua bộ chấm điểm theo lô để
+dò lưới trọng số thành phần × ngưỡng điểm ròng mà không gọi lại nhà cung cấp:
+- Mỗi dòng chỉ được chấm điểm thành phần một lần (chưa nhân trọng số), rồi ghép
+  với lợi nhuận kỳ tới của cùng mã sau --tầm-nhìn-giờ
+- Điểm thành phần là các mức rời rạc nên các dòng được gộp theo bộ điểm giống nhau;
+  lưới chỉ chạy trên các nhóm (số đếm, số tăng/giảm, tổng lợi nhuận cộng dồn được)
+- Điểm ròng tính theo đúng thứ tự cộng của tổng_hợp_điểm nên tín hiệu trùng với lần chạy thật
+- Lưới trọng số được chia cho nhiều tiến trình
+Báo cáo cho mỗi cấu hình: số tín hiệu MUA/BÁN, tỷ lệ trúng hướng và lợi nhuận kỳ tới trung bình.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from alpha_signal_checker_plus import (
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    TIỀN_TỐ_THÀNH_PHẦN,
+    chuẩn_hóa_điểm,
+    thành_phần_lõi,
+)
+from batch_scorer import SỐ_TIN_NÓNG, THÀNH_PHẦN_LÔ, điểm_thành_phần_lô
+
+# Cột thống kê của mỗi cấu hình, theo thứ tự trong mảng kết quả
+CỘT_THỐNG_KÊ = ("số_mua", "số_bán", "trúng_mua", "trúng_bán", "tổng_lợi_nhuận_mua", "tổng_lợi_nhuận_bán")
+
+# Chỉ dùng giá kỳ tới nếu ảnh chụp kế tiếp không trễ quá 50% tầm nhìn
+DUNG_SAI_TẦM_NHÌN = 0.5
+
+@dataclass
+class DữLiệuBacktest:
+    """Các nhóm dòng có cùng điểm thành phần, kèm thống kê lợi nhuận kỳ tới cộng dồn"""
+    các_thành_phần: Tuple[str, ...]
+    # (số nhóm, 2 × số thành phần): điểm mua của từng thành phần rồi điểm bán của từng thành phần
+    điểm_nhóm: np.ndarray
+    số_dòng: np.ndarray
+    số_tăng: np.ndarray
+    số_giảm: np.ndarray
+    tổng_lợi_nhuận: np.ndarray
+    số_lần_chạy: int = 0
+    # Dòng đã chấm điểm, kể cả dòng không có giá kỳ tới
+    tổng_số_dòng: int = 0
+
+    @property
+    def số_dòng_có_lợi_nhuận(self) -> int:
+        return int(self.số_dòng.sum())
+
+# ---------- Chấm điểm thành phần từ dòng đã lưu ----------
+
+def _cột_thành_phần(các_giá_trị: List[Any], tên: str, trường: Dict[str, List[str]]) -> Dict[str, List[Any]]:
+    """Mảng giá trị (hoặc dict) của một thành phần trên mọi dòng -> {tên trường: cột}"""
+    kiểu = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].kiểu_dữ_liệu
+    tên_trường = trường.get(tên) or [f.name for f in fields(kiểu)]
+    mặc_định = kiểu(mã="") if tên == "hợp_đồng" else kiểu()
+    hàng_mặc_định = [getattr(mặc_định, t) for t in tên_trường]
+    các_hàng = [
+        g if isinstance(g, list) else ([g.get(t) for t in tên_trường] if isinstance(g, dict) else hàng_mặc_định)
+        for g in các_giá_trị
+    ]
+    return dict(zip(tên_trường, (list(cột) for cột in zip(*các_hàng))))
+
+def khung_từ_dòng_thô(thông_tin: Dict[str, Any], các_dòng: Sequence[Tuple]) -> Dict[str, np.ndarray]:
+    """Dựng khung cột của batch_scorer từ dòng của KhoẢnhChụp.lặp_dòng_thô"""
+    n = len(các_dòng)
+    các_thành_phần = [json.loads(dòng[3]) for dòng in các_dòng]
+    khung: Dict[str, np.ndarray] = {"mã": np.asarray([dòng[0] for dòng in các_dòng])}
+    for tên in ("mạng_xã_hội", "tin_tức", "hợp_đồng"):
+        tiền_tố = TIỀN_TỐ_THÀNH_PHẦN[tên]
+        cột = _cột_thành_phần([tp.get(tên) for tp in các_thành_phần], tên, thông_tin["trường"])
+        tin_nóng = cột.pop("tin_nóng", None)
+        cột.pop("mã", None)
+        for trường, giá_trị in cột.items():
+            khung[f"{tiền_tố}_{trường}"] = np.asarray(giá_trị)
+        if tin_nóng is not None:
+            for k in range(SỐ_TIN_NÓNG):
+                các_tin = [d[k] if d is not None and k < len(d) else None for d in tin_nóng]
+                khung[f"tt_nóng_{k}_tác_động"] = np.asarray(
+                    [t.get("tác_động", 0) if t is not None else np.nan for t in các_tin], dtype=np.float64)
+                khung[f"tt_nóng_{k}_tâm_lý"] = np.asarray(
+                    [t.get("tâm_lý", 0) if t is not None else np.nan for t in các_tin], dtype=np.float64)
+    # Vĩ mô của cả lần chạy lặp lại cho mọi dòng
+    kiểu_vĩ_mô = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN["vĩ_mô"].kiểu_dữ_liệu
+    vĩ_mô = thông_tin["toàn_cục"].get("vĩ_mô") or {}
+    for trường in fields(kiểu_vĩ_mô):
+        giá_trị = vĩ_mô.get(trường.name, getattr(kiểu_vĩ_mô(), trường.name))
+        khung[f"{TIỀN_TỐ_THÀNH_PHẦN['vĩ_mô']}_{trường.name}"] = np.full(n, giá_trị)
+    return khung
+
+def điểm_thành_phần_lần_chạy(thông_tin: Dict[str, Any], các_dòng: Sequence[Tuple],
+                             các_thành_phần: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Điểm mua và bán chưa nhân trọng số, dạng (số thành phần, số dòng), theo thứ tự các_thành_phần"""
+    n = len(các_dòng)
+    điểm_lõi = điểm_thành_phần_lô(khung_từ_dòng_thô(thông_tin, các_dòng))
+    mua = np.zeros((len(các_thành_phần), n))
+    bán = np.zeros((len(các_thành_phần), n))
+    for i, tên in enumerate(các_thành_phần):
+        if tên in điểm_lõi:
+            mua[i], bán[i] = điểm_lõi[tên][0], điểm_lõi[tên][1]
+            continue
+        # Thành phần toàn cục khác: chấm một lần cho lần chạy; lần chạy không có dữ liệu thì không cộng điểm
+        tp = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên]
+        dữ_liệu = thông_tin["toàn_cục"].get(tên)
+        if dữ_liệu is not None:
+            điểm = chuẩn_hóa_điểm(tp.hàm_chấm(tp.kiểu_dữ_liệu(**dữ_liệu)))
+            mua[i], bán[i] = điểm[0], điểm[1]
+    return mua, bán
+
+def các_thành_phần_backtest(các_tên: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+    """Thành phần được dò, theo thứ tự đăng ký; thành phần theo mã chỉ hỗ trợ các thành phần lõi của batch_scorer"""
+    các_tên = thành_phần_lõi() if các_tên is None else tuple(các_tên)
+    for tên in các_tên:
+        tp = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên]
+        if tên not in THÀNH_PHẦN_LÔ and (tp.phạm_vi != "toàn_cục" or tp.kiểu_dữ_liệu is None):
+            raise ValueError(f"Thành phần không hỗ trợ backtest: {tên}")
+    return tuple(tên for tên in SỔ_ĐĂNG_KÝ_THÀNH_PHẦN if tên in các_tên)
+
+# ---------- Nạp dữ liệu: ghép lợi nhuận kỳ tới và gộp nhóm ----------
+
+class _BộGộpNhóm:
+    """Gán id nhóm toàn cục cho bộ điểm thành phần và cộng dồn thống kê theo nhóm"""
+
+    def __init__(self, số_cột: int):
+        self.số_cột = số_cột
+        self._id: Dict[bytes, int] = {}
+        self.điểm: List[np.ndarray] = []
+        self.số_dòng = np.zeros(0)
+        self.số_tăng = np.zeros(0)
+        self.số_giảm = np.zeros(0)
+        self.tổng_lợi_nhuận = np.zeros(0)
+
+    def gán_nhóm(self, điểm: np.ndarray) -> np.ndarray:
+        """điểm: (số dòng, số cột) -> id nhóm của từng dòng"""
+        duy_nhất, nghịch_đảo = np.unique(điểm, axis=0, return_inverse=True)
+        id_cục_bộ = np.empty(len(duy_nhất), dtype=np.int64)
+        for i, hàng in enumerate(duy_nhất):
+            khóa = hàng.tobytes()
+            if khóa not in self._id:
+                self._id[khóa] = len(self.điểm)
+                self.điểm.append(hàng)
+            id_cục_bộ[i] = self._id[khóa]
+        return id_cục_bộ[np.ravel(nghịch_đảo)]
+
+    def cộng(self, nhóm: np.ndarray, lợi_nhuận: np.ndarray):
+        g = len(self.điểm)
+        def _cộng_dồn(cũ, trọng_số=None):
+            mới = np.bincount(nhóm, weights=trọng_số, minlength=g)
+            return np.concatenate([cũ, np.zeros(g - len(cũ))]) + mới
+        self.số_dòng = _cộng_dồn(self.số_dòng)
+        self.số_tăng = _cộng_dồn(self.số_tăng, (lợi_nhuận > 0).astype(np.float64))
+        self.số_giảm = _cộng_dồn(self.số_giảm, (lợi_nhuận < 0).astype(np.float64))
+        self.tổng_lợi_nhuận = _cộng_dồn(self.tổng_lợi_nhuận, lợi_nhuận)
+
+def _ghép_kỳ_tới(mã: np.ndarray, thời_gian: np.ndarray, giá: np.ndarray, tầm_nhìn: float,
+                 đã_xét_đến: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Với mỗi dòng tìm ảnh chụp đầu tiên của cùng mã sau tầm_nhìn giây
+
+    Trả về (lợi nhuận kỳ tới, mặt nạ đã ghép được, mặt nạ còn chờ dữ liệu sau đã_xét_đến).
+    Dòng không thuộc hai nhóm trên (không có giá, hoặc ảnh chụp kế tiếp quá trễ) bị bỏ.
+    """
+    thứ_tự = np.lexsort((thời_gian, mã))
+    mã_s, tg_s, giá_s = mã[thứ_tự], thời_gian[thứ_tự], giá[thứ_tự]
+    # Khóa (mã, thời gian) đơn điệu tăng: mã nhân khoảng lớn hơn mọi độ chênh thời gian
+    gốc = tg_s.min() if len(tg_s) else 0.0
+    khoảng = (tg_s.max() - gốc if len(tg_s) else 0.0) + 4 * tầm_nhìn + 1.0
+    khóa = mã_s * khoảng + (tg_s - gốc)
+    j = np.searchsorted(khóa, khóa + tầm_nhìn, side="left")
+    có_sau = j < len(khóa)
+    j_an_toàn = np.minimum(j, max(len(khóa) - 1, 0))
+    cùng_mã = có_sau & (mã_s[j_an_toàn] == mã_s)
+    đúng_hạn = cùng_mã & (tg_s[j_an_toàn] <= tg_s + tầm_nhìn * (1 + DUNG_SAI_TẦM_NHÌN))
+    có_giá = ~np.isnan(giá_s) & (giá_s > 0)
+    ghép_được = đúng_hạn & có_giá & ~np.isnan(giá_s[j_an_toàn])
+    lợi_nhuận = np.full(len(khóa), np.nan)
+    lợi_nhuận[ghép_được] = giá_s[j_an_toàn][ghép_được] / giá_s[ghép_được] - 1.0
+    # Chưa có ảnh chụp kỳ tới và hạn chót còn sau phần dữ liệu đã đọc: chờ khối sau
+    còn_chờ = có_giá & ~cùng_mã & (tg_s + tầm_nhìn * (1 + DUNG_SAI_TẦM_NHÌN) > đã_xét_đến)
+
+    # Trả về theo thứ tự ban đầu
+    đảo = np.empty_like(thứ_tự)
+    đảo[thứ_tự] = np.arange(len(thứ_tự))
+    return lợi_nhuận[đảo], ghép_được[đảo], còn_chờ[đảo]
+
+def nạp_dữ_liệu_backtest(kho, tầm_nhìn_giây: float, từ: Optional[float] = None, đến: Optional[float] = None,
+                         các_thành_phần: Optional[Iterable[str]] = None,
+                         số_lần_chạy_mỗi_khối: int = 200) -> DữLiệuBacktest:
+    """Đọc kho theo khối lần chạy, chấm điểm thành phần và gộp các dòng có lợi nhuận kỳ tới thành nhóm"""
+    các_thành_phần = các_thành_phần_backtest(các_thành_phần)
+    c = len(các_thành_phần)
+    bộ_gộp = _BộGộpNhóm(2 * c)
+    id_mã: Dict[str, int] = {}
+    # Dòng chưa có giá kỳ tới: (mã, thời gian, giá, nhóm)
+    chờ = (np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64))
+    khối: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+    số_lần_chạy = tổng_số_dòng = 0
+
+    def xử_lý_khối(đã_xét_đến: float):
+        nonlocal chờ
+        mã = np.concatenate([chờ[0]] + [k[0] for k in khối])
+        thời_gian = np.concatenate([chờ[1]] + [k[1] for k in khối])
+        giá = np.concatenate([chờ[2]] + [k[2] for k in khối])
+        nhóm = np.concatenate([chờ[3]] + [k[3] for k in khối])
+        lợi_nhuận, ghép_được, còn_chờ = _ghép_kỳ_tới(mã, thời_gian, giá, tầm_nhìn_giây, đã_xét_đến)
+        bộ_gộp.cộng(nhóm[ghép_được], lợi_nhuận[ghép_được])
+        chờ = (mã[còn_chờ], thời_gian[còn_chờ], giá[còn_chờ], nhóm[còn_chờ])
+        khối.clear()
+
+    for thông_tin, các_dòng in kho.lặp_dòng_thô(từ, đến):
+        if not các_dòng:
+            continue
+        mua, bán = điểm_thành_phần_lần_chạy(thông_tin, các_dòng, các_thành_phần)
+        nhóm = bộ_gộp.gán_nhóm(np.concatenate([mua, bán]).T)
+        mã = np.asarray([id_mã.setdefault(dòng[0], len(id_mã)) for dòng in các_dòng], dtype=np.float64)
+        giá = np.asarray([dòng[1] if dòng[1] is not None else np.nan for dòng in các_dòng], dtype=np.float64)
+        khối.append((mã, np.full(len(các_dòng), thông_tin["thời_gian"]), giá, nhóm))
+        số_lần_chạy += 1
+        tổng_số_dòng += len(các_dòng)
+        if len(khối) >= số_lần_chạy_mỗi_khối:
+            xử_lý_khối(thông_tin["thời_gian"])
+    if khối or len(chờ[0]):
+        xử_lý_khối(float("inf"))
+
+    g = len(bộ_gộp.điểm)
+    return DữLiệuBacktest(
+        các_thành_phần=các_thành_phần,
+        điểm_nhóm=np.asarray(bộ_gộp.điểm).reshape(g, 2 * c),
+        số_dòng=bộ_gộp.số_dòng[:g] if len(bộ_gộp.số_dòng) else np.zeros(g),
+        số_tăng=bộ_gộp.số_tăng[:g] if len(bộ_gộp.số_tăng) else np.zeros(g),
+        số_giảm=bộ_gộp.số_giảm[:g] if len(bộ_gộp.số_giảm) else np.zeros(g),
+        tổng_lợi_nhuận=bộ_gộp.tổng_lợi_nhuận[:g] if len(bộ_gộp.tổng_lợi_nhuận) else np.zeros(g),
+        số_lần_chạy=số_lần_chạy,
+        tổng_số_dòng=tổng_số_dòng,
+    )
+
+# ---------- Dò lưới ----------
+
+def tạo_lưới_trọng_số(lựa_chọn: Dict[str, Sequence[float]], các_thành_phần: Sequence[str]) -> np.ndarray:
+    """Tích Descartes các giá trị trọng số; thành phần không chỉ định giữ trọng số đăng ký. Trả về (số bộ, số thành phần)"""
+    các_trục = [list(lựa_chọn.get(tên, [SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].trọng_số])) for tên in các_thành_phần]
+    return np.asarray(list(itertools.product(*các_trục)), dtype=np.float64).reshape(-1, len(các_thành_phần))
+
+def _thống_kê_lưới(dữ_liệu: DữLiệuBacktest, lưới_trọng_số: np.ndarray, các_ngưỡng: np.ndarray,
+                   bộ_nhớ_tối_đa: int = 64 * 1024 * 1024) -> np.ndarray:
+    """Thống kê (số bộ trọng số, số ngưỡng, len(CỘT_THỐNG_KÊ)) cho mọi cấu hình"""
+    c = len(dữ_liệu.các_thành_phần)
+    điểm_mua, điểm_bán = dữ_liệu.điểm_nhóm[:, :c], dữ_liệu.điểm_nhóm[:, c:]
+    g = len(điểm_mua)
+    kết_quả = np.zeros((len(lưới_trọng_số), len(các_ngưỡng), len(CỘT_THỐNG_KÊ)))
+    cỡ_khối = max(1, bộ_nhớ_tối_đa // (8 * max(g, 1) * 3))
+    for đầu in range(0, len(lưới_trọng_số), cỡ_khối):
+        w = lưới_trọng_số[đầu:đầu + cỡ_khối]
+        # Cộng dồn theo thứ tự thành phần như tổng_hợp_điểm: điểm ròng trùng từng bit với lần chạy thật
+        tổng_mua = np.zeros((g, len(w)))
+        tổng_bán = np.zeros((g, len(w)))
+        for i in range(c):
+            tổng_mua = tổng_mua + điểm_mua[:, i:i + 1] * w[:, i]
+            tổng_bán = tổng_bán + điểm_bán[:, i:i + 1] * w[:, i]
+        điểm_ròng = tổng_mua - tổng_bán
+        for j, ngưỡng in enumerate(các_ngưỡng):
+            mua = (điểm_ròng >= ngưỡng).astype(np.float64)
+            bán = (điểm_ròng <= -ngưỡng).astype(np.float64)
+            thống_kê = kết_quả[đầu:đầu + len(w), j]
+            thống_kê[:, 0] = dữ_liệu.số_dòng @ mua
+            thống_kê[:, 1] = dữ_liệu.số_dòng @ bán
+            thống_kê[:, 2] = dữ_liệu.số_tăng @ mua
+            thống_kê[:, 3] = dữ_liệu.số_giảm @ bán
+            thống_kê[:, 4] = dữ_liệu.tổng_lợi_nhuận @ mua
+            thống_kê[:, 5] = -(dữ_liệu.tổng_lợi_nhuận @ bán)
+    return kết_quả
+
+_DỮ_LIỆU_TIẾN_TRÌNH: Optional[Tuple[DữLiệuBacktest, np.ndarray]] = None
+
+def _khởi_tạo_tiến_trình(dữ_liệu: DữLiệuBacktest, các_ngưỡng: np.ndarray):
+    """Nhận dữ liệu nhóm một lần cho mỗi tiến trình con thay vì gửi theo từng khối lưới"""
+    global _DỮ_LIỆU_TIẾN_TRÌNH
+    _DỮ_LIỆU_TIẾN_TRÌNH = (dữ_liệu, các_ngưỡng)
+
+def _thống_kê_khối(lưới_khối: np.ndarray) -> np.ndarray:
+    dữ_liệu, các_ngưỡng = _DỮ_LIỆU_TIẾN_TRÌNH
+    return _thống_kê_lưới(dữ_liệu, lưới_khối, các_ngưỡng)
+
+def đánh_giá_lưới(dữ_liệu: DữLiệuBacktest, lưới_trọng_số: np.ndarray, các_ngưỡng: Sequence[float],
+                  số_tiến_trình: int = 1) -> List[Dict[str, Any]]:
+    """Đánh giá mọi cấu hình (bộ trọng số × ngưỡng); trả về một dict thống kê cho mỗi cấu hình"""
+    các_ngưỡng = np.asarray(các_ngưỡng, dtype=np.float64)
+    if số_tiến_trình <= 1 or len(lưới_trọng_số) < 2:
+        thống_kê = _thống_kê_lưới(dữ_liệu, lưới_trọng_số, các_ngưỡng)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        các_khối = np.array_split(lưới_trọng_số, min(len(lưới_trọng_số), số_tiến_trình * 4))
+        with ProcessPoolExecutor(max_workers=số_tiến_trình, initializer=_khởi_tạo_tiến_trình,
+                                 initargs=(dữ_liệu, các_ngưỡng)) as pool:
+            thống_kê = np.concatenate(list(pool.map(_thống_kê_khối, các_khối)))
+
+    kết_quả = []
+    for i, w in enumerate(lưới_trọng_số):
+        for j, ngưỡng in enumerate(các_ngưỡng):
+            số_mua, số_bán, trúng_mua, trúng_bán, ln_mua, ln_bán = thống_kê[i, j].tolist()
+            số_tín_hiệu = số_mua + số_bán
+            kết_quả.append({
+                "trọng_số": dict(zip(dữ_liệu.các_thành_phần, w.tolist())),
+                "ngưỡng": float(ngưỡng),
+                "số_mua": int(số_mua),
+                "số_bán": int(số_bán),
+                "tỷ_lệ_trúng": (trúng_mua + trúng_bán) / số_tín_hiệu if số_tín_hiệu else float("nan"),
+                "tỷ_lệ_trúng_mua": trúng_mua / số_mua if số_mua else float("nan"),
+                "tỷ_lệ_trúng_bán": trúng_bán / số_bán if số_bán else float("nan"),
+                # Lợi nhuận theo hướng tín hiệu (BÁN có lợi khi giá giảm), trung bình mỗi tín hiệu
+                "lợi_nhuận_tb": (ln_mua + ln_bán) / số_tín_hiệu if số_tín_hiệu else float("nan"),
+                "lợi_nhuận_tb_mua": ln_mua / số_mua if số_mua else float("nan"),
+                "lợi_nhuận_tb_bán": ln_bán / số_bán if số_bán else float("nan"),
+            })
+    return kết_quả
+
+def _phân_tích_lưới(các_mục: Sequence[str]) -> Dict[str, List[float]]:
+    lưới = {}
+    for mục in các_mục:
+        tên, _, giá_trị = mục.partition("=")
+        if tên not in SỔ_ĐĂNG_KÝ_THÀNH_PHẦN or not giá_trị:
+            raise argparse.ArgumentTypeError(f"Lưới trọng số không hợp lệ: {mục} (dạng tên=0,0.1,0.2)")
+        lưới[tên] = [float(x) for x in giá_trị.split(",")]
+    return lưới
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest lưới trọng số/ngưỡng trên kho ảnh chụp lịch sử")
+    parser.add_argument("--file-lịch-sử", type=str, required=True, help="Kho SQLite của snapshot_store.py")
+    parser.add_argument("--tầm-nhìn-giờ", type=float, default=24.0, help="Tầm nhìn lợi nhuận kỳ tới (giờ)")
+    parser.add_argument("--từ", type=float, default=None, help="Mốc thời gian bắt đầu (epoch giây)")
+    parser.add_argument("--đến", type=float, default=None, help="Mốc thời gian kết thúc (epoch giây)")
+    parser.add_argument("--thành-phần", nargs="+", default=None,
+                        help="Thành phần được cộng điểm (mặc định: thành phần lõi)")
+    parser.add_argument("--trọng-số", nargs="+", default=[],
+                        help="Lưới trọng số dạng tên=0,0.1,0.2; thành phần không chỉ định giữ trọng số mặc định")
+    parser.add_argument("--ngưỡng", nargs="+", type=float, default=[1.0, 1.5, 2.0, 2.5, 3.0],
+                        help="Các ngưỡng điểm ròng tối thiểu")
+    parser.add_argument("--số-tiến-trình", "--workers", type=int, default=1, dest="số_tiến_trình")
+    parser.add_argument("--tín-hiệu-tối-thiểu", type=int, default=30,
+                        help="Bỏ qua cấu hình có ít tín hiệu hơn khi xếp hạng")
+    parser.add_argument("--hiển-thị", type=int, default=10, help="Số cấu hình tốt nhất được in ra")
+    parser.add_argument("--file-kết-quả", type=str, default="", help="Ghi thống kê mọi cấu hình ra CSV")
+    args = parser.parse_args()
+
+    from snapshot_store import KhoẢnhChụp
+
+    kho = KhoẢnhChụp(args.file_lịch_sử)
+    try:
+        dữ_liệu = nạp_dữ_liệu_backtest(kho, args.tầm_nhìn_giờ * 3600, args.từ, args.đến, args.thành_phần)
+    finally:
+        kho.đóng()
+    print(f"{dữ_liệu.số_lần_chạy} lần chạy, {dữ_liệu.tổng_số_dòng} dòng, "
+          f"{dữ_liệu.số_dòng_có_lợi_nhuận} dòng có lợi nhuận kỳ tới, {len(dữ_liệu.số_dòng)} nhóm điểm")
+    if dữ_liệu.số_dòng_có_lợi_nhuận == 0:
+        print("Không có dòng nào có giá kỳ tới trong kho")
+        return
+
+    lưới = tạo_lưới_trọng_số(_phân_tích_lưới(args.trọng_số), dữ_liệu.các_thành_phần)
+    kết_quả = đánh_giá_lưới(dữ_liệu, lưới, args.ngưỡng, args.số_tiến_trình)
+    print(f"Đã đánh giá {len(kết_quả)} cấu hình ({len(lưới)} bộ trọng số × {len(args.ngưỡng)} ngưỡng)")
+
+    if args.file_kết_quả:
+        with open(args.file_kết_quả, "w", newline="", encoding="utf-8") as f:
+            bộ_ghi = csv.writer(f)
+            bộ_ghi.writerow(list(dữ_liệu.các_thành_phần) + [k for k in kết_quả[0] if k != "trọng_số"])
+            for mục in kết_quả:
+                bộ_ghi.writerow(list(mục["trọng_số"].values()) + [v for k, v in mục.items() if k != "trọng_số"])
+        print(f"Thống kê mọi cấu hình đã lưu vào: {args.file_kết_quả}")
+
+    đủ_tín_hiệu = [m for m in kết_quả if m["số_mua"] + m["số_bán"] >= args.tín_hiệu_tối_thiểu]
+    print("\n" + "=" * 100)
+    print(f"{'Trọng số':<44} {'Ngưỡng':>7} {'Mua':>6} {'Bán':>6} {'Trúng':>7} {'LN tb':>8} {'LN mua':>8} {'LN bán':>8}")
+    print("-" * 100)
+    for mục in sorted(đủ_tín_hiệu, key=lambda m: m["lợi_nhuận_tb"], reverse=True)[:args.hiển_thị]:
+        trọng_số = " ".join(f"{TIỀN_TỐ_THÀNH_PHẦN.get(t, t)}={w:g}" for t, w in mục["trọng_số"].items())
+        print(f"{trọng_số:<44} {mục['ngưỡng']:>7.2f} {mục['số_mua']:>6} {mục['số_bán']:>6} "
+              f"{mục['tỷ_lệ_trúng']:>7.1%} {mục['lợi_nhuận_tb']:>8.2%} "
+              f"{mục['lợi_nhuận_tb_mua']:>8.2%} {mục['lợi_nhuận_tb_bán']:>8.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Chấm Điểm Theo Lô (NumPy)
+--------------------
+Phiên bản vector hóa của các hàm chấm_điểm_* trong alpha_signal_checker_plus:
+nhận một khung cột (dict tên cột -> mảng, hoặc DataFrame) chứa mọi coin và tính
+điểm_mua, điểm_bán, điểm_ròng, độ_tin_cậy, tín_hiệu_chính bằng mặt nạ boolean.
+
+Kết quả trùng khớp từng bit với đường chấm điểm vô hướng: các phép cộng được
+thực hiện đúng thứ tự như bản gốc (cộng 0.0 và nhân 1.0 là chính xác), và làm
+tròn cho kết quả giống round() của Python thay vì np.round. Chuỗi tín_hiệu/cảnh_báo chỉ được
+dựng khi cần, cho những dòng thực sự hiển thị.
+"""
+
+from dataclasses import fields
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from alpha_signal_checker_plus import (
+    ChỉSốKinhTếVĩMô,
+    DữLiệuHợpĐồngTươngLai,
+    KếtQuảTínHiệu,
+    MẪU_ALTRANK_KÉM,
+    MẪU_ALTRANK_TỐT,
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    TácĐộngTinTức,
+    TâmLýMạngXãHội,
+    TIỀN_TỐ_THÀNH_PHẦN,
+    TRỌNG_SỐ_MẶC_ĐỊNH,
+    ẢnhChụpThànhPhần,
+)
+
+KhungThànhPhần = Mapping[str, Any]
+
+# Số tin nóng được xét, giống tin_tức.tin_nóng[:3] trong bản vô hướng
+SỐ_TIN_NÓNG = 3
+
+def khung_từ_ảnh_chụp(các_ảnh_chụp: Sequence[ẢnhChụpThànhPhần]) -> Dict[str, np.ndarray]:
+    """Chuyển danh sách ảnh chụp thành khung cột cho bộ chấm điểm theo lô"""
+    các_ảnh_chụp = list(các_ảnh_chụp)
+    khung: Dict[str, np.ndarray] = {"mã": np.asarray([a.mã for a in các_ảnh_chụp])}
+
+    for thuộc_tính, kiểu in (("mạng_xã_hội", TâmLýMạngXãHội), ("tin_tức", TácĐộngTinTức),
+                             ("hợp_đồng", DữLiệuHợpĐồngTươngLai), ("vĩ_mô", ChỉSốKinhTếVĩMô)):
+        tiền_tố = TIỀN_TỐ_THÀNH_PHẦN[thuộc_tính]
+        các_thành_phần = [getattr(a, thuộc_tính) for a in các_ảnh_chụp]
+        for trường in fields(kiểu):
+            if trường.name in ("tin_nóng", "mã"):
+                continue
+            khung[f"{tiền_tố}_{trường.name}"] = np.asarray([getattr(tp, trường.name) for tp in các_thành_phần])
+
+    for k in range(SỐ_TIN_NÓNG):
+        # NaN khiến mọi phép so sánh sai, tương đương không có tin
+        các_tin = [a.tin_tức.tin_nóng[k] if k < len(a.tin_tức.tin_nóng) else None for a in các_ảnh_chụp]
+        khung[f"tt_nóng_{k}_tác_động"] = np.asarray(
+            [tin.get("tác_động", 0) if tin is not None else np.nan for tin in các_tin], dtype=np.float64)
+        khung[f"tt_nóng_{k}_tâm_lý"] = np.asarray(
+            [tin.get("tâm_lý", 0) if tin is not None else np.nan for tin in các_tin], dtype=np.float64)
+
+    return khung
+
+def _làm_tròn(mảng: np.ndarray, chữ_số: int = 2) -> np.ndarray:
+    """Làm tròn giống hệt round() của Python"""
+    # rint(x*100)/100 chỉ có thể lệch với round() khi x*100 gần sát điểm .5;
+    # các phần tử đó được làm tròn lại bằng round() của Python
+    hệ_số = 10.0 ** chữ_số
+    phóng_to = mảng * hệ_số
+    kết_quả = np.rint(phóng_to) / hệ_số
+    phần_lẻ = np.abs(phóng_to - np.floor(phóng_to) - 0.5)
+    sát_biên = np.flatnonzero(phần_lẻ < 1e-7 * np.maximum(1.0, np.abs(phóng_to)))
+    for i in sát_biên.tolist():
+        kết_quả[i] = round(float(mảng[i]), chữ_số)
+    return kết_quả
+
+class _BộDựngChuỗi:
+    """Ghi lại (mặt nạ, mẫu chuỗi, cột giá trị) theo đúng thứ tự của bản vô hướng"""
+
+    def __init__(self):
+        self.tín_hiệu: List[Tuple[np.ndarray, str, Optional[np.ndarray]]] = []
+        self.cảnh_báo: List[Tuple[np.ndarray, str, Optional[np.ndarray]]] = []
+
+    @staticmethod
+    def dựng(các_mục, i: int) -> List[str]:
+        return [
+            mẫu.format(giá_trị[i]) if giá_trị is not None else mẫu
+            for mặt_nạ, mẫu, giá_trị in các_mục if mặt_nạ[i]
+        ]
+
+def _chấm_mạng_xã_hội(k: KhungThànhPhần, n: int, chuỗi: _BộDựngChuỗi):
+    mua, bán = np.zeros(n), np.zeros(n)
+    galaxy = np.asarray(k["mxh_điểm_galaxy"])
+    alt = np.asarray(k["mxh_xếp_hạng_alt"])
+    thay_đổi = np.asarray(k["mxh_thay_đổi_tâm_lý_24h"])
+
+    m = galaxy >= 70
+    m2 = ~m & (galaxy <= 30)
+    mua = mua + np.where(m, 1.5, 0.0)
+    bán = bán + np.where(m2, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((m, "Điểm Galaxy cao → tương tác cộng đồng mạnh", None))
+    chuỗi.cảnh_báo.append((m2, "Điểm Galaxy thấp → hiện diện mạng xã hội yếu", None))
+
+    m = alt <= 50
+    m2 = ~m & (alt >= 200)
+    mua = mua + np.where(m, 1.0, 0.0)
+    bán = bán + np.where(m2, 0.5, 0.0)
+    chuỗi.tín_hiệu.append((m, MẪU_ALTRANK_TỐT, alt))
+    chuỗi.cảnh_báo.append((m2, MẪU_ALTRANK_KÉM, alt))
+
+    m = thay_đổi > 0.15
+    m2 = ~m & (thay_đổi < -0.15)
+    mua = mua + np.where(m, 1.0, 0.0)
+    bán = bán + np.where(m2, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((m, "Cải thiện tâm lý nhanh → đà đang hình thành", None))
+    chuỗi.cảnh_báo.append((m2, "Tâm lý đang xấu đi → khuyến cáo thận trọng", None))
+
+    tổng_hợp = (
+        np.asarray(k["mxh_tâm_lý_twitter"]) * 0.4 +
+        np.asarray(k["mxh_tâm_lý_reddit"]) * 0.3 +
+        np.asarray(k["mxh_tâm_lý_influencer"]) * 0.3
+    )
+    m = tổng_hợp > 0.6
+    mua = mua + np.where(m, 1.5, 0.0)
+    bán = bán + np.where(~m & (tổng_hợp < 0.4), 1.0, 0.0)
+    return mua, bán
+
+def _chấm_tin_tức(k: KhungThànhPhần, n: int, chuỗi: _BộDựngChuỗi):
+    mua, bán = np.zeros(n), np.zeros(n)
+    tâm_lý = np.asarray(k["tt_tâm_lý_tin_tức_trung_bình"])
+
+    m = tâm_lý > 0.6
+    m2 = ~m & (tâm_lý < 0.3)
+    mua = mua + np.where(m, 2.0, 0.0)
+    bán = bán + np.where(m2, 1.5, 0.0)
+    chuỗi.tín_hiệu.append((m, "Tâm lý tin tức tích cực mạnh → chất xúc tác tăng giá", None))
+    chuỗi.cảnh_báo.append((m2, "Tâm lý tin tức tiêu cực → áp lực giảm giá", None))
+
+    tác_động_cao = np.asarray(k["tt_tin_tác_động_cao"]) >= 2
+    tích_cực_hơn = np.asarray(k["tt_số_tin_tích_cực"]) > np.asarray(k["tt_số_tin_tiêu_cực"])
+    m = tác_động_cao & tích_cực_hơn
+    m2 = tác_động_cao & ~tích_cực_hơn
+    mua = mua + np.where(m, 1.5, 0.0)
+    bán = bán + np.where(m2, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((m, "Nhiều sự kiện tin tức tích cực tác động cao", None))
+    chuỗi.cảnh_báo.append((m2, "Nhiều sự kiện tin tức tiêu cực tác động cao", None))
+
+    m = np.asarray(k["tt_lượng_tin_24h"]) > 50
+    mua = mua + np.where(m, 0.5, 0.0)
+    chuỗi.tín_hiệu.append((m, "Lượng tin cao → tăng sự chú ý của thị trường", None))
+
+    for i in range(SỐ_TIN_NÓNG):
+        tác_động = np.asarray(k[f"tt_nóng_{i}_tác_động"], dtype=np.float64)
+        tâm_lý_tin = np.asarray(k[f"tt_nóng_{i}_tâm_lý"], dtype=np.float64)
+        m = (tác_động >= 7) & (tâm_lý_tin > 0.5)
+        mua = mua + np.where(m, 1.0, 0.0)
+        bán = bán + np.where(~m & (tác_động >= 7) & (tâm_lý_tin < -0.3), 1.0, 0.0)
+    return mua, bán
+
+def _chấm_hợp_đồng(k: KhungThànhPhần, n: int, chuỗi: _BộDựngChuỗi):
+    mua, bán = np.zeros(n), np.zeros(n)
+    xu_hướng = np.asarray(k["hd_xu_hướng_dòng_tiền"])
+    đà = np.asarray(k["hd_đà_dòng_tiền"])
+    tâm_lý_tt = np.asarray(k["hd_tâm_lý_thị_trường"])
+
+    vào_mạnh = xu_hướng == "DÒNG_VÀO_MẠNH"
+    vào = xu_hướng == "DÒNG_VÀO"
+    ra_mạnh = xu_hướng == "DÒNG_RA_MẠNH"
+    ra = xu_hướng == "DÒNG_RA"
+    mua = mua + np.where(vào_mạnh, 2.5, 0.0)
+    mua = mua + np.where(vào, 1.5, 0.0)
+    bán = bán + np.where(ra_mạnh, 2.0, 0.0)
+    bán = bán + np.where(ra, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((vào_mạnh, "Xu hướng dòng vào mạnh → vốn đang vào thị trường", None))
+    chuỗi.tín_hiệu.append((vào, "Dòng vào tích cực → dòng vốn tăng giá", None))
+    chuỗi.cảnh_báo.append((ra_mạnh, "Dòng ra mạnh → vốn rời khỏi thị trường", None))
+    chuỗi.cảnh_báo.append((ra, "Dòng ra tiêu cực → dòng vốn giảm giá", None))
+
+    m = đà > 0.2
+    m2 = ~m & (đà < -0.2)
+    mua = mua + np.where(m, 1.0, 0.0)
+    bán = bán + np.where(m2, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((m, "Dòng vào tăng tốc → đà đang hình thành", None))
+    chuỗi.cảnh_báo.append((m2, "Dòng ra tăng tốc → đà đang xấu đi", None))
+
+    m = (tâm_lý_tt == "BULL") & (vào | vào_mạnh)
+    m2 = ~m & (tâm_lý_tt == "BEAR") & (ra | ra_mạnh)
+    mua = mua + np.where(m, 1.0, 0.0)
+    bán = bán + np.where(m2, 1.0, 0.0)
+    chuỗi.tín_hiệu.append((m, "Tâm lý tăng giá + dòng vào → xác nhận mạnh", None))
+    chuỗi.cảnh_báo.append((m2, "Tâm lý giảm giá + dòng ra → xác nhận mạnh", None))
+
+    lớn = np.asarray(k["hd_khối_lượng_cân_bằng"]) > 1000000
+    dương = np.asarray(k["hd_dòng_tiền_ròng_24h"]) > 0
+    mua = mua + np.where(lớn & dương, 0.5, 0.0)
+    bán = bán + np.where(lớn & ~dương, 0.5, 0.0)
+    return mua, bán
+
+def _chấm_vĩ_mô(k: KhungThànhPhần, n: int, chuỗi: _BộDựngChuỗi):
+    mua, bán, hệ_số = np.zeros(n), np.zeros(n), np.ones(n)
+    vix = np.asarray(k["vm_vix_hiện_tại"])
+    xu_vix = np.asarray(k["vm_xu_hướng_vix"])
+    dxy = np.asarray(k["vm_dxy_hiện_tại"])
+    xu_dxy = np.asarray(k["vm_xu_hướng_dxy"])
+    sp500 = np.asarray(k["vm_thay_đổi_sp500"])
+    nasdaq = np.asarray(k["vm_thay_đổi_nasdaq"])
+    chế_độ = np.asarray(k["vm_mức_độ_chấp_nhận_rủi_ro"])
+
+    m = (vix > 25) & (xu_vix == "TĂNG")
+    m2 = ~m & (vix < 15) & (xu_vix == "GIẢM")
+    bán = bán + np.where(m, 1.5, 0.0)
+    hệ_số = hệ_số * np.where(m, 0.7, 1.0)
+    mua = mua + np.where(m2, 1.0, 0.0)
+    chuỗi.cảnh_báo.append((m, "VIX cao & đang tăng → môi trường rủi ro", None))
+    chuỗi.tín_hiệu.append((m2, "VIX thấp & đang giảm → môi trường chấp nhận rủi ro", None))
+
+    m = (dxy > 105) & (xu_dxy == "TĂNG")
+    m2 = ~m & (dxy < 100) & (xu_dxy == "GIẢM")
+    bán = bán + np.where(m, 1.5, 0.0)
+    hệ_số = hệ_số * np.where(m, 0.8, 1.0)
+    mua = mua + np.where(m2, 1.0, 0.0)
+    chuỗi.cảnh_báo.append((m, "USD mạnh & đang tăng → đầu gió ngược crypto", None))
+    chuỗi.tín_hiệu.append((m2, "USD yếu & đang giảm → đầu gió thuận crypto", None))
+
+    m = (np.asarray(k["vm_lợi_suất_trái_phiếu_mỹ_10năm"]) > 4.5) & (np.asarray(k["vm_xu_hướng_lợi_suất"]) == "TĂNG")
+    bán = bán + np.where(m, 1.0, 0.0)
+    chuỗi.cảnh_báo.append((m, "Lợi suất cao & đang tăng → áp lực cạnh tranh", None))
+
+    m = (sp500 > 1.0) & (nasdaq > 1.5)
+    m2 = ~m & (sp500 < -1.0) & (nasdaq < -1.5)
+    mua = mua + np.where(m, 1.0, 0.0)
+    bán = bán + np.where(m2, 0.5, 0.0)
+    chuỗi.tín_hiệu.append((m, "Hiệu suất cổ phiếu mạnh → tương quan tích cực", None))
+    chuỗi.cảnh_báo.append((m2, "Hiệu suất cổ phiếu yếu → tương quan tiêu cực", None))
+
+    hệ_số = hệ_số * np.where(chế_độ == "CAO", 1.2, 1.0)
+    hệ_số = hệ_số * np.where(chế_độ == "THẤP", 0.8, 1.0)
+    return mua, bán, hệ_số
+
+class KếtQuảLô:
+    """Kết quả chấm điểm dạng cột; chuỗi văn bản chỉ dựng theo yêu cầu"""
+
+    def __init__(self, mã: np.ndarray, điểm_mua: np.ndarray, điểm_bán: np.ndarray, điểm_ròng: np.ndarray,
+                 hệ_số_kích_thước_vị_thế: np.ndarray, độ_tin_cậy: np.ndarray, tín_hiệu_chính: np.ndarray,
+                 chuỗi: _BộDựngChuỗi):
+        self.mã = mã
+        self.điểm_mua = điểm_mua
+        self.điểm_bán = điểm_bán
+        self.điểm_ròng = điểm_ròng
+        self.hệ_số_kích_thước_vị_thế = hệ_số_kích_thước_vị_thế
+        self.độ_tin_cậy = độ_tin_cậy
+        self.tín_hiệu_chính = tín_hiệu_chính
+        self._chuỗi = chuỗi
+
+    def __len__(self) -> int:
+        return len(self.điểm_ròng)
+
+    def tín_hiệu(self, i: int) -> List[str]:
+        return _BộDựngChuỗi.dựng(self._chuỗi.tín_hiệu, i)
+
+    def cảnh_báo(self, i: int) -> List[str]:
+        return _BộDựngChuỗi.dựng(self._chuỗi.cảnh_báo, i)
+
+    def kết_quả(self, i: int, thành_phần: Dict[str, Any] = None) -> KếtQuảTínHiệu:
+        """Dựng KếtQuảTínHiệu đầy đủ cho một dòng (dùng cho dòng được hiển thị)"""
+        return KếtQuảTínHiệu(
+            mã=str(self.mã[i]),
+            điểm_mua=float(self.điểm_mua[i]),
+            điểm_bán=float(self.điểm_bán[i]),
+            điểm_ròng=float(self.điểm_ròng[i]),
+            hệ_số_kích_thước_vị_thế=float(self.hệ_số_kích_thước_vị_thế[i]),
+            độ_tin_cậy=str(self.độ_tin_cậy[i]),
+            tín_hiệu_chính=str(self.tín_hiệu_chính[i]),
+            cảnh_báo=self.cảnh_báo(i),
+            tín_hiệu=self.tín_hiệu(i),
+            thành_phần=thành_phần if thành_phần is not None else {},
+        )
+
+# Thành phần lõi theo đúng thứ tự cộng điểm của tổng_hợp_điểm
+THÀNH_PHẦN_LÔ = ("mạng_xã_hội", "tin_tức", "hợp_đồng", "vĩ_mô")
+
+def điểm_thành_phần_lô(khung: KhungThànhPhần,
+                        chuỗi: _BộDựngChuỗi = None) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Điểm (mua, bán, hệ số kích thước) chưa nhân trọng số của từng thành phần lõi"""
+    if chuỗi is None:
+        chuỗi = _BộDựngChuỗi()
+    n = len(khung["mã"])
+    m_mua, m_bán = _chấm_mạng_xã_hội(khung, n, chuỗi)
+    t_mua, t_bán = _chấm_tin_tức(khung, n, chuỗi)
+    h_mua, h_bán = _chấm_hợp_đồng(khung, n, chuỗi)
+    v_mua, v_bán, v_hệ_số = _chấm_vĩ_mô(khung, n, chuỗi)
+    một = np.ones(n)
+    return {
+        "mạng_xã_hội": (m_mua, m_bán, một),
+        "tin_tức": (t_mua, t_bán, một),
+        "hợp_đồng": (h_mua, h_bán, một),
+        "vĩ_mô": (v_mua, v_bán, v_hệ_số),
+    }
+
+def tổng_hợp_điểm_lô(khung: KhungThànhPhần, trọng_số: Dict[str, float] = None,
+                      chuỗi: _BộDựngChuỗi = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bản vector hóa của tổng_hợp_điểm: trả về (tổng mua, tổng bán, hệ số kích thước) chưa làm tròn"""
+    if trọng_số is None:
+        trọng_số = TRỌNG_SỐ_MẶC_ĐỊNH
+    điểm = điểm_thành_phần_lô(khung, chuỗi)
+    n = len(khung["mã"])
+
+    # Cùng thứ tự cộng dồn như tổng_hợp_điểm để giữ nguyên từng bit
+    tổng_mua = np.zeros(n)
+    tổng_bán = np.zeros(n)
+    for tên in THÀNH_PHẦN_LÔ:
+        mua, bán, _ = điểm[tên]
+        # Trọng số thiếu thì dùng trọng số đã đăng ký, như tổng_hợp_điểm
+        w = trọng_số.get(tên, SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].trọng_số)
+        tổng_mua = tổng_mua + mua * w
+        tổng_bán = tổng_bán + bán * w
+    hệ_số = np.ones(n) * điểm["vĩ_mô"][2]
+    return tổng_mua, tổng_bán, hệ_số
+
+def phân_loại_lô(điểm_ròng: np.ndarray, điểm_ròng_tối_thiểu: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Bản vector hóa của phân_loại_tín_hiệu (trên điểm ròng chưa làm tròn)"""
+    tuyệt_đối = np.abs(điểm_ròng)
+    độ_tin_cậy = np.select([tuyệt_đối >= 3.0, tuyệt_đối >= 1.5], ["CAO", "TRUNG_BÌNH"], "THẤP")
+    tín_hiệu_chính = np.select(
+        [điểm_ròng >= điểm_ròng_tối_thiểu, điểm_ròng <= -điểm_ròng_tối_thiểu], ["MUA", "BÁN"], "TRUNG_LẬP"
+    )
+    return độ_tin_cậy, tín_hiệu_chính
+
+def chấm_điểm_lô(khung: KhungThànhPhần, điểm_ròng_tối_thiểu: float = 2.0,
+                  trọng_số: Dict[str, float] = None) -> KếtQuảLô:
+    """Chấm điểm toàn bộ khung cột, tương đương chấm_điểm_ảnh_chụp cho từng dòng"""
+    chuỗi = _BộDựngChuỗi()
+    tổng_mua, tổng_bán, hệ_số = tổng_hợp_điểm_lô(khung, trọng_số, chuỗi)
+    điểm_ròng = tổng_mua - tổng_bán
+    hệ_số_vị_thế = np.maximum(0.1, np.minimum(2.0, hệ_số))
+    độ_tin_cậy, tín_hiệu_chính = phân_loại_lô(điểm_ròng, điểm_ròng_tối_thiểu)
+
+    return KếtQuảLô(
+        mã=np.asarray(khung["mã"]),
+        điểm_mua=_làm_tròn(tổng_mua),
+        điểm_bán=_làm_tròn(tổng_bán),
+        điểm_ròng=_làm_tròn(điểm_ròng),
+        hệ_số_kích_thước_vị_thế=_làm_tròn(hệ_số_vị_thế),
+        độ_tin_cậy=độ_tin_cậy,
+        tín_hiệu_chính=tín_hiệu_chính,
+        chuỗi=chuỗi,
+    )
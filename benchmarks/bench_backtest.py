@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark và kiểm tra tương đương của backtest
+--------------------
+Ghi --số-lần-chạy lần chạy tổng hợp (ảnh chụp của tests/du_lieu_mau.py, vĩ mô đổi theo
+từng lần chạy, giá đi ngẫu nhiên) vào một KhoẢnhChụp mới, chấm điểm bằng đường thật
+(chấm_điểm_ảnh_chụp), rồi:
+- đối chiếu backtest ở trọng số/ngưỡng mặc định với bản đếm thẳng bằng Python trên
+  tín_hiệu_chính đã lưu: số tín hiệu, số lần trúng và tổng lợi nhuận phải khớp
+- đo tốc độ nạp (dòng/s) và ước lượng cho --số-ngày-ước-lượng ngày dữ liệu
+- đo thời gian dò lưới --số-bộ-trọng-số bộ trọng số × 5 ngưỡng
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_backtest --số-coin 500 --số-lần-chạy 200
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict, replace
+
+import numpy as np
+
+from alpha_signal_checker_plus import (
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    NgữCảnhChạy,
+    chuẩn_hóa_điểm,
+    chấm_điểm_môi_trường_vĩ_mô,
+    chấm_điểm_ảnh_chụp,
+)
+from backtest import nạp_dữ_liệu_backtest, tạo_lưới_trọng_số, đánh_giá_lưới
+from snapshot_store import KhoẢnhChụp
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+CÁC_NGƯỠNG = (1.0, 1.5, 2.0, 2.5, 3.0)
+
+def _ghi_kho(kho: KhoẢnhChụp, số_coin: int, số_lần_chạy: int, chu_kỳ: float, điểm_ròng_tối_thiểu: float):
+    """Ghi các lần chạy tổng hợp; mỗi lần chạy một bộ ảnh chụp và vĩ mô mới"""
+    rng = random.Random(11)
+    giá = {f"C{i}": 100.0 for i in range(số_coin)}
+    for r in range(số_lần_chạy):
+        các_ảnh_chụp = sinh_ảnh_chụp(số_coin, hạt_giống=r)
+        vĩ_mô = các_ảnh_chụp[0].vĩ_mô
+        điểm_vĩ_mô = chuẩn_hóa_điểm(chấm_điểm_môi_trường_vĩ_mô(vĩ_mô))
+        ngữ_cảnh = NgữCảnhChạy(vĩ_mô=vĩ_mô, điểm_vĩ_mô=điểm_vĩ_mô, thành_phần_vĩ_mô=asdict(vĩ_mô),
+                               điểm_toàn_cục={"vĩ_mô": điểm_vĩ_mô})
+        # Thỉnh thoảng thiếu một mã trong lần chạy: lợi nhuận kỳ tới phải lấy ảnh chụp kế tiếp còn lại
+        các_kết_quả = [
+            chấm_điểm_ảnh_chụp(replace(a, vĩ_mô=vĩ_mô, ngữ_cảnh=ngữ_cảnh), điểm_ròng_tối_thiểu)
+            for a in các_ảnh_chụp if rng.random() > 0.02
+        ]
+        for mã in giá:
+            giá[mã] *= 1 + rng.gauss(0, 0.01)
+        kho.ghi_lần_chạy(các_kết_quả, ngữ_cảnh, thời_gian=r * chu_kỳ, giá=dict(giá),
+                         điểm_ròng_tối_thiểu=điểm_ròng_tối_thiểu)
+
+def _đếm_thẳng(kho: KhoẢnhChụp, tầm_nhìn: float) -> dict:
+    """Đếm tín hiệu đã lưu và lợi nhuận kỳ tới bằng vòng lặp Python, không qua backtest"""
+    theo_mã = {}
+    for lần, các_dòng in kho.lặp_dòng_thô():
+        for mã, giá, tín_hiệu_chính, _ in các_dòng:
+            theo_mã.setdefault(mã, []).append((lần["thời_gian"], giá, tín_hiệu_chính))
+    đếm = {"số_mua": 0, "số_bán": 0, "trúng": 0, "tổng_lợi_nhuận": 0.0}
+    for chuỗi in theo_mã.values():
+        chuỗi.sort()
+        for i, (t, giá, tín_hiệu) in enumerate(chuỗi):
+            sau = next((d for d in chuỗi[i + 1:] if d[0] >= t + tầm_nhìn), None)
+            if sau is None or sau[0] > t + 1.5 * tầm_nhìn or tín_hiệu == "TRUNG_LẬP":
+                continue
+            lợi_nhuận = sau[1] / giá - 1.0
+            hướng = 1 if tín_hiệu == "MUA" else -1
+            đếm["số_mua" if hướng > 0 else "số_bán"] += 1
+            đếm["trúng"] += int(hướng * lợi_nhuận > 0)
+            đếm["tổng_lợi_nhuận"] += hướng * lợi_nhuận
+    return đếm
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo tốc độ nạp và dò lưới của backtest")
+    parser.add_argument("--số-coin", type=int, default=500)
+    parser.add_argument("--số-lần-chạy", type=int, default=200)
+    parser.add_argument("--chu-kỳ-phút", type=float, default=60.0)
+    parser.add_argument("--tầm-nhìn-giờ", type=float, default=24.0)
+    parser.add_argument("--số-bộ-trọng-số", type=int, default=2000)
+    parser.add_argument("--số-tiến-trình", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--số-ngày-ước-lượng", type=float, default=90.0)
+    args = parser.parse_args()
+
+    chu_kỳ = args.chu_kỳ_phút * 60
+    tầm_nhìn = args.tầm_nhìn_giờ * 3600
+    điểm_ròng_tối_thiểu = 2.0
+    with tempfile.TemporaryDirectory() as thư_mục:
+        kho = KhoẢnhChụp(os.path.join(thư_mục, "lich_su.db"))
+        bắt_đầu = time.perf_counter()
+        _ghi_kho(kho, args.số_coin, args.số_lần_chạy, chu_kỳ, điểm_ròng_tối_thiểu)
+        print(f"Ghi {args.số_lần_chạy} lần chạy x {args.số_coin} coin: {time.perf_counter() - bắt_đầu:.1f}s")
+
+        bắt_đầu = time.perf_counter()
+        dữ_liệu = nạp_dữ_liệu_backtest(kho, tầm_nhìn, số_lần_chạy_mỗi_khối=37)
+        thời_gian_nạp = time.perf_counter() - bắt_đầu
+        đếm = _đếm_thẳng(kho, tầm_nhìn)
+        kho.đóng()
+
+    tốc_độ = dữ_liệu.tổng_số_dòng / thời_gian_nạp
+    print(f"Nạp: {dữ_liệu.tổng_số_dòng:,} dòng trong {thời_gian_nạp:.1f}s ({tốc_độ:,.0f} dòng/s), "
+          f"{dữ_liệu.số_dòng_có_lợi_nhuận:,} dòng có lợi nhuận kỳ tới, {len(dữ_liệu.số_dòng):,} nhóm điểm")
+
+    # Cấu hình mặc định phải tái hiện đúng tín hiệu đã lưu
+    mặc_định = đánh_giá_lưới(dữ_liệu, tạo_lưới_trọng_số({}, dữ_liệu.các_thành_phần), [điểm_ròng_tối_thiểu])[0]
+    số_tín_hiệu = mặc_định["số_mua"] + mặc_định["số_bán"]
+    assert (mặc_định["số_mua"], mặc_định["số_bán"]) == (đếm["số_mua"], đếm["số_bán"]), (mặc_định, đếm)
+    assert round(mặc_định["tỷ_lệ_trúng"] * số_tín_hiệu) == đếm["trúng"], (mặc_định, đếm)
+    assert math.isclose(mặc_định["lợi_nhuận_tb"] * số_tín_hiệu, đếm["tổng_lợi_nhuận"], rel_tol=1e-9, abs_tol=1e-9)
+    print(f"✅ Cấu hình mặc định khớp tín hiệu đã lưu: {đếm['số_mua']} MUA, {đếm['số_bán']} BÁN, "
+          f"trúng {mặc_định['tỷ_lệ_trúng']:.1%}")
+
+    # Lưới ngẫu nhiên quanh trọng số mặc định, đủ số bộ yêu cầu
+    rng = np.random.default_rng(5)
+    gốc = np.array([SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[t].trọng_số for t in dữ_liệu.các_thành_phần])
+    lưới = gốc * rng.uniform(0, 2, size=(args.số_bộ_trọng_số, len(gốc)))
+    for số_tiến_trình in sorted({1, args.số_tiến_trình}):
+        bắt_đầu = time.perf_counter()
+        kết_quả = đánh_giá_lưới(dữ_liệu, lưới, CÁC_NGƯỠNG, số_tiến_trình)
+        print(f"Dò {len(kết_quả):,} cấu hình với {số_tiến_trình} tiến trình: {time.perf_counter() - bắt_đầu:.2f}s")
+
+    số_dòng_ước_lượng = args.số_ngày_ước_lượng * 86400 / chu_kỳ * args.số_coin
+    print(f"\nƯớc lượng {args.số_ngày_ước_lượng:.0f} ngày ({số_dòng_ước_lượng:,.0f} dòng): "
+          f"nạp ~{số_dòng_ước_lượng / tốc_độ / 60:.1f} phút; thời gian dò lưới tỷ lệ với số nhóm điểm, "
+          f"không phải số dòng")
+
+if __name__ == "__main__":
+    main()
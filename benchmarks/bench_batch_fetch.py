@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark lấy dữ liệu theo lô
+--------------------
+Server giả lập cục bộ đóng vai LunarCrush (/lunarcrush/coins?symbol=A,B,...) và
+CryptoPanic (/cryptopanic/posts/?currencies=A,B,... có phân trang qua "next").
+Chạy lấy_đồng_thời cho N coin ở hai chế độ, mỗi chế độ với bộ nhớ đệm trống:
+- từng_mã: mỗi mã một yêu cầu cho mỗi nhà cung cấp
+- theo_lô:  lấy_tâm_lý_mạng_xã_hội_lô / lấy_tác_động_tin_tức_lô
+so sánh số yêu cầu và thời gian, kiểm tra hai chế độ cho kết quả giống hệt nhau,
+rồi chạy lại theo lô để xác nhận lần thứ hai chỉ đọc bộ nhớ đệm.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_batch_fetch --số-coin 500
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from alpha_signal_checker_plus import BỘ_NHỚ_ĐỆM, CẤU_HÌNH
+from benchmarks.bench_fetch_engine import _ServerGiảLập
+from fetch_engine import lấy_đồng_thời, nhà_cung_cấp_mặc_định
+
+CỠ_TRANG = 20
+
+def _số(mã: str, hạt_giống: int, mod: int) -> int:
+    return zlib.crc32(f"{mã}:{hạt_giống}".encode("utf-8")) % mod
+
+def _coin_lunarcrush(mã: str) -> dict:
+    return {
+        "symbol": mã,
+        "social_mentions_24h": _số(mã, 1, 5000),
+        "tweet_sentiment": _số(mã, 2, 100) / 100,
+        "reddit_posts_24h": _số(mã, 3, 800),
+        "reddit_sentiment": _số(mã, 4, 100) / 100,
+        "sentiment_change_24h": (_số(mã, 5, 60) - 30) / 100,
+        "influencer_sentiment": _số(mã, 6, 100) / 100,
+        "galaxy_score": _số(mã, 7, 1000) / 10,
+        "alt_rank": _số(mã, 8, 400),
+        "interactions_24h": _số(mã, 9, 100000),
+        "social_engagement": _số(mã, 10, 100) / 100,
+    }
+
+def _bài_của(các_mã: list) -> list:
+    """Mỗi coin 3 bài; bài thứ hai nhắc thêm coin kế tiếp để kiểm tra chia bài cho nhiều mã"""
+    các_bài = []
+    for i, mã in enumerate(các_mã):
+        for j in range(3):
+            tiền_tệ = [{"code": mã}]
+            if j == 1 and i + 1 < len(các_mã):
+                tiền_tệ.append({"code": các_mã[i + 1]})
+            các_bài.append({
+                "title": f"Tin {j} về {mã}",
+                "currencies": tiền_tệ,
+                "votes": {"positive": _số(mã, 20 + j, 10), "negative": _số(mã, 30 + j, 10),
+                          "important": _số(mã, 40 + j, 12)},
+            })
+    return các_bài
+
+class _BộXửLýNhàCungCấp(BaseHTTPRequestHandler):
+    tất_cả_bài: list = []
+    không_theo_dõi: set = set()
+    độ_trễ = 0.01
+    số_yêu_cầu = {"/lunarcrush/coins": 0, "/cryptopanic/posts/": 0}
+    khóa = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        tham_số = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self.khóa:
+            self.số_yêu_cầu[url.path] += 1
+        time.sleep(self.độ_trễ)
+        if url.path == "/lunarcrush/coins":
+            các_mã = tham_số["symbol"].split(",")
+            dữ_liệu = {"data": [_coin_lunarcrush(mã) for mã in các_mã if mã not in self.không_theo_dõi]}
+        else:
+            các_mã = set(tham_số["currencies"].split(","))
+            khớp = [b for b in self.tất_cả_bài if any(t["code"] in các_mã for t in b["currencies"])]
+            trang = int(tham_số.get("page", "1"))
+            dữ_liệu = {"results": khớp[(trang - 1) * CỠ_TRANG:trang * CỠ_TRANG], "next": None}
+            if trang * CỠ_TRANG < len(khớp):
+                tham_số["page"] = str(trang + 1)
+                dữ_liệu["next"] = f"http://{self.headers['Host']}{url.path}?{urlencode(tham_số)}"
+        nội_dung = json.dumps(dữ_liệu).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lấy dữ liệu mạng xã hội/tin tức: từng mã vs theo lô")
+    parser.add_argument("--số-coin", type=int, default=500)
+    parser.add_argument("--độ-trễ-ms", type=float, default=10.0, help="Độ trễ mỗi phản hồi của server giả lập")
+    args = parser.parse_args()
+
+    các_mã = [f"C{i}" for i in range(args.số_coin)]
+    _BộXửLýNhàCungCấp.tất_cả_bài = _bài_của(các_mã)
+    # Vài mã LunarCrush không theo dõi: phải nhận dữ liệu rỗng thay vì bị thiếu
+    _BộXửLýNhàCungCấp.không_theo_dõi = set(các_mã[::7])
+    _BộXửLýNhàCungCấp.độ_trễ = args.độ_trễ_ms / 1000
+    server = _ServerGiảLập(("127.0.0.1", 0), _BộXửLýNhàCungCấp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gốc = f"http://127.0.0.1:{server.server_address[1]}"
+
+    CẤU_HÌNH.update({
+        "LUNARCRUSH_API_KEY": "bench-key", "LUNARCRUSH_BASE": f"{gốc}/lunarcrush/",
+        "CRYPTOPANIC_TOKEN": "bench-key", "CRYPTOPANIC_BASE": f"{gốc}/cryptopanic/",
+    })
+    theo_lô = nhà_cung_cấp_mặc_định()
+    từng_mã = [replace(ncc, hàm_lấy_lô=None) for ncc in theo_lô]
+
+    print(f"{args.số_coin} coin, lô LunarCrush {CẤU_HÌNH['LUNARCRUSH_BATCH_SIZE']} mã, "
+          f"lô CryptoPanic {CẤU_HÌNH['CRYPTOPANIC_BATCH_SIZE']} mã ({CỠ_TRANG} bài/trang)")
+    print(f"{'Chế độ':<20} {'Thời gian (s)':>14} {'LunarCrush':>11} {'CryptoPanic':>12}")
+    print("-" * 60)
+    kết_quả = {}
+    try:
+        for chế_độ, các_nhà_cung_cấp, xóa_đệm in (("từng_mã", từng_mã, True), ("theo_lô", theo_lô, True),
+                                                  ("theo_lô (đã đệm)", theo_lô, False)):
+            if xóa_đệm:
+                BỘ_NHỚ_ĐỆM.xóa()
+            for đường_dẫn in _BộXửLýNhàCungCấp.số_yêu_cầu:
+                _BộXửLýNhàCungCấp.số_yêu_cầu[đường_dẫn] = 0
+
+            bắt_đầu = time.perf_counter()
+            kết_quả[chế_độ] = lấy_đồng_thời(các_mã, các_nhà_cung_cấp)
+            thời_gian = time.perf_counter() - bắt_đầu
+
+            số_yêu_cầu = _BộXửLýNhàCungCấp.số_yêu_cầu
+            print(f"{chế_độ:<20} {thời_gian:>14.2f} {số_yêu_cầu['/lunarcrush/coins']:>11} "
+                  f"{số_yêu_cầu['/cryptopanic/posts/']:>12}")
+    finally:
+        server.shutdown()
+
+    # Mọi mã phải có dữ liệu, và cách chia lô không được làm thay đổi kết quả
+    assert all(v is not None for theo_mã in kết_quả["từng_mã"] for v in theo_mã.values())
+    assert kết_quả["từng_mã"] == kết_quả["theo_lô"] == kết_quả["theo_lô (đã đệm)"]
+    print("Kết quả từng mã và theo lô giống hệt nhau")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark và kiểm tra tương đương của bộ chấm điểm theo lô
+--------------------
+Sinh N coin tổng hợp phủ mọi nhánh của các hàm chấm_điểm_*, chấm điểm bằng
+đường vô hướng (chấm_điểm_ảnh_chụp) và bằng chấm_điểm_lô, rồi:
+- so sánh từng bit điểm số, độ tin cậy, tín hiệu chính và chuỗi văn bản
+- in thời gian của cả hai đường từ 10k đến 100k coin
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_batch_scorer
+"""
+
+import argparse
+import time
+from typing import List
+
+from alpha_signal_checker_plus import chấm_điểm_ảnh_chụp, tạo_kết_quả, tổng_hợp_điểm, ẢnhChụpThànhPhần
+from batch_scorer import chấm_điểm_lô, khung_từ_ảnh_chụp
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def kiểm_tra_tương_đương(các_ảnh_chụp: List[ẢnhChụpThànhPhần], điểm_ròng_tối_thiểu: float,
+                          trọng_số=None) -> int:
+    """So sánh từng dòng giữa hai đường chấm điểm; trả về số dòng đã kiểm"""
+    lô = chấm_điểm_lô(khung_từ_ảnh_chụp(các_ảnh_chụp), điểm_ròng_tối_thiểu, trọng_số)
+    for i, ảnh_chụp in enumerate(các_ảnh_chụp):
+        vô_hướng = chấm_điểm_ảnh_chụp(ảnh_chụp, điểm_ròng_tối_thiểu, trọng_số)
+        vector = lô.kết_quả(i)
+        for tên in ("điểm_mua", "điểm_bán", "điểm_ròng", "hệ_số_kích_thước_vị_thế"):
+            a, b = getattr(vô_hướng, tên), getattr(vector, tên)
+            assert a.hex() == b.hex(), f"{ảnh_chụp.mã}.{tên}: {a!r} != {b!r}"
+        assert vô_hướng.độ_tin_cậy == vector.độ_tin_cậy, ảnh_chụp.mã
+        assert vô_hướng.tín_hiệu_chính == vector.tín_hiệu_chính, ảnh_chụp.mã
+        assert vô_hướng.tín_hiệu == vector.tín_hiệu, ảnh_chụp.mã
+        assert vô_hướng.cảnh_báo == vector.cảnh_báo, ảnh_chụp.mã
+    return len(các_ảnh_chụp)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chấm điểm vô hướng vs theo lô")
+    parser.add_argument("--số-coin", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--số-coin-kiểm-tra", type=int, default=20000, help="Số coin cho kiểm tra tương đương")
+    args = parser.parse_args()
+
+    # Kiểm tra tương đương với nhiều ngưỡng và trọng số
+    kiểm_tra = sinh_ảnh_chụp(args.số_coin_kiểm_tra, hạt_giống=1)
+    số_dòng = 0
+    for ngưỡng in (0.0, 0.5, 2.0, 3.3):
+        số_dòng += kiểm_tra_tương_đương(kiểm_tra, ngưỡng)
+    số_dòng += kiểm_tra_tương_đương(
+        kiểm_tra, 1.0, {"mạng_xã_hội": 0.35, "tin_tức": 0.1, "hợp_đồng": 0.45, "vĩ_mô": 0.05}
+    )
+    print(f"✅ Tương đương từng bit trên {số_dòng} dòng")
+
+    print(f"{'Số coin':>8} {'Vô hướng (s)':>13} {'Dựng khung (s)':>15} {'Theo lô (s)':>12} {'Tăng tốc':>9}")
+    print("-" * 62)
+    for số_coin in args.số_coin:
+        các_ảnh_chụp = sinh_ảnh_chụp(số_coin)
+
+        bắt_đầu = time.perf_counter()
+        for ảnh_chụp in các_ảnh_chụp:
+            # Bỏ qua asdict() của thành_phần để chỉ đo phần chấm điểm
+            tạo_kết_quả(ảnh_chụp.mã, *tổng_hợp_điểm(ảnh_chụp), {})
+        t_vô_hướng = time.perf_counter() - bắt_đầu
+
+        bắt_đầu = time.perf_counter()
+        khung = khung_từ_ảnh_chụp(các_ảnh_chụp)
+        t_khung = time.perf_counter() - bắt_đầu
+
+        bắt_đầu = time.perf_counter()
+        chấm_điểm_lô(khung)
+        t_lô = time.perf_counter() - bắt_đầu
+
+        print(f"{số_coin:>8} {t_vô_hướng:>13.3f} {t_khung:>15.3f} {t_lô:>12.3f} {t_vô_hướng / t_lô:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark nạp sự kiện thời gian thực
+--------------------
+Dựng universe N mã (bản ghi sm/cin/cout/st/bv ngẫu nhiên, dữ liệu theo mã là dữ liệu mẫu), rồi
+một luồng ghi riêng gửi M sự kiện (cập nhật một phần, có "ts") qua từng nguồn của event_ingest:
+- tệp (đọc đuôi NDJSON), fifo, unix socket: độ trễ nhận -> tín hiệu và gửi -> tín hiệu
+- dồn dập: ghi mọi sự kiện một lúc, sự kiện cùng mã được gộp thành một lần chấm điểm
+- so với cách kéo: chấm điểm lại cả universe cho mỗi thay đổi
+Kiểm tra trạng thái cuối bằng đúng kết quả chấm điểm theo lô (chấm_điểm_hợp_đồng) trên các bản
+ghi đã gộp, sự kiện trùng giá trị không chấm lại, sự kiện thành phần không sửa dữ liệu trong bộ nhớ đệm.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_event_ingest --số-coin 2000 --số-sự-kiện 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+
+from alpha_signal_checker_plus import (
+    chấm_điểm_hợp_đồng,
+    chấm_điểm_ảnh_chụp,
+    phân_tích_dữ_liệu_hợp_đồng_tương_lai,
+    tạo_ngữ_cảnh_chạy,
+)
+from event_ingest import TIỀN_TỐ_UNIX, BộNạpSựKiện, nghe_sự_kiện
+from metrics import ĐO_LƯỜNG
+
+def sinh_bản_ghi(rng: random.Random, mã: str) -> dict:
+    return {
+        "p": f"{mã}-USDT-PERP@ethereum",
+        "sm": {"24h": rng.uniform(-5e6, 5e6), "7d": rng.uniform(-5e6, 5e6), "30d": rng.uniform(-5e6, 5e6)},
+        "cin": {"24h": rng.uniform(0, 5e6)},
+        "cout": {"24h": rng.uniform(0, 5e6)},
+        "st": {"24h": rng.choice(["bull", "bear", "neutral"])},
+        "bv": {"24h": rng.uniform(0, 5e6)},
+    }
+
+def sinh_sự_kiện(rng: random.Random, số_coin: int) -> dict:
+    """Cập nhật một phần: dòng tiền 24h, tiền gửi/rút hoặc tâm lý của một mã"""
+    mã = f"C{rng.randrange(số_coin)}"
+    loại = rng.randrange(3)
+    if loại == 0:
+        return {"p": f"{mã}-USDT-PERP", "sm": {"24h": rng.uniform(-5e6, 5e6)}}
+    if loại == 1:
+        return {"p": f"{mã}-USDT-PERP", "cin": {"24h": rng.uniform(0, 5e6)}, "cout": {"24h": rng.uniform(0, 5e6)}}
+    return {"p": f"{mã}-USDT-PERP", "st": {"24h": rng.choice(["bull", "bear", "neutral"])}}
+
+def gộp_bản_ghi(bản_ghi: dict, sự_kiện: dict):
+    for khóa, giá_trị in sự_kiện.items():
+        if isinstance(giá_trị, dict):
+            bản_ghi.setdefault(khóa, {}).update(giá_trị)
+
+def _ghi_tệp(đường_dẫn: str, các_dòng, khoảng: float):
+    with open(đường_dẫn, "a", encoding="utf-8") as f:
+        for dòng in các_dòng:
+            f.write(dòng())
+            f.flush()
+            if khoảng:
+                time.sleep(khoảng)
+
+def _ghi_fifo(đường_dẫn: str, các_dòng, khoảng: float):
+    # Mở để ghi chờ tới khi bên đọc đã mở FIFO
+    with open(đường_dẫn, "w", encoding="utf-8") as f:
+        for dòng in các_dòng:
+            f.write(dòng())
+            f.flush()
+            if khoảng:
+                time.sleep(khoảng)
+
+def _ghi_unix(đường_dẫn: str, các_dòng, khoảng: float):
+    kết_nối = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    for _ in range(500):
+        try:
+            kết_nối.connect(đường_dẫn)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            time.sleep(0.01)
+    with kết_nối:
+        for dòng in các_dòng:
+            kết_nối.sendall(dòng().encode("utf-8"))
+            if khoảng:
+                time.sleep(khoảng)
+
+def chạy_kịch_bản(bộ_nạp: BộNạpSựKiện, nguồn: str, hàm_ghi, đích: str, các_sự_kiện, khoảng: float) -> float:
+    """Gửi các sự kiện từ một luồng riêng, chờ bộ nạp xử lý hết; trả về thời gian (giây)"""
+    # "ts" gắn lúc gửi để đo độ trễ đầu-cuối
+    các_dòng = [lambda sk=sk: json.dumps(dict(sk, ts=time.time())) + "\n" for sk in các_sự_kiện]
+    mục_tiêu = bộ_nạp.số_sự_kiện + len(các_sự_kiện)
+
+    async def chính():
+        tác_vụ = asyncio.ensure_future(nghe_sự_kiện(bộ_nạp, [nguồn]))
+        # Nguồn mở xong trước khi gửi: file đọc từ cuối, socket cần server
+        await asyncio.sleep(0.2)
+        luồng_ghi = threading.Thread(target=hàm_ghi, args=(đích, các_dòng, khoảng))
+        bắt_đầu = time.perf_counter()
+        luồng_ghi.start()
+        while bộ_nạp.số_sự_kiện < mục_tiêu:
+            if tác_vụ.done():
+                tác_vụ.result()
+            await asyncio.sleep(0.002)
+        thời_gian = time.perf_counter() - bắt_đầu
+        tác_vụ.cancel()
+        await asyncio.gather(tác_vụ, return_exceptions=True)
+        luồng_ghi.join()
+        return thời_gian
+
+    return asyncio.run(chính())
+
+def _độ_trễ(giai_đoạn: str) -> dict:
+    for mục in ĐO_LƯỜNG.ảnh_chụp()["giai_đoạn"]:
+        if mục["giai_đoạn"] == giai_đoạn:
+            return mục
+    return {"p50_ms": float("nan"), "p95_ms": float("nan"), "p99_ms": float("nan")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Độ trễ sự kiện -> tín hiệu của chế độ --nghe-sự-kiện")
+    parser.add_argument("--số-coin", type=int, default=2000)
+    parser.add_argument("--số-sự-kiện", type=int, default=2000)
+    parser.add_argument("--khoảng-ms", type=float, default=1.0, help="Khoảng cách giữa hai sự kiện khi gửi đều")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    các_bản_ghi = {f"C{i}": sinh_bản_ghi(rng, f"C{i}") for i in range(args.số_coin)}
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    bộ_nạp = BộNạpSựKiện(ngữ_cảnh)
+    bắt_đầu = time.perf_counter()
+    bộ_nạp.nạp_ban_đầu(phân_tích_dữ_liệu_hợp_đồng_tương_lai(
+        json.loads(json.dumps(list(các_bản_ghi.values())))).values())
+    t_ban_đầu = time.perf_counter() - bắt_đầu
+
+    # Cách kéo: mỗi thay đổi chấm điểm lại cả universe (chỉ tính phần chấm điểm)
+    bắt_đầu = time.perf_counter()
+    for ảnh_chụp in bộ_nạp.ảnh_chụp.values():
+        ảnh_chụp._thành_phần = None
+        chấm_điểm_ảnh_chụp(ảnh_chụp)
+    t_cả_universe = time.perf_counter() - bắt_đầu
+
+    thư_mục = tempfile.mkdtemp()
+    đường_tệp = os.path.join(thư_mục, "su_kien.ndjson")
+    open(đường_tệp, "w").close()
+    đường_fifo = os.path.join(thư_mục, "su_kien.fifo")
+    os.mkfifo(đường_fifo)
+    đường_socket = os.path.join(thư_mục, "su_kien.sock")
+    kịch_bản = [
+        ("tệp (đọc đuôi)", đường_tệp, _ghi_tệp, đường_tệp, args.khoảng_ms / 1000),
+        ("fifo", đường_fifo, _ghi_fifo, đường_fifo, args.khoảng_ms / 1000),
+        ("unix socket", TIỀN_TỐ_UNIX + đường_socket, _ghi_unix, đường_socket, args.khoảng_ms / 1000),
+        ("unix socket, dồn dập", TIỀN_TỐ_UNIX + đường_socket, _ghi_unix, đường_socket, 0.0),
+    ]
+
+    print(f"{args.số_coin} mã, {args.số_sự_kiện} sự kiện mỗi kịch bản; nạp ban đầu {t_ban_đầu:.3f}s, "
+          f"chấm lại cả universe {t_cả_universe * 1000:.1f} ms (cách kéo, mỗi thay đổi)")
+    print(f"{'Nguồn':<22} {'Sự kiện/s':>10} {'Lần chấm':>9} {'Nhận->tín hiệu p50/p95/p99 (ms)':>34} "
+          f"{'Gửi->tín hiệu p50/p95/p99 (ms)':>33}")
+    print("-" * 112)
+    for tên, nguồn, hàm_ghi, đích, khoảng in kịch_bản:
+        các_sự_kiện = [sinh_sự_kiện(rng, args.số_coin) for _ in range(args.số_sự_kiện)]
+        for sk in các_sự_kiện:
+            gộp_bản_ghi(các_bản_ghi[sk["p"].split("-")[0]], sk)
+        ĐO_LƯỜNG.đặt_lại()
+        lần_chấm_trước = bộ_nạp.số_lần_chấm
+        thời_gian = chạy_kịch_bản(bộ_nạp, nguồn, hàm_ghi, đích, các_sự_kiện, khoảng)
+        nhận, gửi = _độ_trễ("sự_kiện_tới_tín_hiệu"), _độ_trễ("gửi_tới_tín_hiệu")
+        print(f"{tên:<22} {args.số_sự_kiện / thời_gian:>10.0f} {bộ_nạp.số_lần_chấm - lần_chấm_trước:>9} "
+              f"{nhận['p50_ms']:>14.3f} {nhận['p95_ms']:>9.3f} {nhận['p99_ms']:>9.3f} "
+              f"{gửi['p50_ms']:>13.3f} {gửi['p95_ms']:>9.3f} {gửi['p99_ms']:>9.3f}")
+
+    # Trạng thái cuối giống chấm điểm theo lô trên bản ghi đã gộp
+    hợp_đồng = phân_tích_dữ_liệu_hợp_đồng_tương_lai(json.loads(json.dumps(list(các_bản_ghi.values()))))
+    theo_lô = {kq.mã: kq for kq in chấm_điểm_hợp_đồng(hợp_đồng.values(), 2.0, ngữ_cảnh)}
+    assert theo_lô == bộ_nạp.kết_quả, [m for m in theo_lô if theo_lô[m] != bộ_nạp.kết_quả.get(m)][:5]
+
+    # Sự kiện trùng giá trị không chấm lại; sự kiện thành phần thay bản sao, không sửa dữ liệu dùng chung
+    cũ = bộ_nạp.ảnh_chụp["C1"].mạng_xã_hội
+    assert bộ_nạp.áp_dụng({"p": "C1-USDT-PERP", "sm": dict(các_bản_ghi["C1"]["sm"])}) is None
+    galaxy_cũ = cũ.điểm_galaxy
+    assert bộ_nạp.áp_dụng({"p": "C1-USDT-PERP", "mạng_xã_hội": {"điểm_galaxy": galaxy_cũ + 50}}) == "C1"
+    assert cũ.điểm_galaxy == galaxy_cũ and bộ_nạp.ảnh_chụp["C1"].mạng_xã_hội.điểm_galaxy == galaxy_cũ + 50
+    os.unlink(đường_tệp)
+    os.unlink(đường_fifo)
+    os.rmdir(thư_mục)
+    print("\nTrạng thái cuối giống chấm điểm theo lô; sự kiện trùng giá trị không chấm lại; "
+          "sự kiện thành phần không sửa dữ liệu dùng chung")
+
+if __name__ == "__main__":
+    main()
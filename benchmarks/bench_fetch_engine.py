@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark bộ máy lấy dữ liệu đồng thời
+--------------------
+Dựng một HTTP server giả lập cục bộ có độ trễ cố định, rồi so sánh thời gian
+thực (wall-clock) giữa vòng lặp tuần tự cũ và lấy_đồng_thời khi số coin tăng
+từ 10 đến 500.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_fetch_engine --độ-trễ-ms 20
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from alpha_signal_checker_plus import _yêu_cầu_an_toàn
+from fetch_engine import NhàCungCấp, lấy_đồng_thời
+from http_session import lấy_thống_kê
+
+class _BộXửLýGiảLập(BaseHTTPRequestHandler):
+    độ_trễ = 0.02
+
+    def do_GET(self):
+        time.sleep(self.độ_trễ)
+        nội_dung = json.dumps({"đường_dẫn": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+    def log_message(self, *args):
+        pass
+
+class _ServerGiảLập(ThreadingHTTPServer):
+    daemon_threads = True
+    # Hàng đợi listen mặc định (5) quá nhỏ cho nhiều kết nối đồng thời
+    request_queue_size = 256
+
+def khởi_động_server_giả_lập(độ_trễ_ms: float) -> ThreadingHTTPServer:
+    """Khởi động server giả lập trên một cổng ngẫu nhiên"""
+    _BộXửLýGiảLập.độ_trễ = độ_trễ_ms / 1000
+    server = _ServerGiảLập(("127.0.0.1", 0), _BộXửLýGiảLập)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lấy dữ liệu theo mã: tuần tự vs đồng thời")
+    parser.add_argument("--độ-trễ-ms", type=float, default=20.0, help="Độ trễ mỗi phản hồi của server giả lập")
+    parser.add_argument("--đồng-thời", type=int, default=16, help="Giới hạn đồng thời mỗi nhà cung cấp")
+    parser.add_argument("--số-coin", type=int, nargs="+", default=[10, 50, 100, 250, 500])
+    args = parser.parse_args()
+
+    server = khởi_động_server_giả_lập(args.độ_trễ_ms)
+    gốc = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def lấy_mạng_xã_hội(mã):
+        return _yêu_cầu_an_toàn(f"{gốc}/lunarcrush", {"symbol": mã})
+
+    def lấy_tin_tức(mã):
+        return _yêu_cầu_an_toàn(f"{gốc}/cryptopanic", {"currencies": mã})
+
+    các_nhà_cung_cấp = [
+        NhàCungCấp("mạng_xã_hội", lấy_mạng_xã_hội, args.đồng_thời),
+        NhàCungCấp("tin_tức", lấy_tin_tức, args.đồng_thời),
+    ]
+
+    print(f"{'Số coin':>8} {'Tuần tự (s)':>12} {'Đồng thời (s)':>14} {'Tăng tốc':>9}")
+    print("-" * 46)
+    try:
+        for số_coin in args.số_coin:
+            các_mã = [f"C{i}" for i in range(số_coin)]
+
+            bắt_đầu = time.perf_counter()
+            tuần_tự = [{"mạng_xã_hội": lấy_mạng_xã_hội(mã), "tin_tức": lấy_tin_tức(mã)} for mã in các_mã]
+            t_tuần_tự = time.perf_counter() - bắt_đầu
+
+            bắt_đầu = time.perf_counter()
+            đồng_thời = lấy_đồng_thời(các_mã, các_nhà_cung_cấp)
+            t_đồng_thời = time.perf_counter() - bắt_đầu
+
+            assert đồng_thời == tuần_tự, "Kết quả đồng thời phải giữ đúng thứ tự xếp hạng"
+            print(f"{số_coin:>8} {t_tuần_tự:>12.2f} {t_đồng_thời:>14.2f} {t_tuần_tự / t_đồng_thời:>8.1f}x")
+        print(f"Thống kê HTTP: {lấy_thống_kê()}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
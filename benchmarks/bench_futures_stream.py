@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark bộ nhớ và thông lượng khi đọc dữ liệu hợp đồng tương lai
+--------------------
+Sinh file mảng JSON (mặc định 1M bản ghi) rồi đo, mỗi chế độ trong một tiến
+trình con riêng để RSS đỉnh không ảnh hưởng lẫn nhau:
+- toàn_bộ: json.load + phân_tích_dữ_liệu_hợp_đồng_tương_lai (cách cũ)
+- luồng:   đọc_hợp_đồng_theo_luồng (chế độ --đọc-luồng: hai lượt lặp_bản_ghi, mã trùng giữ bản ghi cuối)
+Cả hai chế độ đều chấm điểm phần hợp đồng tương lai của mọi bản ghi.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_futures_stream --số-bản-ghi 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from alpha_signal_checker_plus import (
+    chấm_điểm_dữ_liệu_hợp_đồng_tương_lai,
+    phân_tích_dữ_liệu_hợp_đồng_tương_lai,
+    đọc_hợp_đồng_theo_luồng,
+)
+
+def sinh_file(đường_dẫn: str, số_bản_ghi: int):
+    """Ghi file mảng JSON với các bản ghi sm/cin/cout/st/bv ngẫu nhiên"""
+    rng = random.Random(11)
+    with open(đường_dẫn, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(số_bản_ghi):
+            mục = {
+                "p": f"C{i}-USDT-PERP@ethereum",
+                "sm": {"24h": rng.uniform(-5e6, 5e6), "7d": rng.uniform(-5e6, 5e6), "30d": rng.uniform(-5e6, 5e6)},
+                "cin": {"24h": rng.uniform(0, 5e6)},
+                "cout": {"24h": rng.uniform(0, 5e6)},
+                "st": {"24h": rng.choice(["bull", "bear", "neutral"])},
+                "bv": {"24h": rng.uniform(0, 5e6)},
+            }
+            f.write(("," if i else "") + json.dumps(mục))
+        f.write("]")
+
+def đo(chế_độ: str, đường_dẫn: str) -> dict:
+    """Chạy một chế độ trong tiến trình hiện tại và trả về số liệu"""
+    bắt_đầu = time.perf_counter()
+    số_bản_ghi = 0
+    if chế_độ == "toàn_bộ":
+        with open(đường_dẫn, "r", encoding="utf-8") as f:
+            dữ_liệu = json.load(f)
+        for hợp_đồng in phân_tích_dữ_liệu_hợp_đồng_tương_lai(dữ_liệu).values():
+            chấm_điểm_dữ_liệu_hợp_đồng_tương_lai(hợp_đồng)
+            số_bản_ghi += 1
+    else:
+        for hợp_đồng in đọc_hợp_đồng_theo_luồng(đường_dẫn):
+            chấm_điểm_dữ_liệu_hợp_đồng_tương_lai(hợp_đồng)
+            số_bản_ghi += 1
+    thời_gian = time.perf_counter() - bắt_đầu
+    return {
+        "chế_độ": chế_độ,
+        "số_bản_ghi": số_bản_ghi,
+        "thời_gian": thời_gian,
+        "rss_đỉnh_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark đọc toàn bộ vs đọc luồng dữ liệu hợp đồng tương lai")
+    parser.add_argument("--số-bản-ghi", type=int, default=1_000_000)
+    parser.add_argument("--chế-độ", choices=["toàn_bộ", "luồng"], help=argparse.SUPPRESS)
+    parser.add_argument("--file", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.chế_độ:
+        print(json.dumps(đo(args.chế_độ, args.file)))
+        return
+
+    with tempfile.TemporaryDirectory() as thư_mục:
+        đường_dẫn = os.path.join(thư_mục, "futures.json")
+        sinh_file(đường_dẫn, args.số_bản_ghi)
+        kích_thước_mb = os.path.getsize(đường_dẫn) / 1024 / 1024
+        print(f"File đầu vào: {args.số_bản_ghi} bản ghi, {kích_thước_mb:.1f} MB")
+        print(f"{'Chế độ':<10} {'Thời gian (s)':>14} {'Bản ghi/s':>12} {'RSS đỉnh (MB)':>14}")
+        print("-" * 54)
+        for chế_độ in ("toàn_bộ", "luồng"):
+            đầu_ra = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_futures_stream", "--chế-độ", chế_độ, "--file", đường_dẫn],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            kq = json.loads(đầu_ra.strip().splitlines()[-1])
+            print(f"{chế_độ:<10} {kq['thời_gian']:>14.2f} {kq['số_bản_ghi'] / kq['thời_gian']:>12,.0f} {kq['rss_đỉnh_mb']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark thời gian nhập module khi khởi động
+--------------------
+Chạy từng kịch bản trong tiến trình mới với python -X importtime, cộng thời gian nhập
+của các module cấp cao nhất và liệt kê module đã nạp:
+- cli_chấm_điểm / cli_đọc_luồng: CLI chấm điểm chỉ ghi JSON/NDJSON, không khóa API
+- dashboard_*: các lệnh import cấp module của trang Streamlit (trừ chính streamlit)
+Thoát với mã 1 nếu kịch bản nạp module bị cấm (pandas, numpy, pyarrow, streamlit, thư viện
+vẽ, requests...) hoặc vượt --ngân-sách-ms; kiểm tra module bị cấm chạy trong pytest ở
+tests/test_import_time.py.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_import_time --ngân-sách-ms 150
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+THƯ_MỤC_GỐC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+THƯ_VIỆN_NẶNG = {"pandas", "numpy", "pyarrow", "streamlit", "matplotlib", "seaborn", "plotly"}
+# Không có khóa API: CLI chỉ dùng dữ liệu mẫu nên không cần requests
+CẤM_CLI = THƯ_VIỆN_NẶNG | {"requests", "urllib3"}
+# Trang dashboard chỉ nạp pandas khi vẽ bảng, requests khi thật sự lấy dữ liệu
+CẤM_DASHBOARD = (THƯ_VIỆN_NẶNG - {"streamlit"}) | {"requests", "urllib3"}
+
+def _lệnh_import_cấp_module(đường_dẫn: str) -> str:
+    """Mã Python chỉ gồm các lệnh import cấp module của một trang, bỏ streamlit"""
+    with open(đường_dẫn, encoding="utf-8") as f:
+        cây = ast.parse(f.read())
+    các_module = []
+    for nút in cây.body:
+        if isinstance(nút, ast.Import):
+            các_module.extend(tên.name for tên in nút.names)
+        elif isinstance(nút, ast.ImportFrom) and nút.module:
+            các_module.append(nút.module)
+    return "; ".join(f"import {m}" for m in các_module if m.split(".")[0] != "streamlit")
+
+def đo(lệnh: list, môi_trường: dict):
+    """(tổng ms nhập module cấp cao nhất, tập module đã nạp) của một lần chạy"""
+    kết_quả = subprocess.run([sys.executable, "-X", "importtime"] + lệnh, cwd=THƯ_MỤC_GỐC, env=môi_trường,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    tổng_us = 0
+    các_module = set()
+    for dòng in kết_quả.stderr.splitlines():
+        if not dòng.startswith("import time:") or "self [us]" in dòng:
+            continue
+        _, tích_lũy, tên = dòng[len("import time:"):].split("|")
+        if not tên.startswith("  "):
+            tổng_us += int(tích_lũy)
+        các_module.add(tên.strip())
+    return tổng_us / 1000, các_module
+
+def module_bị_cấm(các_module: set, bị_cấm: set) -> list:
+    """Các module đã nạp thuộc một gói bị cấm"""
+    return sorted(m for m in các_module if m.split(".")[0] in bị_cấm)
+
+def môi_trường_không_khóa() -> dict:
+    """Biến môi trường cho tiến trình con: không khóa API, không bộ nhớ đệm/metrics trên đĩa"""
+    môi_trường = dict(os.environ, PYTHONPATH=THƯ_MỤC_GỐC, PYTHONDONTWRITEBYTECODE="")
+    for khóa in ("LUNARCRUSH_API_KEY", "CRYPTOPANIC_TOKEN", "NEWSAPI_KEY", "FRED_API_KEY", "CACHE_DB",
+                 "METRICS_PROM_FILE"):
+        môi_trường[khóa] = ""
+    return môi_trường
+
+def các_kịch_bản(thư_mục: str, số_coin: int) -> list:
+    """(tên, lệnh, module bị cấm, áp ngân sách) của từng kịch bản; file đầu vào/đầu ra nằm trong thư_mục"""
+    đầu_vào = os.path.join(thư_mục, "dau_vao.json")
+    with open(đầu_vào, "w", encoding="utf-8") as f:
+        json.dump([{"p": f"C{i}-USDT-PERP", "sm": {"24h": i - 25, "7d": 70}, "st": {"24h": "bullish"}}
+                   for i in range(số_coin)], f)
+    cli = ["alpha_signal_checker_plus.py", "--file-đầu-vào", đầu_vào]
+    return [
+        ("cli_chấm_điểm", cli + ["--file-đầu-ra", os.path.join(thư_mục, "kq.json")], CẤM_CLI, True),
+        ("cli_đọc_luồng", cli + ["--đọc-luồng", "--file-đầu-ra", os.path.join(thư_mục, "kq.ndjson")],
+         CẤM_CLI, True),
+        ("dashboard_tổng_quan", ["-c", _lệnh_import_cấp_module(os.path.join(THƯ_MỤC_GỐC, "Home.py"))],
+         CẤM_DASHBOARD, False),
+        ("dashboard_chi_tiết", ["-c", _lệnh_import_cấp_module(os.path.join(THƯ_MỤC_GỐC, "1_Sentiment_Detail.py"))],
+         CẤM_DASHBOARD, False),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo thời gian nhập module và kiểm tra module nặng bị cấm")
+    parser.add_argument("--số-lần", type=int, default=5)
+    parser.add_argument("--số-coin", type=int, default=50)
+    parser.add_argument("--ngân-sách-ms", type=float, default=None,
+                        help="Thất bại nếu trung vị thời gian nhập của một kịch bản CLI vượt ngưỡng này")
+    args = parser.parse_args()
+
+    môi_trường = môi_trường_không_khóa()
+    with tempfile.TemporaryDirectory() as thư_mục:
+        lỗi = []
+        print(f"{'Kịch bản':<22} {'Nhập (ms, trung vị)':>20} {'Tối thiểu':>10} {'Số module':>10}  Module nặng")
+        print("-" * 90)
+        for tên, lệnh, bị_cấm, theo_ngân_sách in các_kịch_bản(thư_mục, args.số_coin):
+            các_lần = [đo(lệnh, môi_trường) for _ in range(args.số_lần)]
+            thời_gian = [ms for ms, _ in các_lần]
+            các_module = các_lần[-1][1]
+            vi_phạm = module_bị_cấm(các_module, bị_cấm)
+            trung_vị = statistics.median(thời_gian)
+            print(f"{tên:<22} {trung_vị:>20.1f} {min(thời_gian):>10.1f} {len(các_module):>10}  "
+                  f"{', '.join(sorted({m.split('.')[0] for m in vi_phạm})) or '-'}")
+            if vi_phạm:
+                lỗi.append(f"{tên}: nạp module bị cấm {sorted({m.split('.')[0] for m in vi_phạm})}")
+            if theo_ngân_sách and args.ngân_sách_ms is not None and trung_vị > args.ngân_sách_ms:
+                lỗi.append(f"{tên}: {trung_vị:.1f} ms vượt ngân sách {args.ngân_sách_ms:.1f} ms")
+
+    if lỗi:
+        print("\n❌ " + "\n❌ ".join(lỗi))
+        sys.exit(1)
+    print("\n✅ Không kịch bản nào nạp module bị cấm")
+
+if __name__ == "__main__":
+    main()
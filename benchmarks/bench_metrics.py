@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark chi phí đo lường
+--------------------
+Chấm điểm N hợp đồng tổng hợp qua đường của CLI (chấm_điểm_hợp_đồng, dữ liệu mẫu,
+không mạng) khi tắt và bật đo từng mã (--profile), rồi:
+- kiểm tra kết quả giống hệt nhau, số lần quan sát từng_mã bằng số mã
+- in chi phí mỗi lần ghi vào biểu đồ và phần trăm thời gian thêm của chế độ chi tiết
+- kiểm tra văn bản Prometheus: bucket tích lũy không giảm, +Inf bằng _count
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_metrics --số-coin 20000
+"""
+
+import argparse
+import re
+import time
+
+from alpha_signal_checker_plus import chấm_điểm_hợp_đồng, thống_kê_bổ_sung, tạo_ngữ_cảnh_chạy
+from metrics import ĐO_LƯỜNG, BộĐoLường
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+DÒNG_PROMETHEUS = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-z_]+="([^"\\]|\\.)*",?)*\})? \S+$')
+
+def _chạy(các_hợp_đồng, ngữ_cảnh, chi_tiết: bool):
+    ĐO_LƯỜNG.đặt_lại()
+    ĐO_LƯỜNG.chi_tiết = chi_tiết
+    bắt_đầu = time.perf_counter()
+    kết_quả = list(chấm_điểm_hợp_đồng(các_hợp_đồng, 2.0, ngữ_cảnh))
+    return kết_quả, time.perf_counter() - bắt_đầu
+
+def _kiểm_tra_prometheus(văn_bản: str):
+    bucket = {}
+    đếm = {}
+    for dòng in văn_bản.splitlines():
+        if dòng.startswith("#"):
+            continue
+        assert DÒNG_PROMETHEUS.match(dòng), dòng
+        tên_nhãn, giá_trị = dòng.rsplit(" ", 1)
+        if "_bucket{" in tên_nhãn:
+            chuỗi = tên_nhãn.rsplit(',le="', 1)[0]
+            trước = bucket.get(chuỗi, 0)
+            assert int(giá_trị) >= trước, dòng
+            bucket[chuỗi] = int(giá_trị)
+        elif "_count{" in tên_nhãn:
+            đếm[tên_nhãn.replace("_count{", "_bucket{")[:-1]] = int(giá_trị)
+    assert bucket and all(bucket[k] == đếm[k] for k in bucket), (bucket, đếm)
+
+def main():
+    parser = argparse.ArgumentParser(description="Chi phí của đo lường trên đường chấm điểm CLI")
+    parser.add_argument("--số-coin", type=int, default=20000)
+    parser.add_argument("--số-lần", type=int, default=3)
+    args = parser.parse_args()
+
+    các_hợp_đồng = [a.hợp_đồng for a in sinh_ảnh_chụp(args.số_coin)]
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    # Làm nóng bộ nhớ đệm dữ liệu mẫu để hai chế độ đo cùng một công việc
+    _chạy(các_hợp_đồng, ngữ_cảnh, False)
+
+    thời_gian = {False: [], True: []}
+    for _ in range(args.số_lần):
+        for chi_tiết in (False, True):
+            kết_quả, giây = _chạy(các_hợp_đồng, ngữ_cảnh, chi_tiết)
+            thời_gian[chi_tiết].append(giây)
+            if chi_tiết:
+                kết_quả_chi_tiết = kết_quả
+                số_liệu = ĐO_LƯỜNG.ảnh_chụp()
+            else:
+                kết_quả_thường = kết_quả
+    assert kết_quả_thường == kết_quả_chi_tiết
+    từng_mã = next(m for m in số_liệu["giai_đoạn"] if m["giai_đoạn"] == "từng_mã")
+    assert từng_mã["số_lần"] == args.số_coin and len(số_liệu["mã_chậm_nhất"]) == ĐO_LƯỜNG.số_mã_chậm_nhất
+    _kiểm_tra_prometheus(ĐO_LƯỜNG.sang_prometheus(thống_kê_bổ_sung()))
+    ĐO_LƯỜNG.chi_tiết = False
+
+    # Chi phí thô của một lần ghi, trên một sổ riêng
+    sổ = BộĐoLường()
+    số_lần_ghi = 200000
+    bắt_đầu = time.perf_counter()
+    for i in range(số_lần_ghi):
+        sổ.ghi("chấm_điểm", i * 1e-7)
+    us_ghi = (time.perf_counter() - bắt_đầu) / số_lần_ghi * 1e6
+    bắt_đầu = time.perf_counter()
+    for i in range(số_lần_ghi):
+        sổ.ghi_mã("C", i * 1e-7)
+    us_ghi_mã = (time.perf_counter() - bắt_đầu) / số_lần_ghi * 1e6
+
+    thường, chi_tiết = min(thời_gian[False]), min(thời_gian[True])
+    print(f"{args.số_coin} hợp đồng, tốt nhất trong {args.số_lần} lần")
+    print(f"{'Chế độ':<26} {'Thời gian (s)':>14} {'µs/mã':>8}")
+    print("-" * 50)
+    print(f"{'thường (theo khối)':<26} {thường:>14.3f} {thường / args.số_coin * 1e6:>8.2f}")
+    print(f"{'chi tiết (--profile)':<26} {chi_tiết:>14.3f} {chi_tiết / args.số_coin * 1e6:>8.2f}")
+    print(f"\nChế độ chi tiết thêm {(chi_tiết / thường - 1) * 100:.1f}%; "
+          f"mỗi lần ghi biểu đồ {us_ghi:.2f} µs, ghi_mã {us_ghi_mã:.2f} µs")
+    print("Kết quả giống hệt khi bật/tắt đo chi tiết; văn bản Prometheus hợp lệ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark các định dạng đầu ra kết quả
+--------------------
+Với N kết quả (mặc định 10k coin), đo cho mỗi định dạng, có và không có chế độ gọn:
+- thời gian ghi (ghi từng kết quả + đóng file)
+- kích thước file
+- thời gian đọc lại (đọc_kết_quả)
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_output_formats --số-coin 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from alpha_signal_checker_plus import tạo_ngữ_cảnh_chạy
+from benchmarks.bench_result_memory import sinh_kết_quả
+from result_writers import ĐỊNH_DẠNG, tạo_bộ_ghi, đọc_kết_quả
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh thời gian ghi, kích thước và thời gian đọc lại của các định dạng đầu ra")
+    parser.add_argument("--số-coin", type=int, default=10000)
+    args = parser.parse_args()
+
+    # Nạp trước pyarrow để thời gian import không tính vào lần ghi parquet đầu tiên
+    import pyarrow.parquet  # noqa: F401
+
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    các_kết_quả = list(sinh_kết_quả(args.số_coin, ngữ_cảnh))
+
+    print(f"{'Định dạng':<14} {'Ghi (s)':>9} {'Kích thước (MB)':>16} {'Đọc lại (s)':>12}")
+    print("-" * 54)
+    with tempfile.TemporaryDirectory() as thư_mục:
+        for định_dạng in ĐỊNH_DẠNG:
+            for gọn in (False, True):
+                đường_dẫn = os.path.join(thư_mục, f"kết_quả_{định_dạng}_{int(gọn)}")
+
+                bắt_đầu = time.perf_counter()
+                bộ_ghi = tạo_bộ_ghi(đường_dẫn, định_dạng, gọn)
+                for kq in các_kết_quả:
+                    bộ_ghi.ghi(kq)
+                bộ_ghi.đóng()
+                thời_gian_ghi = time.perf_counter() - bắt_đầu
+
+                bắt_đầu = time.perf_counter()
+                đọc_kết_quả(đường_dẫn, định_dạng)
+                thời_gian_đọc = time.perf_counter() - bắt_đầu
+
+                tên = định_dạng + (" (gọn)" if gọn else "")
+                kích_thước_mb = os.path.getsize(đường_dẫn) / 1024 / 1024
+                print(f"{tên:<14} {thời_gian_ghi:>9.3f} {kích_thước_mb:>16.2f} {thời_gian_đọc:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark bộ giới hạn tốc độ theo nhà cung cấp
+--------------------
+Server giả lập cục bộ áp quota riêng cho /lunarcrush và /cryptopanic (xô token
+phía server), vượt quota thì trả 429 kèm Retry-After. Chạy lấy_đồng_thời cho N
+coin hai lần:
+- không_giới_hạn: mọi luồng bắn thẳng vào server
+- có_giới_hạn:    đăng ký xô token theo đúng quota trong BỘ_GIỚI_HẠN
+và so sánh thời gian, số 429, số yêu cầu thất bại, độ sâu hàng đợi và thời gian
+bị điều tiết. Thứ tự hoàn thành được đối chiếu với hạng vốn hóa.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_rate_limit --số-coin 500 --quota-mỗi-giây 50
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+from alpha_signal_checker_plus import _yêu_cầu_an_toàn
+from benchmarks.bench_fetch_engine import _ServerGiảLập
+from fetch_engine import NhàCungCấp, lấy_đồng_thời
+from http_session import THỐNG_KÊ, lấy_thống_kê
+from rate_limiter import BỘ_GIỚI_HẠN, XôToken, lấy_thống_kê as lấy_thống_kê_giới_hạn
+
+class _BộXửLýCóQuota(BaseHTTPRequestHandler):
+    quota = {}
+    độ_trễ = 0.01
+
+    def do_GET(self):
+        if not self.quota[self.path.split("?")[0]].thử_lấy():
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        time.sleep(self.độ_trễ)
+        nội_dung = json.dumps({"đường_dẫn": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+    def log_message(self, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lấy dữ liệu khi nhà cung cấp giới hạn tốc độ")
+    parser.add_argument("--số-coin", type=int, default=500)
+    parser.add_argument("--quota-mỗi-giây", type=float, default=50.0, help="Quota mỗi nhà cung cấp của server giả lập")
+    parser.add_argument("--đồng-thời", type=int, default=16, help="Giới hạn đồng thời mỗi nhà cung cấp")
+    args = parser.parse_args()
+
+    _BộXửLýCóQuota.quota = {
+        đường_dẫn: XôToken(đường_dẫn, args.quota_mỗi_giây * 60, tức_thời=5)
+        for đường_dẫn in ("/lunarcrush", "/cryptopanic")
+    }
+    server = _ServerGiảLập(("127.0.0.1", 0), _BộXửLýCóQuota)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gốc = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thứ_tự_cấp = []
+    khóa = threading.Lock()
+
+    def tạo_hàm_lấy(đường_dẫn):
+        def hàm_lấy(mã):
+            kết_quả = _yêu_cầu_an_toàn(f"{gốc}{đường_dẫn}", {"symbol": mã})
+            with khóa:
+                thứ_tự_cấp.append(int(mã[1:]))
+            return kết_quả
+        return hàm_lấy
+
+    các_nhà_cung_cấp = [
+        NhàCungCấp("mạng_xã_hội", tạo_hàm_lấy("/lunarcrush"), args.đồng_thời),
+        NhàCungCấp("tin_tức", tạo_hàm_lấy("/cryptopanic"), args.đồng_thời),
+    ]
+    các_mã = [f"C{i}" for i in range(args.số_coin)]
+
+    print(f"{args.số_coin} coin x 2 nhà cung cấp, quota {args.quota_mỗi_giây:.0f} yêu cầu/s mỗi nhà cung cấp "
+          f"(tối thiểu {args.số_coin / args.quota_mỗi_giây:.1f}s)")
+    print(f"{'Chế độ':<16} {'Thời gian (s)':>14} {'Số 429':>8} {'Thất bại':>9}")
+    print("-" * 50)
+    try:
+        for chế_độ in ("không_giới_hạn", "có_giới_hạn"):
+            if chế_độ == "có_giới_hạn":
+                for đường_dẫn in ("/lunarcrush", "/cryptopanic"):
+                    BỘ_GIỚI_HẠN.đăng_ký(đường_dẫn, [f"{gốc}{đường_dẫn}"], args.quota_mỗi_giây * 60, tức_thời=5)
+            # Server bắt đầu mỗi chế độ với quota đầy
+            time.sleep(1.0)
+            THỐNG_KÊ.đặt_lại()
+            thứ_tự_cấp.clear()
+
+            bắt_đầu = time.perf_counter()
+            kết_quả = lấy_đồng_thời(các_mã, các_nhà_cung_cấp)
+            thời_gian = time.perf_counter() - bắt_đầu
+
+            thất_bại = sum(1 for theo_mã in kết_quả for giá_trị in theo_mã.values() if giá_trị is None)
+            print(f"{chế_độ:<16} {thời_gian:>14.2f} {lấy_thống_kê()['bị_giới_hạn']:>8} {thất_bại:>9}")
+
+        # Coin hạng cao phải xong trước: hạng trung bình của 10% coin hoàn thành đầu tiên
+        mười_phần_trăm = thứ_tự_cấp[:max(1, len(thứ_tự_cấp) // 10)]
+        print(f"Hạng trung bình của 10% lệnh gọi hoàn thành đầu tiên: {sum(mười_phần_trăm) / len(mười_phần_trăm):.1f}")
+        for tên, thống_kê in lấy_thống_kê_giới_hạn().items():
+            if tên.startswith("/"):
+                print(f"{tên}: {thống_kê}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
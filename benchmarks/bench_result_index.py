@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark chỉ mục kết quả
+--------------------
+Chấm điểm N coin tổng hợp (ảnh chụp của tests/du_lieu_mau.py), rồi so sánh với
+cách làm trước đây và kiểm tra cho cùng kết quả:
+- top 5 MUA/BÁN mạnh: sắp xếp cả danh sách vs ĐỉnhK theo luồng vs ChỉMụcKếtQuả
+- tra một mã: df[df["mã"] == mã].iloc[0] vs df.iloc[chỉ_mục.vị_trí(mã)]
+- lọc theo tín hiệu chính: mặt nạ trên DataFrame vs nhóm dựng sẵn
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_result_index --số-coin 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+from alpha_signal_checker_plus import chấm_điểm_ảnh_chụp
+from result_index import ChỉMụcKếtQuả, ĐỉnhK
+from result_table import BảngKếtQuả
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def _đo(hàm, số_lần: int = 1):
+    """(kết quả lần gọi cuối, ms trung bình mỗi lần)"""
+    bắt_đầu = time.perf_counter()
+    for _ in range(số_lần):
+        kết_quả = hàm()
+    return kết_quả, (time.perf_counter() - bắt_đầu) / số_lần * 1000
+
+def _top_sắp_xếp(các_kết_quả):
+    mua = [k for k in các_kết_quả if k.độ_tin_cậy == "CAO" and k.tín_hiệu_chính == "MUA"]
+    bán = [k for k in các_kết_quả if k.độ_tin_cậy == "CAO" and k.tín_hiệu_chính == "BÁN"]
+    return ([k.mã for k in sorted(mua, key=lambda x: x.điểm_ròng, reverse=True)[:5]],
+            [k.mã for k in sorted(bán, key=lambda x: x.điểm_ròng)[:5]])
+
+def _top_đỉnh_k(các_kết_quả):
+    mua = ĐỉnhK(5, khóa=lambda x: x.điểm_ròng)
+    bán = ĐỉnhK(5, khóa=lambda x: x.điểm_ròng, lớn_nhất=False)
+    for k in các_kết_quả:
+        if k.độ_tin_cậy == "CAO":
+            if k.tín_hiệu_chính == "MUA":
+                mua.thêm(k)
+            elif k.tín_hiệu_chính == "BÁN":
+                bán.thêm(k)
+    return [k.mã for k in mua.kết_quả()], [k.mã for k in bán.kết_quả()]
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh xếp hạng/tra cứu/lọc có và không có chỉ mục")
+    parser.add_argument("--số-coin", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'Số coin':>8} {'Thao tác':<24} {'Trước (ms)':>11} {'Chỉ mục (ms)':>13} {'Nhanh hơn':>10}")
+    print("-" * 72)
+    for số_coin in args.số_coin:
+        các_kết_quả = [chấm_điểm_ảnh_chụp(a, 1.0) for a in sinh_ảnh_chụp(số_coin)]
+        bảng = BảngKếtQuả.từ_kết_quả(các_kết_quả)
+        df = bảng.sang_dataframe()
+        chỉ_mục, ms_lập = _đo(lambda: ChỉMụcKếtQuả(bảng))
+        rng = random.Random(1)
+        các_mã = [rng.choice(bảng.mã) for _ in range(50)]
+
+        top_cũ, ms_cũ = _đo(lambda: _top_sắp_xếp(các_kết_quả), 5)
+        top_luồng, ms_luồng = _đo(lambda: _top_đỉnh_k(các_kết_quả), 5)
+        top_mục, ms_mục = _đo(lambda: (chỉ_mục.mã_của(chỉ_mục.top_mua(5, "CAO")),
+                                       chỉ_mục.mã_của(chỉ_mục.top_bán(5, "CAO"))), 5)
+        assert top_cũ == top_luồng == top_mục, (top_cũ, top_luồng, top_mục)
+
+        for mã in các_mã:
+            assert df[df["mã"] == mã].iloc[0].equals(df.iloc[chỉ_mục.vị_trí(mã)])
+        _, ms_tra_cũ = _đo(lambda: [df[df["mã"] == mã].iloc[0] for mã in các_mã])
+        _, ms_tra_mục = _đo(lambda: [df.iloc[chỉ_mục.vị_trí(mã)] for mã in các_mã])
+
+        lọc_cũ, ms_lọc_cũ = _đo(lambda: df["mã"][df["tín_hiệu_chính"] == "MUA"].tolist(), 5)
+        lọc_mục, ms_lọc_mục = _đo(lambda: chỉ_mục.mã_của(chỉ_mục.nhóm(tín_hiệu_chính="MUA")), 5)
+        assert lọc_cũ == lọc_mục
+
+        for thao_tác, trước, sau in (
+            ("top 5 MUA/BÁN (luồng)", ms_cũ, ms_luồng),
+            ("top 5 MUA/BÁN (chỉ mục)", ms_cũ, ms_mục),
+            ("tra 1 mã", ms_tra_cũ / len(các_mã), ms_tra_mục / len(các_mã)),
+            ("lọc tín hiệu MUA", ms_lọc_cũ, ms_lọc_mục),
+        ):
+            print(f"{số_coin:>8} {thao_tác:<24} {trước:>11.3f} {sau:>13.3f} {trước / sau:>9.1f}x")
+        print(f"{số_coin:>8} {'lập chỉ mục (một lần)':<24} {'':>11} {ms_lập:>13.3f}")
+    print("Top-K, tra cứu và lọc qua chỉ mục cho kết quả giống hệt cách cũ")
+
+if __name__ == "__main__":
+    main()
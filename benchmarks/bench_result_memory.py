@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark bộ nhớ cho mỗi coin của các cách lưu kết quả
+--------------------
+Dùng tracemalloc để đo số byte còn giữ lại cho mỗi coin khi lưu N kết quả:
+- list_asdict:  list các dict asdict(kq) (cách Home.py dựng DataFrame trước đây)
+- list_kết_quả: list KếtQuảTínHiệu (slots, thành phần vĩ mô dùng chung)
+- bảng_cột:     BảngKếtQuả dạng struct-of-arrays
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_result_memory --số-coin 10000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import asdict
+
+from alpha_signal_checker_plus import (
+    DữLiệuHợpĐồngTươngLai,
+    phân_tích_mã,
+    tạo_ngữ_cảnh_chạy,
+    tính_đà_dòng_tiền,
+    xác_định_xu_hướng_dòng_tiền,
+)
+from result_table import BảngKếtQuả
+
+def sinh_kết_quả(số_coin: int, ngữ_cảnh):
+    """Sinh kết quả với dữ liệu hợp đồng khác nhau cho mỗi coin"""
+    rng = random.Random(5)
+    for i in range(số_coin):
+        mã = f"C{i}"
+        hợp_đồng = DữLiệuHợpĐồngTươngLai(
+            mã=mã,
+            dòng_tiền_ròng_24h=rng.uniform(-5e6, 5e6),
+            dòng_tiền_ròng_7ngày=rng.uniform(-5e6, 5e6),
+            khối_lượng_cân_bằng=rng.uniform(0, 5e6),
+            tâm_lý_thị_trường=rng.choice(["BULL", "BEAR", "NEUTRAL"]),
+        )
+        hợp_đồng.đà_dòng_tiền = tính_đà_dòng_tiền(hợp_đồng)
+        hợp_đồng.xu_hướng_dòng_tiền = xác_định_xu_hướng_dòng_tiền(hợp_đồng)
+        yield phân_tích_mã(mã, {mã: hợp_đồng}, 2.0, ngữ_cảnh)
+
+def đo_byte(hàm_dựng, số_coin: int, ngữ_cảnh) -> float:
+    gc.collect()
+    tracemalloc.start()
+    giữ_lại = hàm_dựng(sinh_kết_quả(số_coin, ngữ_cảnh))
+    gc.collect()
+    hiện_tại, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del giữ_lại
+    return hiện_tại / số_coin
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh byte/coin giữa các cách lưu kết quả")
+    parser.add_argument("--số-coin", type=int, default=10000)
+    args = parser.parse_args()
+
+    # Làm nóng bộ nhớ đệm nhà cung cấp và ngữ cảnh để không tính vào phép đo
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    for _ in sinh_kết_quả(args.số_coin, ngữ_cảnh):
+        pass
+
+    cách_lưu = {
+        "list_asdict": lambda kq: [asdict(k) for k in kq],
+        "list_kết_quả": list,
+        "bảng_cột": BảngKếtQuả.từ_kết_quả,
+    }
+    print(f"{'Cách lưu':<14} {'Byte/coin':>10}")
+    print("-" * 26)
+    for tên, hàm_dựng in cách_lưu.items():
+        print(f"{tên:<14} {đo_byte(hàm_dựng, args.số_coin, ngữ_cảnh):>10,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark ghi nhớ điểm thành phần
+--------------------
+So sánh chi phí chấm điểm mỗi coin khi tắt / bật BỘ_GHI_NHỚ_ĐIỂM (score_memo.py):
+- tổng_hợp_điểm: chỉ các bộ chấm điểm, trên ảnh chụp dữ liệu mẫu và ảnh chụp ngẫu nhiên
+- đường CLI: chấm_điểm_hợp_đồng đầy đủ (lấy dữ liệu mẫu, dựng ảnh chụp, kết quả)
+- ngẫu nhiên: mọi thành phần khác nhau (tests/du_lieu_mau.py), trường hợp xấu nhất của bộ nhớ
+Lạnh: bộ nhớ trống; ấm: chấm lại cùng dữ liệu (dashboard đổi trọng số, tiến trình nền chấm
+lại giữa các lần làm mới). Kiểm tra kết quả giống hệt và đếm số đối tượng chuỗi tín hiệu.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_score_memo --số-coin 2000
+"""
+
+import argparse
+import time
+
+from alpha_signal_checker_plus import (
+    BỘ_GHI_NHỚ_ĐIỂM,
+    chấm_điểm_hợp_đồng,
+    chấm_điểm_ảnh_chụp,
+    lấy_dữ_liệu_lô,
+    tạo_ngữ_cảnh_chạy,
+    tạo_ảnh_chụp,
+    tổng_hợp_điểm,
+)
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def _đo(hàm, số_lần: int):
+    """(kết quả, thời gian tốt nhất) của hàm()"""
+    tốt_nhất = float("inf")
+    for _ in range(số_lần):
+        bắt_đầu = time.perf_counter()
+        kết_quả = hàm()
+        tốt_nhất = min(tốt_nhất, time.perf_counter() - bắt_đầu)
+    return kết_quả, tốt_nhất
+
+def _số_chuỗi(các_kết_quả) -> int:
+    """Số đối tượng chuỗi tín hiệu/cảnh báo khác nhau (KếtQuảTínHiệu hoặc tuple của tổng_hợp_điểm)"""
+    return len({id(c) for kq in các_kết_quả
+                for c in (kq.tín_hiệu + kq.cảnh_báo if hasattr(kq, "tín_hiệu") else kq[3] + kq[4])})
+
+def main():
+    parser = argparse.ArgumentParser(description="Chi phí chấm điểm mỗi coin khi tắt / bật ghi nhớ điểm")
+    parser.add_argument("--số-coin", type=int, default=2000)
+    parser.add_argument("--số-lần", type=int, default=5)
+    parser.add_argument("--dung-lượng", type=int, default=None,
+                        help="Số mục ghi nhớ mỗi thành phần (mặc định SCORE_MEMO_SIZE); nhỏ hơn số coin thì chấm lại không trúng")
+    args = parser.parse_args()
+
+    dung_lượng = args.dung_lượng or BỘ_GHI_NHỚ_ĐIỂM.dung_lượng
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    ảnh_chụp_ngẫu_nhiên = sinh_ảnh_chụp(args.số_coin)
+    các_hợp_đồng = [a.hợp_đồng for a in ảnh_chụp_ngẫu_nhiên]
+    # Ảnh chụp dữ liệu mẫu như đường CLI, dựng sẵn để chỉ đo bộ chấm điểm
+    dữ_liệu = lấy_dữ_liệu_lô([h.mã for h in các_hợp_đồng], ngữ_cảnh)
+    ảnh_chụp_mẫu = [tạo_ảnh_chụp(h.mã, {tên: theo_mã.get(h.mã) for tên, theo_mã in dữ_liệu.items()}, h, ngữ_cảnh)
+                    for h in các_hợp_đồng]
+
+    kịch_bản = {
+        "tổng_hợp_điểm, mẫu": lambda: [tổng_hợp_điểm(a) for a in ảnh_chụp_mẫu],
+        "tổng_hợp_điểm, ngẫu nhiên": lambda: [tổng_hợp_điểm(a) for a in ảnh_chụp_ngẫu_nhiên],
+        "đường CLI (dữ liệu mẫu)": lambda: list(chấm_điểm_hợp_đồng(các_hợp_đồng, 2.0, ngữ_cảnh)),
+        "ngẫu nhiên": lambda: [chấm_điểm_ảnh_chụp(a) for a in ảnh_chụp_ngẫu_nhiên],
+    }
+    print(f"{args.số_coin} coin, tốt nhất trong {args.số_lần} lần; dung lượng ghi nhớ {dung_lượng}")
+    print(f"{'Kịch bản':<26} {'Tắt (µs/coin)':>14} {'Bật, lạnh':>10} {'Bật, ấm':>9} {'Trúng (lạnh)':>12} {'Chuỗi tắt/bật':>16}")
+    print("-" * 92)
+    for tên, hàm in kịch_bản.items():
+        BỘ_GHI_NHỚ_ĐIỂM.dung_lượng = 0
+        kq_tắt, t_tắt = _đo(hàm, args.số_lần)
+
+        BỘ_GHI_NHỚ_ĐIỂM.dung_lượng = dung_lượng
+        BỘ_GHI_NHỚ_ĐIỂM.xóa()
+        hàm()
+        thống_kê = BỘ_GHI_NHỚ_ĐIỂM.lấy_thống_kê()
+        t_lạnh = float("inf")
+        for _ in range(args.số_lần):
+            BỘ_GHI_NHỚ_ĐIỂM.xóa()
+            kq_lạnh, t = _đo(hàm, 1)
+            t_lạnh = min(t_lạnh, t)
+        # Ấm: chấm lại khi bộ nhớ đã có các dấu vân tay của lần trước
+        kq_ấm, t_ấm = _đo(hàm, args.số_lần)
+        assert kq_tắt == kq_lạnh == kq_ấm
+
+        n = args.số_coin
+        print(f"{tên:<26} {t_tắt / n * 1e6:>14.2f} {t_lạnh / n * 1e6:>10.2f} {t_ấm / n * 1e6:>9.2f} "
+              f"{thống_kê['tỷ_lệ_trúng']:>12.1%} {_số_chuỗi(kq_tắt):>8}/{_số_chuỗi(kq_lạnh)}")
+    BỘ_GHI_NHỚ_ĐIỂM.dung_lượng = dung_lượng
+    print("\nKết quả giống hệt khi tắt / bật ghi nhớ (lạnh: bộ nhớ trống; ấm: chấm lại cùng dữ liệu)")
+
+if __name__ == "__main__":
+    main()
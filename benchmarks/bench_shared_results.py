@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark kết quả dùng chung qua Arrow IPC
+--------------------
+Công bố N kết quả vào file Arrow IPC (shared_results.py) rồi so sánh hai cách một phiên
+dashboard hiển thị cùng kết quả đó:
+- chấm lại riêng: mỗi phiên chấm điểm lại từ ảnh chụp, dựng BảngKếtQuả, chỉ mục và bảng hiển
+  thị (sang_dataframe như trước, sang_arrow như đường dự phòng hiện tại)
+- dùng chung: phiên giữ tham chiếu tới KếtQuảChung ánh xạ bộ nhớ và chỉ mục đã dựng một lần
+Đo byte giữ lại cho mỗi phiên thêm (tracemalloc + bộ cấp phát Arrow), bộ nhớ riêng (Anonymous,
+/proc/self/smaps_rollup) của một tiến trình con chỉ làm một việc, và độ trễ một lần vẽ trang.
+Kiểm tra dòng dựng lại, chỉ mục và các cột giống hệt kết quả gốc.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_shared_results --số-coin 2000
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from alpha_signal_checker_plus import chấm_điểm_ảnh_chụp
+from result_index import ChỉMụcKếtQuả
+from result_table import BảngKếtQuả
+from shared_results import KếtQuảChung, công_bố_kết_quả_chung, phiên_bản_tệp
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def _đo(hàm, số_lần: int):
+    """(kết quả, thời gian tốt nhất) của hàm()"""
+    tốt_nhất = float("inf")
+    for _ in range(số_lần):
+        bắt_đầu = time.perf_counter()
+        kết_quả = hàm()
+        tốt_nhất = min(tốt_nhất, time.perf_counter() - bắt_đầu)
+    return kết_quả, tốt_nhất
+
+def _byte_giữ_lại(hàm_dựng, số_phiên: int) -> float:
+    """Byte trung bình còn giữ cho mỗi phiên sau số_phiên lần hàm_dựng() (Python + bộ cấp phát Arrow)"""
+    import pyarrow as pa
+
+    gc.collect()
+    arrow_trước = pa.total_allocated_bytes()
+    tracemalloc.start()
+    các_phiên = [hàm_dựng() for _ in range(số_phiên)]
+    gc.collect()
+    python, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow = pa.total_allocated_bytes() - arrow_trước
+    del các_phiên
+    return (python + arrow) / số_phiên
+
+def _bộ_nhớ_riêng() -> int:
+    """Byte bộ nhớ ẩn danh (không chia sẻ qua page cache) của tiến trình hiện tại"""
+    with open("/proc/self/smaps_rollup") as f:
+        for dòng in f:
+            if dòng.startswith("Anonymous:"):
+                return int(dòng.split()[1]) * 1024
+    return 0
+
+def _tiến_trình_con(chế_độ: str, số_coin: int, đường_dẫn: str):
+    """Một phiên trong tiến trình riêng: in byte bộ nhớ ẩn danh tăng thêm để hiển thị kết quả"""
+    các_ảnh_chụp = sinh_ảnh_chụp(số_coin) if chế_độ == "chấm_lại" else None
+    # Nạp thư viện và làm nóng bộ cấp phát Arrow trước khi đo, như nhau ở cả hai chế độ
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+    pa.table({"x": [1.0]}).to_pandas()
+    gc.collect()
+    trước = _bộ_nhớ_riêng()
+    if chế_độ == "chấm_lại":
+        bảng = BảngKếtQuả.từ_kết_quả([chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp])
+        giữ = (bảng, ChỉMụcKếtQuả(bảng), bảng.sang_arrow())
+    else:
+        kết_quả_chung = KếtQuảChung.mở(đường_dẫn)
+        giữ = (kết_quả_chung, ChỉMụcKếtQuả(kết_quả_chung))
+    gc.collect()
+    print(json.dumps({"byte": _bộ_nhớ_riêng() - trước, "số_dòng": len(giữ[0])}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Bộ nhớ và độ trễ mỗi phiên: chấm lại riêng / kết quả Arrow dùng chung")
+    parser.add_argument("--số-coin", type=int, default=2000)
+    parser.add_argument("--số-phiên", type=int, default=8)
+    parser.add_argument("--số-lần", type=int, default=5)
+    parser.add_argument("--con", nargs=2, metavar=("CHẾ_ĐỘ", "ĐƯỜNG_DẪN"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.con:
+        _tiến_trình_con(args.con[0], args.số_coin, args.con[1])
+        return
+
+    các_ảnh_chụp = sinh_ảnh_chụp(args.số_coin)
+    các_kết_quả = [chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp]
+    bảng_gốc = BảngKếtQuả.từ_kết_quả(các_kết_quả)
+    thư_mục = tempfile.mkdtemp()
+    đường_dẫn = os.path.join(thư_mục, "ket_qua_chung.arrow")
+    _, t_công_bố = _đo(lambda: công_bố_kết_quả_chung(bảng_gốc, đường_dẫn, lần_chạy=1), args.số_lần)
+
+    # Kết quả chung giống hệt: cột như sang_arrow, từng dòng dựng lại, chỉ mục
+    kết_quả_chung = KếtQuảChung.mở(đường_dẫn)
+    assert kết_quả_chung.bảng.replace_schema_metadata(None).equals(bảng_gốc.sang_arrow())
+    assert [kết_quả_chung.dòng(i) for i in range(len(các_kết_quả))] == các_kết_quả
+    chỉ_mục_gốc, chỉ_mục_chung = ChỉMụcKếtQuả(bảng_gốc), ChỉMụcKếtQuả(kết_quả_chung)
+    assert chỉ_mục_gốc.thống_kê() == chỉ_mục_chung.thống_kê()
+    assert chỉ_mục_gốc.top_mua(20) == chỉ_mục_chung.top_mua(20)
+    assert chỉ_mục_gốc.top_bán(20) == chỉ_mục_chung.top_bán(20)
+    assert all(chỉ_mục_chung.vị_trí(kq.mã) == chỉ_mục_gốc.vị_trí(kq.mã) for kq in các_kết_quả)
+    cắt = kết_quả_chung.cắt(50)
+    assert [cắt.dòng(i) for i in range(50)] == các_kết_quả[:50]
+
+    def chấm_lại(hiển_thị):
+        bảng = BảngKếtQuả.từ_kết_quả([chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp])
+        chỉ_mục = ChỉMụcKếtQuả(bảng)
+        return bảng, chỉ_mục, hiển_thị(bảng), chỉ_mục.top_mua(5), chỉ_mục.top_bán(5)
+
+    # Dùng chung: mỗi lần vẽ chỉ stat file để lấy phiên bản rồi tra bộ nhớ đệm (st.cache_resource)
+    bộ_nhớ_đệm = {}
+
+    def dùng_chung():
+        khóa = phiên_bản_tệp(đường_dẫn)
+        if khóa not in bộ_nhớ_đệm:
+            kq = KếtQuảChung.mở(đường_dẫn)
+            bộ_nhớ_đệm[khóa] = (kq, ChỉMụcKếtQuả(kq))
+        kq, chỉ_mục = bộ_nhớ_đệm[khóa]
+        return kq.bảng, chỉ_mục, chỉ_mục.top_mua(5), chỉ_mục.top_bán(5)
+
+    def gắn_lạnh():
+        bộ_nhớ_đệm.clear()
+        return dùng_chung()
+
+    dùng_chung()
+    kịch_bản = [
+        ("chấm lại + DataFrame", lambda: chấm_lại(BảngKếtQuả.sang_dataframe)),
+        ("chấm lại + Arrow", lambda: chấm_lại(BảngKếtQuả.sang_arrow)),
+        ("dùng chung, gắn lần đầu", gắn_lạnh),
+        ("dùng chung, đã gắn", dùng_chung),
+    ]
+
+    print(f"{args.số_coin} coin, file công bố {os.path.getsize(đường_dẫn) / 1024:.0f} KiB "
+          f"(ghi {t_công_bố * 1000:.1f} ms); {args.số_phiên} phiên, tốt nhất trong {args.số_lần} lần")
+    print(f"{'Cách hiển thị':<26} {'Vẽ trang (ms)':>14} {'Byte/phiên thêm':>16}")
+    print("-" * 58)
+    for tên, hàm in kịch_bản:
+        _, thời_gian = _đo(hàm, args.số_lần)
+        if tên == "dùng chung, gắn lần đầu":
+            # Chỉ một lần cho mỗi lần công bố, mọi phiên dùng lại
+            byte = _byte_giữ_lại(gắn_lạnh, 1)
+            byte_văn_bản = f"{byte:>14,.0f} *"
+        else:
+            byte_văn_bản = f"{_byte_giữ_lại(hàm, args.số_phiên):>16,.0f}"
+        print(f"{tên:<26} {thời_gian * 1000:>14.2f} {byte_văn_bản}")
+    print("* một lần cho mỗi lần công bố (danh sách mã dạng str và chỉ mục), không phải mỗi phiên")
+
+    print(f"\n{'Tiến trình riêng':<26} {'Bộ nhớ ẩn danh thêm (KiB)':>26}")
+    print("-" * 54)
+    for chế_độ in ("chấm_lại", "dùng_chung"):
+        kết_quả_con = json.loads(subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_shared_results", "--số-coin", str(args.số_coin),
+             "--con", chế_độ, đường_dẫn],
+            check=True, capture_output=True, text=True,
+        ).stdout)
+        assert kết_quả_con["số_dòng"] == args.số_coin
+        print(f"{chế_độ:<26} {kết_quả_con['byte'] / 1024:>26,.0f}")
+
+    os.unlink(đường_dẫn)
+    os.rmdir(thư_mục)
+    print("\nCột, dòng dựng lại và chỉ mục của kết quả chung giống hệt kết quả gốc")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark tiến trình nền và dashboard đọc từ kho
+--------------------
+Server giả lập cục bộ (CoinGecko, LunarCrush, CryptoPanic của bench_batch_fetch) với
+độ trễ mỗi phản hồi. So sánh độ trễ đến khi một phiên dashboard có kết quả:
+- tự_chạy:   phiên tự lấy dữ liệu và chấm điểm (nút "Bắt đầu phân tích", bộ nhớ đệm trống)
+- đọc_kho:   phiên đầu tiên đọc lần chạy mới nhất do TiếnTrìnhNền công bố
+- đọc_chung: phiên tiếp theo dùng lại ảnh chụp đã dựng (st.cache_resource), chỉ chấm điểm lại
+đồng thời kiểm tra kết quả chấm lại từ kho giống hệt kết quả tiến trình nền đã công bố.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_signal_worker --số-coin 500
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from alpha_signal_checker_plus import (
+    BỘ_NHỚ_ĐỆM,
+    CẤU_HÌNH,
+    DữLiệuHợpĐồngTươngLai,
+    chấm_điểm_ảnh_chụp,
+    tạo_ngữ_cảnh_chạy,
+    tạo_ảnh_chụp,
+)
+from benchmarks.bench_batch_fetch import _BộXửLýNhàCungCấp, _bài_của
+from benchmarks.bench_fetch_engine import _ServerGiảLập
+from fetch_engine import lặp_đồng_thời, nhà_cung_cấp_mặc_định
+from signal_worker import THÀNH_PHẦN_NỀN, TiếnTrìnhNền
+from snapshot_store import KhoẢnhChụp
+
+class _BộXửLýCóCoinGecko(_BộXửLýNhàCungCấp):
+    """Thêm /coingecko/markets; đường dẫn khác (fear & greed, TVL) trả 404"""
+    số_coin = 500
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/coingecko/markets":
+            trang = int(parse_qs(url.query)["page"][0])
+            các_coin = [{"symbol": f"c{i}", "current_price": 1.0 + i}
+                        for i in range((trang - 1) * 250, min(trang * 250, self.số_coin))]
+            nội_dung = json.dumps(các_coin).encode("utf-8")
+            self.send_response(200)
+        elif url.path in self.số_yêu_cầu:
+            return super().do_GET()
+        else:
+            nội_dung = b"{}"
+            self.send_response(404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+def _phiên_tự_chạy(số_coin: int, điểm_ròng_tối_thiểu: float):
+    """Như Home.py khi bấm nút: lấy top coin, ngữ cảnh, dữ liệu theo mã rồi chấm điểm"""
+    from alpha_signal_checker_plus import lấy_thị_trường_top_coin
+    các_mã = [coin["mã"] for coin in lấy_thị_trường_top_coin()][:số_coin]
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy(THÀNH_PHẦN_NỀN)
+    kết_quả = [None] * len(các_mã)
+    for vị_trí, mã, dữ_liệu in lặp_đồng_thời(các_mã, nhà_cung_cấp_mặc_định(ngữ_cảnh.các_thành_phần)):
+        ảnh_chụp = tạo_ảnh_chụp(mã, dữ_liệu, DữLiệuHợpĐồngTươngLai(mã=mã), ngữ_cảnh)
+        kết_quả[vị_trí] = chấm_điểm_ảnh_chụp(ảnh_chụp, điểm_ròng_tối_thiểu)
+    return kết_quả
+
+def main():
+    parser = argparse.ArgumentParser(description="Độ trễ dashboard: tự chạy mỗi phiên vs đọc kết quả tiến trình nền")
+    parser.add_argument("--số-coin", type=int, default=500)
+    parser.add_argument("--độ-trễ-ms", type=float, default=10.0)
+    parser.add_argument("--số-phiên", type=int, default=5)
+    args = parser.parse_args()
+
+    các_mã = [f"C{i}" for i in range(args.số_coin)]
+    _BộXửLýCóCoinGecko.số_coin = args.số_coin
+    _BộXửLýCóCoinGecko.tất_cả_bài = _bài_của(các_mã)
+    _BộXửLýCóCoinGecko.độ_trễ = args.độ_trễ_ms / 1000
+    server = _ServerGiảLập(("127.0.0.1", 0), _BộXửLýCóCoinGecko)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gốc = f"http://127.0.0.1:{server.server_address[1]}"
+    CẤU_HÌNH.update({
+        "COINGECKO_MARKETS_URL": f"{gốc}/coingecko/markets",
+        "LUNARCRUSH_API_KEY": "bench-key", "LUNARCRUSH_BASE": f"{gốc}/lunarcrush/",
+        "CRYPTOPANIC_TOKEN": "bench-key", "CRYPTOPANIC_BASE": f"{gốc}/cryptopanic/",
+        "FEAR_GREED_URL": f"{gốc}/fng/", "DEFILLAMA_TVL_URL": f"{gốc}/tvl",
+    })
+    điểm_ròng_tối_thiểu = 2.0
+
+    try:
+        with tempfile.TemporaryDirectory() as thư_mục:
+            kho = KhoẢnhChụp(os.path.join(thư_mục, "lich_su.db"))
+
+            BỘ_NHỚ_ĐỆM.xóa()
+            bắt_đầu = time.perf_counter()
+            _phiên_tự_chạy(args.số_coin, điểm_ròng_tối_thiểu)
+            t_tự_chạy = time.perf_counter() - bắt_đầu
+
+            BỘ_NHỚ_ĐỆM.xóa()
+            tiến_trình = TiếnTrìnhNền(kho, số_coin=args.số_coin, điểm_ròng_tối_thiểu=điểm_ròng_tối_thiểu)
+            bắt_đầu = time.perf_counter()
+            lần_chạy = tiến_trình.chạy_một_vòng()
+            t_vòng_đầy_đủ = time.perf_counter() - bắt_đầu
+            bắt_đầu = time.perf_counter()
+            tiến_trình.làm_mới("tin_tức")
+            tiến_trình.công_bố()
+            t_vòng_tin_tức = time.perf_counter() - bắt_đầu
+            đã_công_bố = tiến_trình.chấm_điểm()
+
+            bắt_đầu = time.perf_counter()
+            mới_nhất = kho.lần_chạy_mới_nhất()
+            _, các_ảnh_chụp = kho.ảnh_chụp_lần_chạy(mới_nhất["id"], THÀNH_PHẦN_NỀN)
+            kết_quả_kho = [chấm_điểm_ảnh_chụp(a, điểm_ròng_tối_thiểu) for a in các_ảnh_chụp]
+            t_đọc_kho = time.perf_counter() - bắt_đầu
+
+            bắt_đầu = time.perf_counter()
+            for _ in range(args.số_phiên):
+                kho.lần_chạy_mới_nhất()
+                [chấm_điểm_ảnh_chụp(a, điểm_ròng_tối_thiểu) for a in các_ảnh_chụp]
+            t_đọc_chung = (time.perf_counter() - bắt_đầu) / args.số_phiên
+            kho.đóng()
+    finally:
+        server.shutdown()
+
+    assert lần_chạy is not None and kết_quả_kho == đã_công_bố
+    print(f"{args.số_coin} coin, độ trễ nhà cung cấp {args.độ_trễ_ms:.0f} ms")
+    print(f"{'Phiên dashboard':<34} {'Độ trễ (s)':>11}")
+    print("-" * 46)
+    print(f"{'tự_chạy (mỗi phiên)':<34} {t_tự_chạy:>11.3f}")
+    print(f"{'đọc_kho (phiên đầu sau công bố)':<34} {t_đọc_kho:>11.3f}")
+    print(f"{'đọc_chung (phiên tiếp theo)':<34} {t_đọc_chung:>11.3f}")
+    print(f"\nTiến trình nền: vòng đầy đủ {t_vòng_đầy_đủ:.2f}s, vòng chỉ làm mới tin tức {t_vòng_tin_tức:.2f}s")
+    print(f"{args.số_phiên} phiên tự chạy: ~{t_tự_chạy * args.số_phiên:.1f}s lấy dữ liệu; "
+          f"dùng chung: một vòng nền + {t_đọc_kho + t_đọc_chung * (args.số_phiên - 1):.2f}s đọc")
+    print("Kết quả chấm lại từ kho giống hệt kết quả tiến trình nền đã công bố")
+
+if __name__ == "__main__":
+    main()
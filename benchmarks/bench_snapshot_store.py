@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark kho ảnh chụp lịch sử
+--------------------
+Ghi các lần chạy cách nhau --chu-kỳ-phút cho N coin trong --số-ngày ngày vào một
+KhoẢnhChụp mới, rồi đo:
+- tốc độ ghi (dòng/s) và kích thước file
+- lịch_sử(mã) theo khoảng thời gian: 1 ngày, 30 ngày, toàn bộ
+- kết_quả_lần_chạy của một lần chạy bất kỳ (đọc cả universe tại một thời điểm)
+Mặc định 30 ngày; một năm (--số-ngày 365) cho 500 coin là ~52 triệu dòng,
+phần cuối in ước lượng cho một năm theo tốc độ ghi đo được.
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_snapshot_store --số-coin 500 --số-ngày 30
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from alpha_signal_checker_plus import tạo_ngữ_cảnh_chạy
+from benchmarks.bench_result_memory import sinh_kết_quả
+from snapshot_store import KhoẢnhChụp
+
+def _đo_truy_vấn(hàm, số_lần: int) -> float:
+    """Thời gian trung bình (ms) của một lần gọi"""
+    bắt_đầu = time.perf_counter()
+    for _ in range(số_lần):
+        hàm()
+    return (time.perf_counter() - bắt_đầu) / số_lần * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo tốc độ ghi và truy vấn của kho ảnh chụp SQLite")
+    parser.add_argument("--số-coin", type=int, default=500)
+    parser.add_argument("--số-ngày", type=float, default=30.0)
+    parser.add_argument("--chu-kỳ-phút", type=float, default=5.0)
+    args = parser.parse_args()
+
+    ngữ_cảnh = tạo_ngữ_cảnh_chạy()
+    # Một bộ kết quả dùng lại cho mọi lần chạy: chi phí mã hóa JSON mỗi dòng vẫn như thật
+    các_kết_quả = list(sinh_kết_quả(args.số_coin, ngữ_cảnh))
+    các_mã = [kq.mã for kq in các_kết_quả]
+    chu_kỳ = args.chu_kỳ_phút * 60
+    số_lần_chạy = int(args.số_ngày * 86400 / chu_kỳ)
+    gốc_thời_gian = time.time() - số_lần_chạy * chu_kỳ
+    rng = random.Random(3)
+
+    with tempfile.TemporaryDirectory() as thư_mục:
+        đường_dẫn = os.path.join(thư_mục, "lich_su.db")
+        kho = KhoẢnhChụp(đường_dẫn)
+
+        bắt_đầu = time.perf_counter()
+        for i in range(số_lần_chạy):
+            giá = {mã: 100.0 * (1 + rng.uniform(-0.05, 0.05)) for mã in các_mã}
+            kho.ghi_lần_chạy(các_kết_quả, ngữ_cảnh, thời_gian=gốc_thời_gian + i * chu_kỳ, giá=giá)
+        thời_gian_ghi = time.perf_counter() - bắt_đầu
+        số_dòng = số_lần_chạy * args.số_coin
+        kích_thước_mb = sum(os.path.getsize(os.path.join(thư_mục, f)) for f in os.listdir(thư_mục)) / 1024 / 1024
+
+        print(f"{số_lần_chạy} lần chạy x {args.số_coin} coin = {số_dòng:,} dòng")
+        print(f"Ghi: {thời_gian_ghi:.1f}s ({số_dòng / thời_gian_ghi:,.0f} dòng/s), file {kích_thước_mb:.1f} MB "
+              f"({kích_thước_mb * 1024 * 1024 / số_dòng:.0f} byte/dòng)")
+
+        cuối = gốc_thời_gian + (số_lần_chạy - 1) * chu_kỳ
+        print(f"\n{'Truy vấn':<36} {'ms/lần':>10} {'Số dòng':>9}")
+        print("-" * 58)
+        for nhãn, số_ngày in (("lịch_sử(mã) 1 ngày", 1), ("lịch_sử(mã) 30 ngày", 30), ("lịch_sử(mã) toàn bộ", None)):
+            từ = cuối - số_ngày * 86400 if số_ngày is not None else None
+            số_dòng_kq = len(kho.lịch_sử(các_mã[0], từ=từ)["thời_gian"])
+            ms = _đo_truy_vấn(lambda: kho.lịch_sử(rng.choice(các_mã), từ=từ), 50)
+            print(f"{nhãn:<36} {ms:>10.2f} {số_dòng_kq:>9}")
+        các_lần_chạy = kho.các_lần_chạy()
+        ms = _đo_truy_vấn(lambda: kho.kết_quả_lần_chạy(rng.choice(các_lần_chạy)["id"]), 20)
+        print(f"{'kết_quả_lần_chạy (cả universe)':<36} {ms:>10.2f} {args.số_coin:>9}")
+        ms = _đo_truy_vấn(lambda: kho.các_lần_chạy(cuối - 86400, cuối), 50)
+        print(f"{'các_lần_chạy 1 ngày':<36} {ms:>10.2f} {int(86400 / chu_kỳ):>9}")
+        kho.đóng()
+
+    số_dòng_năm = int(365 * 86400 / chu_kỳ) * args.số_coin
+    print(f"\nƯớc lượng một năm ({số_dòng_năm:,} dòng): ghi ~{số_dòng_năm / (số_dòng / thời_gian_ghi) / 60:.0f} phút, "
+          f"~{kích_thước_mb / số_dòng * số_dòng_năm / 1024:.1f} GB")
+
+if __name__ == "__main__":
+    main()
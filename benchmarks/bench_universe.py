@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark universe thị trường dạng cột
+--------------------
+Server giả lập /coins/markets (dòng đầy đủ kiểu CoinGecko, có ký hiệu trùng nhau, độ
+trễ mỗi trang). Đo và kiểm tra:
+- làm mới mọi trang tuần tự vs đồng thời; làm mới tăng dần chỉ lấy lại trang quá hạn
+- lọc khối lượng / khoảng vốn hóa trên cột vs duyệt list dict thô, cùng kết quả
+- bộ nhớ của bảng cột vs giữ nguyên các dòng JSON
+- id_của() chọn coin đứng đầu khi trùng ký hiệu; lấy_thị_trường_top_coin() giữ dạng
+  [{"mã", "giá"}] theo thứ tự API như bản cũ, mỗi ký hiệu một dòng
+
+Chạy từ thư mục gốc:
+    python -m benchmarks.bench_universe --số-coin 10000
+"""
+
+import argparse
+import json
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+from alpha_signal_checker_plus import BỘ_NHỚ_ĐỆM, CẤU_HÌNH, lấy_thị_trường_top_coin
+from benchmarks.bench_fetch_engine import _ServerGiảLập
+from universe import UNIVERSE, BảngUniverse
+
+def sinh_dòng_thị_trường(số_coin: int) -> list:
+    """Dòng kiểu /coins/markets theo vốn hóa giảm dần; cứ 7 coin có một coin trùng ký hiệu coin trước"""
+    các_dòng = []
+    for i in range(số_coin):
+        ký_hiệu = f"c{i - 3}" if i % 7 == 6 else f"c{i}"
+        các_dòng.append({
+            "id": f"coin-{i}", "symbol": ký_hiệu, "name": f"Coin {i}",
+            "image": f"https://example.invalid/{i}.png",
+            "current_price": None if i % 97 == 0 else 1000.0 / (i + 1),
+            "market_cap": 1e12 / (i + 1), "market_cap_rank": i + 1,
+            "fully_diluted_valuation": 1.2e12 / (i + 1),
+            "total_volume": None if i % 89 == 0 else (1e10 / (i + 1)) * (1 + i % 5),
+            "high_24h": 1.0, "low_24h": 0.9, "price_change_24h": 0.01,
+            "price_change_percentage_24h": (i % 21) - 10.0,
+            "market_cap_change_24h": 1.0, "market_cap_change_percentage_24h": 0.1,
+            "circulating_supply": 1e9, "total_supply": 1e9, "max_supply": None,
+            "ath": 2.0, "ath_change_percentage": -50.0, "ath_date": "2024-03-14T07:10:36.635Z",
+            "atl": 0.1, "atl_change_percentage": 900.0, "atl_date": "2015-10-20T00:00:00.000Z",
+            "roi": None, "last_updated": "2026-10-18T00:00:00.000Z",
+        })
+    return các_dòng
+
+class _BộXửLýThịTrường(BaseHTTPRequestHandler):
+    các_dòng: list = []
+    độ_trễ = 0.05
+    số_yêu_cầu = 0
+    khóa = threading.Lock()
+
+    def do_GET(self):
+        tham_số = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        with self.khóa:
+            type(self).số_yêu_cầu += 1
+        time.sleep(self.độ_trễ)
+        trang, cỡ = int(tham_số["page"]), int(tham_số["per_page"])
+        nội_dung = json.dumps(self.các_dòng[(trang - 1) * cỡ:trang * cỡ]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+    def log_message(self, *args):
+        pass
+
+def _bộ_nhớ(hàm):
+    tracemalloc.start()
+    giá_trị = hàm()
+    kích_thước = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return giá_trị, kích_thước
+
+def main():
+    parser = argparse.ArgumentParser(description="Universe dạng cột: làm mới theo trang, lọc, bộ nhớ")
+    parser.add_argument("--số-coin", type=int, default=10000)
+    parser.add_argument("--số-mỗi-trang", type=int, default=250)
+    parser.add_argument("--độ-trễ-ms", type=float, default=50.0)
+    parser.add_argument("--đồng-thời", type=int, default=8)
+    args = parser.parse_args()
+
+    các_dòng = sinh_dòng_thị_trường(args.số_coin)
+    số_trang = -(-args.số_coin // args.số_mỗi_trang)
+    _BộXửLýThịTrường.các_dòng = các_dòng
+    _BộXửLýThịTrường.độ_trễ = args.độ_trễ_ms / 1000
+    server = _ServerGiảLập(("127.0.0.1", 0), _BộXửLýThịTrường)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CẤU_HÌNH["COINGECKO_MARKETS_URL"] = f"http://127.0.0.1:{server.server_address[1]}/coins/markets"
+
+    try:
+        thời_gian = {}
+        for đồng_thời in (1, args.đồng_thời):
+            bảng = BảngUniverse(args.số_mỗi_trang)
+            bắt_đầu = time.perf_counter()
+            assert len(bảng.làm_mới(số_trang, bắt_buộc=True, đồng_thời=đồng_thời)) == số_trang
+            thời_gian[đồng_thời] = time.perf_counter() - bắt_đầu
+            assert len(bảng) == args.số_coin
+
+        # Làm mới tăng dần: chỉ trang cuối quá hạn
+        bảng._lúc_trang[số_trang] -= 10_000
+        trước = _BộXửLýThịTrường.số_yêu_cầu
+        bắt_đầu = time.perf_counter()
+        assert bảng.làm_mới(số_trang, ttl=3600, đồng_thời=args.đồng_thời) == [số_trang]
+        t_tăng_dần = time.perf_counter() - bắt_đầu
+        assert _BộXửLýThịTrường.số_yêu_cầu - trước == 1 and len(bảng) == args.số_coin
+
+        # Coin rơi khỏi universe bị loại khi mọi trang đã mới hơn
+        _BộXửLýThịTrường.các_dòng = các_dòng[:-10]
+        bảng.làm_mới(số_trang, bắt_buộc=True, đồng_thời=args.đồng_thời)
+        assert len(bảng) == args.số_coin - 10
+        _BộXửLýThịTrường.các_dòng = các_dòng
+        bảng.làm_mới(số_trang, bắt_buộc=True, đồng_thời=args.đồng_thời)
+
+        # Trùng ký hiệu: c3 là coin-3 và coin-6
+        assert bảng.id_của("C3") == "coin-3" and bảng.các_id_của("c3") == ["coin-3", "coin-6"]
+
+        # Lọc: cột vs list dict thô
+        kl_min, vh_min, vh_max = 5e7, 1e8, 1e11
+        số_lần = 20
+        bắt_đầu = time.perf_counter()
+        for _ in range(số_lần):
+            chỉ_số = bảng.lọc(khối_lượng_tối_thiểu=kl_min, vốn_hóa_tối_thiểu=vh_min, vốn_hóa_tối_đa=vh_max)
+        t_lọc_cột = (time.perf_counter() - bắt_đầu) / số_lần
+        bắt_đầu = time.perf_counter()
+        for _ in range(số_lần):
+            thô = [d["id"] for d in các_dòng
+                   if d["total_volume"] is not None and d["total_volume"] >= kl_min
+                   and d["market_cap"] is not None and vh_min <= d["market_cap"] <= vh_max]
+        t_lọc_thô = (time.perf_counter() - bắt_đầu) / số_lần
+        assert [bảng.id[i] for i in chỉ_số] == thô and thô
+
+        # Bộ nhớ: giữ dòng JSON đầy đủ vs bảng cột
+        văn_bản = json.dumps(các_dòng)
+        _, b_thô = _bộ_nhớ(lambda: json.loads(văn_bản))
+        def dựng_bảng():
+            b = BảngUniverse(args.số_mỗi_trang)
+            for trang in range(1, số_trang + 1):
+                b.cập_nhật_trang(trang, json.loads(json.dumps(các_dòng[(trang - 1) * args.số_mỗi_trang:
+                                                                       trang * args.số_mỗi_trang])))
+            return b
+        _, b_bảng = _bộ_nhớ(dựng_bảng)
+
+        # Đường dashboard / tiến trình nền: cùng dạng và thứ tự với bản cũ (2 trang x 250)
+        CẤU_HÌNH["UNIVERSE_PER_PAGE"] = UNIVERSE.số_mỗi_trang = 250
+        BỘ_NHỚ_ĐỆM.xóa("top_coin")
+        top = lấy_thị_trường_top_coin()
+        # Như bản cũ nhưng mỗi ký hiệu chỉ coin vốn hóa lớn nhất (bên gọi khóa giá theo ký hiệu)
+        cũ, đã_thấy = [], set()
+        for d in các_dòng[:500]:
+            if d["symbol"].upper() not in đã_thấy:
+                đã_thấy.add(d["symbol"].upper())
+                cũ.append({"mã": d["symbol"].upper(), "giá": d.get("current_price")})
+        assert top == cũ, (top[:3], cũ[:3])
+    finally:
+        server.shutdown()
+
+    print(f"{args.số_coin} coin, {số_trang} trang x {args.số_mỗi_trang}, độ trễ {args.độ_trễ_ms:.0f} ms/trang")
+    print(f"{'Thao tác':<40} {'Thời gian':>12}")
+    print("-" * 54)
+    print(f"{'làm mới tuần tự':<40} {thời_gian[1]:>11.3f}s")
+    print(f"{f'làm mới đồng thời ({args.đồng_thời})':<40} {thời_gian[args.đồng_thời]:>11.3f}s")
+    print(f"{'làm mới tăng dần (1 trang quá hạn)':<40} {t_tăng_dần:>11.3f}s")
+    print(f"{'lọc trên cột':<40} {t_lọc_cột * 1000:>10.2f}ms")
+    print(f"{'lọc list dict thô':<40} {t_lọc_thô * 1000:>10.2f}ms")
+    print(f"\nBộ nhớ: dòng JSON đầy đủ {b_thô / 1e6:.1f} MB, bảng cột {b_bảng / 1e6:.1f} MB "
+          f"({len(chỉ_số)} coin qua bộ lọc)")
+    print("Kết quả lọc giống nhau; trùng ký hiệu tra đúng id; lấy_thị_trường_top_coin giữ dạng cũ")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Nạp Sự Kiện Thời Gian Thực
+--------------------
+Chế độ đẩy (python alpha_signal_checker_plus.py --nghe-sự-kiện NGUỒN): nhận sự kiện từ một
+luồng cục bộ và chấm điểm lại đúng mã bị ảnh hưởng thay vì cả universe:
+- Nguồn: file NDJSON được ghi nối tiếp (đọc đuôi), named pipe (FIFO) hoặc Unix socket
+  ("unix:/đường/dẫn.sock", mỗi kết nối gửi NDJSON); nhiều nguồn chạy cùng lúc
+- Mỗi dòng là một bản ghi cùng lược đồ với file đầu vào (p, sm, cin, cout, st, bv). Mã mới được
+  phân tích như phân_tích_mục_hợp_đồng; mã đã có chỉ cập nhật tại chỗ các trường có mặt rồi
+  tính lại đà / xu hướng dòng tiền. Khóa "mạng_xã_hội" / "tin_tức" (dict các trường) thay dữ
+  liệu thành phần đó của mã
+- Một vòng asyncio: các nguồn đẩy dòng vào hàng đợi, bộ xử lý rút hết các dòng đang chờ, áp dụng
+  rồi chấm điểm lại mỗi mã có thay đổi đúng một lần (sự kiện dồn dập cho cùng mã được gộp);
+  sự kiện không đổi giá trị nào thì không chấm lại
+- Độ trễ từ lúc nhận dòng tới khi có tín hiệu mới ghi vào ĐO_LƯỜNG ("sự_kiện_tới_tín_hiệu",
+  nhãn là loại nguồn); sự kiện có "ts" (epoch giây của bên gửi) thì ghi thêm độ trễ đầu-cuối
+  ("gửi_tới_tín_hiệu")
+"""
+
+import asyncio
+import json
+import os
+import stat
+import time
+from dataclasses import fields, is_dataclass, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from alpha_signal_checker_plus import (
+    CẤU_HÌNH,
+    DữLiệuHợpĐồngTươngLai,
+    KếtQuảTínHiệu,
+    NgữCảnhChạy,
+    chấm_điểm_ảnh_chụp,
+    lấy_dữ_liệu_lô,
+    phân_tích_mục_hợp_đồng,
+    thành_phần_theo_mã,
+    thống_kê_bổ_sung,
+    trích_xuất_mã_từ_cặp,
+    tính_đà_dòng_tiền,
+    tạo_ảnh_chụp,
+    xác_định_xu_hướng_dòng_tiền,
+)
+from metrics import ĐO_LƯỜNG
+
+# (khóa bản ghi, khung thời gian, trường của DữLiệuHợpĐồngTươngLai), giống phân_tích_mục_hợp_đồng
+TRƯỜNG_SỰ_KIỆN = (
+    ("sm", "24h", "dòng_tiền_ròng_24h"),
+    ("sm", "7d", "dòng_tiền_ròng_7ngày"),
+    ("sm", "30d", "dòng_tiền_ròng_30ngày"),
+    ("cin", "24h", "tiền_gửi_24h"),
+    ("cout", "24h", "tiền_rút_24h"),
+    ("st", "24h", "tâm_lý_thị_trường"),
+    ("bv", "24h", "khối_lượng_cân_bằng"),
+)
+
+TIỀN_TỐ_UNIX = "unix:"
+
+# Một dòng đã nhận: (nội dung, lúc nhận theo perf_counter, loại nguồn)
+DòngSựKiện = Tuple[Any, float, str]
+
+class BộNạpSựKiện:
+    """Giữ ảnh chụp và kết quả mới nhất theo mã; áp dụng sự kiện tại chỗ và chấm điểm lại mã bị ảnh hưởng"""
+
+    def __init__(self, ngữ_cảnh: NgữCảnhChạy, điểm_ròng_tối_thiểu: float = 2.0,
+                 khi_có_tín_hiệu: Callable[[KếtQuảTínHiệu, float], None] = None):
+        self.ngữ_cảnh = ngữ_cảnh
+        self.điểm_ròng_tối_thiểu = điểm_ròng_tối_thiểu
+        self.khi_có_tín_hiệu = khi_có_tín_hiệu
+        self.ảnh_chụp: Dict[str, Any] = {}
+        self.kết_quả: Dict[str, KếtQuảTínHiệu] = {}
+        # Thành phần theo mã có thể được thay qua sự kiện: tên -> kiểu dữ liệu
+        self._thành_phần_sự_kiện = {tp.tên: tp.kiểu_dữ_liệu for tp in thành_phần_theo_mã(ngữ_cảnh.các_thành_phần)}
+        # Mã mới thấy lần đầu, chờ lấy dữ liệu theo mã trước khi chấm điểm: mã -> hợp đồng
+        self._chờ_dữ_liệu: Dict[str, DữLiệuHợpĐồngTươngLai] = {}
+        # Số dòng đã xử lý và số lần chấm điểm lại (nhỏ hơn khi sự kiện cùng mã được gộp)
+        self.số_sự_kiện = 0
+        self.số_lần_chấm = 0
+        # Trường thành phần nhận qua sự kiện của mã đang chờ, áp lên dữ liệu vừa lấy: mã -> tên -> {trường: giá trị}
+        self._chờ_thành_phần: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def nạp_ban_đầu(self, các_hợp_đồng: Iterable[DữLiệuHợpĐồngTươngLai]) -> List[KếtQuảTínHiệu]:
+        """Dựng trạng thái từ dữ liệu hợp đồng có sẵn (file đầu vào) trước khi nghe sự kiện"""
+        for hợp_đồng in các_hợp_đồng:
+            self._chờ_dữ_liệu[hợp_đồng.mã] = hợp_đồng
+        các_mã = list(self._chờ_dữ_liệu)
+        self.lấy_dữ_liệu_chờ()
+        return [self.chấm_lại(mã) for mã in các_mã]
+
+    def lấy_dữ_liệu_chờ(self):
+        """Lấy dữ liệu theo mã (mạng xã hội, tin tức...) cho các mã mới theo lô; có I/O mạng"""
+        if not self._chờ_dữ_liệu:
+            return
+        chờ, self._chờ_dữ_liệu = self._chờ_dữ_liệu, {}
+        try:
+            with ĐO_LƯỜNG.đo("lấy_dữ_liệu", "sự_kiện"):
+                dữ_liệu = lấy_dữ_liệu_lô(list(chờ), self.ngữ_cảnh)
+        except Exception as e:
+            # Vẫn chấm điểm phần dữ liệu đã có (hợp đồng, sự kiện) thay vì dừng chế độ nghe
+            print(f"Lấy dữ liệu cho {len(chờ)} mã mới thất bại: {e}")
+            ĐO_LƯỜNG.đếm("lỗi_làm_mới", "sự_kiện")
+            dữ_liệu = {}
+        for mã, hợp_đồng in chờ.items():
+            ảnh_chụp = tạo_ảnh_chụp(mã, {tên: theo_mã.get(mã) for tên, theo_mã in dữ_liệu.items()},
+                                    hợp_đồng, self.ngữ_cảnh)
+            for tên, giá_trị in self._chờ_thành_phần.pop(mã, {}).items():
+                self._thay_thành_phần(ảnh_chụp, tên, giá_trị)
+            self.ảnh_chụp[mã] = ảnh_chụp
+
+    def áp_dụng(self, mục: Dict[str, Any]) -> Optional[str]:
+        """Áp dụng một bản ghi sự kiện; trả về mã nếu trạng thái của mã thay đổi"""
+        mã = trích_xuất_mã_từ_cặp(mục.get("p", ""))
+        if not mã:
+            ĐO_LƯỜNG.đếm("sự_kiện_lỗi", "không_có_mã")
+            return None
+        ảnh_chụp = self.ảnh_chụp.get(mã)
+        hợp_đồng = ảnh_chụp.hợp_đồng if ảnh_chụp is not None else self._chờ_dữ_liệu.get(mã)
+        if hợp_đồng is None:
+            self._chờ_dữ_liệu[mã] = phân_tích_mục_hợp_đồng(mục)
+            đã_đổi = True
+        else:
+            đã_đổi = self._cập_nhật_hợp_đồng(hợp_đồng, mục)
+        for tên in self._thành_phần_sự_kiện:
+            giá_trị = mục.get(tên)
+            if not isinstance(giá_trị, dict):
+                continue
+            if ảnh_chụp is None:
+                self._chờ_thành_phần.setdefault(mã, {}).setdefault(tên, {}).update(giá_trị)
+                đã_đổi = True
+            elif self._thay_thành_phần(ảnh_chụp, tên, giá_trị):
+                đã_đổi = True
+        if not đã_đổi:
+            ĐO_LƯỜNG.đếm("sự_kiện_không_đổi")
+            return None
+        return mã
+
+    @staticmethod
+    def _cập_nhật_hợp_đồng(hợp_đồng: DữLiệuHợpĐồngTươngLai, mục: Dict[str, Any]) -> bool:
+        """Ghi các trường có mặt trong sự kiện vào hợp đồng tại chỗ; True nếu có giá trị thay đổi"""
+        đã_đổi = False
+        for khóa, khung, trường in TRƯỜNG_SỰ_KIỆN:
+            nhóm = mục.get(khóa)
+            if not isinstance(nhóm, dict) or khung not in nhóm:
+                continue
+            giá_trị = nhóm[khung]
+            if trường == "tâm_lý_thị_trường":
+                giá_trị = str(giá_trị).upper()
+            if getattr(hợp_đồng, trường) != giá_trị:
+                setattr(hợp_đồng, trường, giá_trị)
+                đã_đổi = True
+        if đã_đổi:
+            hợp_đồng.đà_dòng_tiền = tính_đà_dòng_tiền(hợp_đồng)
+            hợp_đồng.xu_hướng_dòng_tiền = xác_định_xu_hướng_dòng_tiền(hợp_đồng)
+        return đã_đổi
+
+    def _thay_thành_phần(self, ảnh_chụp, tên: str, giá_trị: Dict[str, Any]) -> bool:
+        """Thay các trường của một thành phần theo mã; True nếu có giá trị thay đổi"""
+        cũ = ảnh_chụp.dữ_liệu(tên)
+        kiểu = self._thành_phần_sự_kiện[tên]
+        if cũ is None and kiểu is not None:
+            cũ = kiểu()
+        if is_dataclass(cũ):
+            # Thay bằng bản sao: đối tượng cũ có thể đang nằm trong bộ nhớ đệm nhà cung cấp
+            tên_trường = {f.name for f in fields(cũ)}
+            thay_đổi = {k: v for k, v in giá_trị.items() if k in tên_trường and getattr(cũ, k) != v}
+            if not thay_đổi:
+                return False
+            mới = replace(cũ, **thay_đổi)
+        else:
+            if giá_trị == cũ:
+                return False
+            mới = giá_trị
+        if tên in ("mạng_xã_hội", "tin_tức"):
+            setattr(ảnh_chụp, tên, mới)
+        else:
+            ảnh_chụp.thêm[tên] = mới
+        return True
+
+    def chấm_lại(self, mã: str) -> KếtQuảTínHiệu:
+        """Chấm điểm lại một mã từ ảnh chụp hiện tại, không I/O mạng"""
+        ảnh_chụp = self.ảnh_chụp[mã]
+        # Dict thành phần cũ vẫn thuộc về kết quả trước, dựng dict mới thay vì sửa
+        ảnh_chụp._thành_phần = None
+        kết_quả = self.kết_quả[mã] = chấm_điểm_ảnh_chụp(ảnh_chụp, self.điểm_ròng_tối_thiểu)
+        return kết_quả
+
+    def xử_lý_lô(self, lô: List[DòngSựKiện]) -> Dict[str, List[tuple]]:
+        """Giải mã và áp dụng các dòng; trả về mã có thay đổi -> (dòng, lúc nhận, nguồn, ts) gây ra thay đổi"""
+        bị_ảnh_hưởng: Dict[str, List[tuple]] = {}
+        self.số_sự_kiện += len(lô)
+        for dòng in lô:
+            try:
+                mục = json.loads(dòng[0])
+            except ValueError:
+                ĐO_LƯỜNG.đếm("sự_kiện_lỗi", "json")
+                continue
+            if not isinstance(mục, dict):
+                ĐO_LƯỜNG.đếm("sự_kiện_lỗi", "json")
+                continue
+            ĐO_LƯỜNG.đếm("sự_kiện", dòng[2])
+            mã = self.áp_dụng(mục)
+            if mã is not None:
+                bị_ảnh_hưởng.setdefault(mã, []).append(dòng + (mục.get("ts"),))
+        return bị_ảnh_hưởng
+
+    def công_bố(self, bị_ảnh_hưởng: Dict[str, List[tuple]]) -> List[KếtQuảTínHiệu]:
+        """Chấm điểm lại mỗi mã bị ảnh hưởng một lần, ghi độ trễ của từng sự kiện"""
+        các_kết_quả = []
+        for mã, các_dòng in bị_ảnh_hưởng.items():
+            with ĐO_LƯỜNG.đo("chấm_điểm", "sự_kiện"):
+                kết_quả = self.chấm_lại(mã)
+            self.số_lần_chấm += 1
+            xong, xong_thực = time.perf_counter(), time.time()
+            for _, lúc_nhận, nguồn, ts in các_dòng:
+                ĐO_LƯỜNG.ghi("sự_kiện_tới_tín_hiệu", xong - lúc_nhận, nguồn)
+                if isinstance(ts, (int, float)):
+                    ĐO_LƯỜNG.ghi("gửi_tới_tín_hiệu", max(0.0, xong_thực - ts), nguồn)
+            if self.khi_có_tín_hiệu is not None:
+                # Độ trễ của sự kiện đến sớm nhất trong các sự kiện được gộp
+                self.khi_có_tín_hiệu(kết_quả, xong - các_dòng[0][1])
+            các_kết_quả.append(kết_quả)
+        return các_kết_quả
+
+    async def xử_lý(self, hàng_đợi: "asyncio.Queue[DòngSựKiện]", kích_thước_lô: int = 1024):
+        """Vòng xử lý: rút các dòng đang chờ, áp dụng, lấy dữ liệu cho mã mới rồi công bố"""
+        loop = asyncio.get_running_loop()
+        while True:
+            lô = [await hàng_đợi.get()]
+            while len(lô) < kích_thước_lô and not hàng_đợi.empty():
+                lô.append(hàng_đợi.get_nowait())
+            bị_ảnh_hưởng = self.xử_lý_lô(lô)
+            if self._chờ_dữ_liệu:
+                # Lấy dữ liệu mạng ngoài vòng sự kiện để các nguồn vẫn nhận tiếp
+                await loop.run_in_executor(None, self.lấy_dữ_liệu_chờ)
+            self.công_bố(bị_ảnh_hưởng)
+            for _ in lô:
+                hàng_đợi.task_done()
+
+# ========== NGUỒN SỰ KIỆN ==========
+
+async def _đọc_luồng(reader: asyncio.StreamReader, hàng_đợi: "asyncio.Queue[DòngSựKiện]", nguồn: str):
+    while True:
+        dòng = await reader.readline()
+        if not dòng:
+            return
+        if dòng.strip():
+            hàng_đợi.put_nowait((dòng, time.perf_counter(), nguồn))
+
+async def đọc_đuôi_tệp(đường_dẫn: str, hàng_đợi: "asyncio.Queue[DòngSựKiện]", từ_đầu: bool = False,
+                       nhịp: float = None):
+    """Đọc các dòng được ghi thêm vào file NDJSON; file bị cắt ngắn hoặc thay mới thì đọc lại từ đầu"""
+    nhịp = CẤU_HÌNH["EVENT_TAIL_INTERVAL"] if nhịp is None else nhịp
+    while not os.path.exists(đường_dẫn):
+        await asyncio.sleep(nhịp)
+    tệp = open(đường_dẫn, "rb")
+    try:
+        if not từ_đầu:
+            tệp.seek(0, os.SEEK_END)
+        dở_dang = b""
+        số_dòng = 0
+        while True:
+            dòng = tệp.readline()
+            if dòng:
+                số_dòng += 1
+                if số_dòng % 1024 == 0:
+                    # File có sẵn nhiều dòng: nhường vòng sự kiện cho bộ xử lý
+                    await asyncio.sleep(0)
+                if not dòng.endswith(b"\n"):
+                    # Bên ghi chưa ghi xong dòng này
+                    dở_dang += dòng
+                    continue
+                dòng, dở_dang = dở_dang + dòng, b""
+                if dòng.strip():
+                    hàng_đợi.put_nowait((dòng, time.perf_counter(), "tệp"))
+                continue
+            await asyncio.sleep(nhịp)
+            try:
+                thông_tin = os.stat(đường_dẫn)
+            except FileNotFoundError:
+                continue
+            if thông_tin.st_ino != os.fstat(tệp.fileno()).st_ino or thông_tin.st_size < tệp.tell():
+                tệp.close()
+                tệp = open(đường_dẫn, "rb")
+                dở_dang = b""
+    finally:
+        tệp.close()
+
+async def đọc_fifo(đường_dẫn: str, hàng_đợi: "asyncio.Queue[DòngSựKiện]"):
+    """Đọc NDJSON từ named pipe; mở cả đọc lẫn ghi để bên gửi đóng / mở lại không làm kết thúc luồng"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=1 << 20)
+    tệp = os.fdopen(os.open(đường_dẫn, os.O_RDWR | os.O_NONBLOCK), "rb", buffering=0)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), tệp)
+    try:
+        await _đọc_luồng(reader, hàng_đợi, "fifo")
+    finally:
+        transport.close()
+
+async def nghe_unix_socket(đường_dẫn: str, hàng_đợi: "asyncio.Queue[DòngSựKiện]"):
+    """Nhận NDJSON từ mọi kết nối tới Unix socket"""
+    async def xử_lý_kết_nối(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await _đọc_luồng(reader, hàng_đợi, "unix")
+        finally:
+            writer.close()
+
+    if os.path.exists(đường_dẫn) and stat.S_ISSOCK(os.stat(đường_dẫn).st_mode):
+        # Socket còn lại từ lần chạy trước
+        os.unlink(đường_dẫn)
+    server = await asyncio.start_unix_server(xử_lý_kết_nối, đường_dẫn, limit=1 << 20)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(đường_dẫn):
+            os.unlink(đường_dẫn)
+
+def mở_nguồn(nguồn: str, hàng_đợi: "asyncio.Queue[DòngSựKiện]", từ_đầu: bool = False):
+    """Coroutine đọc một nguồn: "unix:/đường/dẫn", FIFO có sẵn hoặc file NDJSON"""
+    if nguồn.startswith(TIỀN_TỐ_UNIX):
+        return nghe_unix_socket(nguồn[len(TIỀN_TỐ_UNIX):], hàng_đợi)
+    if os.path.exists(nguồn) and stat.S_ISFIFO(os.stat(nguồn).st_mode):
+        return đọc_fifo(nguồn, hàng_đợi)
+    return đọc_đuôi_tệp(nguồn, hàng_đợi, từ_đầu)
+
+def tóm_tắt_độ_trễ() -> str:
+    """Các dòng tóm tắt độ trễ sự kiện -> tín hiệu theo nguồn (từ ĐO_LƯỜNG)"""
+    dòng = []
+    for mục in ĐO_LƯỜNG.ảnh_chụp()["giai_đoạn"]:
+        if mục["giai_đoạn"] in ("sự_kiện_tới_tín_hiệu", "gửi_tới_tín_hiệu"):
+            dòng.append(f"   {mục['giai_đoạn']}[{mục['nhãn']}]: {mục['số_lần']} sự kiện, p50 {mục['p50_ms']:.3f} ms, "
+                        f"p95 {mục['p95_ms']:.3f} ms, p99 {mục['p99_ms']:.3f} ms, tối đa {mục['tối_đa_ms']:.3f} ms")
+    return "\n".join(dòng)
+
+async def _ghi_prometheus_định_kỳ(đường_dẫn: str, chu_kỳ: float):
+    while True:
+        await asyncio.sleep(chu_kỳ)
+        ĐO_LƯỜNG.ghi_prometheus(đường_dẫn, thống_kê_bổ_sung())
+
+async def nghe_sự_kiện(bộ_nạp: BộNạpSựKiện, các_nguồn: List[str], từ_đầu: bool = False,
+                       file_prometheus: str = "", chu_kỳ_prometheus: float = 15.0):
+    """Chạy các nguồn và bộ xử lý trên cùng một vòng sự kiện cho tới khi bị hủy"""
+    hàng_đợi: "asyncio.Queue[DòngSựKiện]" = asyncio.Queue()
+    các_tác_vụ = [asyncio.ensure_future(mở_nguồn(nguồn, hàng_đợi, từ_đầu)) for nguồn in các_nguồn]
+    các_tác_vụ.append(asyncio.ensure_future(bộ_nạp.xử_lý(hàng_đợi)))
+    if file_prometheus:
+        các_tác_vụ.append(asyncio.ensure_future(_ghi_prometheus_định_kỳ(file_prometheus, chu_kỳ_prometheus)))
+    try:
+        # Một tác vụ lỗi (nguồn không mở được...) dừng cả chế độ nghe
+        xong, _ = await asyncio.wait(các_tác_vụ, return_when=asyncio.FIRST_EXCEPTION)
+        for tác_vụ in xong:
+            tác_vụ.result()
+    finally:
+        for tác_vụ in các_tác_vụ:
+            tác_vụ.cancel()
+        await asyncio.gather(*các_tác_vụ, return_exceptions=True)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Máy Lấy Dữ Liệu Đồng Thời
+--------------------
+Chạy các lệnh gọi lấy dữ liệu theo từng mã song song bằng thread pool có giới hạn.
+Mỗi nhà cung cấp có giới hạn đồng thời riêng. Nhà cung cấp có endpoint theo lô
+nhận cả một lô mã mỗi lệnh gọi và kết quả được chia lại cho từng mã.
+lấy_đồng_thời trả về theo đúng thứ tự xếp hạng ban đầu của danh sách mã;
+lặp_đồng_thời sinh từng mã ngay khi xong để hiển thị dần.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from alpha_signal_checker_plus import thành_phần_theo_mã
+from rate_limiter import ưu_tiên
+
+@dataclass
+class NhàCungCấp:
+    tên: str
+    hàm_lấy: Callable[[str], Any]
+    giới_hạn_đồng_thời: int = 8
+    # Có hàm_lấy_lô thì gọi theo lô kích_thước_lô mã thay vì từng mã
+    hàm_lấy_lô: Optional[Callable[[List[str]], Dict[str, Any]]] = None
+    kích_thước_lô: int = 1
+
+def nhà_cung_cấp_mặc_định(các_thành_phần: Sequence[str] = None) -> List[NhàCungCấp]:
+    """Nhà cung cấp của các thành phần theo mã đã đăng ký (mặc định: thành phần lõi)"""
+    return [
+        NhàCungCấp(tp.tên, tp.hàm_lấy, tp.giới_hạn_đồng_thời, tp.hàm_lấy_lô, tp.kích_thước_lô)
+        for tp in thành_phần_theo_mã(các_thành_phần)
+    ]
+
+def _gọi_theo_hạng(hàm_lấy: Callable[[str], Any], mã: str, hạng: int) -> Any:
+    # Danh sách mã theo vốn hóa giảm dần: hạng nhỏ được cấp token trước khi bị giới hạn tốc độ
+    with ưu_tiên(hạng):
+        return hàm_lấy(mã)
+
+def _gọi_lô_theo_hạng(hàm_lấy_lô: Callable[[List[str]], Dict[str, Any]], các_mã: List[str], hạng: int) -> Dict[str, Any]:
+    # Cả lô mang hạng của mã đứng đầu lô
+    with ưu_tiên(hạng):
+        return hàm_lấy_lô(các_mã)
+
+def lặp_đồng_thời(các_mã: Sequence[str], các_nhà_cung_cấp: Sequence[NhàCungCấp] = None) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """Sinh (vị trí, mã, dữ liệu) ngay khi mọi nhà cung cấp của một mã xong, theo thứ tự hoàn thành"""
+    if các_nhà_cung_cấp is None:
+        các_nhà_cung_cấp = nhà_cung_cấp_mặc_định()
+    if not các_nhà_cung_cấp:
+        for vị_trí, mã in enumerate(các_mã):
+            yield vị_trí, mã, {}
+        return
+
+    # Mỗi nhà cung cấp một pool riêng để giới hạn đồng thời độc lập
+    các_pool = {
+        ncc.tên: ThreadPoolExecutor(max_workers=max(1, ncc.giới_hạn_đồng_thời),
+                                    thread_name_prefix=f"lay-{ncc.tên}")
+        for ncc in các_nhà_cung_cấp
+    }
+    # Callback của future cuối cùng của một mã đẩy vị trí mã vào hàng đợi
+    hoàn_thành: "queue.Queue[int]" = queue.Queue()
+    khóa = threading.Lock()
+    còn_lại: List[int] = [len(các_nhà_cung_cấp)] * len(các_mã)
+    # tương_lai[tên][vị_trí]: future của lệnh gọi chứa mã đó (một future lô dùng chung cho cả lô)
+    tương_lai: Dict[str, List[Future]] = {ncc.tên: [] for ncc in các_nhà_cung_cấp}
+    theo_lô = {ncc.tên for ncc in các_nhà_cung_cấp if ncc.hàm_lấy_lô is not None}
+
+    def khi_xong(các_vị_trí: range):
+        def gọi_lại(_: Future):
+            xong = []
+            with khóa:
+                for vị_trí in các_vị_trí:
+                    còn_lại[vị_trí] -= 1
+                    if còn_lại[vị_trí] == 0:
+                        xong.append(vị_trí)
+            for vị_trí in xong:
+                hoàn_thành.put(vị_trí)
+        return gọi_lại
+
+    def kết_quả_mã(tên: str, vị_trí: int) -> Any:
+        giá_trị = tương_lai[tên][vị_trí].result()
+        return giá_trị.get(các_mã[vị_trí]) if tên in theo_lô else giá_trị
+
+    try:
+        # Mỗi pool nhận lệnh gọi theo thứ tự hạng; nhà cung cấp theo lô nhận từng lô mã liên tiếp
+        for ncc in các_nhà_cung_cấp:
+            kích_thước = max(1, ncc.kích_thước_lô) if ncc.tên in theo_lô else 1
+            for bắt_đầu in range(0, len(các_mã), kích_thước):
+                các_vị_trí = range(bắt_đầu, min(len(các_mã), bắt_đầu + kích_thước))
+                if ncc.tên in theo_lô:
+                    f = các_pool[ncc.tên].submit(_gọi_lô_theo_hạng, ncc.hàm_lấy_lô,
+                                                 [các_mã[i] for i in các_vị_trí], bắt_đầu)
+                else:
+                    f = các_pool[ncc.tên].submit(_gọi_theo_hạng, ncc.hàm_lấy, các_mã[bắt_đầu], bắt_đầu)
+                tương_lai[ncc.tên].extend([f] * len(các_vị_trí))
+                f.add_done_callback(khi_xong(các_vị_trí))
+        for _ in range(len(các_mã)):
+            vị_trí = hoàn_thành.get()
+            yield vị_trí, các_mã[vị_trí], {ncc.tên: kết_quả_mã(ncc.tên, vị_trí) for ncc in các_nhà_cung_cấp}
+    finally:
+        # Người dùng dừng giữa chừng: hủy các lệnh gọi chưa bắt đầu
+        for các_future in tương_lai.values():
+            for f in set(các_future):
+                f.cancel()
+        for pool in các_pool.values():
+            pool.shutdown(wait=False)
+
+def lấy_đồng_thời(các_mã: Sequence[str], các_nhà_cung_cấp: Sequence[NhàCungCấp] = None) -> List[Dict[str, Any]]:
+    """Lấy dữ liệu của mọi nhà cung cấp cho mọi mã, trả về theo thứ tự của các_mã"""
+    kết_quả: List[Dict[str, Any]] = [{} for _ in các_mã]
+    for vị_trí, _, dữ_liệu in lặp_đồng_thời(các_mã, các_nhà_cung_cấp):
+        kết_quả[vị_trí] = dữ_liệu
+    return kết_quả
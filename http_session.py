@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Lớp Phiên HTTP Dùng Chung
+--------------------
+Một requests.Session duy nhất cho mọi lệnh gọi nhà cung cấp:
+- Pool kết nối riêng cho từng host, giữ kết nối (keep-alive)
+- Nén gzip/deflate
+- Thử lại có backoff với 5xx; 429 đi qua bộ giới hạn tốc độ (rate_limiter.py)
+  để cả nhà cung cấp tạm dừng theo Retry-After
+- Bộ đếm (yêu cầu, tái sử dụng kết nối, thử lại, byte) để kiểm tra khi tải cao
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from alpha_signal_checker_plus import CẤU_HÌNH
+from rate_limiter import BỘ_GIỚI_HẠN, ưu_tiên_hiện_tại
+
+class ThốngKêHTTP:
+    """Bộ đếm an toàn luồng cho phiên HTTP dùng chung"""
+
+    def __init__(self):
+        self._khóa = threading.Lock()
+        self.đặt_lại()
+
+    def đặt_lại(self):
+        with self._khóa:
+            self.yêu_cầu = 0
+            self.kết_nối_mới = 0
+            self.thử_lại = 0
+            self.bị_giới_hạn = 0
+            self.số_byte = 0
+
+    def cộng(self, tên: str, giá_trị: int = 1):
+        with self._khóa:
+            setattr(self, tên, getattr(self, tên) + giá_trị)
+
+    def ảnh_chụp(self) -> Dict[str, int]:
+        with self._khóa:
+            # Mỗi lần gửi (kể cả thử lại) không mở kết nối mới là một lần tái sử dụng
+            tái_sử_dụng = max(0, self.yêu_cầu + self.thử_lại - self.kết_nối_mới)
+            return {
+                "yêu_cầu": self.yêu_cầu,
+                "tái_sử_dụng": tái_sử_dụng,
+                "kết_nối_mới": self.kết_nối_mới,
+                "thử_lại": self.thử_lại,
+                "bị_giới_hạn": self.bị_giới_hạn,
+                "số_byte": self.số_byte,
+            }
+
+THỐNG_KÊ = ThốngKêHTTP()
+
+class _ThửLạiCóĐếm(Retry):
+    def increment(self, *args, **kwargs):
+        THỐNG_KÊ.cộng("thử_lại")
+        return super().increment(*args, **kwargs)
+
+class _PoolHTTPCóĐếm(HTTPConnectionPool):
+    def _new_conn(self):
+        THỐNG_KÊ.cộng("kết_nối_mới")
+        return super()._new_conn()
+
+class _PoolHTTPSCóĐếm(HTTPSConnectionPool):
+    def _new_conn(self):
+        THỐNG_KÊ.cộng("kết_nối_mới")
+        return super()._new_conn()
+
+class _BộChuyểnĐổiCóĐếm(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _PoolHTTPCóĐếm, "https": _PoolHTTPSCóĐếm}
+
+_phiên: Optional[requests.Session] = None
+_khóa_phiên = threading.Lock()
+
+def tạo_phiên() -> requests.Session:
+    """Tạo phiên mới với pool kết nối và chính sách thử lại theo CẤU_HÌNH"""
+    thử_lại = _ThửLạiCóĐếm(
+        total=CẤU_HÌNH["HTTP_RETRY_TOTAL"],
+        backoff_factor=CẤU_HÌNH["HTTP_RETRY_BACKOFF"],
+        # 429 không thử lại ở đây: gửi_get xử lý qua xô token của nhà cung cấp
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    bộ_chuyển_đổi = _BộChuyểnĐổiCóĐếm(
+        pool_connections=CẤU_HÌNH["HTTP_POOL_HOSTS"],
+        pool_maxsize=CẤU_HÌNH["HTTP_POOL_MAXSIZE"],
+        max_retries=thử_lại,
+    )
+    phiên = requests.Session()
+    phiên.mount("http://", bộ_chuyển_đổi)
+    phiên.mount("https://", bộ_chuyển_đổi)
+    phiên.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    return phiên
+
+def lấy_phiên() -> requests.Session:
+    """Trả về phiên dùng chung, khởi tạo lần đầu khi cần"""
+    global _phiên
+    if _phiên is None:
+        with _khóa_phiên:
+            if _phiên is None:
+                _phiên = tạo_phiên()
+    return _phiên
+
+def gửi_get(url: str, tham_số: Dict[str, Any] = None, headers: Dict[str, str] = None,
+            thời_gian_chờ: int = 10) -> requests.Response:
+    """GET qua phiên dùng chung: chờ token của nhà cung cấp, xử lý 429 và cập nhật bộ đếm"""
+    xô = BỘ_GIỚI_HẠN.tìm(url)
+    số_lần_thử = CẤU_HÌNH["HTTP_RETRY_TOTAL"]
+    for lần in range(số_lần_thử + 1):
+        if xô is not None:
+            xô.lấy(ưu_tiên_hiện_tại())
+        THỐNG_KÊ.cộng("yêu_cầu")
+        phản_hồi = lấy_phiên().get(url, params=tham_số, headers=headers, timeout=thời_gian_chờ)
+        nội_dung = phản_hồi.content
+        # Đếm byte trên đường truyền (trước giải nén) nếu urllib3 cho biết
+        try:
+            số_byte = phản_hồi.raw.tell() or len(nội_dung)
+        except Exception:
+            số_byte = len(nội_dung)
+        THỐNG_KÊ.cộng("số_byte", số_byte)
+        if phản_hồi.status_code != 429 or lần == số_lần_thử:
+            return phản_hồi
+
+        THỐNG_KÊ.cộng("bị_giới_hạn")
+        chờ = _giây_retry_after(phản_hồi, CẤU_HÌNH["HTTP_RETRY_BACKOFF"] * (2 ** lần))
+        if xô is not None:
+            xô.tạm_dừng(chờ)
+        else:
+            time.sleep(chờ)
+    return phản_hồi
+
+def _giây_retry_after(phản_hồi: requests.Response, mặc_định: float) -> float:
+    """Số giây trong header Retry-After; dạng ngày HTTP hoặc thiếu thì dùng mặc định"""
+    try:
+        return max(0.0, float(phản_hồi.headers.get("Retry-After", "")))
+    except ValueError:
+        return mặc_định
+
+def lấy_thống_kê() -> Dict[str, int]:
+    """Ảnh chụp bộ đếm hiện tại"""
+    return THỐNG_KÊ.ảnh_chụp()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Chấm Điểm Tăng Dần Theo Ảnh Chụp
+--------------------
+Giữ dữ liệu hợp đồng đã phân tích và kết quả của lần chạy trước trong một file
+trạng thái. Ở lần chạy sau, đầu vào được so sánh theo từng mã bằng dấu vân tay
+của bản ghi gốc (p/sm/cin/cout/st/bv):
+- Mã mới hoặc có thay đổi: chạy lại tính_đà_dòng_tiền, xác_định_xu_hướng_dòng_tiền và chấm điểm
+- Mã không đổi: giữ nguyên kết quả cũ
+Trạng thái bị bỏ qua toàn bộ khi ngưỡng điểm ròng hoặc dữ liệu vĩ mô thay đổi,
+vì khi đó mọi điểm số đều phải tính lại.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from alpha_signal_checker_plus import (
+    KếtQuảTínHiệu,
+    NgữCảnhChạy,
+    chấm_điểm_hợp_đồng,
+    lặp_dữ_liệu_hợp_đồng_tương_lai,
+    trích_xuất_mã_từ_cặp,
+)
+
+PHIÊN_BẢN_TRẠNG_THÁI = 1
+
+# Các trường của bản ghi gốc ảnh hưởng tới dữ liệu hợp đồng
+TRƯỜNG_VÂN_TAY = ("p", "sm", "cin", "cout", "st", "bv")
+
+@dataclass
+class TậpThayĐổi:
+    mới: List[str] = field(default_factory=list)
+    thay_đổi: List[str] = field(default_factory=list)
+    không_đổi: List[str] = field(default_factory=list)
+    bị_xóa: List[str] = field(default_factory=list)
+
+    def tóm_tắt(self) -> str:
+        return (f"{len(self.mới)} mới, {len(self.thay_đổi)} thay đổi, "
+                f"{len(self.không_đổi)} không đổi, {len(self.bị_xóa)} bị xóa")
+
+def dấu_vân_tay_mục(mục: Dict[str, Any]) -> str:
+    """Băm ổn định các trường đầu vào của một bản ghi"""
+    chuẩn_hóa = json.dumps({k: mục.get(k) for k in TRƯỜNG_VÂN_TAY}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(chuẩn_hóa.encode("utf-8"), digest_size=16).hexdigest()
+
+def đọc_trạng_thái(đường_dẫn: str) -> Optional[Dict[str, Any]]:
+    """Đọc file trạng thái; None nếu chưa có hoặc không dùng được"""
+    if not os.path.exists(đường_dẫn):
+        return None
+    try:
+        with open(đường_dẫn, "r", encoding="utf-8") as f:
+            trạng_thái = json.load(f)
+    except Exception as e:
+        print(f"Lỗi đọc file trạng thái: {e}")
+        return None
+    if trạng_thái.get("phiên_bản") != PHIÊN_BẢN_TRẠNG_THÁI:
+        return None
+    return trạng_thái
+
+def ghi_trạng_thái(đường_dẫn: str, trạng_thái: Dict[str, Any]):
+    """Ghi nguyên tử (file tạm + os.replace) để không để lại trạng thái hỏng"""
+    tạm = đường_dẫn + ".tmp"
+    with open(tạm, "w", encoding="utf-8") as f:
+        json.dump(trạng_thái, f, ensure_ascii=False)
+    os.replace(tạm, đường_dẫn)
+
+def _khôi_phục_kết_quả(dữ_liệu: Dict[str, Any], ngữ_cảnh: NgữCảnhChạy) -> KếtQuảTínHiệu:
+    kết_quả = KếtQuảTínHiệu(**dữ_liệu)
+    # Phần vĩ mô không lưu theo mã, gắn lại dict dùng chung của lần chạy
+    kết_quả.thành_phần["vĩ_mô"] = ngữ_cảnh.thành_phần_vĩ_mô
+    return kết_quả
+
+def chấm_điểm_tăng_dần(dữ_liệu_đầu_vào: Iterable[Dict[str, Any]], trạng_thái_cũ: Optional[Dict[str, Any]],
+                        điểm_ròng_tối_thiểu: float, ngữ_cảnh: NgữCảnhChạy,
+                        số_tiến_trình: int = 1) -> Tuple[List[KếtQuảTínHiệu], Dict[str, Any], TậpThayĐổi]:
+    """Chỉ chấm điểm lại mã mới/thay đổi; trả về (kết quả theo thứ tự đầu vào, trạng thái mới, tập thay đổi)"""
+    # Giống phân_tích_dữ_liệu_hợp_đồng_tương_lai: bản ghi sau ghi đè, giữ vị trí xuất hiện đầu tiên
+    mục_theo_mã: Dict[str, Dict[str, Any]] = {}
+    for mục in dữ_liệu_đầu_vào:
+        mã = trích_xuất_mã_từ_cặp(mục.get("p", ""))
+        if mã:
+            mục_theo_mã[mã] = mục
+
+    cũ: Dict[str, Any] = {}
+    if (trạng_thái_cũ is not None
+            and trạng_thái_cũ.get("điểm_ròng_tối_thiểu") == điểm_ròng_tối_thiểu
+            and trạng_thái_cũ.get("vĩ_mô") == ngữ_cảnh.thành_phần_vĩ_mô):
+        cũ = trạng_thái_cũ.get("mã", {})
+
+    tập_thay_đổi = TậpThayĐổi()
+    vân_tay: Dict[str, str] = {}
+    cần_chấm: List[Dict[str, Any]] = []
+    for mã, mục in mục_theo_mã.items():
+        vân_tay[mã] = dấu_vân_tay_mục(mục)
+        if mã not in cũ:
+            tập_thay_đổi.mới.append(mã)
+            cần_chấm.append(mục)
+        elif cũ[mã]["vân_tay"] != vân_tay[mã]:
+            tập_thay_đổi.thay_đổi.append(mã)
+            cần_chấm.append(mục)
+        else:
+            tập_thay_đổi.không_đổi.append(mã)
+    tập_thay_đổi.bị_xóa = [mã for mã in cũ if mã not in mục_theo_mã]
+
+    chấm_mới = {
+        kq.mã: kq for kq in chấm_điểm_hợp_đồng(
+            lặp_dữ_liệu_hợp_đồng_tương_lai(cần_chấm), điểm_ròng_tối_thiểu, ngữ_cảnh, số_tiến_trình
+        )
+    }
+
+    kết_quả: List[KếtQuảTínHiệu] = []
+    trạng_thái_mã: Dict[str, Any] = {}
+    for mã in mục_theo_mã:
+        if mã in chấm_mới:
+            kq = chấm_mới[mã]
+            dữ_liệu = asdict(kq)
+            dữ_liệu["thành_phần"].pop("vĩ_mô", None)
+        else:
+            dữ_liệu = cũ[mã]["kết_quả"]
+            kq = _khôi_phục_kết_quả(json.loads(json.dumps(dữ_liệu)), ngữ_cảnh)
+        kết_quả.append(kq)
+        trạng_thái_mã[mã] = {"vân_tay": vân_tay[mã], "kết_quả": dữ_liệu}
+
+    trạng_thái_mới = {
+        "phiên_bản": PHIÊN_BẢN_TRẠNG_THÁI,
+        "điểm_ròng_tối_thiểu": điểm_ròng_tối_thiểu,
+        "vĩ_mô": ngữ_cảnh.thành_phần_vĩ_mô,
+        "mã": trạng_thái_mã,
+    }
+    return kết_quả, trạng_thái_mới, tập_thay_đổi
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Đọc JSON Theo Luồng
+--------------------
+Đọc từng bản ghi từ file lớn mà không nạp cả file vào bộ nhớ:
+- Mảng JSON ([{...}, {...}]) được giải mã tăng dần theo từng khối
+- JSON phân tách theo dòng (NDJSON): mỗi dòng một bản ghi
+Định dạng được tự nhận diện từ ký tự đầu tiên của file. Phần tử lỗi được báo ngay khi
+bộ đệm đã chứa trọn phần tử đó, không đọc tiếp phần còn lại của file.
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+KÍCH_THƯỚC_KHỐI = 1 << 16
+
+def _phần_tử_đã_trọn(bộ_đệm: str, vị_trí: int) -> bool:
+    """Bộ đệm đã chứa hết phần tử bắt đầu tại vị_trí chưa (đóng ngoặc, hoặc gặp ',' / ']' ở cấp mảng)"""
+    độ_sâu = 0
+    trong_chuỗi = thoát = False
+    for ký_tự in bộ_đệm[vị_trí:]:
+        if trong_chuỗi:
+            if thoát:
+                thoát = False
+            elif ký_tự == "\\":
+                thoát = True
+            elif ký_tự == '"':
+                trong_chuỗi = False
+        elif ký_tự == '"':
+            trong_chuỗi = True
+        elif ký_tự in "[{":
+            độ_sâu += 1
+        elif ký_tự in "]}":
+            độ_sâu -= 1
+            if độ_sâu <= 0:
+                return True
+        elif ký_tự == "," and độ_sâu == 0:
+            return True
+    return False
+
+def lặp_mảng_json(tệp: TextIO, kích_thước_khối: int = KÍCH_THƯỚC_KHỐI) -> Iterator[Any]:
+    """Sinh từng phần tử của một mảng JSON ở cấp cao nhất"""
+    bộ_giải_mã = json.JSONDecoder()
+    bộ_đệm = ""
+    vị_trí = 0
+    hết_file = False
+    đã_mở_mảng = False
+
+    def đọc_thêm() -> bool:
+        nonlocal bộ_đệm, vị_trí, hết_file
+        khối = tệp.read(kích_thước_khối)
+        if not khối:
+            hết_file = True
+            return False
+        # Bỏ phần đã tiêu thụ để bộ đệm không phình theo kích thước file
+        bộ_đệm = bộ_đệm[vị_trí:] + khối
+        vị_trí = 0
+        return True
+
+    while True:
+        # Bỏ qua khoảng trắng và dấu phẩy giữa các phần tử
+        while vị_trí < len(bộ_đệm) and bộ_đệm[vị_trí] in " \t\r\n,":
+            vị_trí += 1
+        if vị_trí >= len(bộ_đệm):
+            if not đọc_thêm():
+                if đã_mở_mảng:
+                    raise ValueError("Mảng JSON chưa được đóng")
+                return
+            continue
+
+        if not đã_mở_mảng:
+            if bộ_đệm[vị_trí] != "[":
+                raise ValueError("File không bắt đầu bằng mảng JSON")
+            đã_mở_mảng = True
+            vị_trí += 1
+            continue
+
+        if bộ_đệm[vị_trí] == "]":
+            return
+
+        try:
+            giá_trị, kết_thúc = bộ_giải_mã.raw_decode(bộ_đệm, vị_trí)
+        except json.JSONDecodeError:
+            # Phần tử đã trọn mà vẫn lỗi thì đọc thêm cũng không sửa được
+            if _phần_tử_đã_trọn(bộ_đệm, vị_trí) or not đọc_thêm():
+                raise
+            continue
+        # Giá trị chạm cuối bộ đệm có thể bị cắt dở (ví dụ số), đọc thêm rồi giải mã lại
+        if kết_thúc == len(bộ_đệm) and not hết_file:
+            đọc_thêm()
+            continue
+        vị_trí = kết_thúc
+        yield giá_trị
+
+def lặp_ndjson(tệp: TextIO) -> Iterator[Any]:
+    """Sinh từng bản ghi của file JSON phân tách theo dòng"""
+    for dòng in tệp:
+        dòng = dòng.strip()
+        if dòng:
+            yield json.loads(dòng)
+
+def lặp_bản_ghi(tệp: TextIO) -> Iterator[Any]:
+    """Sinh từng bản ghi của file đã mở, tự nhận diện mảng JSON hay NDJSON"""
+    ký_tự_đầu = ""
+    while True:
+        ký_tự = tệp.read(1)
+        if not ký_tự or not ký_tự.isspace():
+            ký_tự_đầu = ký_tự
+            break
+    tệp.seek(0)
+    if ký_tự_đầu == "[":
+        yield from lặp_mảng_json(tệp)
+    else:
+        yield from lặp_ndjson(tệp)
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Đo Lường Pipeline
+--------------------
+Biết thời gian của một lần chạy đi đâu: mạng, chấm điểm hay ghi kết quả:
+- Biểu đồ độ trễ (bucket cố định kiểu Prometheus) theo (giai đoạn, nhãn): đọc đầu vào,
+  ngữ cảnh, lấy dữ liệu, chấm điểm, ghi kết quả; giai đoạn "http" có nhãn là nhà cung cấp
+- Bộ đếm sự kiện: yêu cầu lỗi theo nhà cung cấp, lần dùng dữ liệu mẫu, thành phần thiếu dữ liệu
+- Chế độ chi tiết (--profile, bảng đo lường trên dashboard): thời gian từng mã và các mã chậm nhất
+- Xuất báo cáo văn bản, dict cho dashboard và định dạng văn bản Prometheus
+- Tiến trình con (--workers) xuất trạng thái để tiến trình chính gộp lại
+"""
+
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+# Cận trên (giây) của các bucket; bucket cuối cùng là +Inf
+CÁC_NGƯỠNG_GIÂY = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class BiểuĐồĐộTrễ:
+    """Số lần quan sát theo bucket cùng tổng, nhỏ nhất, lớn nhất; không an toàn luồng (BộĐoLường giữ khóa)"""
+
+    def __init__(self, các_ngưỡng: Tuple[float, ...] = CÁC_NGƯỠNG_GIÂY):
+        self.các_ngưỡng = các_ngưỡng
+        self.đếm = [0] * (len(các_ngưỡng) + 1)
+        self.số_lần = 0
+        self.tổng = 0.0
+        self.nhỏ_nhất = float("inf")
+        self.lớn_nhất = 0.0
+
+    def ghi(self, giây: float):
+        self.đếm[bisect_left(self.các_ngưỡng, giây)] += 1
+        self.số_lần += 1
+        self.tổng += giây
+        if giây < self.nhỏ_nhất:
+            self.nhỏ_nhất = giây
+        if giây > self.lớn_nhất:
+            self.lớn_nhất = giây
+
+    def gộp(self, khác: "BiểuĐồĐộTrễ"):
+        self.đếm = [a + b for a, b in zip(self.đếm, khác.đếm)]
+        self.số_lần += khác.số_lần
+        self.tổng += khác.tổng
+        self.nhỏ_nhất = min(self.nhỏ_nhất, khác.nhỏ_nhất)
+        self.lớn_nhất = max(self.lớn_nhất, khác.lớn_nhất)
+
+    def phân_vị(self, q: float) -> float:
+        """Ước lượng phân vị bằng nội suy tuyến tính trong bucket chứa nó"""
+        if self.số_lần == 0:
+            return 0.0
+        mục_tiêu = q * self.số_lần
+        tích_lũy = 0
+        for i, số in enumerate(self.đếm):
+            if số and tích_lũy + số >= mục_tiêu:
+                dưới = self.các_ngưỡng[i - 1] if i > 0 else 0.0
+                trên = self.các_ngưỡng[i] if i < len(self.các_ngưỡng) else self.lớn_nhất
+                giá_trị = dưới + (trên - dưới) * (mục_tiêu - tích_lũy) / số
+                return min(max(giá_trị, self.nhỏ_nhất), self.lớn_nhất)
+            tích_lũy += số
+        return self.lớn_nhất
+
+    def tóm_tắt(self) -> Dict[str, float]:
+        return {
+            "số_lần": self.số_lần,
+            "tổng_giây": round(self.tổng, 6),
+            "tb_ms": round(self.tổng / self.số_lần * 1000, 3) if self.số_lần else 0.0,
+            "p50_ms": round(self.phân_vị(0.5) * 1000, 3),
+            "p95_ms": round(self.phân_vị(0.95) * 1000, 3),
+            "p99_ms": round(self.phân_vị(0.99) * 1000, 3),
+            "tối_đa_ms": round(self.lớn_nhất * 1000, 3),
+        }
+
+def _thoát_nhãn(giá_trị: str) -> str:
+    return str(giá_trị).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class BộĐoLường:
+    """Sổ đo lường an toàn luồng cho cả tiến trình: biểu đồ độ trễ, bộ đếm và thời gian từng mã"""
+
+    def __init__(self, số_mã_chậm_nhất: int = 20):
+        self._khóa = threading.Lock()
+        self.số_mã_chậm_nhất = số_mã_chậm_nhất
+        # Bật để ghi thời gian từng mã (tốn thêm một lần đo mỗi mã)
+        self.chi_tiết = False
+        self.đặt_lại()
+
+    def đặt_lại(self):
+        with self._khóa:
+            self._biểu_đồ: Dict[Tuple[str, str], BiểuĐồĐộTrễ] = {}
+            self._bộ_đếm: Dict[Tuple[str, str], int] = {}
+            self._lỗi_gần_nhất: Dict[str, str] = {}
+            # Heap nhỏ nhất (giây, mã): gốc là mã nhanh nhất trong nhóm chậm nhất
+            self._mã_chậm: List[Tuple[float, str]] = []
+            self.bắt_đầu = time.time()
+
+    def ghi(self, giai_đoạn: str, giây: float, nhãn: str = ""):
+        """Ghi một lần quan sát độ trễ của giai đoạn"""
+        with self._khóa:
+            biểu_đồ = self._biểu_đồ.get((giai_đoạn, nhãn))
+            if biểu_đồ is None:
+                biểu_đồ = self._biểu_đồ[(giai_đoạn, nhãn)] = BiểuĐồĐộTrễ()
+            biểu_đồ.ghi(giây)
+
+    @contextmanager
+    def đo(self, giai_đoạn: str, nhãn: str = ""):
+        """Đo khối lệnh bên trong, kể cả khi có ngoại lệ"""
+        bắt_đầu = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ghi(giai_đoạn, time.perf_counter() - bắt_đầu, nhãn)
+
+    def đếm(self, tên: str, nhãn: str = "", số: int = 1):
+        with self._khóa:
+            self._bộ_đếm[(tên, nhãn)] = self._bộ_đếm.get((tên, nhãn), 0) + số
+
+    def ghi_lỗi(self, nhà_cung_cấp: str, thông_báo: str):
+        """Đếm một yêu cầu lỗi; chỉ in lỗi đầu tiên của mỗi nhà cung cấp, còn lại xem trong báo cáo"""
+        with self._khóa:
+            lần_đầu = nhà_cung_cấp not in self._lỗi_gần_nhất
+            self._lỗi_gần_nhất[nhà_cung_cấp] = thông_báo
+            khóa = ("lỗi_yêu_cầu", nhà_cung_cấp)
+            self._bộ_đếm[khóa] = self._bộ_đếm.get(khóa, 0) + 1
+        if lần_đầu:
+            print(f"Lỗi yêu cầu API ({nhà_cung_cấp}): {thông_báo} — lỗi tiếp theo chỉ được đếm")
+
+    def ghi_mã(self, mã: str, giây: float):
+        """Thời gian xử lý một mã (chỉ khi bật chi_tiết)"""
+        with self._khóa:
+            biểu_đồ = self._biểu_đồ.get(("từng_mã", ""))
+            if biểu_đồ is None:
+                biểu_đồ = self._biểu_đồ[("từng_mã", "")] = BiểuĐồĐộTrễ()
+            biểu_đồ.ghi(giây)
+            if len(self._mã_chậm) < self.số_mã_chậm_nhất:
+                heapq.heappush(self._mã_chậm, (giây, mã))
+            elif self._mã_chậm and giây > self._mã_chậm[0][0]:
+                heapq.heapreplace(self._mã_chậm, (giây, mã))
+
+    def xuất(self) -> Dict[str, Any]:
+        """Trạng thái thô (pickle được) để tiến trình khác gộp vào"""
+        with self._khóa:
+            return {
+                "biểu_đồ": {khóa: (bd.đếm[:], bd.số_lần, bd.tổng, bd.nhỏ_nhất, bd.lớn_nhất)
+                            for khóa, bd in self._biểu_đồ.items()},
+                "bộ_đếm": dict(self._bộ_đếm),
+                "lỗi_gần_nhất": dict(self._lỗi_gần_nhất),
+                "mã_chậm": list(self._mã_chậm),
+            }
+
+    def gộp(self, trạng_thái: Dict[str, Any]):
+        """Cộng trạng thái do xuất() của tiến trình khác trả về"""
+        with self._khóa:
+            for khóa, (đếm, số_lần, tổng, nhỏ_nhất, lớn_nhất) in trạng_thái["biểu_đồ"].items():
+                khác = BiểuĐồĐộTrễ()
+                khác.đếm, khác.số_lần, khác.tổng, khác.nhỏ_nhất, khác.lớn_nhất = đếm, số_lần, tổng, nhỏ_nhất, lớn_nhất
+                self._biểu_đồ.setdefault(khóa, BiểuĐồĐộTrễ()).gộp(khác)
+            for khóa, số in trạng_thái["bộ_đếm"].items():
+                self._bộ_đếm[khóa] = self._bộ_đếm.get(khóa, 0) + số
+            self._lỗi_gần_nhất.update(trạng_thái["lỗi_gần_nhất"])
+            self._mã_chậm = heapq.nlargest(self.số_mã_chậm_nhất, self._mã_chậm + trạng_thái["mã_chậm"])
+            heapq.heapify(self._mã_chậm)
+
+    def ảnh_chụp(self) -> Dict[str, Any]:
+        """Dạng dict cho dashboard: tóm tắt từng biểu đồ, bộ đếm, lỗi gần nhất và mã chậm nhất"""
+        with self._khóa:
+            return {
+                "giai_đoạn": [dict(giai_đoạn=gđ, nhãn=nhãn, **bd.tóm_tắt())
+                              for (gđ, nhãn), bd in self._biểu_đồ.items()],
+                "bộ_đếm": [{"tên": tên, "nhãn": nhãn, "số": số} for (tên, nhãn), số in sorted(self._bộ_đếm.items())],
+                "lỗi_gần_nhất": dict(self._lỗi_gần_nhất),
+                "mã_chậm_nhất": [{"mã": mã, "ms": round(giây * 1000, 3)}
+                                 for giây, mã in sorted(self._mã_chậm, reverse=True)],
+            }
+
+    def báo_cáo(self, tổng_giây: float = None) -> str:
+        """Báo cáo văn bản cho --profile; tổng_giây để tính tỷ lệ của từng giai đoạn"""
+        số_liệu = self.ảnh_chụp()
+        dòng = [f"{'Giai đoạn':<28} {'Số lần':>8} {'Tổng (s)':>10} {'%':>6} {'TB (ms)':>10} "
+                f"{'p50 (ms)':>10} {'p95 (ms)':>10} {'Tối đa (ms)':>12}", "-" * 100]
+        for mục in sorted(số_liệu["giai_đoạn"], key=lambda m: (m["giai_đoạn"] == "http", -m["tổng_giây"])):
+            tên = f"{mục['giai_đoạn']}[{mục['nhãn']}]" if mục["nhãn"] else mục["giai_đoạn"]
+            tỷ_lệ = f"{mục['tổng_giây'] / tổng_giây * 100:.1f}" if tổng_giây else ""
+            dòng.append(f"{tên:<28} {mục['số_lần']:>8} {mục['tổng_giây']:>10.3f} {tỷ_lệ:>6} {mục['tb_ms']:>10.3f} "
+                        f"{mục['p50_ms']:>10.3f} {mục['p95_ms']:>10.3f} {mục['tối_đa_ms']:>12.3f}")
+        if số_liệu["bộ_đếm"]:
+            dòng.append("\nSự kiện:")
+            dòng.extend(f"   {m['tên']}[{m['nhãn']}]: {m['số']}" if m["nhãn"] else f"   {m['tên']}: {m['số']}"
+                        for m in số_liệu["bộ_đếm"])
+        if số_liệu["lỗi_gần_nhất"]:
+            dòng.append("\nLỗi gần nhất:")
+            dòng.extend(f"   {ncc}: {thông_báo}" for ncc, thông_báo in số_liệu["lỗi_gần_nhất"].items())
+        if số_liệu["mã_chậm_nhất"]:
+            dòng.append("\nMã chậm nhất:")
+            dòng.extend(f"   {m['mã']}: {m['ms']:.3f} ms" for m in số_liệu["mã_chậm_nhất"])
+        return "\n".join(dòng)
+
+    def sang_prometheus(self, bổ_sung: Dict[str, Dict[str, Any]] = None, tiền_tố: str = "tin_hieu") -> str:
+        """Định dạng văn bản Prometheus; bổ_sung {nhóm: {tên: số}} xuất thành gauge (bộ đếm HTTP, bộ nhớ đệm...)"""
+        with self._khóa:
+            biểu_đồ = sorted(self._biểu_đồ.items())
+            bộ_đếm = sorted(self._bộ_đếm.items())
+        dòng = [f"# HELP {tiền_tố}_giai_doan_giay Độ trễ theo giai đoạn pipeline (giây)",
+                f"# TYPE {tiền_tố}_giai_doan_giay histogram"]
+        for (gđ, nhãn), bd in biểu_đồ:
+            nhãn_chung = f'giai_doan="{_thoát_nhãn(gđ)}",nhan="{_thoát_nhãn(nhãn)}"'
+            tích_lũy = 0
+            for ngưỡng, số in zip(bd.các_ngưỡng + (float("inf"),), bd.đếm):
+                tích_lũy += số
+                le = "+Inf" if ngưỡng == float("inf") else repr(ngưỡng)
+                dòng.append(f'{tiền_tố}_giai_doan_giay_bucket{{{nhãn_chung},le="{le}"}} {tích_lũy}')
+            dòng.append(f"{tiền_tố}_giai_doan_giay_sum{{{nhãn_chung}}} {bd.tổng!r}")
+            dòng.append(f"{tiền_tố}_giai_doan_giay_count{{{nhãn_chung}}} {bd.số_lần}")
+        dòng += [f"# HELP {tiền_tố}_su_kien_tong Số sự kiện (lỗi yêu cầu, dữ liệu mẫu, thiếu dữ liệu)",
+                 f"# TYPE {tiền_tố}_su_kien_tong counter"]
+        dòng.extend(f'{tiền_tố}_su_kien_tong{{ten="{_thoát_nhãn(tên)}",nhan="{_thoát_nhãn(nhãn)}"}} {số}'
+                    for (tên, nhãn), số in bộ_đếm)
+        for nhóm, giá_trị in (bổ_sung or {}).items():
+            tên_số_liệu = f"{tiền_tố}_{nhóm}"
+            dòng.append(f"# TYPE {tên_số_liệu} gauge")
+            dòng.extend(f'{tên_số_liệu}{{ten="{_thoát_nhãn(tên)}"}} {số}' for tên, số in giá_trị.items()
+                        if isinstance(số, (int, float)) and not isinstance(số, bool))
+        return "\n".join(dòng) + "\n"
+
+    def ghi_prometheus(self, đường_dẫn: str, bổ_sung: Dict[str, Dict[str, Any]] = None):
+        """Ghi file văn bản Prometheus (ghi file tạm rồi đổi tên, cho textfile collector của node_exporter)"""
+        tạm = f"{đường_dẫn}.{os.getpid()}.tmp"
+        with open(tạm, "w", encoding="utf-8") as f:
+            f.write(self.sang_prometheus(bổ_sung))
+        os.replace(tạm, đường_dẫn)
+
+ĐO_LƯỜNG = BộĐoLường()
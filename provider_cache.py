@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Nhớ Đệm Phản Hồi Nhà Cung Cấp
+--------------------
+Bộ nhớ đệm TTL + LRU đặt dưới các hàm lấy_*, khóa theo (nguồn, mã):
+- TTL riêng cho từng nguồn (vĩ mô sống hàng giờ, tin tức vài phút)
+- Giới hạn số mục trong bộ nhớ, loại bỏ mục ít dùng nhất (LRU)
+- Lưu trữ SQLite tùy chọn để giữ dữ liệu qua các lần khởi động lại
+- Thống kê trúng/trượt/loại bỏ để hiển thị trên dashboard
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+class BộNhớĐệmNhàCungCấp:
+    """Bộ nhớ đệm TTL/LRU an toàn luồng với lưu trữ đĩa tùy chọn"""
+
+    def __init__(self, ttl_theo_nguồn: Dict[str, float], dung_lượng_tối_đa: int = 5000,
+                 đường_dẫn_đĩa: str = ""):
+        self._ttl = dict(ttl_theo_nguồn)
+        self._dung_lượng = dung_lượng_tối_đa
+        self._dữ_liệu: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._khóa = threading.Lock()
+        self._thống_kê = {"trúng": 0, "trúng_đĩa": 0, "trượt": 0, "hết_hạn": 0, "loại_bỏ": 0}
+        self._db: Optional["sqlite3.Connection"] = None
+        if đường_dẫn_đĩa:
+            self._mở_đĩa(đường_dẫn_đĩa)
+
+    def _mở_đĩa(self, đường_dẫn: str):
+        # Chỉ nạp sqlite3 khi bật tầng đĩa (CACHE_DB)
+        import sqlite3
+        try:
+            self._db = sqlite3.connect(đường_dẫn, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS bo_nho_dem ("
+                "nguon TEXT NOT NULL, khoa TEXT NOT NULL, gia_tri TEXT NOT NULL, het_han REAL NOT NULL, "
+                "PRIMARY KEY (nguon, khoa))"
+            )
+            self._db.execute("DELETE FROM bo_nho_dem WHERE het_han < ?", (time.time(),))
+            self._db.commit()
+        except Exception as e:
+            print(f"Lỗi mở bộ nhớ đệm đĩa: {e}")
+            self._db = None
+
+    def ttl(self, nguồn: str) -> float:
+        return self._ttl.get(nguồn, 0)
+
+    def lấy(self, nguồn: str, khóa: str, giải_mã: Callable[[Any], Any] = None) -> Tuple[bool, Any]:
+        """Trả về (trúng, giá_trị); đọc đĩa nếu bộ nhớ không có"""
+        with self._khóa:
+            mục = self._dữ_liệu.get((nguồn, khóa))
+            if mục is not None:
+                hết_hạn, giá_trị = mục
+                if hết_hạn > time.monotonic():
+                    self._dữ_liệu.move_to_end((nguồn, khóa))
+                    self._thống_kê["trúng"] += 1
+                    return True, giá_trị
+                del self._dữ_liệu[(nguồn, khóa)]
+                self._thống_kê["hết_hạn"] += 1
+
+            if self._db is not None:
+                hàng = self._db.execute(
+                    "SELECT gia_tri, het_han FROM bo_nho_dem WHERE nguon = ? AND khoa = ?", (nguồn, khóa)
+                ).fetchone()
+                if hàng is not None and hàng[1] > time.time():
+                    giá_trị = json.loads(hàng[0])
+                    if giải_mã is not None:
+                        giá_trị = giải_mã(giá_trị)
+                    self._ghi_bộ_nhớ(nguồn, khóa, giá_trị, hàng[1] - time.time())
+                    self._thống_kê["trúng_đĩa"] += 1
+                    return True, giá_trị
+
+            self._thống_kê["trượt"] += 1
+            return False, None
+
+    def đặt(self, nguồn: str, khóa: str, giá_trị: Any):
+        """Lưu giá trị với TTL của nguồn (bỏ qua nếu nguồn không có TTL)"""
+        ttl = self.ttl(nguồn)
+        if ttl <= 0:
+            return
+        with self._khóa:
+            self._ghi_bộ_nhớ(nguồn, khóa, giá_trị, ttl)
+            if self._db is not None:
+                try:
+                    dạng_thô = asdict(giá_trị) if is_dataclass(giá_trị) else giá_trị
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO bo_nho_dem VALUES (?, ?, ?, ?)",
+                        (nguồn, khóa, json.dumps(dạng_thô, ensure_ascii=False), time.time() + ttl),
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    print(f"Lỗi ghi bộ nhớ đệm đĩa: {e}")
+
+    def _ghi_bộ_nhớ(self, nguồn: str, khóa: str, giá_trị: Any, ttl: float):
+        self._dữ_liệu[(nguồn, khóa)] = (time.monotonic() + ttl, giá_trị)
+        self._dữ_liệu.move_to_end((nguồn, khóa))
+        while len(self._dữ_liệu) > self._dung_lượng:
+            self._dữ_liệu.popitem(last=False)
+            self._thống_kê["loại_bỏ"] += 1
+
+    def xóa(self, nguồn: str = None):
+        """Xóa toàn bộ hoặc chỉ một nguồn"""
+        with self._khóa:
+            if nguồn is None:
+                self._dữ_liệu.clear()
+            else:
+                for khóa in [k for k in self._dữ_liệu if k[0] == nguồn]:
+                    del self._dữ_liệu[khóa]
+            if self._db is not None:
+                if nguồn is None:
+                    self._db.execute("DELETE FROM bo_nho_dem")
+                else:
+                    self._db.execute("DELETE FROM bo_nho_dem WHERE nguon = ?", (nguồn,))
+                self._db.commit()
+
+    def lấy_thống_kê(self) -> Dict[str, int]:
+        with self._khóa:
+            thống_kê = dict(self._thống_kê)
+            thống_kê["số_mục"] = len(self._dữ_liệu)
+            return thống_kê
+
+    def bọc(self, nguồn: str, giải_mã: Callable[[Any], Any] = None):
+        """Decorator cho hàm lấy_*: khóa theo các tham số vị trí của lệnh gọi"""
+        def trang_trí(hàm):
+            @wraps(hàm)
+            def hàm_bọc(*args):
+                khóa = "|".join(str(a) for a in args)
+                trúng, giá_trị = self.lấy(nguồn, khóa, giải_mã)
+                if trúng:
+                    return giá_trị
+                giá_trị = hàm(*args)
+                # Không lưu kết quả rỗng/lỗi để lần sau thử lại
+                if giá_trị is not None and not (isinstance(giá_trị, (list, dict)) and not giá_trị):
+                    self.đặt(nguồn, khóa, giá_trị)
+                return giá_trị
+            hàm_bọc.bỏ_qua_bộ_nhớ_đệm = hàm
+            return hàm_bọc
+        return trang_trí
+
+    def bọc_lô(self, nguồn: str, giải_mã: Callable[[Any], Any] = None):
+        """Decorator cho hàm lấy_*_lô(các_mã) -> {mã: giá_trị}: chỉ gọi hàm cho các mã chưa có
+
+        Khóa theo từng mã, trùng với khóa của bọc() cho hàm một mã nên hai dạng dùng chung bộ nhớ đệm.
+        """
+        def trang_trí(hàm):
+            @wraps(hàm)
+            def hàm_bọc(các_mã: Sequence[str]) -> Dict[str, Any]:
+                kết_quả: Dict[str, Any] = {}
+                thiếu = []
+                for mã in dict.fromkeys(các_mã):
+                    trúng, giá_trị = self.lấy(nguồn, str(mã), giải_mã)
+                    if trúng:
+                        kết_quả[mã] = giá_trị
+                    else:
+                        thiếu.append(mã)
+                if thiếu:
+                    for mã, giá_trị in hàm(thiếu).items():
+                        kết_quả[mã] = giá_trị
+                        if giá_trị is not None:
+                            self.đặt(nguồn, str(mã), giá_trị)
+                return kết_quả
+            hàm_bọc.bỏ_qua_bộ_nhớ_đệm = hàm
+            return hàm_bọc
+        return trang_trí
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Lập Lịch Giới Hạn Tốc Độ Theo Nhà Cung Cấp
+--------------------
+Mỗi nhà cung cấp (CoinGecko, LunarCrush, CryptoPanic, NewsAPI, FRED...) có một
+xô token riêng, nhận diện theo tiền tố URL:
+- Yêu cầu xếp hàng và được cấp token đều đặn ở tốc độ tối đa cho phép
+- Hàng đợi ưu tiên: số nhỏ đi trước (hạng vốn hóa trong danh sách top coin)
+- Khi nhận 429, cả nhà cung cấp tạm dừng theo Retry-After thay vì từng luồng tự thử lại
+- Thống kê độ sâu hàng đợi, thời gian bị điều tiết và số lần 429
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from alpha_signal_checker_plus import CẤU_HÌNH
+
+class XôToken:
+    """Xô token an toàn luồng với hàng đợi ưu tiên cho các yêu cầu đang chờ"""
+
+    def __init__(self, tên: str, mỗi_phút: float, tức_thời: int = 1):
+        self.tên = tên
+        self.tốc_độ = mỗi_phút / 60.0
+        self.dung_lượng = max(1, tức_thời)
+        self._token = float(self.dung_lượng)
+        self._lần_nạp = time.monotonic()
+        self._tạm_dừng_đến = 0.0
+        self._hàng_đợi: List[Tuple[float, int]] = []
+        self._số_thứ_tự = itertools.count()
+        self._điều_kiện = threading.Condition()
+        # Thống kê
+        self.số_cấp = 0
+        self.độ_sâu_tối_đa = 0
+        self.tổng_thời_gian_chờ = 0.0
+        self.thời_gian_chờ_tối_đa = 0.0
+        self.số_lần_tạm_dừng = 0
+
+    def _nạp(self, bây_giờ: float):
+        self._token = min(self.dung_lượng, self._token + (bây_giờ - self._lần_nạp) * self.tốc_độ)
+        self._lần_nạp = bây_giờ
+
+    def lấy(self, ưu_tiên: float = 0.0) -> float:
+        """Chờ tới lượt và nhận một token; trả về số giây đã bị điều tiết"""
+        with self._điều_kiện:
+            vé = (ưu_tiên, next(self._số_thứ_tự))
+            heapq.heappush(self._hàng_đợi, vé)
+            self.độ_sâu_tối_đa = max(self.độ_sâu_tối_đa, len(self._hàng_đợi))
+            bắt_đầu = time.monotonic()
+            try:
+                while True:
+                    bây_giờ = time.monotonic()
+                    self._nạp(bây_giờ)
+                    if self._hàng_đợi[0] != vé:
+                        # Chưa tới lượt: chờ vé đứng đầu được cấp rồi xét lại
+                        self._điều_kiện.wait()
+                        continue
+                    if bây_giờ >= self._tạm_dừng_đến and self._token >= 1.0:
+                        heapq.heappop(self._hàng_đợi)
+                        self._token -= 1.0
+                        break
+                    self._điều_kiện.wait(max(self._tạm_dừng_đến - bây_giờ, (1.0 - self._token) / self.tốc_độ))
+            except BaseException:
+                # Bị ngắt khi đang chờ: rút vé để không chặn các yêu cầu sau
+                self._hàng_đợi.remove(vé)
+                heapq.heapify(self._hàng_đợi)
+                self._điều_kiện.notify_all()
+                raise
+            đã_chờ = bây_giờ - bắt_đầu
+            self.số_cấp += 1
+            self.tổng_thời_gian_chờ += đã_chờ
+            self.thời_gian_chờ_tối_đa = max(self.thời_gian_chờ_tối_đa, đã_chờ)
+            self._điều_kiện.notify_all()
+            return đã_chờ
+
+    def thử_lấy(self) -> bool:
+        """Lấy một token nếu có ngay, không chờ và không xếp hàng"""
+        with self._điều_kiện:
+            bây_giờ = time.monotonic()
+            self._nạp(bây_giờ)
+            if self._hàng_đợi or bây_giờ < self._tạm_dừng_đến or self._token < 1.0:
+                return False
+            self._token -= 1.0
+            self.số_cấp += 1
+            return True
+
+    def tạm_dừng(self, số_giây: float):
+        """Nhà cung cấp trả 429: không cấp token nào trong số_giây, bỏ phần đã tích lũy"""
+        with self._điều_kiện:
+            self._tạm_dừng_đến = max(self._tạm_dừng_đến, time.monotonic() + số_giây)
+            self._token = 0.0
+            self.số_lần_tạm_dừng += 1
+            self._điều_kiện.notify_all()
+
+    def lấy_thống_kê(self) -> Dict[str, Any]:
+        with self._điều_kiện:
+            return {
+                "mỗi_phút": round(self.tốc_độ * 60, 2),
+                "đã_cấp": self.số_cấp,
+                "đang_chờ": len(self._hàng_đợi),
+                "độ_sâu_tối_đa": self.độ_sâu_tối_đa,
+                "thời_gian_điều_tiết_s": round(self.tổng_thời_gian_chờ, 3),
+                "chờ_tối_đa_s": round(self.thời_gian_chờ_tối_đa, 3),
+                "số_lần_429": self.số_lần_tạm_dừng,
+            }
+
+class BộGiớiHạnTốcĐộ:
+    """Ánh xạ tiền tố URL sang xô token của nhà cung cấp"""
+
+    def __init__(self):
+        self._khóa = threading.Lock()
+        self._theo_tiền_tố: List[Tuple[str, XôToken]] = []
+        self._theo_tên: Dict[str, XôToken] = {}
+
+    def đăng_ký(self, tên: str, các_tiền_tố: Iterable[str], mỗi_phút: float, tức_thời: int = 1) -> Optional[XôToken]:
+        """Thêm hoặc thay giới hạn của một nhà cung cấp; mỗi_phút <= 0 để bỏ giới hạn"""
+        with self._khóa:
+            self._theo_tiền_tố = [(t, x) for t, x in self._theo_tiền_tố if x.tên != tên]
+            self._theo_tên.pop(tên, None)
+            if mỗi_phút <= 0:
+                return None
+            xô = XôToken(tên, mỗi_phút, tức_thời)
+            self._theo_tên[tên] = xô
+            self._theo_tiền_tố.extend((tiền_tố, xô) for tiền_tố in các_tiền_tố)
+            # Tiền tố dài hơn được so trước
+            self._theo_tiền_tố.sort(key=lambda mục: len(mục[0]), reverse=True)
+            return xô
+
+    def tìm(self, url: str) -> Optional[XôToken]:
+        for tiền_tố, xô in self._theo_tiền_tố:
+            if url.startswith(tiền_tố):
+                return xô
+        return None
+
+    def lấy_thống_kê(self) -> Dict[str, Dict[str, Any]]:
+        with self._khóa:
+            các_xô = dict(self._theo_tên)
+        return {tên: xô.lấy_thống_kê() for tên, xô in các_xô.items()}
+
+def tạo_bộ_giới_hạn() -> BộGiớiHạnTốcĐộ:
+    """Bộ giới hạn theo CẤU_HÌNH["RATE_LIMITS"]"""
+    bộ_giới_hạn = BộGiớiHạnTốcĐộ()
+    for tên, giới_hạn in CẤU_HÌNH["RATE_LIMITS"].items():
+        bộ_giới_hạn.đăng_ký(tên, giới_hạn["tiền_tố"], giới_hạn["mỗi_phút"], giới_hạn["tức_thời"])
+    return bộ_giới_hạn
+
+BỘ_GIỚI_HẠN = tạo_bộ_giới_hạn()
+
+# Ưu tiên của yêu cầu đang chạy trên luồng hiện tại (gán bởi fetch_engine)
+_cục_bộ = threading.local()
+
+@contextmanager
+def ưu_tiên(giá_trị: float):
+    """Gán ưu tiên cho mọi yêu cầu HTTP trong khối; số nhỏ được phục vụ trước"""
+    trước = getattr(_cục_bộ, "ưu_tiên", 0.0)
+    _cục_bộ.ưu_tiên = giá_trị
+    try:
+        yield
+    finally:
+        _cục_bộ.ưu_tiên = trước
+
+def ưu_tiên_hiện_tại() -> float:
+    return getattr(_cục_bộ, "ưu_tiên", 0.0)
+
+def lấy_thống_kê() -> Dict[str, Dict[str, Any]]:
+    """Thống kê hàng đợi và điều tiết của mọi nhà cung cấp"""
+    return BỘ_GIỚI_HẠN.lấy_thống_kê()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Chỉ Mục Kết Quả
+--------------------
+Tra cứu và xếp hạng kết quả mà không quét hay sắp xếp lại cả universe:
+- ĐỉnhK: chọn K mục tốt nhất từ luồng kết quả bằng heap kích thước K,
+  thứ tự giống sorted(...)[:K] kể cả khi bằng điểm
+- ChỉMụcKếtQuả: trên một BảngKếtQuả, giữ mã -> dòng, các nhóm theo
+  (độ_tin_cậy, tín_hiệu_chính) và xếp hạng MUA/BÁN top-K theo điểm ròng
+- Chỉ mục cập nhật tăng dần khi bảng được thêm dòng (dashboard hiện dần)
+"""
+
+import heapq
+from array import array
+from itertools import count
+from operator import itemgetter
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from alpha_signal_checker_plus import KếtQuảTínHiệu
+from result_table import ĐỘ_TIN_CẬY, TÍN_HIỆU_CHÍNH, BảngKếtQuả
+
+T = TypeVar("T")
+
+class ĐỉnhK(Generic[T]):
+    """Giữ K mục có khóa lớn nhất (hoặc nhỏ nhất) trong một luồng, O(log K) mỗi mục"""
+
+    def __init__(self, k: int, khóa: Callable[[T], float], lớn_nhất: bool = True):
+        self.k = k
+        self.khóa = khóa
+        self.lớn_nhất = lớn_nhất
+        # Số mục đã xét, kể cả mục không lọt top
+        self.số_mục = 0
+        self._heap: List[Tuple[float, int, T]] = []
+        self._thứ_tự = count()
+
+    def thêm(self, mục: T):
+        self.số_mục += 1
+        if self.k <= 0:
+            return
+        khóa = self.khóa(mục)
+        # Gốc heap là mục kém nhất; bằng khóa thì mục đến sau kém hơn, giống sắp xếp ổn định
+        giá_trị = (khóa if self.lớn_nhất else -khóa, -next(self._thứ_tự), mục)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, giá_trị)
+        elif giá_trị[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, giá_trị)
+
+    def kết_quả(self) -> List[T]:
+        """Các mục tốt nhất, tốt trước"""
+        return [mục for _, _, mục in sorted(self._heap, key=lambda g: g[:2], reverse=True)]
+
+class ChỉMụcKếtQuả:
+    """Chỉ mục trên các dòng của một BảngKếtQuả; gọi cập_nhật() sau khi bảng có thêm dòng"""
+
+    def __init__(self, bảng: BảngKếtQuả):
+        self.bảng = bảng
+        self._vị_trí: Dict[str, int] = {}
+        # Các dòng theo thứ tự trong bảng, nhóm theo (độ tin cậy, tín hiệu chính) và theo từng trường riêng;
+        # khóa là mã số của result_table, None = mọi giá trị
+        self._nhóm: Dict[Tuple[Optional[int], Optional[int]], array] = {
+            (a, b): array("i")
+            for a in (None,) + tuple(range(len(ĐỘ_TIN_CẬY))) for b in (None,) + tuple(range(len(TÍN_HIỆU_CHÍNH)))
+            if (a, b) != (None, None)
+        }
+        self._đã_lập = 0
+        self.cập_nhật()
+
+    @classmethod
+    def từ_kết_quả(cls, các_kết_quả: Iterable[KếtQuảTínHiệu]) -> "ChỉMụcKếtQuả":
+        return cls(BảngKếtQuả.từ_kết_quả(các_kết_quả))
+
+    def cập_nhật(self):
+        """Lập chỉ mục cho các dòng mới của bảng"""
+        bảng = self.bảng
+        for i in range(self._đã_lập, len(bảng)):
+            # Mã trùng giữ dòng đầu tiên, như df[df["mã"] == mã].iloc[0]
+            self._vị_trí.setdefault(bảng.mã[i], i)
+            a, b = bảng.độ_tin_cậy[i], bảng.tín_hiệu_chính[i]
+            self._nhóm[(a, b)].append(i)
+            self._nhóm[(a, None)].append(i)
+            self._nhóm[(None, b)].append(i)
+        self._đã_lập = len(bảng)
+
+    def __len__(self) -> int:
+        return self._đã_lập
+
+    def __contains__(self, mã: str) -> bool:
+        return mã in self._vị_trí
+
+    def vị_trí(self, mã: str) -> Optional[int]:
+        """Chỉ số dòng của mã trong bảng (và DataFrame xuất từ bảng), None nếu không có"""
+        return self._vị_trí.get(mã)
+
+    def dòng(self, mã: str) -> Optional[KếtQuảTínHiệu]:
+        i = self._vị_trí.get(mã)
+        return self.bảng.dòng(i) if i is not None else None
+
+    @staticmethod
+    def _khóa(độ_tin_cậy: Optional[str], tín_hiệu_chính: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        return (None if độ_tin_cậy is None else ĐỘ_TIN_CẬY.index(độ_tin_cậy),
+                None if tín_hiệu_chính is None else TÍN_HIỆU_CHÍNH.index(tín_hiệu_chính))
+
+    def nhóm(self, độ_tin_cậy: Optional[str] = None, tín_hiệu_chính: Optional[str] = None) -> Sequence[int]:
+        """Các dòng thuộc nhóm đã chọn (None = mọi giá trị), theo thứ tự trong bảng; chỉ đọc"""
+        khóa = self._khóa(độ_tin_cậy, tín_hiệu_chính)
+        if khóa == (None, None):
+            return range(self._đã_lập)
+        return self._nhóm[khóa]
+
+    def đếm(self, độ_tin_cậy: Optional[str] = None, tín_hiệu_chính: Optional[str] = None) -> int:
+        return len(self.nhóm(độ_tin_cậy, tín_hiệu_chính))
+
+    def mã_của(self, các_dòng: Sequence[int]) -> List[str]:
+        if len(các_dòng) < 2:
+            return [self.bảng.mã[i] for i in các_dòng]
+        return list(itemgetter(*các_dòng)(self.bảng.mã))
+
+    def top_mua(self, k: int, độ_tin_cậy: Optional[str] = None) -> List[int]:
+        """K dòng MUA có điểm ròng cao nhất"""
+        return heapq.nlargest(k, self.nhóm(độ_tin_cậy, "MUA"), key=self.bảng.điểm_ròng.__getitem__)
+
+    def top_bán(self, k: int, độ_tin_cậy: Optional[str] = None) -> List[int]:
+        """K dòng BÁN có điểm ròng thấp nhất"""
+        return heapq.nsmallest(k, self.nhóm(độ_tin_cậy, "BÁN"), key=self.bảng.điểm_ròng.__getitem__)
+
+    def thống_kê(self) -> Dict[str, Any]:
+        """Số dòng theo từng nhóm {độ_tin_cậy: {tín_hiệu_chính: số dòng}}"""
+        return {
+            ĐỘ_TIN_CẬY[a]: {TÍN_HIỆU_CHÍNH[b]: len(self._nhóm[(a, b)]) for b in range(len(TÍN_HIỆU_CHÍNH))}
+            for a in range(len(ĐỘ_TIN_CẬY))
+        }
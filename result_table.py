@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Bảng Kết Quả Dạng Cột
+--------------------
+Lưu kết quả của cả universe theo kiểu struct-of-arrays thay vì một list
+KếtQuảTínHiệu, mỗi cái mang dict thành_phần lồng nhau:
+- Điểm số trong array('d'), độ tin cậy / tín hiệu chính là mã số nhỏ array('b')
+- Thành phần theo mã được làm phẳng thành cột có kiểu (mxh_*, tt_*, hd_*)
+- Thành phần toàn cục (vĩ mô) chỉ lưu một lần, mỗi dòng giữ chỉ số tham chiếu
+- Xuất DataFrame trực tiếp từ các cột, không đi qua list các dict asdict()
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from alpha_signal_checker_plus import KếtQuảTínHiệu, TIỀN_TỐ_THÀNH_PHẦN
+
+ĐỘ_TIN_CẬY = ("THẤP", "TRUNG_BÌNH", "CAO")
+TÍN_HIỆU_CHÍNH = ("TRUNG_LẬP", "MUA", "BÁN")
+
+# Thành phần dùng chung cho mọi mã trong một lần chạy
+THÀNH_PHẦN_TOÀN_CỤC = ("vĩ_mô",)
+
+Cột = Union[array, List[Any]]
+
+def _cột_mới(giá_trị: Any, độ_dài: int) -> Cột:
+    """Tạo cột theo kiểu của giá trị đầu tiên, điền giá trị mặc định cho các dòng trước"""
+    if isinstance(giá_trị, bool) or not isinstance(giá_trị, (int, float)):
+        return [None] * độ_dài
+    if isinstance(giá_trị, int):
+        return array("q", bytes(8 * độ_dài))
+    return array("d", bytes(8 * độ_dài))
+
+def _sang_numpy(a: array):
+    """Sao chép một khối qua buffer protocol; giữ view sẽ chặn array.append() về sau"""
+    import numpy as np
+    return np.frombuffer(a, dtype={"d": np.float64, "q": np.int64, "b": np.int8, "i": np.int32}[a.typecode]).copy()
+
+def _mảng_arrow(giá_trị: List[Any]):
+    """Cột đối tượng sang Arrow; kiểu lẫn lộn thì lưu chuỗi JSON"""
+    import json
+    import pyarrow as pa
+    try:
+        return pa.array(giá_trị)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([None if v is None else json.dumps(v, ensure_ascii=False) for v in giá_trị], pa.string())
+
+def _giá_trị_trống(cột: Cột) -> Any:
+    if isinstance(cột, array):
+        return 0 if cột.typecode == "q" else 0.0
+    return None
+
+class BảngKếtQuả:
+    """Kết quả chấm điểm của cả universe dạng cột"""
+
+    def __init__(self):
+        self.mã: List[str] = []
+        self.điểm_mua = array("d")
+        self.điểm_bán = array("d")
+        self.điểm_ròng = array("d")
+        self.hệ_số_kích_thước_vị_thế = array("d")
+        self.độ_tin_cậy = array("b")
+        self.tín_hiệu_chính = array("b")
+        self.tín_hiệu: List[Tuple[str, ...]] = []
+        self.cảnh_báo: List[Tuple[str, ...]] = []
+        self.cột_thành_phần: Dict[str, Cột] = {}
+        # (trường, tên cột) theo thành phần, thêm khi tạo cột để dựng lại dòng không phải quét tiền tố
+        self._nhóm_cột: Dict[str, List[Tuple[str, str]]] = {
+            tên: [] for tên in TIỀN_TỐ_THÀNH_PHẦN if tên not in THÀNH_PHẦN_TOÀN_CỤC
+        }
+        self.toàn_cục: Dict[str, List[Dict[str, Any]]] = {tên: [] for tên in THÀNH_PHẦN_TOÀN_CỤC}
+        self.chỉ_số_toàn_cục: Dict[str, array] = {tên: array("i") for tên in THÀNH_PHẦN_TOÀN_CỤC}
+
+    @classmethod
+    def từ_kết_quả(cls, các_kết_quả: Iterable[KếtQuảTínHiệu]) -> "BảngKếtQuả":
+        bảng = cls()
+        for kq in các_kết_quả:
+            bảng.thêm(kq)
+        return bảng
+
+    def __len__(self) -> int:
+        return len(self.mã)
+
+    def thêm(self, kq: KếtQuảTínHiệu):
+        """Thêm một kết quả; dict thành_phần được làm phẳng vào các cột"""
+        i = len(self.mã)
+        self.mã.append(sys.intern(kq.mã))
+        self.điểm_mua.append(kq.điểm_mua)
+        self.điểm_bán.append(kq.điểm_bán)
+        self.điểm_ròng.append(kq.điểm_ròng)
+        self.hệ_số_kích_thước_vị_thế.append(kq.hệ_số_kích_thước_vị_thế)
+        self.độ_tin_cậy.append(ĐỘ_TIN_CẬY.index(kq.độ_tin_cậy))
+        self.tín_hiệu_chính.append(TÍN_HIỆU_CHÍNH.index(kq.tín_hiệu_chính))
+        self.tín_hiệu.append(tuple(kq.tín_hiệu))
+        self.cảnh_báo.append(tuple(kq.cảnh_báo))
+
+        for tên in THÀNH_PHẦN_TOÀN_CỤC:
+            self.chỉ_số_toàn_cục[tên].append(self._chỉ_số_dùng_chung(tên, kq.thành_phần.get(tên)))
+
+        đã_ghi = set()
+        for tên_thành_phần, tiền_tố in TIỀN_TỐ_THÀNH_PHẦN.items():
+            if tên_thành_phần in THÀNH_PHẦN_TOÀN_CỤC:
+                continue
+            for trường, giá_trị in kq.thành_phần.get(tên_thành_phần, {}).items():
+                if trường == "mã":
+                    continue
+                tên_cột = f"{tiền_tố}_{trường}"
+                self._ghi(tên_cột, giá_trị, i, tên_thành_phần, trường)
+                đã_ghi.add(tên_cột)
+
+        # Cột không có trong dòng này nhận giá trị mặc định
+        for tên_cột, cột in self.cột_thành_phần.items():
+            if tên_cột not in đã_ghi:
+                cột.append(_giá_trị_trống(cột))
+
+    def _chỉ_số_dùng_chung(self, tên: str, giá_trị: Dict[str, Any]) -> int:
+        if giá_trị is None:
+            return -1
+        danh_sách = self.toàn_cục[tên]
+        # Kết quả trong cùng lần chạy giữ cùng một dict nên chỉ cần so với mục cuối
+        if danh_sách and (danh_sách[-1] is giá_trị or danh_sách[-1] == giá_trị):
+            return len(danh_sách) - 1
+        danh_sách.append(giá_trị)
+        return len(danh_sách) - 1
+
+    def _ghi(self, tên_cột: str, giá_trị: Any, i: int, tên_thành_phần: str, trường: str):
+        cột = self.cột_thành_phần.get(tên_cột)
+        if cột is None:
+            cột = self.cột_thành_phần[tên_cột] = _cột_mới(giá_trị, i)
+            self._nhóm_cột[tên_thành_phần].append((trường, tên_cột))
+        if isinstance(cột, array):
+            if cột.typecode == "q" and isinstance(giá_trị, float):
+                cột = self.cột_thành_phần[tên_cột] = array("d", cột)
+            if isinstance(giá_trị, (int, float)) and not isinstance(giá_trị, bool):
+                cột.append(giá_trị)
+                return
+            cột = self.cột_thành_phần[tên_cột] = list(cột)
+        cột.append(sys.intern(giá_trị) if isinstance(giá_trị, str) else giá_trị)
+
+    def thành_phần(self, i: int) -> Dict[str, Any]:
+        """Dựng lại dict thành_phần lồng nhau cho một dòng"""
+        kết_quả: Dict[str, Any] = {}
+        # Cột có thể được thay bằng kiểu rộng hơn (_ghi) nên tra theo tên mỗi lần
+        cột = self.cột_thành_phần
+        for tên_thành_phần in TIỀN_TỐ_THÀNH_PHẦN:
+            if tên_thành_phần in THÀNH_PHẦN_TOÀN_CỤC:
+                j = self.chỉ_số_toàn_cục[tên_thành_phần][i]
+                if j >= 0:
+                    kết_quả[tên_thành_phần] = self.toàn_cục[tên_thành_phần][j]
+                continue
+            trường = {tên_trường: cột[tên_cột][i] for tên_trường, tên_cột in self._nhóm_cột[tên_thành_phần]}
+            if trường:
+                if tên_thành_phần == "hợp_đồng":
+                    trường = {"mã": self.mã[i], **trường}
+                kết_quả[tên_thành_phần] = trường
+        return kết_quả
+
+    def dòng(self, i: int) -> KếtQuảTínHiệu:
+        """Dựng lại KếtQuảTínHiệu cho một dòng (ví dụ khi hiển thị chi tiết)"""
+        return KếtQuảTínHiệu(
+            mã=self.mã[i],
+            điểm_mua=self.điểm_mua[i],
+            điểm_bán=self.điểm_bán[i],
+            điểm_ròng=self.điểm_ròng[i],
+            hệ_số_kích_thước_vị_thế=self.hệ_số_kích_thước_vị_thế[i],
+            độ_tin_cậy=ĐỘ_TIN_CẬY[self.độ_tin_cậy[i]],
+            tín_hiệu_chính=TÍN_HIỆU_CHÍNH[self.tín_hiệu_chính[i]],
+            cảnh_báo=list(self.cảnh_báo[i]),
+            tín_hiệu=list(self.tín_hiệu[i]),
+            thành_phần=self.thành_phần(i),
+        )
+
+    def sang_dataframe(self, bao_gồm_toàn_cục: bool = True):
+        """Xuất DataFrame với cột thành phần đã làm phẳng, không qua list dict"""
+        import numpy as np
+        import pandas as pd
+
+        mảng = _sang_numpy
+        cột: Dict[str, Any] = {
+            "mã": self.mã,
+            "điểm_mua": mảng(self.điểm_mua),
+            "điểm_bán": mảng(self.điểm_bán),
+            "điểm_ròng": mảng(self.điểm_ròng),
+            "hệ_số_kích_thước_vị_thế": mảng(self.hệ_số_kích_thước_vị_thế),
+            "độ_tin_cậy": pd.Categorical.from_codes(mảng(self.độ_tin_cậy), ĐỘ_TIN_CẬY),
+            "tín_hiệu_chính": pd.Categorical.from_codes(mảng(self.tín_hiệu_chính), TÍN_HIỆU_CHÍNH),
+            "cảnh_báo": self.cảnh_báo,
+            "tín_hiệu": self.tín_hiệu,
+        }
+        for tên_cột, giá_trị in self.cột_thành_phần.items():
+            cột[tên_cột] = mảng(giá_trị) if isinstance(giá_trị, array) else giá_trị
+
+        if bao_gồm_toàn_cục:
+            for tên_thành_phần in THÀNH_PHẦN_TOÀN_CỤC:
+                chỉ_số = mảng(self.chỉ_số_toàn_cục[tên_thành_phần])
+                danh_sách = self.toàn_cục[tên_thành_phần]
+                if not danh_sách or (chỉ_số < 0).any():
+                    continue
+                tiền_tố = TIỀN_TỐ_THÀNH_PHẦN[tên_thành_phần]
+                for trường in danh_sách[0]:
+                    giá_trị_riêng = np.asarray([d[trường] for d in danh_sách])
+                    cột[f"{tiền_tố}_{trường}"] = giá_trị_riêng[chỉ_số]
+
+        return pd.DataFrame(cột)
+
+    def sang_arrow(self, bao_gồm_toàn_cục: bool = True):
+        """Xuất pyarrow.Table; không bao gồm toàn cục thì chỉ giữ chỉ số khi có nhiều giá trị"""
+        import pyarrow as pa
+
+        cột: Dict[str, Any] = {
+            "mã": pa.array(self.mã, pa.string()),
+            "điểm_mua": pa.array(_sang_numpy(self.điểm_mua)),
+            "điểm_bán": pa.array(_sang_numpy(self.điểm_bán)),
+            "điểm_ròng": pa.array(_sang_numpy(self.điểm_ròng)),
+            "hệ_số_kích_thước_vị_thế": pa.array(_sang_numpy(self.hệ_số_kích_thước_vị_thế)),
+            "độ_tin_cậy": pa.DictionaryArray.from_arrays(pa.array(_sang_numpy(self.độ_tin_cậy)), pa.array(ĐỘ_TIN_CẬY)),
+            "tín_hiệu_chính": pa.DictionaryArray.from_arrays(pa.array(_sang_numpy(self.tín_hiệu_chính)), pa.array(TÍN_HIỆU_CHÍNH)),
+            "cảnh_báo": pa.array(self.cảnh_báo, pa.list_(pa.string())),
+            "tín_hiệu": pa.array(self.tín_hiệu, pa.list_(pa.string())),
+        }
+        for tên_cột, giá_trị in self.cột_thành_phần.items():
+            cột[tên_cột] = pa.array(_sang_numpy(giá_trị)) if isinstance(giá_trị, array) else _mảng_arrow(giá_trị)
+
+        for tên_thành_phần in THÀNH_PHẦN_TOÀN_CỤC:
+            danh_sách = self.toàn_cục[tên_thành_phần]
+            chỉ_số = _sang_numpy(self.chỉ_số_toàn_cục[tên_thành_phần])
+            tiền_tố = TIỀN_TỐ_THÀNH_PHẦN[tên_thành_phần]
+            if not bao_gồm_toàn_cục:
+                if len(danh_sách) > 1:
+                    cột[f"{tiền_tố}_chỉ_số"] = pa.array(chỉ_số)
+                continue
+            if not danh_sách:
+                continue
+            # Chỉ số -1 (dòng không có thành phần này) thành null
+            chỉ_số_arrow = pa.array(chỉ_số, mask=chỉ_số < 0)
+            for trường in danh_sách[0]:
+                cột[f"{tiền_tố}_{trường}"] = _mảng_arrow([d.get(trường) for d in danh_sách]).take(chỉ_số_arrow)
+
+        return pa.table(cột)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Ghi Kết Quả
+--------------------
+Các định dạng đầu ra có thể thay thế cho nhau, cùng giao diện ghi(kq) / đóng():
+- json:    mảng JSON thụt lề 2, giống json.dump(..., indent=2) trước đây
+- ndjson:  mỗi dòng một kết quả, ghi ngay khi chấm xong
+- parquet: dạng cột, thành phần làm phẳng (mxh_*, tt_*, hd_*, vm_*)
+- arrow:   file Arrow IPC dạng cột, đọc lại bằng memory-map
+Chế độ gọn bỏ thành phần toàn cục (vĩ mô) lặp lại ở mỗi kết quả và lưu một lần:
+phần đầu file với json/ndjson, metadata của schema với parquet/arrow.
+"""
+
+import json
+import os
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from alpha_signal_checker_plus import KếtQuảTínHiệu
+from result_table import THÀNH_PHẦN_TOÀN_CỤC, BảngKếtQuả
+
+ĐỊNH_DẠNG = ("json", "ndjson", "parquet", "arrow")
+
+ĐUÔI_FILE = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+KHÓA_METADATA_TOÀN_CỤC = "toàn_cục".encode("utf-8")
+
+def đoán_định_dạng(đường_dẫn: str) -> str:
+    """Định dạng theo đuôi file, mặc định json"""
+    return ĐUÔI_FILE.get(os.path.splitext(đường_dẫn)[1].lower(), "json")
+
+class _BộGhiJSONCơSở:
+    """Phần dùng chung của json/ndjson: asdict và tách thành phần toàn cục khi ghi gọn"""
+
+    def __init__(self, đường_dẫn: str, gọn: bool = False):
+        self.tệp = open(đường_dẫn, "w", encoding="utf-8")
+        self.gọn = gọn
+        self.số_mục = 0
+        self.toàn_cục: Optional[Dict[str, Any]] = None
+
+    def _chuẩn_bị(self, kq: KếtQuảTínHiệu) -> Dict[str, Any]:
+        dữ_liệu = asdict(kq)
+        if not self.gọn:
+            return dữ_liệu
+        if self.toàn_cục is None:
+            self.toàn_cục = {tên: dữ_liệu["thành_phần"][tên] for tên in THÀNH_PHẦN_TOÀN_CỤC if tên in dữ_liệu["thành_phần"]}
+            self._ghi_đầu_file()
+        for tên, giá_trị in self.toàn_cục.items():
+            # Chỉ bỏ khi trùng với bản lưu ở đầu file, khác thì giữ lại trong kết quả
+            if dữ_liệu["thành_phần"].get(tên) == giá_trị:
+                del dữ_liệu["thành_phần"][tên]
+        return dữ_liệu
+
+    def _ghi_đầu_file(self):
+        pass
+
+class BộGhiMảngJSON(_BộGhiJSONCơSở):
+    """Ghi từng kết quả vào mảng JSON ngay khi chấm xong, cùng định dạng với json.dump(..., indent=2)"""
+
+    def ghi(self, kq: KếtQuảTínHiệu):
+        văn_bản = json.dumps(self._chuẩn_bị(kq), ensure_ascii=False, indent=2)
+        thụt_lề = "\n    " if self.gọn else "\n  "
+        mở_đầu = "[" if not self.gọn else ""
+        # Chuỗi JSON không chứa ký tự xuống dòng thô nên có thể thụt lề theo dòng
+        self.tệp.write((mở_đầu + thụt_lề if self.số_mục == 0 else "," + thụt_lề) + văn_bản.replace("\n", thụt_lề))
+        self.số_mục += 1
+
+    def _ghi_đầu_file(self):
+        toàn_cục = json.dumps(self.toàn_cục, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self.tệp.write(f'{{\n  "toàn_cục": {toàn_cục},\n  "kết_quả": [')
+
+    def đóng(self):
+        if self.gọn:
+            if self.số_mục == 0:
+                self.tệp.write('{\n  "toàn_cục": {},\n  "kết_quả": []\n}')
+            else:
+                self.tệp.write("\n  ]\n}")
+        else:
+            self.tệp.write("\n]" if self.số_mục else "[]")
+        self.tệp.close()
+
+class BộGhiNDJSON(_BộGhiJSONCơSở):
+    """Mỗi kết quả một dòng JSON, ghi ngay khi chấm xong"""
+
+    def ghi(self, kq: KếtQuảTínHiệu):
+        self.tệp.write(json.dumps(self._chuẩn_bị(kq), ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.số_mục += 1
+
+    def _ghi_đầu_file(self):
+        self.tệp.write(json.dumps({"toàn_cục": self.toàn_cục}, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def đóng(self):
+        self.tệp.close()
+
+class BộGhiCột:
+    """Gom kết quả vào BảngKếtQuả rồi ghi Parquet hoặc Arrow IPC một lần khi đóng"""
+
+    def __init__(self, đường_dẫn: str, định_dạng: str = "parquet", gọn: bool = False):
+        self.đường_dẫn = đường_dẫn
+        self.định_dạng = định_dạng
+        self.gọn = gọn
+        self.bảng = BảngKếtQuả()
+
+    @property
+    def số_mục(self) -> int:
+        return len(self.bảng)
+
+    def ghi(self, kq: KếtQuảTínHiệu):
+        self.bảng.thêm(kq)
+
+    def đóng(self):
+        import pyarrow as pa
+
+        bảng_arrow = self.bảng.sang_arrow(bao_gồm_toàn_cục=not self.gọn)
+        if self.gọn:
+            toàn_cục = {tên: self.bảng.toàn_cục[tên] for tên in THÀNH_PHẦN_TOÀN_CỤC}
+            bảng_arrow = bảng_arrow.replace_schema_metadata(
+                {KHÓA_METADATA_TOÀN_CỤC: json.dumps(toàn_cục, ensure_ascii=False).encode("utf-8")}
+            )
+        if self.định_dạng == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(bảng_arrow, self.đường_dẫn, compression="zstd")
+        else:
+            with pa.OSFile(self.đường_dẫn, "wb") as sink:
+                with pa.ipc.new_file(sink, bảng_arrow.schema) as bộ_ghi:
+                    bộ_ghi.write_table(bảng_arrow)
+
+def tạo_bộ_ghi(đường_dẫn: str, định_dạng: Optional[str] = None, gọn: bool = False):
+    """Chọn bộ ghi theo định dạng (hoặc đuôi file nếu không chỉ định)"""
+    định_dạng = định_dạng or đoán_định_dạng(đường_dẫn)
+    if định_dạng == "json":
+        return BộGhiMảngJSON(đường_dẫn, gọn)
+    if định_dạng == "ndjson":
+        return BộGhiNDJSON(đường_dẫn, gọn)
+    if định_dạng in ("parquet", "arrow"):
+        return BộGhiCột(đường_dẫn, định_dạng, gọn)
+    raise ValueError(f"Định dạng đầu ra không hỗ trợ: {định_dạng}")
+
+def _gắn_toàn_cục(các_kết_quả: List[Dict[str, Any]], toàn_cục: Dict[str, Any]) -> List[Dict[str, Any]]:
+    for dữ_liệu in các_kết_quả:
+        for tên, giá_trị in toàn_cục.items():
+            dữ_liệu["thành_phần"].setdefault(tên, giá_trị)
+    return các_kết_quả
+
+def đọc_kết_quả(đường_dẫn: str, định_dạng: Optional[str] = None):
+    """Đọc lại file kết quả: list dict với json/ndjson, pyarrow.Table với parquet/arrow"""
+    định_dạng = định_dạng or đoán_định_dạng(đường_dẫn)
+    if định_dạng == "json":
+        with open(đường_dẫn, "r", encoding="utf-8") as f:
+            dữ_liệu = json.load(f)
+        if isinstance(dữ_liệu, dict):
+            return _gắn_toàn_cục(dữ_liệu["kết_quả"], dữ_liệu["toàn_cục"])
+        return dữ_liệu
+    if định_dạng == "ndjson":
+        toàn_cục: Dict[str, Any] = {}
+        các_kết_quả = []
+        with open(đường_dẫn, "r", encoding="utf-8") as f:
+            for dòng in f:
+                if not dòng.strip():
+                    continue
+                dữ_liệu = json.loads(dòng)
+                if "toàn_cục" in dữ_liệu and "mã" not in dữ_liệu:
+                    toàn_cục = dữ_liệu["toàn_cục"]
+                else:
+                    các_kết_quả.append(dữ_liệu)
+        return _gắn_toàn_cục(các_kết_quả, toàn_cục)
+    if định_dạng == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(đường_dẫn)
+    if định_dạng == "arrow":
+        import pyarrow as pa
+        # Bảng trả về giữ tham chiếu tới vùng nhớ ánh xạ, không sao chép dữ liệu
+        return pa.ipc.open_file(pa.memory_map(đường_dẫn, "r")).read_all()
+    raise ValueError(f"Định dạng đầu ra không hỗ trợ: {định_dạng}")
+
+def toàn_cục_từ_metadata(bảng_arrow) -> Dict[str, List[Dict[str, Any]]]:
+    """Thành phần toàn cục đã lưu trong metadata của file parquet/arrow ghi gọn"""
+    metadata = bảng_arrow.schema.metadata or {}
+    if KHÓA_METADATA_TOÀN_CỤC not in metadata:
+        return {}
+    return json.loads(metadata[KHÓA_METADATA_TOÀN_CỤC].decode("utf-8"))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Bộ Ghi Nhớ Điểm Thành Phần
+--------------------
+Ghi nhớ kết quả của các hàm chấm_điểm_* (thuần: chỉ phụ thuộc vào dữ liệu thành phần):
+- Khóa là dấu vân tay bất biến (tuple các trường mà bộ chấm điểm đọc), không phải
+  đối tượng dữ liệu; dữ liệu mẫu / giá trị lặp giữa các lần làm mới dùng chung một mục
+- Kết quả lưu dạng đóng băng (tín hiệu / cảnh báo thành tuple), chuỗi tín hiệu chỉ dựng
+  một lần cho mỗi dấu vân tay; mỗi lần trả về là list mới như hàm gốc, nên kiểu kết quả
+  không đổi khi tắt ghi nhớ và bên gọi sửa list không làm hỏng mục đã lưu
+- Mỗi thành phần một OrderedDict giới hạn SCORE_MEMO_SIZE mục (0 để tắt), đầy thì bỏ
+  mục cũ nhất (FIFO, popitem O(1)); không khóa: thao tác trên dict là nguyên tử, bộ chấm
+  điểm chỉ tốn ~1 µs nên lượt trúng phải rẻ hơn thế
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, List
+
+def đóng_băng(điểm: tuple) -> tuple:
+    """Danh sách tín hiệu / cảnh báo (hai phần tử cuối) thành tuple"""
+    return (*điểm[:-2], tuple(điểm[-2]), tuple(điểm[-1]))
+
+def rã_băng(điểm: tuple) -> tuple:
+    """Ngược của đóng_băng: tín hiệu / cảnh báo thành list mới, cùng kiểu với hàm chấm gốc"""
+    return (*điểm[:-2], list(điểm[-2]), list(điểm[-1]))
+
+class BộGhiNhớĐiểm:
+    """Bộ nhớ kết quả chấm điểm theo (thành phần, dấu vân tay), có thống kê trúng/trượt"""
+
+    def __init__(self, dung_lượng_tối_đa: int = 4096):
+        self.dung_lượng = dung_lượng_tối_đa
+        self._bộ_nhớ: Dict[str, "OrderedDict[Hashable, tuple]"] = {}
+        # [trúng, trượt] theo thành phần; cộng không khóa nên chỉ là số gần đúng khi nhiều luồng
+        self._thống_kê: Dict[str, List[int]] = {}
+
+    def bọc(self, thành_phần: str, dấu_vân_tay: Callable[[Any], Hashable]):
+        """Decorator cho hàm chấm_điểm_*(dữ_liệu): ghi nhớ theo dấu_vân_tay(dữ_liệu)"""
+        bộ_nhớ = self._bộ_nhớ.setdefault(thành_phần, OrderedDict())
+        thống_kê = self._thống_kê.setdefault(thành_phần, [0, 0])
+        def trang_trí(hàm_chấm):
+            @wraps(hàm_chấm)
+            def hàm_bọc(dữ_liệu):
+                if self.dung_lượng <= 0:
+                    return hàm_chấm(dữ_liệu)
+                khóa = dấu_vân_tay(dữ_liệu)
+                điểm = bộ_nhớ.get(khóa)
+                if điểm is not None:
+                    thống_kê[0] += 1
+                    return rã_băng(điểm)
+                thống_kê[1] += 1
+                điểm = đóng_băng(hàm_chấm(dữ_liệu))
+                if len(bộ_nhớ) >= self.dung_lượng:
+                    # Bỏ mục cũ nhất; luồng khác vừa làm trống thì bỏ qua
+                    try:
+                        bộ_nhớ.popitem(last=False)
+                    except KeyError:
+                        pass
+                bộ_nhớ[khóa] = điểm
+                return rã_băng(điểm)
+            hàm_bọc.bỏ_qua_ghi_nhớ = hàm_chấm
+            return hàm_bọc
+        return trang_trí
+
+    def xóa(self):
+        for thành_phần, bộ_nhớ in self._bộ_nhớ.items():
+            bộ_nhớ.clear()
+            self._thống_kê[thành_phần][:] = [0, 0]
+
+    def lấy_thống_kê(self) -> Dict[str, Any]:
+        """Số phẳng (xuất được thành gauge Prometheus): tổng và theo từng thành phần"""
+        trúng = sum(tk[0] for tk in self._thống_kê.values())
+        trượt = sum(tk[1] for tk in self._thống_kê.values())
+        kết_quả: Dict[str, Any] = {
+            "số_mục": sum(len(bộ_nhớ) for bộ_nhớ in self._bộ_nhớ.values()), "dung_lượng": self.dung_lượng,
+            "trúng": trúng, "trượt": trượt,
+            "tỷ_lệ_trúng": round(trúng / (trúng + trượt), 3) if trúng + trượt else 0.0,
+        }
+        for thành_phần, (trúng_tp, trượt_tp) in self._thống_kê.items():
+            kết_quả[f"trúng_{thành_phần}"] = trúng_tp
+            kết_quả[f"trượt_{thành_phần}"] = trượt_tp
+        return kết_quả
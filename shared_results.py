@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Kết Quả Dùng Chung Qua Arrow IPC
+--------------------
+Công bố kết quả một lần vào file Arrow IPC để mọi phiên dashboard (và mọi tiến trình) gắn vào
+chỉ đọc, thay vì mỗi phiên tự chấm lại và giữ một bản sao bảng kết quả:
+- Bên công bố (tiến trình nền, phiên bấm "Bắt đầu phân tích") ghi BảngKếtQuả.sang_arrow() với
+  thành phần đã làm phẳng (mxh_*, tt_*, hd_*, vm_*) vào file tạm rồi os.replace: người đọc luôn
+  thấy một file hoàn chỉnh, lần công bố mới là một inode mới
+- Bên đọc ánh xạ file (pa.memory_map) và đọc bảng không sao chép: cột số trỏ thẳng vào page
+  cache của hệ điều hành, dùng chung giữa các phiên trong tiến trình và giữa các tiến trình
+- Metadata ghi id lần chạy, thời điểm, ngưỡng điểm ròng và trọng số đã dùng; phiên có cùng
+  tham số dùng thẳng bảng chung, đổi trọng số / ngưỡng thì chấm lại riêng như trước
+- KếtQuảChung có các cột mà ChỉMụcKếtQuả cần (mã, điểm_ròng, độ_tin_cậy, tín_hiệu_chính)
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from alpha_signal_checker_plus import TIỀN_TỐ_THÀNH_PHẦN, KếtQuảTínHiệu
+from result_table import THÀNH_PHẦN_TOÀN_CỤC, ĐỘ_TIN_CẬY, TÍN_HIỆU_CHÍNH, BảngKếtQuả
+
+KHÓA_METADATA = b"ket_qua_chung"
+
+def công_bố_kết_quả_chung(bảng: BảngKếtQuả, đường_dẫn: str, **thông_tin: Any) -> Dict[str, Any]:
+    """Ghi bảng kèm thông tin lần chạy (lần_chạy, điểm_ròng_tối_thiểu, trọng_số...) và thay file cũ một lần"""
+    import pyarrow as pa
+
+    thông_tin = {"thời_gian": time.time(), "số_mã": len(bảng), **thông_tin}
+    bảng_arrow = bảng.sang_arrow()
+    bảng_arrow = bảng_arrow.replace_schema_metadata(
+        {KHÓA_METADATA: json.dumps(thông_tin, ensure_ascii=False).encode("utf-8")}
+    )
+    tạm = f"{đường_dẫn}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tạm, "wb") as sink:
+            # Một record batch: mỗi cột là một khối liên tục, đọc ra không cần ghép
+            with pa.ipc.new_file(sink, bảng_arrow.schema) as bộ_ghi:
+                bộ_ghi.write_table(bảng_arrow, max_chunksize=max(len(bảng), 1))
+        os.replace(tạm, đường_dẫn)
+    except BaseException:
+        if os.path.exists(tạm):
+            os.unlink(tạm)
+        raise
+    return thông_tin
+
+def phiên_bản_tệp(đường_dẫn: str) -> Optional[Tuple[int, int]]:
+    """(inode, mtime_ns) của file công bố, làm khóa bộ nhớ đệm; None nếu chưa có"""
+    try:
+        thông_tin = os.stat(đường_dẫn)
+    except OSError:
+        return None
+    return thông_tin.st_ino, thông_tin.st_mtime_ns
+
+def _cột_numpy(cột):
+    """Cột Arrow một khối sang numpy không sao chép"""
+    return cột.chunk(0).to_numpy(zero_copy_only=True) if cột.num_chunks == 1 else cột.to_numpy()
+
+class KếtQuảChung:
+    """Bảng kết quả ánh xạ bộ nhớ của một lần công bố, chỉ đọc"""
+
+    def __init__(self, bảng_arrow, thông_tin: Dict[str, Any]):
+        self.bảng = bảng_arrow
+        self.thông_tin = thông_tin
+        # Mã cần là str cho chỉ mục (dict mã -> dòng); các cột còn lại là view trên vùng nhớ ánh xạ
+        self.mã = bảng_arrow.column("mã").to_pylist()
+        self.điểm_ròng = _cột_numpy(bảng_arrow.column("điểm_ròng"))
+        self.độ_tin_cậy = self._mã_số(bảng_arrow.column("độ_tin_cậy"), ĐỘ_TIN_CẬY)
+        self.tín_hiệu_chính = self._mã_số(bảng_arrow.column("tín_hiệu_chính"), TÍN_HIỆU_CHÍNH)
+        # (trường, tên cột) theo thành phần, gom một lần từ lược đồ thay vì quét tiền tố mỗi dòng
+        self._nhóm_cột: Dict[str, List[Tuple[str, str]]] = {}
+        for tên_thành_phần, tiền_tố in TIỀN_TỐ_THÀNH_PHẦN.items():
+            tiền_tố_cột = tiền_tố + "_"
+            self._nhóm_cột[tên_thành_phần] = [(tên_cột[len(tiền_tố_cột):], tên_cột)
+                                              for tên_cột in bảng_arrow.column_names if tên_cột.startswith(tiền_tố_cột)]
+
+    @classmethod
+    def mở(cls, đường_dẫn: str) -> "KếtQuảChung":
+        import pyarrow as pa
+
+        bảng_arrow = pa.ipc.open_file(pa.memory_map(đường_dẫn, "r")).read_all()
+        metadata = bảng_arrow.schema.metadata or {}
+        thông_tin = json.loads(metadata[KHÓA_METADATA].decode("utf-8")) if KHÓA_METADATA in metadata else {}
+        return cls(bảng_arrow, thông_tin)
+
+    @staticmethod
+    def _mã_số(cột, nhãn: Tuple[str, ...]):
+        """Mã số theo thứ tự nhãn của result_table; sang_arrow ghi từ điển đúng thứ tự này nên không phải sao chép"""
+        import numpy as np
+
+        khối = cột.chunk(0) if cột.num_chunks == 1 else cột.combine_chunks()
+        chỉ_số = khối.indices.to_numpy(zero_copy_only=True)
+        từ_điển = tuple(khối.dictionary.to_pylist())
+        if từ_điển == nhãn:
+            return chỉ_số
+        return np.array([nhãn.index(v) for v in từ_điển], dtype=np.int8)[chỉ_số]
+
+    def __len__(self) -> int:
+        return len(self.mã)
+
+    def cắt(self, số_dòng: int) -> "KếtQuảChung":
+        """N dòng đầu (theo hạng), vẫn không sao chép cột"""
+        if số_dòng >= len(self):
+            return self
+        kết_quả = object.__new__(KếtQuảChung)
+        kết_quả.bảng = self.bảng.slice(0, số_dòng)
+        kết_quả.thông_tin = self.thông_tin
+        kết_quả.mã = self.mã[:số_dòng]
+        kết_quả.điểm_ròng = self.điểm_ròng[:số_dòng]
+        kết_quả.độ_tin_cậy = self.độ_tin_cậy[:số_dòng]
+        kết_quả.tín_hiệu_chính = self.tín_hiệu_chính[:số_dòng]
+        kết_quả._nhóm_cột = self._nhóm_cột
+        return kết_quả
+
+    def khớp(self, điểm_ròng_tối_thiểu: float, trọng_số: Dict[str, float], tuổi_tối_đa: float = None) -> bool:
+        """Lần công bố dùng đúng ngưỡng và trọng số này (và chưa quá cũ) thì phiên dùng thẳng được"""
+        if tuổi_tối_đa is not None and time.time() - self.thông_tin.get("thời_gian", 0) > tuổi_tối_đa:
+            return False
+        return (self.thông_tin.get("điểm_ròng_tối_thiểu") == điểm_ròng_tối_thiểu
+                and self.thông_tin.get("trọng_số") == trọng_số)
+
+    def dòng_dict(self, i: int) -> Dict[str, Any]:
+        """Một dòng dạng {cột: giá trị} với thành phần đã làm phẳng (trang chi tiết)"""
+        return self.bảng.slice(i, 1).to_pylist()[0]
+
+    def dòng(self, i: int) -> KếtQuảTínHiệu:
+        """Dựng lại KếtQuảTínHiệu cho một dòng, gom cột mxh_* / tt_* / hd_* / vm_* về dict thành_phần"""
+        dữ_liệu = self.dòng_dict(i)
+        thành_phần: Dict[str, Dict[str, Any]] = {}
+        for tên_thành_phần, nhóm in self._nhóm_cột.items():
+            trường = {tên_trường: dữ_liệu[tên_cột] for tên_trường, tên_cột in nhóm}
+            # Cột toàn cục là null ở dòng không có thành phần đó
+            if tên_thành_phần in THÀNH_PHẦN_TOÀN_CỤC and all(v is None for v in trường.values()):
+                continue
+            if trường:
+                if tên_thành_phần == "hợp_đồng":
+                    trường = {"mã": dữ_liệu["mã"], **trường}
+                thành_phần[tên_thành_phần] = trường
+        return KếtQuảTínHiệu(
+            mã=dữ_liệu["mã"],
+            điểm_mua=dữ_liệu["điểm_mua"],
+            điểm_bán=dữ_liệu["điểm_bán"],
+            điểm_ròng=dữ_liệu["điểm_ròng"],
+            hệ_số_kích_thước_vị_thế=dữ_liệu["hệ_số_kích_thước_vị_thế"],
+            độ_tin_cậy=dữ_liệu["độ_tin_cậy"],
+            tín_hiệu_chính=dữ_liệu["tín_hiệu_chính"],
+            cảnh_báo=dữ_liệu["cảnh_báo"],
+            tín_hiệu=dữ_liệu["tín_hiệu"],
+            thành_phần=thành_phần,
+        )
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Tiến Trình Nền Tính Sẵn Tín Hiệu
+--------------------
+Chạy liên tục (python alpha_signal_checker_plus.py --chạy-nền) để dashboard không
+phải tự lấy và chấm điểm trong mỗi phiên:
+- Mỗi nguồn (top coin, mạng xã hội, tin tức, vĩ mô, fear & greed, TVL DeFi) có chu kỳ
+  làm mới riêng trong CẤU_HÌNH["WORKER_INTERVAL"]; chỉ nguồn đến hạn được lấy lại
+- Hợp đồng tương lai không có API: đọc lại file đầu vào (file_hợp_đồng, cùng định dạng với CLI)
+  theo chu kỳ riêng; không có file thì thành phần hợp đồng bị bỏ khỏi lần chạy và ghi rõ trong
+  thông tin công bố (các_thành_phần), thay vì chấm trên dữ liệu rỗng
+- Khi có nguồn mới, chấm điểm lại cả universe từ dữ liệu đang giữ và công bố một lần
+  chạy vào kho ảnh chụp SQLite (WAL, xem snapshot_store.py)
+- Trang dashboard đọc lần chạy mới nhất từ kho, mọi phiên dùng chung một lần tính; kết quả
+  còn được công bố dạng Arrow IPC (SHARED_RESULTS_FILE, xem shared_results.py) để phiên dùng
+  trọng số mặc định hiển thị thẳng, không chấm lại
+- Thời gian làm mới từng nguồn và công bố được ghi vào ĐO_LƯỜNG (metrics.py); có
+  METRICS_PROM_FILE thì ghi file Prometheus sau mỗi lần công bố
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from alpha_signal_checker_plus import (
+    BỘ_NHỚ_ĐỆM,
+    CẤU_HÌNH,
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    DữLiệuHợpĐồngTươngLai,
+    KếtQuảTínHiệu,
+    chấm_điểm_ảnh_chụp,
+    dựng_ngữ_cảnh_chạy,
+    lấy_thị_trường_top_coin,
+    phân_tích_dữ_liệu_hợp_đồng_tương_lai,
+    thống_kê_bổ_sung,
+    tạo_ảnh_chụp,
+)
+from json_stream import lặp_bản_ghi
+from fetch_engine import lấy_đồng_thời, nhà_cung_cấp_mặc_định
+from metrics import ĐO_LƯỜNG
+
+# Tiến trình nền tính giống dashboard: mọi thành phần đã đăng ký
+THÀNH_PHẦN_NỀN = tuple(SỔ_ĐĂNG_KÝ_THÀNH_PHẦN)
+
+# Nguồn danh sách coin, làm mới trước các nguồn theo mã
+NGUỒN_TOP_COIN = "top_coin"
+# Nguồn hợp đồng tương lai: file đầu vào, không phải API
+NGUỒN_HỢP_ĐỒNG = "hợp_đồng"
+# Nguồn vĩ mô: chấm_điểm không tự lấy, mọi lần lấy đi qua làm_mới
+NGUỒN_VĨ_MÔ = "vĩ_mô"
+
+class TiếnTrìnhNền:
+    """Giữ dữ liệu mới nhất của từng nguồn, làm mới theo chu kỳ và công bố kết quả vào kho"""
+
+    def __init__(self, kho, số_coin: int = None, điểm_ròng_tối_thiểu: float = 2.0,
+                 các_thành_phần: Iterable[str] = None, chu_kỳ: Dict[str, float] = None,
+                 file_hợp_đồng: Optional[str] = None):
+        self.kho = kho
+        self.số_coin = CẤU_HÌNH["WORKER_TOP_N"] if số_coin is None else số_coin
+        self.điểm_ròng_tối_thiểu = điểm_ròng_tối_thiểu
+        self.các_thành_phần = THÀNH_PHẦN_NỀN if các_thành_phần is None else tuple(các_thành_phần)
+        self.file_hợp_đồng = file_hợp_đồng
+        if file_hợp_đồng is None:
+            # Không có nguồn hợp đồng tương lai: không cộng điểm thành phần này thay vì chấm dữ liệu rỗng
+            self.các_thành_phần = tuple(tên for tên in self.các_thành_phần if tên != NGUỒN_HỢP_ĐỒNG)
+        self.hợp_đồng: Dict[str, DữLiệuHợpĐồngTươngLai] = {}
+        self.chu_kỳ = dict(CẤU_HÌNH["WORKER_INTERVAL"], **(chu_kỳ or {}))
+        self.thị_trường: List[Dict[str, Any]] = []
+        self.theo_mã: Dict[str, Dict[str, Any]] = {
+            tên: {} for tên in self.các_thành_phần
+            if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].phạm_vi == "theo_mã" and SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].hàm_lấy is not None
+        }
+        self.toàn_cục: Dict[str, Any] = {}
+        self.ngữ_cảnh = None
+        # Nguồn -> thời điểm làm mới gần nhất
+        self.lần_làm_mới: Dict[str, float] = {}
+        self.lần_chạy_cuối: Optional[int] = None
+
+    def các_nguồn(self) -> List[str]:
+        toàn_cục = [tên for tên in self.các_thành_phần if SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].phạm_vi == "toàn_cục"]
+        # Vĩ mô luôn hiển thị trong kết quả: vẫn làm mới theo chu kỳ khi không cộng điểm
+        if NGUỒN_VĨ_MÔ not in toàn_cục:
+            toàn_cục.append(NGUỒN_VĨ_MÔ)
+        hợp_đồng = [NGUỒN_HỢP_ĐỒNG] if NGUỒN_HỢP_ĐỒNG in self.các_thành_phần else []
+        return [NGUỒN_TOP_COIN] + hợp_đồng + list(self.theo_mã) + toàn_cục
+
+    def hạn_kế_tiếp(self, nguồn: str) -> float:
+        return self.lần_làm_mới.get(nguồn, float("-inf")) + self.chu_kỳ.get(nguồn, 0.0)
+
+    def đến_hạn(self, bây_giờ: float) -> List[str]:
+        return [nguồn for nguồn in self.các_nguồn() if self.hạn_kế_tiếp(nguồn) <= bây_giờ]
+
+    def các_mã(self) -> List[str]:
+        return [coin["mã"] for coin in self.thị_trường]
+
+    def _lấy_theo_mã(self, nguồn: str, các_mã: List[str]):
+        if not các_mã:
+            return
+        dữ_liệu = lấy_đồng_thời(các_mã, nhà_cung_cấp_mặc_định([nguồn]))
+        self.theo_mã[nguồn].update((mã, d.get(nguồn)) for mã, d in zip(các_mã, dữ_liệu))
+
+    def làm_mới(self, nguồn: str, bây_giờ: float = None):
+        """Lấy lại một nguồn, bỏ qua bộ nhớ đệm của nguồn đó"""
+        BỘ_NHỚ_ĐỆM.xóa(nguồn)
+        if nguồn == NGUỒN_TOP_COIN:
+            thị_trường = lấy_thị_trường_top_coin()[:self.số_coin]
+            # Lỗi mạng trả danh sách rỗng: giữ universe cũ
+            if thị_trường:
+                self.thị_trường = thị_trường
+                các_mã = set(self.các_mã())
+                for tên, dữ_liệu in self.theo_mã.items():
+                    for mã in [m for m in dữ_liệu if m not in các_mã]:
+                        del dữ_liệu[mã]
+                    # Coin mới vào universe được lấy ngay, không đợi chu kỳ của nguồn
+                    self._lấy_theo_mã(tên, [m for m in self.các_mã() if m not in dữ_liệu])
+        elif nguồn == NGUỒN_HỢP_ĐỒNG:
+            # Lỗi đọc / file rỗng giữa lúc đang ghi: giữ dữ liệu cũ
+            with open(self.file_hợp_đồng, "r", encoding="utf-8") as f:
+                hợp_đồng = phân_tích_dữ_liệu_hợp_đồng_tương_lai(lặp_bản_ghi(f))
+            if hợp_đồng:
+                self.hợp_đồng = hợp_đồng
+        elif nguồn in self.theo_mã:
+            self._lấy_theo_mã(nguồn, self.các_mã())
+        else:
+            dữ_liệu = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[nguồn].hàm_lấy()
+            # Nguồn toàn cục lỗi tạm thời: dùng tiếp giá trị cũ thay vì bỏ điểm của cả universe
+            if dữ_liệu is not None or nguồn not in self.toàn_cục:
+                self.toàn_cục[nguồn] = dữ_liệu
+        self.lần_làm_mới[nguồn] = time.time() if bây_giờ is None else bây_giờ
+
+    def chấm_điểm(self) -> List[KếtQuảTínHiệu]:
+        """Chấm điểm cả universe từ dữ liệu đang giữ, không I/O mạng"""
+        ngữ_cảnh = dựng_ngữ_cảnh_chạy(self.toàn_cục, self.các_thành_phần)
+        self.ngữ_cảnh = ngữ_cảnh
+        return [
+            chấm_điểm_ảnh_chụp(
+                tạo_ảnh_chụp(mã, {tên: dữ_liệu.get(mã) for tên, dữ_liệu in self.theo_mã.items()},
+                             self.hợp_đồng.get(mã) or DữLiệuHợpĐồngTươngLai(mã=mã), ngữ_cảnh),
+                self.điểm_ròng_tối_thiểu,
+            )
+            for mã in self.các_mã()
+        ]
+
+    def công_bố(self, bây_giờ: float = None) -> int:
+        """Chấm điểm và ghi một lần chạy vào kho; trả về id lần chạy"""
+        các_kết_quả = self.chấm_điểm()
+        giá = {coin["mã"]: coin["giá"] for coin in self.thị_trường if coin.get("giá") is not None}
+        self.lần_chạy_cuối = self.kho.ghi_lần_chạy(các_kết_quả, self.ngữ_cảnh, thời_gian=bây_giờ, giá=giá,
+                                                   điểm_ròng_tối_thiểu=self.điểm_ròng_tối_thiểu)
+        if CẤU_HÌNH["SHARED_RESULTS_FILE"]:
+            from result_table import BảngKếtQuả
+            from shared_results import công_bố_kết_quả_chung
+            with ĐO_LƯỜNG.đo("công_bố_arrow"):
+                công_bố_kết_quả_chung(
+                    BảngKếtQuả.từ_kết_quả(các_kết_quả), CẤU_HÌNH["SHARED_RESULTS_FILE"],
+                    lần_chạy=self.lần_chạy_cuối, điểm_ròng_tối_thiểu=self.điểm_ròng_tối_thiểu,
+                    các_thành_phần=list(self.các_thành_phần),
+                    # Trọng số thực dùng khi chấm (mặc định của từng thành phần), để phiên dashboard so khớp
+                    trọng_số={tên: SỔ_ĐĂNG_KÝ_THÀNH_PHẦN[tên].trọng_số for tên in self.các_thành_phần},
+                )
+        return self.lần_chạy_cuối
+
+    def chạy_một_vòng(self, bây_giờ: float = None) -> Optional[int]:
+        """Làm mới các nguồn đến hạn; có nguồn mới thì công bố, trả về id lần chạy (None nếu không có gì đổi)"""
+        bây_giờ = time.time() if bây_giờ is None else bây_giờ
+        đến_hạn = self.đến_hạn(bây_giờ)
+        for nguồn in đến_hạn:
+            try:
+                with ĐO_LƯỜNG.đo("làm_mới", nguồn):
+                    self.làm_mới(nguồn, bây_giờ)
+            except Exception as e:
+                # Một nguồn lỗi không được dừng tiến trình nền; thử lại ở chu kỳ sau
+                print(f"Làm mới {nguồn} thất bại: {e}")
+                ĐO_LƯỜNG.đếm("lỗi_làm_mới", nguồn)
+                self.lần_làm_mới[nguồn] = bây_giờ
+        if not đến_hạn or not self.thị_trường:
+            return None
+        with ĐO_LƯỜNG.đo("công_bố"):
+            lần_chạy = self.công_bố()
+        if CẤU_HÌNH["METRICS_PROM_FILE"]:
+            ĐO_LƯỜNG.ghi_prometheus(CẤU_HÌNH["METRICS_PROM_FILE"], thống_kê_bổ_sung())
+        return lần_chạy
+
+    def chạy(self, số_vòng: int = None, nhịp_tối_đa: float = 60.0):
+        """Vòng lặp chính: ngủ tới hạn gần nhất của một nguồn (tối đa nhịp_tối_đa giây)"""
+        vòng = 0
+        while số_vòng is None or vòng < số_vòng:
+            bắt_đầu = time.time()
+            lần_chạy = self.chạy_một_vòng(bắt_đầu)
+            if lần_chạy is not None:
+                print(f"[{time.strftime('%H:%M:%S')}] Đã công bố lần chạy {lần_chạy}: {len(self.thị_trường)} coin "
+                      f"trong {time.time() - bắt_đầu:.1f}s")
+            vòng += 1
+            if số_vòng is not None and vòng >= số_vòng:
+                break
+            hạn_gần_nhất = min(self.hạn_kế_tiếp(nguồn) for nguồn in self.các_nguồn())
+            time.sleep(min(max(hạn_gần_nhất - time.time(), 1.0), nhịp_tối_đa))
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Kho Ảnh Chụp Lịch Sử Tín Hiệu
+--------------------
+Lưu kết quả của mọi lần chạy vào SQLite theo kiểu chỉ-ghi-thêm (append-only):
+- Bảng lan_chay: một dòng mỗi lần chạy, thành phần toàn cục (vĩ mô, fear & greed...) lưu một lần;
+  hoan_tat = 1 khi bộ ghi đã đóng, truy vấn danh sách lần chạy chỉ thấy lần chạy đã hoàn tất
+- Bảng anh_chup: một dòng mỗi (mã, lần chạy) với điểm số, đà dòng tiền, giá (tùy chọn)
+  và thành phần theo mã dạng JSON gọn: mảng giá trị, tên trường lưu một lần ở lan_chay
+- Chỉ mục phủ (ma, thoi_gian, điểm số...): truy vấn lịch sử theo mã + khoảng thời gian
+  chỉ quét một khoảng chỉ mục, không chạm tới phần JSON thành phần
+- Chế độ WAL: dashboard đọc trong khi CLI/dashboard khác đang ghi
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, fields, is_dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from alpha_signal_checker_plus import (
+    CẤU_HÌNH,
+    SỔ_ĐĂNG_KÝ_THÀNH_PHẦN,
+    DữLiệuHợpĐồngTươngLai,
+    KếtQuảTínHiệu,
+    NgữCảnhChạy,
+    dựng_ngữ_cảnh_chạy,
+    tạo_ảnh_chụp,
+    ẢnhChụpThànhPhần,
+)
+from result_table import THÀNH_PHẦN_TOÀN_CỤC
+
+PHIÊN_BẢN_LƯỢC_ĐỒ = 2
+
+# Cột của lịch_sử(), theo thứ tự trong câu truy vấn
+CỘT_LỊCH_SỬ = ("thời_gian", "điểm_mua", "điểm_bán", "điểm_ròng", "hệ_số_kích_thước_vị_thế",
+               "độ_tin_cậy", "tín_hiệu_chính", "đà_dòng_tiền", "giá")
+
+_LƯỢC_ĐỒ = (
+    "CREATE TABLE IF NOT EXISTS lan_chay ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, thoi_gian REAL NOT NULL, diem_rong_toi_thieu REAL, "
+    "so_ma INTEGER NOT NULL DEFAULT 0, toan_cuc TEXT NOT NULL, truong_thanh_phan TEXT NOT NULL DEFAULT '{}', "
+    "hoan_tat INTEGER NOT NULL DEFAULT 0)",
+    "CREATE INDEX IF NOT EXISTS idx_lan_chay_thoi_gian ON lan_chay (thoi_gian)",
+    "CREATE TABLE IF NOT EXISTS anh_chup ("
+    "ma TEXT NOT NULL, thoi_gian REAL NOT NULL, lan_chay INTEGER NOT NULL, "
+    "diem_mua REAL NOT NULL, diem_ban REAL NOT NULL, diem_rong REAL NOT NULL, he_so REAL NOT NULL, "
+    "do_tin_cay TEXT NOT NULL, tin_hieu_chinh TEXT NOT NULL, da_dong_tien REAL, gia REAL, "
+    "thanh_phan TEXT NOT NULL)",
+    # Phủ mọi cột của lịch_sử(): dòng nhỏ, liền nhau theo mã; JSON thành phần nằm ngoài chỉ mục
+    "CREATE INDEX IF NOT EXISTS idx_anh_chup_ma_thoi_gian ON anh_chup "
+    "(ma, thoi_gian, diem_mua, diem_ban, diem_rong, he_so, do_tin_cay, tin_hieu_chinh, da_dong_tien, gia)",
+    # Đọc cả một lần chạy (dashboard, backtest) theo lần chạy thay vì quét theo mã
+    "CREATE INDEX IF NOT EXISTS idx_anh_chup_lan_chay ON anh_chup (lan_chay)",
+)
+
+def _json_gọn(giá_trị: Any) -> str:
+    return json.dumps(giá_trị, ensure_ascii=False, separators=(",", ":"))
+
+def _giải_nén_thành_phần(thành_phần: Dict[str, Any], trường: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Mảng giá trị -> dict theo tên trường của lần chạy; thành phần lưu dạng dict giữ nguyên"""
+    return {tên: dict(zip(trường[tên], giá_trị)) if isinstance(giá_trị, list) and tên in trường else giá_trị
+            for tên, giá_trị in thành_phần.items()}
+
+def _dựng_dữ_liệu(tên: str, giá_trị: Any) -> Any:
+    """Dict đã lưu -> dataclass của thành phần; bỏ qua trường không còn trong dataclass"""
+    tp = SỔ_ĐĂNG_KÝ_THÀNH_PHẦN.get(tên)
+    if not isinstance(giá_trị, dict) or tp is None or tp.kiểu_dữ_liệu is None:
+        return giá_trị
+    tên_trường = {f.name for f in fields(tp.kiểu_dữ_liệu)}
+    return tp.kiểu_dữ_liệu(**{k: v for k, v in giá_trị.items() if k in tên_trường})
+
+class BộGhiLầnChạy:
+    """Ghi kết quả của một lần chạy theo từng mã, cùng giao diện ghi(kq) / đóng() với result_writers"""
+
+    def __init__(self, kho: "KhoẢnhChụp", lần_chạy: int, thời_gian: float,
+                 giá: Optional[Dict[str, float]] = None, kích_thước_lô: int = 1000):
+        self.kho = kho
+        self.lần_chạy = lần_chạy
+        self.thời_gian = thời_gian
+        self.giá = giá or {}
+        self.kích_thước_lô = kích_thước_lô
+        self.số_mục = 0
+        self._lô: List[Tuple] = []
+        # Tên trường của từng thành phần, lấy từ kết quả đầu tiên
+        self._trường: Dict[str, List[str]] = {}
+
+    def _nén_thành_phần(self, theo_mã: Dict[str, Any]) -> Dict[str, Any]:
+        nén = {}
+        for tên, giá_trị in theo_mã.items():
+            if isinstance(giá_trị, dict):
+                khóa = self._trường.setdefault(tên, list(giá_trị))
+                # Chỉ bỏ tên trường khi trùng đúng thứ tự với tên đã lưu của lần chạy
+                if len(khóa) == len(giá_trị) and all(a == b for a, b in zip(khóa, giá_trị)):
+                    giá_trị = list(giá_trị.values())
+            nén[tên] = giá_trị
+        return nén
+
+    def ghi(self, kq: KếtQuảTínHiệu):
+        theo_mã = {tên: giá_trị for tên, giá_trị in kq.thành_phần.items() if tên not in THÀNH_PHẦN_TOÀN_CỤC}
+        self._lô.append((
+            kq.mã, self.thời_gian, self.lần_chạy, kq.điểm_mua, kq.điểm_bán, kq.điểm_ròng,
+            kq.hệ_số_kích_thước_vị_thế, kq.độ_tin_cậy, kq.tín_hiệu_chính,
+            (theo_mã.get("hợp_đồng") or {}).get("đà_dòng_tiền"), self.giá.get(kq.mã),
+            _json_gọn(self._nén_thành_phần(theo_mã)),
+        ))
+        self.số_mục += 1
+        if len(self._lô) >= self.kích_thước_lô:
+            self._đẩy()
+
+    def _đẩy(self, hoàn_tất: bool = False):
+        if self._lô or hoàn_tất:
+            # Tên trường (và cờ hoàn tất) được lưu cùng giao dịch với các dòng dùng nó
+            self.kho._chèn_ảnh_chụp(self._lô, self.lần_chạy, self.số_mục, self._trường, hoàn_tất)
+            self._lô = []
+
+    def đóng(self):
+        """Ghi lô cuối và đánh dấu lần chạy hoàn tất; không gọi (lỗi giữa chừng) thì lần chạy không hiện ra"""
+        self._đẩy(hoàn_tất=True)
+
+class KhoẢnhChụp:
+    """Kho chuỗi thời gian append-only của kết quả tín hiệu, an toàn luồng"""
+
+    def __init__(self, đường_dẫn: str):
+        self.đường_dẫn = đường_dẫn
+        self._khóa = threading.Lock()
+        self._db = sqlite3.connect(đường_dẫn, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: mất tối đa giao dịch cuối khi mất điện, không hỏng file
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        phiên_bản = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if phiên_bản not in (0, 1, PHIÊN_BẢN_LƯỢC_ĐỒ):
+            raise ValueError(f"Phiên bản kho ảnh chụp không hỗ trợ: {phiên_bản}")
+        if phiên_bản == 1 and "hoan_tat" not in {d[1] for d in self._db.execute("PRAGMA table_info(lan_chay)")}:
+            # Kho cũ chưa có cờ hoàn tất: coi mọi lần chạy đã ghi là hoàn tất
+            self._db.execute("ALTER TABLE lan_chay ADD COLUMN hoan_tat INTEGER NOT NULL DEFAULT 1")
+        for câu_lệnh in _LƯỢC_ĐỒ:
+            self._db.execute(câu_lệnh)
+        self._db.execute(f"PRAGMA user_version={PHIÊN_BẢN_LƯỢC_ĐỒ}")
+
+    # ---------- Ghi ----------
+
+    def mở_lần_chạy(self, ngữ_cảnh: Optional[NgữCảnhChạy] = None, thời_gian: Optional[float] = None,
+                    giá: Optional[Dict[str, float]] = None,
+                    điểm_ròng_tối_thiểu: Optional[float] = None) -> BộGhiLầnChạy:
+        """Tạo một lần chạy mới và trả về bộ ghi cho kết quả của nó"""
+        thời_gian = time.time() if thời_gian is None else thời_gian
+        toàn_cục: Dict[str, Any] = {}
+        if ngữ_cảnh is not None:
+            toàn_cục["vĩ_mô"] = ngữ_cảnh.thành_phần_vĩ_mô
+            for tên, giá_trị in ngữ_cảnh.toàn_cục.items():
+                toàn_cục[tên] = asdict(giá_trị) if is_dataclass(giá_trị) else giá_trị
+        with self._khóa:
+            con_trỏ = self._db.execute(
+                "INSERT INTO lan_chay (thoi_gian, diem_rong_toi_thieu, toan_cuc, hoan_tat) VALUES (?, ?, ?, 0)",
+                (thời_gian, điểm_ròng_tối_thiểu, _json_gọn(toàn_cục)),
+            )
+            lần_chạy = con_trỏ.lastrowid
+        return BộGhiLầnChạy(self, lần_chạy, thời_gian, giá)
+
+    def ghi_lần_chạy(self, các_kết_quả: Iterable[KếtQuảTínHiệu], ngữ_cảnh: Optional[NgữCảnhChạy] = None,
+                     thời_gian: Optional[float] = None, giá: Optional[Dict[str, float]] = None,
+                     điểm_ròng_tối_thiểu: Optional[float] = None) -> int:
+        """Ghi trọn một lần chạy; trả về id lần chạy"""
+        bộ_ghi = self.mở_lần_chạy(ngữ_cảnh, thời_gian, giá, điểm_ròng_tối_thiểu)
+        for kq in các_kết_quả:
+            bộ_ghi.ghi(kq)
+        bộ_ghi.đóng()
+        return bộ_ghi.lần_chạy
+
+    def _chèn_ảnh_chụp(self, các_dòng: List[Tuple], lần_chạy: int, số_mã: int, trường: Dict[str, List[str]],
+                       hoàn_tất: bool = False):
+        with self._khóa:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("UPDATE lan_chay SET so_ma = ?, truong_thanh_phan = ?, hoan_tat = ? WHERE id = ?",
+                                 (số_mã, _json_gọn(trường), int(hoàn_tất), lần_chạy))
+                self._db.executemany(
+                    "INSERT INTO anh_chup (ma, thoi_gian, lan_chay, diem_mua, diem_ban, diem_rong, he_so, "
+                    "do_tin_cay, tin_hieu_chinh, da_dong_tien, gia, thanh_phan) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", các_dòng)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # ---------- Truy vấn ----------
+
+    def các_lần_chạy(self, từ: Optional[float] = None, đến: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Các lần chạy đã hoàn tất trong khoảng thời gian [từ, đến], cũ trước"""
+        with self._khóa:
+            các_dòng = self._db.execute(
+                "SELECT id, thoi_gian, diem_rong_toi_thieu, so_ma FROM lan_chay "
+                "WHERE thoi_gian >= ? AND thoi_gian <= ? AND hoan_tat = 1 ORDER BY thoi_gian, id",
+                (từ if từ is not None else float("-inf"), đến if đến is not None else float("inf")),
+            ).fetchall()
+        return [{"id": d[0], "thời_gian": d[1], "điểm_ròng_tối_thiểu": d[2], "số_mã": d[3]} for d in các_dòng]
+
+    def lần_chạy_mới_nhất(self) -> Optional[Dict[str, Any]]:
+        """Lần chạy hoàn tất mới nhất; lần chạy đang ghi dở không bao giờ được trả về"""
+        with self._khóa:
+            dòng = self._db.execute(
+                "SELECT id, thoi_gian, diem_rong_toi_thieu, so_ma FROM lan_chay WHERE hoan_tat = 1 "
+                "ORDER BY thoi_gian DESC, id DESC LIMIT 1"
+            ).fetchone()
+        if dòng is None:
+            return None
+        return {"id": dòng[0], "thời_gian": dòng[1], "điểm_ròng_tối_thiểu": dòng[2], "số_mã": dòng[3]}
+
+    def lịch_sử(self, mã: str, từ: Optional[float] = None, đến: Optional[float] = None) -> Dict[str, list]:
+        """Chuỗi thời gian điểm số của một mã dạng cột {tên cột: list}, theo CỘT_LỊCH_SỬ"""
+        with self._khóa:
+            các_dòng = self._db.execute(
+                "SELECT thoi_gian, diem_mua, diem_ban, diem_rong, he_so, do_tin_cay, tin_hieu_chinh, "
+                "da_dong_tien, gia FROM anh_chup WHERE ma = ? AND thoi_gian >= ? AND thoi_gian <= ? "
+                "ORDER BY thoi_gian",
+                (mã, từ if từ is not None else float("-inf"), đến if đến is not None else float("inf")),
+            ).fetchall()
+        if not các_dòng:
+            return {cột: [] for cột in CỘT_LỊCH_SỬ}
+        return {cột: list(giá_trị) for cột, giá_trị in zip(CỘT_LỊCH_SỬ, zip(*các_dòng))}
+
+    def kết_quả_lần_chạy(self, lần_chạy: int) -> List[Dict[str, Any]]:
+        """Các dòng của một lần chạy dạng dict như asdict(KếtQuảTínHiệu), gắn lại thành phần toàn cục"""
+        with self._khóa:
+            lần = self._db.execute("SELECT toan_cuc, truong_thanh_phan FROM lan_chay WHERE id = ?",
+                                   (lần_chạy,)).fetchone()
+            các_dòng = self._db.execute(
+                "SELECT ma, diem_mua, diem_ban, diem_rong, he_so, do_tin_cay, tin_hieu_chinh, gia, thanh_phan "
+                "FROM anh_chup WHERE lan_chay = ? ORDER BY rowid", (lần_chạy,),
+            ).fetchall()
+        if lần is None:
+            return []
+        toàn_cục, trường = json.loads(lần[0]), json.loads(lần[1])
+        kết_quả = []
+        for mã, mua, bán, ròng, hệ_số, tin_cậy, tín_hiệu_chính, giá, thành_phần in các_dòng:
+            thành_phần = _giải_nén_thành_phần(json.loads(thành_phần), trường)
+            for tên in THÀNH_PHẦN_TOÀN_CỤC:
+                if tên in toàn_cục:
+                    thành_phần[tên] = toàn_cục[tên]
+            kết_quả.append({
+                "mã": mã, "điểm_mua": mua, "điểm_bán": bán, "điểm_ròng": ròng,
+                "hệ_số_kích_thước_vị_thế": hệ_số, "độ_tin_cậy": tin_cậy, "tín_hiệu_chính": tín_hiệu_chính,
+                "giá": giá, "thành_phần": thành_phần,
+            })
+        return kết_quả
+
+    def lặp_dòng_thô(self, từ: Optional[float] = None,
+                     đến: Optional[float] = None) -> Iterator[Tuple[Dict[str, Any], List[Tuple]]]:
+        """Sinh (thông tin lần chạy, các dòng) theo thời gian; dòng là (mã, giá, tín_hiệu_chính, thành phần JSON chưa giải mã)
+
+        Thông tin lần chạy có thêm "toàn_cục" và "trường" (tên trường của thành phần dạng mảng giá trị)
+        để bên đọc hàng loạt (backtest) tự dựng cột mà không qua dict của từng dòng.
+        """
+        for lần in self.các_lần_chạy(từ, đến):
+            with self._khóa:
+                toàn_cục, trường = self._db.execute(
+                    "SELECT toan_cuc, truong_thanh_phan FROM lan_chay WHERE id = ?", (lần["id"],)
+                ).fetchone()
+                các_dòng = self._db.execute(
+                    "SELECT ma, gia, tin_hieu_chinh, thanh_phan FROM anh_chup WHERE lan_chay = ? ORDER BY rowid",
+                    (lần["id"],),
+                ).fetchall()
+            lần["toàn_cục"] = json.loads(toàn_cục)
+            lần["trường"] = json.loads(trường)
+            yield lần, các_dòng
+
+    def ảnh_chụp_lần_chạy(self, lần_chạy: int, các_thành_phần: Optional[Iterable[str]] = None
+                          ) -> Tuple[Optional[NgữCảnhChạy], List[ẢnhChụpThànhPhần]]:
+        """Dựng lại ngữ cảnh và ảnh chụp của một lần chạy để chấm điểm lại với trọng số/ngưỡng khác, không I/O mạng"""
+        các_dòng = self.kết_quả_lần_chạy(lần_chạy)
+        if not các_dòng:
+            return None, []
+        toàn_cục = {tên: _dựng_dữ_liệu(tên, giá_trị) for tên, giá_trị in self.toàn_cục_lần_chạy(lần_chạy).items()}
+        ngữ_cảnh = dựng_ngữ_cảnh_chạy(toàn_cục, các_thành_phần)
+        các_ảnh_chụp = []
+        for dòng in các_dòng:
+            theo_mã = {tên: _dựng_dữ_liệu(tên, giá_trị) for tên, giá_trị in dòng["thành_phần"].items()
+                       if tên not in THÀNH_PHẦN_TOÀN_CỤC}
+            hợp_đồng = theo_mã.pop("hợp_đồng", None) or DữLiệuHợpĐồngTươngLai(mã=dòng["mã"])
+            các_ảnh_chụp.append(tạo_ảnh_chụp(dòng["mã"], theo_mã, hợp_đồng, ngữ_cảnh))
+        return ngữ_cảnh, các_ảnh_chụp
+
+    def toàn_cục_lần_chạy(self, lần_chạy: int) -> Dict[str, Any]:
+        """Thành phần toàn cục đã lưu của một lần chạy"""
+        with self._khóa:
+            dòng = self._db.execute("SELECT toan_cuc FROM lan_chay WHERE id = ?", (lần_chạy,)).fetchone()
+        return json.loads(dòng[0]) if dòng is not None else {}
+
+    def đóng(self):
+        with self._khóa:
+            self._db.close()
+
+_KHO_MẶC_ĐỊNH: Optional[KhoẢnhChụp] = None
+_khóa_kho_mặc_định = threading.Lock()
+
+def lấy_kho_mặc_định() -> Optional[KhoẢnhChụp]:
+    """Kho tại CẤU_HÌNH["SNAPSHOT_DB"], mở một lần cho mỗi tiến trình; None nếu tắt hoặc không mở được"""
+    global _KHO_MẶC_ĐỊNH
+    if not CẤU_HÌNH["SNAPSHOT_DB"]:
+        return None
+    with _khóa_kho_mặc_định:
+        if _KHO_MẶC_ĐỊNH is None:
+            try:
+                _KHO_MẶC_ĐỊNH = KhoẢnhChụp(CẤU_HÌNH["SNAPSHOT_DB"])
+            except Exception as e:
+                print(f"Lỗi mở kho ảnh chụp: {e}")
+                return None
+        return _KHO_MẶC_ĐỊNH
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Dữ liệu mẫu cho kiểm thử và benchmark
+--------------------
+Sinh ảnh chụp thành phần tổng hợp, tất định theo hạt giống, phủ mọi nhánh của các hàm
+chấm_điểm_*; các file kiểm thử và benchmarks/ cùng dùng bộ sinh này.
+"""
+
+import random
+from typing import List
+
+from alpha_signal_checker_plus import (
+    ChỉSốKinhTếVĩMô,
+    DữLiệuHợpĐồngTươngLai,
+    TácĐộngTinTức,
+    TâmLýMạngXãHội,
+    ẢnhChụpThànhPhần,
+)
+
+XU_HƯỚNG = ["DÒNG_VÀO_MẠNH", "DÒNG_VÀO", "DÒNG_RA_MẠNH", "DÒNG_RA", "TRUNG_LẬP"]
+
+def sinh_ảnh_chụp(số_coin: int, hạt_giống: int = 7) -> List[ẢnhChụpThànhPhần]:
+    """Sinh ảnh chụp ngẫu nhiên, bao gồm các giá trị nằm đúng trên ngưỡng"""
+    rng = random.Random(hạt_giống)
+
+    def chọn(*giá_trị):
+        return rng.choice(giá_trị)
+
+    kết_quả = []
+    for i in range(số_coin):
+        mã = f"C{i}"
+        tin_nóng = [
+            {"tiêu_đề": f"Tin {k} cho {mã}", "tâm_lý": chọn(0.8, 0.5, -0.3, -0.6, 0.0), "tác_động": chọn(8, 7, 6, 2)}
+            for k in range(rng.randint(0, 4))
+        ]
+        kết_quả.append(ẢnhChụpThànhPhần(
+            mã=mã,
+            mạng_xã_hội=TâmLýMạngXãHội(
+                tâm_lý_twitter=rng.random(), tâm_lý_reddit=rng.random(), tâm_lý_influencer=rng.random(),
+                thay_đổi_tâm_lý_24h=chọn(0.15, -0.15, rng.uniform(-0.5, 0.5)),
+                điểm_galaxy=chọn(70, 30, rng.uniform(0, 100)),
+                xếp_hạng_alt=chọn(50, 200, rng.randint(1, 500)),
+            ),
+            tin_tức=TácĐộngTinTức(
+                tin_nóng=tin_nóng,
+                lượng_tin_24h=rng.randint(0, 100),
+                tâm_lý_tin_tức_trung_bình=chọn(0.6, 0.3, rng.uniform(-1, 1)),
+                số_tin_tích_cực=rng.randint(0, 10), số_tin_tiêu_cực=rng.randint(0, 10),
+                tin_tác_động_cao=rng.randint(0, 4),
+            ),
+            hợp_đồng=DữLiệuHợpĐồngTươngLai(
+                mã=mã,
+                dòng_tiền_ròng_24h=rng.uniform(-1e6, 1e6),
+                tâm_lý_thị_trường=chọn("BULL", "BEAR", "TRUNG_LẬP"),
+                khối_lượng_cân_bằng=chọn(1000000, rng.uniform(0, 5e6)),
+                xu_hướng_dòng_tiền=rng.choice(XU_HƯỚNG),
+                đà_dòng_tiền=chọn(0.2, -0.2, rng.uniform(-1, 1)),
+            ),
+            vĩ_mô=ChỉSốKinhTếVĩMô(
+                vix_hiện_tại=chọn(25, 15, rng.uniform(10, 35)), xu_hướng_vix=chọn("TĂNG", "GIẢM", "TRUNG_LẬP"),
+                dxy_hiện_tại=chọn(105, 100, rng.uniform(95, 110)), xu_hướng_dxy=chọn("TĂNG", "GIẢM", "TRUNG_LẬP"),
+                lợi_suất_trái_phiếu_mỹ_10năm=rng.uniform(3, 6), xu_hướng_lợi_suất=chọn("TĂNG", "GIẢM"),
+                thay_đổi_sp500=rng.uniform(-3, 3), thay_đổi_nasdaq=rng.uniform(-3, 3),
+                mức_độ_chấp_nhận_rủi_ro=chọn("CAO", "THẤP", "TRUNG_BÌNH"),
+            ),
+        ))
+    return kết_quả
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử lấy dữ liệu theo lô
+--------------------
+Server giả lập cục bộ đóng vai LunarCrush, CryptoPanic (benchmarks/bench_batch_fetch.py) và
+NewsAPI: lấy theo lô phải cho kết quả giống hệt lấy từng mã với ít yêu cầu hơn, lần thứ hai chỉ
+đọc bộ nhớ đệm; chỉ cấu hình NEWSAPI_KEY thì tin tức lấy từ NewsAPI thay vì trả về rỗng. Trường
+LunarCrush dạng chuỗi ("45.0") vẫn đọc được, trường hỏng giữ mặc định thay vì làm hỏng cả lô.
+"""
+
+import json
+import threading
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import alpha_signal_checker_plus
+from alpha_signal_checker_plus import (
+    BỘ_NHỚ_ĐỆM,
+    CẤU_HÌNH,
+    TâmLýMạngXãHội,
+    lấy_tác_động_tin_tức,
+    lấy_tâm_lý_mạng_xã_hội_lô,
+)
+from benchmarks.bench_batch_fetch import _bài_của, _BộXửLýNhàCungCấp
+from benchmarks.bench_fetch_engine import _ServerGiảLập
+from fetch_engine import lấy_đồng_thời, nhà_cung_cấp_mặc_định
+
+CÁC_MÃ = [f"C{i}" for i in range(120)]
+
+class _BộXửLýNewsAPI(BaseHTTPRequestHandler):
+    các_yêu_cầu: list = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        tham_số = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.các_yêu_cầu.append((tham_số, self.headers.get("X-Api-Key")))
+        if tham_số["q"] == "LỖI":
+            self.send_response(401)
+            self.end_headers()
+            return
+        các_bài = [{"title": f"Tin {j} về {tham_số['q']}"} for j in range(4)]
+        nội_dung = json.dumps({"status": "ok", "totalResults": 57, "articles": các_bài}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(nội_dung)))
+        self.end_headers()
+        self.wfile.write(nội_dung)
+
+    def log_message(self, *args):
+        pass
+
+def _khởi_động(bộ_xử_lý):
+    server = _ServerGiảLập(("127.0.0.1", 0), bộ_xử_lý)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+@pytest.fixture
+def nhà_cung_cấp(monkeypatch):
+    monkeypatch.setattr(_BộXửLýNhàCungCấp, "tất_cả_bài", _bài_của(CÁC_MÃ))
+    monkeypatch.setattr(_BộXửLýNhàCungCấp, "không_theo_dõi", set(CÁC_MÃ[::7]))
+    monkeypatch.setattr(_BộXửLýNhàCungCấp, "độ_trễ", 0.0)
+    server, gốc = _khởi_động(_BộXửLýNhàCungCấp)
+    for khóa, giá_trị in {
+        "LUNARCRUSH_API_KEY": "test-key", "LUNARCRUSH_BASE": f"{gốc}/lunarcrush/",
+        "CRYPTOPANIC_TOKEN": "test-key", "CRYPTOPANIC_BASE": f"{gốc}/cryptopanic/",
+    }.items():
+        monkeypatch.setitem(CẤU_HÌNH, khóa, giá_trị)
+    BỘ_NHỚ_ĐỆM.xóa()
+    yield
+    BỘ_NHỚ_ĐỆM.xóa()
+    server.shutdown()
+    server.server_close()
+
+def _lấy(các_nhà_cung_cấp):
+    for đường_dẫn in _BộXửLýNhàCungCấp.số_yêu_cầu:
+        _BộXửLýNhàCungCấp.số_yêu_cầu[đường_dẫn] = 0
+    kết_quả = lấy_đồng_thời(CÁC_MÃ, các_nhà_cung_cấp)
+    return kết_quả, dict(_BộXửLýNhàCungCấp.số_yêu_cầu)
+
+def test_theo_lô_giống_từng_mã(nhà_cung_cấp):
+    theo_lô = nhà_cung_cấp_mặc_định()
+    từng_mã, yêu_cầu_từng_mã = _lấy([replace(ncc, hàm_lấy_lô=None) for ncc in theo_lô])
+    BỘ_NHỚ_ĐỆM.xóa()
+    lô, yêu_cầu_lô = _lấy(theo_lô)
+
+    assert all(v is not None for theo_mã in từng_mã for v in theo_mã.values())
+    assert lô == từng_mã
+    assert yêu_cầu_từng_mã["/lunarcrush/coins"] == len(CÁC_MÃ)
+    số_lô = -(-len(CÁC_MÃ) // CẤU_HÌNH["LUNARCRUSH_BATCH_SIZE"])
+    assert yêu_cầu_lô["/lunarcrush/coins"] == số_lô
+    assert yêu_cầu_lô["/cryptopanic/posts/"] < yêu_cầu_từng_mã["/cryptopanic/posts/"]
+
+def test_lần_hai_chỉ_đọc_bộ_nhớ_đệm(nhà_cung_cấp):
+    lần_đầu, _ = _lấy(nhà_cung_cấp_mặc_định())
+    lần_hai, số_yêu_cầu = _lấy(nhà_cung_cấp_mặc_định())
+    assert lần_hai == lần_đầu
+    assert sum(số_yêu_cầu.values()) == 0
+
+def test_mã_không_theo_dõi_nhận_dữ_liệu_rỗng(nhà_cung_cấp):
+    kết_quả, _ = _lấy(nhà_cung_cấp_mặc_định())
+    assert kết_quả[0]["mạng_xã_hội"] == TâmLýMạngXãHội()
+    assert kết_quả[1]["mạng_xã_hội"] != TâmLýMạngXãHội()
+
+@pytest.fixture
+def newsapi(monkeypatch):
+    monkeypatch.setattr(_BộXửLýNewsAPI, "các_yêu_cầu", [])
+    server, gốc = _khởi_động(_BộXửLýNewsAPI)
+    monkeypatch.setitem(CẤU_HÌNH, "CRYPTOPANIC_TOKEN", "")
+    monkeypatch.setitem(CẤU_HÌNH, "NEWSAPI_KEY", "newsapi-key")
+    monkeypatch.setitem(CẤU_HÌNH, "NEWSAPI_BASE", f"{gốc}/v2/everything")
+    yield _BộXửLýNewsAPI.các_yêu_cầu
+    server.shutdown()
+    server.server_close()
+
+def test_chỉ_newsapi(newsapi):
+    tin_tức = lấy_tác_động_tin_tức.bỏ_qua_bộ_nhớ_đệm("BTC")
+    assert tin_tức.lượng_tin_24h == 57
+    assert tin_tức.số_tin_trung_tính == 57
+    assert tin_tức.tâm_lý_tin_tức_trung_bình == 0.5
+    assert [t["tiêu_đề"] for t in tin_tức.tin_nóng] == ["Tin 0 về BTC", "Tin 1 về BTC", "Tin 2 về BTC"]
+    ((tham_số, khóa),) = newsapi
+    assert tham_số["q"] == "BTC" and "from" in tham_số
+    assert khóa == "newsapi-key"
+
+def test_newsapi_lỗi_không_lưu_đệm(newsapi):
+    assert lấy_tác_động_tin_tức.bỏ_qua_bộ_nhớ_đệm("LỖI") is None
+
+def test_trường_lunarcrush_hỏng_giữ_mặc_định(monkeypatch):
+    phản_hồi = {"data": [
+        {"symbol": "AAA", "alt_rank": "45.0", "galaxy_score": "71.5", "social_mentions_24h": 1200.0},
+        {"symbol": "BBB", "alt_rank": "n/a", "galaxy_score": {"x": 1}, "tweet_sentiment": "0.7",
+         "reddit_posts_24h": "inf"},
+    ]}
+    monkeypatch.setitem(CẤU_HÌNH, "LUNARCRUSH_API_KEY", "test-key")
+    monkeypatch.setattr(alpha_signal_checker_plus, "_yêu_cầu_an_toàn", lambda *a, **k: phản_hồi)
+    kết_quả = lấy_tâm_lý_mạng_xã_hội_lô.bỏ_qua_bộ_nhớ_đệm(["AAA", "BBB"])
+    assert kết_quả["AAA"] == TâmLýMạngXãHội(xếp_hạng_alt=45, điểm_galaxy=71.5, lượt_nhắc_twitter=1200)
+    assert type(kết_quả["AAA"].xếp_hạng_alt) is int
+    assert kết_quả["BBB"] == TâmLýMạngXãHội(tâm_lý_twitter=0.7)
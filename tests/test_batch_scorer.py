@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử tương đương của bộ chấm điểm theo lô
+--------------------
+chấm_điểm_lô (batch_scorer.py) phải cho đúng từng bit điểm số, cùng độ tin cậy, tín hiệu
+chính và chuỗi tín hiệu / cảnh báo như đường vô hướng chấm_điểm_ảnh_chụp, với nhiều ngưỡng
+và trọng số (kể cả chỉ ghi đè một phần), trên dữ liệu tổng hợp phủ mọi nhánh của các hàm
+chấm_điểm_*.
+"""
+
+import pytest
+
+from alpha_signal_checker_plus import chấm_điểm_ảnh_chụp
+from batch_scorer import chấm_điểm_lô, khung_từ_ảnh_chụp
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+TRỌNG_SỐ_KHÁC = {"mạng_xã_hội": 0.35, "tin_tức": 0.1, "hợp_đồng": 0.45, "vĩ_mô": 0.05}
+
+@pytest.fixture(scope="module")
+def các_ảnh_chụp():
+    return sinh_ảnh_chụp(3000, hạt_giống=1)
+
+@pytest.mark.parametrize("điểm_ròng_tối_thiểu, trọng_số", [
+    (0.0, None), (0.5, None), (2.0, None), (3.3, None), (1.0, TRỌNG_SỐ_KHÁC),
+    # Chỉ ghi đè một phần: các thành phần còn lại dùng trọng số đã đăng ký
+    (1.0, {"hợp_đồng": 0.5}),
+])
+def test_theo_lô_giống_vô_hướng(các_ảnh_chụp, điểm_ròng_tối_thiểu, trọng_số):
+    lô = chấm_điểm_lô(khung_từ_ảnh_chụp(các_ảnh_chụp), điểm_ròng_tối_thiểu, trọng_số)
+    for i, ảnh_chụp in enumerate(các_ảnh_chụp):
+        vô_hướng = chấm_điểm_ảnh_chụp(ảnh_chụp, điểm_ròng_tối_thiểu, trọng_số)
+        vector = lô.kết_quả(i)
+        for tên in ("điểm_mua", "điểm_bán", "điểm_ròng", "hệ_số_kích_thước_vị_thế"):
+            # So sánh từng bit, không dùng sai số
+            assert getattr(vô_hướng, tên).hex() == getattr(vector, tên).hex(), (ảnh_chụp.mã, tên)
+        assert vô_hướng.độ_tin_cậy == vector.độ_tin_cậy, ảnh_chụp.mã
+        assert vô_hướng.tín_hiệu_chính == vector.tín_hiệu_chính, ảnh_chụp.mã
+        assert list(vô_hướng.tín_hiệu) == list(vector.tín_hiệu), ảnh_chụp.mã
+        assert list(vô_hướng.cảnh_báo) == list(vector.cảnh_báo), ảnh_chụp.mã
+
+def test_khung_rỗng():
+    lô = chấm_điểm_lô(khung_từ_ảnh_chụp([]))
+    assert len(lô) == 0
+
+def test_chuỗi_dựng_theo_yêu_cầu(các_ảnh_chụp):
+    # Chấm cả khung chỉ ghi mặt nạ và mẫu chuỗi, không dựng chuỗi cho từng dòng
+    lô = chấm_điểm_lô(khung_từ_ảnh_chụp(các_ảnh_chụp))
+    for mặt_nạ, mẫu, _ in lô._chuỗi.tín_hiệu + lô._chuỗi.cảnh_báo:
+        assert mặt_nạ.shape == (len(các_ảnh_chụp),) and isinstance(mẫu, str)
+    assert lô.tín_hiệu(0) == list(chấm_điểm_ảnh_chụp(các_ảnh_chụp[0]).tín_hiệu)
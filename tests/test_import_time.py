@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử module nạp khi khởi động
+--------------------
+Mỗi kịch bản khởi động của benchmarks/bench_import_time.py (CLI chấm điểm, CLI đọc luồng, hai
+trang dashboard) chạy trong tiến trình mới; thất bại nếu nạp module bị cấm như requests,
+pandas, numpy hay pyarrow.
+"""
+
+import pytest
+
+from benchmarks.bench_import_time import (
+    CẤM_DASHBOARD,
+    các_kịch_bản,
+    module_bị_cấm,
+    môi_trường_không_khóa,
+    đo,
+)
+
+TÊN_KỊCH_BẢN = ["cli_chấm_điểm", "cli_đọc_luồng", "dashboard_tổng_quan", "dashboard_chi_tiết"]
+
+@pytest.fixture(scope="module")
+def kịch_bản(tmp_path_factory):
+    thư_mục = str(tmp_path_factory.mktemp("import_time"))
+    return {tên: (lệnh, bị_cấm) for tên, lệnh, bị_cấm, _ in các_kịch_bản(thư_mục, 20)}
+
+@pytest.mark.parametrize("tên", TÊN_KỊCH_BẢN)
+def test_không_nạp_module_bị_cấm(kịch_bản, tên):
+    lệnh, bị_cấm = kịch_bản[tên]
+    _, các_module = đo(lệnh, môi_trường_không_khóa())
+    assert module_bị_cấm(các_module, bị_cấm) == []
+
+def test_phát_hiện_module_bị_cấm():
+    # Kiểm tra chính bộ phát hiện: một lệnh nạp numpy phải bị bắt
+    pytest.importorskip("numpy")
+    _, các_module = đo(["-c", "import json, numpy"], môi_trường_không_khóa())
+    assert "numpy" in module_bị_cấm(các_module, CẤM_DASHBOARD)
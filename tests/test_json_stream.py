@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử đọc JSON theo luồng
+--------------------
+Mảng JSON và NDJSON đọc theo khối cho cùng kết quả với json.load; phần tử lỗi được báo ngay
+khi đã trọn trong bộ đệm. Chế độ --đọc-luồng giữ bản ghi cuối của mã trùng lặp như khi nạp cả
+file và báo lỗi định dạng như đường không luồng thay vì traceback.
+"""
+
+import io
+import json
+import sys
+
+import pytest
+
+import alpha_signal_checker_plus
+from alpha_signal_checker_plus import phân_tích_dữ_liệu_hợp_đồng_tương_lai, đọc_hợp_đồng_theo_luồng
+from json_stream import lặp_bản_ghi, lặp_mảng_json
+
+BẢN_GHI = [
+    {"p": "AAA-USDT-PERP@ethereum", "sm": {"24h": 1.5e6, "7d": -2}, "st": {"24h": "bull"}},
+    {"p": "BBB-PERP", "sm": {"24h": -4e6}, "ghi_chú": "chuỗi có \"ngoặc\" và ] , {"},
+    {"p": "AAA-USDT-PERP", "sm": {"24h": 9e6, "30d": 12345678901234567890}},
+    {"p": "CCC-USDT", "cin": {"24h": 3}, "mảng": [1, [2, 3], {"x": None}]},
+]
+
+class _TệpĐếmLầnĐọc(io.StringIO):
+    def __init__(self, nội_dung: str):
+        super().__init__(nội_dung)
+        self.số_ký_tự_đã_đọc = 0
+
+    def read(self, kích_thước=-1):
+        khối = super().read(kích_thước)
+        self.số_ký_tự_đã_đọc += len(khối)
+        return khối
+
+@pytest.mark.parametrize("kích_thước_khối", [1, 3, 7, 64, 1 << 16])
+def test_mảng_json_theo_khối(kích_thước_khối):
+    tệp = io.StringIO(json.dumps(BẢN_GHI, ensure_ascii=False, indent=1))
+    assert list(lặp_mảng_json(tệp, kích_thước_khối)) == BẢN_GHI
+
+def test_ndjson():
+    tệp = io.StringIO("\n".join(json.dumps(b) for b in BẢN_GHI) + "\n\n")
+    assert list(lặp_bản_ghi(tệp)) == BẢN_GHI
+
+def test_phần_tử_lỗi_không_đọc_hết_file():
+    phần_đuôi = ",".join(json.dumps(b) for b in BẢN_GHI * 5000)
+    tệp = _TệpĐếmLầnĐọc('[{"p": "AAA"}, {"p": tru}, ' + phần_đuôi + "]")
+    các_mục = lặp_mảng_json(tệp, kích_thước_khối=256)
+    assert next(các_mục) == {"p": "AAA"}
+    with pytest.raises(json.JSONDecodeError):
+        next(các_mục)
+    assert tệp.số_ký_tự_đã_đọc <= 2 * 256
+
+def test_mảng_chưa_đóng():
+    with pytest.raises(ValueError):
+        list(lặp_mảng_json(io.StringIO('[{"p": "AAA"}, {"p": "B'), 4))
+
+def test_mã_trùng_giữ_bản_ghi_cuối(tmp_path):
+    đường_dẫn = tmp_path / "dau_vao.json"
+    đường_dẫn.write_text(json.dumps(BẢN_GHI), encoding="utf-8")
+    theo_luồng = list(đọc_hợp_đồng_theo_luồng(str(đường_dẫn)))
+    # Cùng thứ tự với dict của đường nạp cả file: vị trí đầu tiên, giá trị của bản ghi cuối
+    assert theo_luồng == list(phân_tích_dữ_liệu_hợp_đồng_tương_lai(BẢN_GHI).values())
+    assert [h.mã for h in theo_luồng] == ["AAA", "BBB", "CCC"]
+    assert theo_luồng[0].dòng_tiền_ròng_24h == 9e6
+
+def _chạy_cli(monkeypatch, tmp_path, nội_dung: str, *thêm: str):
+    đầu_vào, đầu_ra = tmp_path / "dau_vao.json", tmp_path / f"kq{'_'.join(thêm)}.ndjson"
+    đầu_vào.write_text(nội_dung, encoding="utf-8")
+    monkeypatch.setitem(alpha_signal_checker_plus.CẤU_HÌNH, "METRICS_PROM_FILE", "")
+    monkeypatch.setattr(sys, "argv", ["alpha_signal_checker_plus.py", "--file-đầu-vào", str(đầu_vào),
+                                      "--file-đầu-ra", str(đầu_ra), "--file-prometheus", "", *thêm])
+    alpha_signal_checker_plus.main()
+    return đầu_ra
+
+def test_cli_luồng_báo_lỗi_định_dạng(monkeypatch, tmp_path, capsys):
+    đầu_ra = _chạy_cli(monkeypatch, tmp_path, '[{"p": "AAA-PERP"}, {"p": tru}, {"p": "CCC-PERP"}]', "--đọc-luồng")
+    assert "Lỗi tải file đầu vào" in capsys.readouterr().out
+    assert not đầu_ra.exists()
+
+def test_cli_luồng_không_in_mã_trùng(monkeypatch, tmp_path, capsys):
+    đầu_ra = _chạy_cli(monkeypatch, tmp_path, json.dumps(BẢN_GHI), "--đọc-luồng")
+    các_dòng = [json.loads(d) for d in đầu_ra.read_text(encoding="utf-8").splitlines()]
+    assert [d["mã"] for d in các_dòng] == ["AAA", "BBB", "CCC"]
+    assert sum(dòng.startswith("AAA ") for dòng in capsys.readouterr().out.splitlines()) == 1
+
+def test_cli_luồng_cùng_đầu_ra_với_nạp_cả_file(monkeypatch, tmp_path):
+    # Mã trùng rải rác: C0..C59, rồi bản ghi mới của C50..C59 và C0..C9, rồi mã mới
+    các_bản_ghi = [{"p": f"C{i}-USDT-PERP", "sm": {"24h": (i - 30) * 1e5}} for i in range(60)]
+    các_bản_ghi += [{"p": f"C{i}-USDT-PERP", "sm": {"24h": 3e6}, "st": {"24h": "bull"}}
+                    for i in list(range(50, 60)) + list(range(10))]
+    các_bản_ghi += [{"p": f"D{i}-PERP", "sm": {"24h": -3e6}} for i in range(5)]
+    nội_dung = json.dumps(các_bản_ghi)
+    luồng = _chạy_cli(monkeypatch, tmp_path, nội_dung, "--đọc-luồng").read_text(encoding="utf-8")
+    cả_file = _chạy_cli(monkeypatch, tmp_path, nội_dung).read_text(encoding="utf-8")
+    assert luồng.splitlines() == cả_file.splitlines()
+    assert json.loads(luồng.splitlines()[0])["mã"] == "C0"
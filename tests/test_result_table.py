@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử bảng kết quả dạng cột
+--------------------
+Dòng dựng lại từ BảngKếtQuả và từ KếtQuảChung (file Arrow công bố) giống hệt kết quả gốc, kể cả
+khi cột thành phần xuất hiện muộn, bị thiếu ở vài dòng hoặc đổi kiểu (int -> float -> chuỗi).
+"""
+
+import pytest
+
+from alpha_signal_checker_plus import KếtQuảTínHiệu, chấm_điểm_ảnh_chụp
+from result_index import ChỉMụcKếtQuả
+from result_table import BảngKếtQuả
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def _kết_quả(mã: str, thành_phần: dict) -> KếtQuảTínHiệu:
+    return KếtQuảTínHiệu(mã=mã, điểm_mua=1.0, điểm_bán=0.5, điểm_ròng=0.5, hệ_số_kích_thước_vị_thế=1.0,
+                         độ_tin_cậy="THẤP", tín_hiệu_chính="TRUNG_LẬP", tín_hiệu=["a"], cảnh_báo=[],
+                         thành_phần=thành_phần)
+
+def test_dòng_giống_kết_quả_gốc():
+    các_kết_quả = [chấm_điểm_ảnh_chụp(a) for a in sinh_ảnh_chụp(300, hạt_giống=2)]
+    bảng = BảngKếtQuả.từ_kết_quả(các_kết_quả)
+    assert [bảng.dòng(i) for i in range(len(bảng))] == các_kết_quả
+    chỉ_mục = ChỉMụcKếtQuả(bảng)
+    assert all(chỉ_mục.dòng(kq.mã) == kq for kq in các_kết_quả)
+
+def test_cột_xuất_hiện_muộn_và_đổi_kiểu():
+    bảng = BảngKếtQuả.từ_kết_quả([
+        _kết_quả("A", {"tin_tức": {"lượng_tin_24h": 3}}),
+        _kết_quả("B", {"tin_tức": {"lượng_tin_24h": 2.5, "nguồn": "x"},
+                       "hợp_đồng": {"mã": "B", "dòng_tiền_ròng_24h": 7}}),
+        _kết_quả("C", {"tin_tức": {"lượng_tin_24h": "nhiều"}}),
+    ])
+    # Cột tạo muộn được điền giá trị trống cho các dòng trước
+    assert bảng.thành_phần(0) == {"tin_tức": {"lượng_tin_24h": 3, "nguồn": None},
+                                  "hợp_đồng": {"mã": "A", "dòng_tiền_ròng_24h": 0}}
+    assert bảng.thành_phần(1) == {"tin_tức": {"lượng_tin_24h": 2.5, "nguồn": "x"},
+                                  "hợp_đồng": {"mã": "B", "dòng_tiền_ròng_24h": 7}}
+    assert bảng.thành_phần(2) == {"tin_tức": {"lượng_tin_24h": "nhiều", "nguồn": None},
+                                  "hợp_đồng": {"mã": "C", "dòng_tiền_ròng_24h": 0}}
+
+def test_kết_quả_chung_giống_kết_quả_gốc(tmp_path):
+    pytest.importorskip("pyarrow")
+    from shared_results import KếtQuảChung, công_bố_kết_quả_chung
+
+    các_kết_quả = [chấm_điểm_ảnh_chụp(a) for a in sinh_ảnh_chụp(200, hạt_giống=4)]
+    đường_dẫn = str(tmp_path / "kq.arrow")
+    công_bố_kết_quả_chung(BảngKếtQuả.từ_kết_quả(các_kết_quả), đường_dẫn, lần_chạy=1)
+    kết_quả_chung = KếtQuảChung.mở(đường_dẫn)
+    assert [kết_quả_chung.dòng(i) for i in range(len(kết_quả_chung))] == các_kết_quả
+    cắt = kết_quả_chung.cắt(20)
+    assert [cắt.dòng(i) for i in range(20)] == các_kết_quả[:20]
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử ghi nhớ điểm thành phần
+--------------------
+Bộ chấm điểm được ghi nhớ trả về cùng giá trị và cùng kiểu (tín hiệu / cảnh báo là list) khi
+tắt ghi nhớ, lần trượt và lần trúng; bên gọi sửa list trả về không làm hỏng mục đã lưu.
+"""
+
+import pytest
+
+from alpha_signal_checker_plus import (
+    BỘ_GHI_NHỚ_ĐIỂM,
+    ChỉSốFearGreed,
+    TVLDeFi,
+    chấm_điểm_fear_greed,
+    chấm_điểm_môi_trường_vĩ_mô,
+    chấm_điểm_tvl_defi,
+    chấm_điểm_tâm_lý_mạng_xã_hội,
+    chấm_điểm_ảnh_chụp,
+)
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+CÁC_ẢNH_CHỤP = sinh_ảnh_chụp(50, hạt_giống=3)
+# (bộ chấm điểm, tên thành phần, dữ liệu đầu vào phủ mọi nhánh)
+BỘ_CHẤM = [
+    (chấm_điểm_tâm_lý_mạng_xã_hội, "mạng_xã_hội", [a.mạng_xã_hội for a in CÁC_ẢNH_CHỤP]),
+    (chấm_điểm_môi_trường_vĩ_mô, "vĩ_mô", [a.vĩ_mô for a in CÁC_ẢNH_CHỤP]),
+    (chấm_điểm_fear_greed, "fear_greed", [ChỉSốFearGreed(giá_trị=v) for v in range(0, 101, 2)]),
+    (chấm_điểm_tvl_defi, "tvl_defi", [TVLDeFi(thay_đổi_7ngày=v / 2) for v in range(-20, 21)]),
+]
+
+@pytest.fixture
+def ghi_nhớ():
+    dung_lượng = BỘ_GHI_NHỚ_ĐIỂM.dung_lượng
+    BỘ_GHI_NHỚ_ĐIỂM.dung_lượng = 4096
+    BỘ_GHI_NHỚ_ĐIỂM.xóa()
+    yield BỘ_GHI_NHỚ_ĐIỂM
+    BỘ_GHI_NHỚ_ĐIỂM.dung_lượng = dung_lượng
+    BỘ_GHI_NHỚ_ĐIỂM.xóa()
+
+def _kiểu(điểm: tuple) -> tuple:
+    return tuple(type(x) for x in điểm)
+
+@pytest.mark.parametrize("hàm_chấm, thành_phần, các_dữ_liệu", BỘ_CHẤM, ids=[t for _, t, _ in BỘ_CHẤM])
+def test_cùng_giá_trị_và_kiểu(ghi_nhớ, hàm_chấm, thành_phần, các_dữ_liệu):
+    for dữ_liệu in các_dữ_liệu:
+        ghi_nhớ.dung_lượng = 0
+        tắt = hàm_chấm(dữ_liệu)
+        ghi_nhớ.dung_lượng = 4096
+        trượt, trúng = hàm_chấm(dữ_liệu), hàm_chấm(dữ_liệu)
+        assert tắt == hàm_chấm.bỏ_qua_ghi_nhớ(dữ_liệu) == trượt == trúng
+        assert _kiểu(tắt) == _kiểu(trượt) == _kiểu(trúng)
+        assert isinstance(trúng[-2], list) and isinstance(trúng[-1], list)
+    assert ghi_nhớ.lấy_thống_kê()[f"trúng_{thành_phần}"] >= len(các_dữ_liệu)
+
+def test_sửa_kết_quả_không_hỏng_bộ_nhớ(ghi_nhớ):
+    dữ_liệu = ChỉSốFearGreed(giá_trị=10)
+    lần_đầu = chấm_điểm_fear_greed(dữ_liệu)
+    lần_đầu[2].append("thêm")
+    lần_đầu[3].append("thêm")
+    assert chấm_điểm_fear_greed(dữ_liệu) == chấm_điểm_fear_greed.bỏ_qua_ghi_nhớ(dữ_liệu)
+
+def test_kết_quả_tắt_bật_giống_hệt(ghi_nhớ):
+    các_ảnh_chụp = sinh_ảnh_chụp(200, hạt_giống=5)
+    ghi_nhớ.dung_lượng = 0
+    tắt = [chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp]
+    ghi_nhớ.dung_lượng = 4096
+    lạnh = [chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp]
+    ấm = [chấm_điểm_ảnh_chụp(a) for a in các_ảnh_chụp]
+    assert tắt == lạnh == ấm
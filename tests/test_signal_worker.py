@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử tiến trình nền
+--------------------
+Thành phần hợp đồng tương lai đọc từ file đầu vào theo chu kỳ riêng, đi vào điểm số và kho
+lịch sử (da_dong_tien) như đường CLI; không có file thì thành phần bị bỏ và ghi rõ khi công bố.
+Chấm điểm không tự lấy vĩ mô qua mạng: vĩ mô chỉ được lấy trong làm_mới.
+"""
+
+import json
+
+import pytest
+
+import alpha_signal_checker_plus
+import signal_worker
+from alpha_signal_checker_plus import (
+    ChỉSốKinhTếVĩMô,
+    chấm_điểm_ảnh_chụp,
+    dựng_ngữ_cảnh_chạy,
+    lấy_chỉ_số_kinh_tế_vĩ_mô,
+    phân_tích_dữ_liệu_hợp_đồng_tương_lai,
+    tạo_ảnh_chụp,
+)
+from shared_results import KếtQuảChung
+from snapshot_store import KhoẢnhChụp
+
+# Chỉ các thành phần không cần mạng, để kiểm thử chạy được offline
+THÀNH_PHẦN = ("hợp_đồng", "vĩ_mô")
+BẢN_GHI = [
+    {"p": "AAA-USDT-PERP@ethereum", "sm": {"24h": 3e6, "7d": 5e6, "30d": 9e6},
+     "cin": {"24h": 1e6}, "cout": {"24h": 4e6}, "st": {"24h": "bull"}, "bv": {"24h": 2e6}},
+    {"p": "BBB-USDT-PERP", "sm": {"24h": -4e6, "7d": -2e6}, "cin": {"24h": 5e6}, "cout": {"24h": 1e5},
+     "st": {"24h": "bear"}},
+]
+
+@pytest.fixture
+def môi_trường(tmp_path, monkeypatch):
+    monkeypatch.setattr(signal_worker, "lấy_thị_trường_top_coin",
+                        lambda: [{"mã": mã, "giá": 1.0} for mã in ("AAA", "BBB", "CCC")])
+    monkeypatch.setitem(signal_worker.CẤU_HÌNH, "SHARED_RESULTS_FILE", str(tmp_path / "kq.arrow"))
+    monkeypatch.setitem(signal_worker.CẤU_HÌNH, "METRICS_PROM_FILE", "")
+    file_hợp_đồng = tmp_path / "hop_dong.json"
+    file_hợp_đồng.write_text(json.dumps(BẢN_GHI), encoding="utf-8")
+    kho = KhoẢnhChụp(str(tmp_path / "kho.db"))
+    yield kho, str(file_hợp_đồng), tmp_path
+    kho.đóng()
+
+def _vĩ_mô_cố_định(tiến_trình):
+    # Vĩ mô đã có sẵn: không gọi API khi làm mới
+    tiến_trình.toàn_cục["vĩ_mô"] = lấy_chỉ_số_kinh_tế_vĩ_mô()
+    tiến_trình.lần_làm_mới["vĩ_mô"] = float("inf")
+
+def test_hợp_đồng_đi_vào_điểm_số_và_kho(môi_trường):
+    kho, file_hợp_đồng, _ = môi_trường
+    tiến_trình = signal_worker.TiếnTrìnhNền(kho, các_thành_phần=THÀNH_PHẦN, file_hợp_đồng=file_hợp_đồng)
+    _vĩ_mô_cố_định(tiến_trình)
+    assert "hợp_đồng" in tiến_trình.các_nguồn()
+    lần_chạy = tiến_trình.chạy_một_vòng(bây_giờ=1000.0)
+    assert lần_chạy is not None
+
+    # Cùng điểm với đường CLI trên cùng dữ liệu hợp đồng
+    ngữ_cảnh = dựng_ngữ_cảnh_chạy(tiến_trình.toàn_cục, THÀNH_PHẦN)
+    hợp_đồng = phân_tích_dữ_liệu_hợp_đồng_tương_lai(BẢN_GHI)
+    mong_đợi = [chấm_điểm_ảnh_chụp(tạo_ảnh_chụp(mã, {}, hợp_đồng[mã], ngữ_cảnh)) for mã in ("AAA", "BBB")]
+    assert tiến_trình.chấm_điểm()[:2] == mong_đợi
+    assert any(kq.điểm_ròng != 0 for kq in mong_đợi)
+
+    lịch_sử = kho.lịch_sử("AAA")
+    assert lịch_sử["đà_dòng_tiền"] == [hợp_đồng["AAA"].đà_dòng_tiền]
+    # Mã không có trong file hợp đồng: chấm trên dữ liệu rỗng như CLI
+    assert kho.lịch_sử("CCC")["đà_dòng_tiền"] == [0.0]
+
+def test_đọc_lại_file_hợp_đồng_theo_chu_kỳ(môi_trường):
+    kho, file_hợp_đồng, _ = môi_trường
+    tiến_trình = signal_worker.TiếnTrìnhNền(kho, các_thành_phần=THÀNH_PHẦN, file_hợp_đồng=file_hợp_đồng,
+                                            chu_kỳ={"hợp_đồng": 60.0})
+    _vĩ_mô_cố_định(tiến_trình)
+    tiến_trình.chạy_một_vòng(bây_giờ=1000.0)
+    with open(file_hợp_đồng, "w", encoding="utf-8") as f:
+        json.dump([dict(BẢN_GHI[0], sm={"24h": -9e6, "7d": 1e6})], f)
+    assert "hợp_đồng" not in tiến_trình.đến_hạn(1030.0)
+    assert tiến_trình.đến_hạn(1060.0) == ["hợp_đồng"]
+    tiến_trình.chạy_một_vòng(bây_giờ=1060.0)
+    assert tiến_trình.hợp_đồng["AAA"].dòng_tiền_ròng_24h == -9e6
+
+def test_không_có_file_hợp_đồng_thì_bỏ_thành_phần(môi_trường):
+    kho, _, tmp_path = môi_trường
+    tiến_trình = signal_worker.TiếnTrìnhNền(kho, các_thành_phần=THÀNH_PHẦN)
+    _vĩ_mô_cố_định(tiến_trình)
+    assert tiến_trình.các_thành_phần == ("vĩ_mô",)
+    assert "hợp_đồng" not in tiến_trình.các_nguồn()
+    tiến_trình.chạy_một_vòng(bây_giờ=1000.0)
+    thông_tin = KếtQuảChung.mở(str(tmp_path / "kq.arrow")).thông_tin
+    assert thông_tin["các_thành_phần"] == ["vĩ_mô"]
+    assert "hợp_đồng" not in thông_tin["trọng_số"]
+
+def test_chấm_điểm_không_tự_lấy_vĩ_mô(môi_trường, monkeypatch):
+    kho, file_hợp_đồng, _ = môi_trường
+
+    def _không_được_gọi():
+        raise AssertionError("chấm_điểm không được lấy vĩ mô qua mạng")
+
+    monkeypatch.setattr(alpha_signal_checker_plus, "lấy_chỉ_số_kinh_tế_vĩ_mô", _không_được_gọi)
+    tiến_trình = signal_worker.TiếnTrìnhNền(kho, các_thành_phần=("hợp_đồng",), file_hợp_đồng=file_hợp_đồng)
+    tiến_trình.thị_trường = [{"mã": "AAA", "giá": 1.0}]
+    tiến_trình.làm_mới("hợp_đồng", bây_giờ=1000.0)
+    # Chưa làm mới vĩ mô: dùng giá trị mặc định, không gọi API
+    assert len(tiến_trình.chấm_điểm()) == 1
+    assert tiến_trình.ngữ_cảnh.vĩ_mô == ChỉSốKinhTếVĩMô()
+    # Vĩ mô không cộng điểm vẫn là một nguồn được làm mới theo chu kỳ
+    assert "vĩ_mô" in tiến_trình.các_nguồn()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử kho ảnh chụp
+--------------------
+Lần chạy đang ghi (hoặc bị bỏ dở) không hiện ra với bên đọc khác; kho phiên bản cũ được nâng
+cấp mà vẫn thấy các lần chạy đã có.
+"""
+
+import sqlite3
+
+from alpha_signal_checker_plus import chấm_điểm_ảnh_chụp
+from snapshot_store import KhoẢnhChụp
+from tests.du_lieu_mau import sinh_ảnh_chụp
+
+def test_lần_chạy_chỉ_hiện_khi_hoàn_tất(tmp_path):
+    các_kết_quả = [chấm_điểm_ảnh_chụp(a) for a in sinh_ảnh_chụp(2500)]
+    đường_dẫn = str(tmp_path / "kho.db")
+    kho_ghi, kho_đọc = KhoẢnhChụp(đường_dẫn), KhoẢnhChụp(đường_dẫn)
+
+    bộ_ghi = kho_ghi.mở_lần_chạy()
+    assert kho_đọc.lần_chạy_mới_nhất() is None
+    # Đã đẩy một lô 1000 dòng xuống đĩa nhưng chưa đóng
+    for kq in các_kết_quả[:1500]:
+        bộ_ghi.ghi(kq)
+    assert kho_đọc.lần_chạy_mới_nhất() is None
+    assert kho_đọc.các_lần_chạy() == []
+    for kq in các_kết_quả[1500:]:
+        bộ_ghi.ghi(kq)
+    bộ_ghi.đóng()
+
+    mới_nhất = kho_đọc.lần_chạy_mới_nhất()
+    assert mới_nhất["id"] == bộ_ghi.lần_chạy and mới_nhất["số_mã"] == len(các_kết_quả)
+    assert len(kho_đọc.kết_quả_lần_chạy(mới_nhất["id"])) == len(các_kết_quả)
+
+    # Lần chạy bỏ dở (không đóng) không che lần chạy hoàn tất trước đó
+    dở_dang = kho_ghi.mở_lần_chạy()
+    dở_dang.ghi(các_kết_quả[0])
+    dở_dang._đẩy()
+    assert kho_đọc.lần_chạy_mới_nhất()["id"] == mới_nhất["id"]
+    assert [lần["id"] for lần in kho_đọc.các_lần_chạy()] == [mới_nhất["id"]]
+    kho_ghi.đóng()
+    kho_đọc.đóng()
+
+def test_nâng_cấp_kho_phiên_bản_1(tmp_path):
+    đường_dẫn = str(tmp_path / "cu.db")
+    db = sqlite3.connect(đường_dẫn)
+    db.execute("CREATE TABLE lan_chay (id INTEGER PRIMARY KEY AUTOINCREMENT, thoi_gian REAL NOT NULL, "
+               "diem_rong_toi_thieu REAL, so_ma INTEGER NOT NULL DEFAULT 0, toan_cuc TEXT NOT NULL, "
+               "truong_thanh_phan TEXT NOT NULL DEFAULT '{}')")
+    db.execute("INSERT INTO lan_chay (thoi_gian, toan_cuc) VALUES (1, '{}')")
+    db.execute("PRAGMA user_version=1")
+    db.commit()
+    db.close()
+
+    kho = KhoẢnhChụp(đường_dẫn)
+    assert kho.lần_chạy_mới_nhất()["id"] == 1
+    bộ_ghi = kho.mở_lần_chạy(thời_gian=2)
+    # Cột thêm vào kho cũ mặc định 1, lần chạy mới vẫn phải bắt đầu là chưa hoàn tất
+    assert kho.lần_chạy_mới_nhất()["id"] == 1
+    bộ_ghi.đóng()
+    assert kho.lần_chạy_mới_nhất()["id"] == bộ_ghi.lần_chạy
+    kho.đóng()
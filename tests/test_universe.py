@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Kiểm thử universe thị trường
+--------------------
+Nhiều coin trùng ký hiệu: top_coin() chỉ trả coin vốn hóa lớn nhất (id_của()) cho mỗi ký hiệu,
+nên giá khóa theo ký hiệu ở dashboard / tiến trình nền không bị coin nhỏ hơn ghi đè.
+"""
+
+from universe import BảngUniverse
+
+def _dòng(id_coin: str, ký_hiệu: str, giá: float, vốn_hóa: float, khối_lượng: float = 1e6) -> dict:
+    return {"id": id_coin, "symbol": ký_hiệu, "name": id_coin, "current_price": giá,
+            "market_cap": vốn_hóa, "total_volume": khối_lượng}
+
+def _bảng() -> BảngUniverse:
+    bảng = BảngUniverse(số_mỗi_trang=10)
+    bảng.cập_nhật_trang(1, [
+        _dòng("bitcoin", "btc", 60000.0, 1e12),
+        _dòng("x-that", "x", 2.0, 5e9),
+        _dòng("ethereum", "eth", 3000.0, 4e11, khối_lượng=10.0),
+        _dòng("x-khac", "x", 0.01, 1e6),
+        _dòng("eth-gia", "ETH", 0.5, 1e5),
+    ])
+    return bảng
+
+def test_trùng_ký_hiệu_giữ_coin_id_của_chọn():
+    bảng = _bảng()
+    top = bảng.top_coin()
+    assert top == [{"mã": "BTC", "giá": 60000.0}, {"mã": "X", "giá": 2.0}, {"mã": "ETH", "giá": 3000.0}]
+    assert {coin["mã"]: coin["giá"] for coin in top}["X"] == bảng.dòng(bảng.id_của("x"))["giá"]
+    assert bảng.các_id_của("x") == ["x-that", "x-khac"]
+
+def test_giới_hạn_tính_sau_khi_bỏ_trùng():
+    assert [coin["mã"] for coin in _bảng().top_coin(giới_hạn=3)] == ["BTC", "X", "ETH"]
+
+def test_coin_đứng_đầu_bị_lọc_thì_không_thay_bằng_coin_trùng_ký_hiệu():
+    # ETH lớn nhất không đủ khối lượng: không lấy "eth-gia" cùng ký hiệu thế chỗ
+    top = _bảng().top_coin(khối_lượng_tối_thiểu=100.0)
+    assert [coin["mã"] for coin in top] == ["BTC", "X"]
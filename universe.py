@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Universe Thị Trường Dạng Cột
+--------------------
+Giữ đầy đủ các dòng thị trường CoinGecko (/coins/markets) thay vì chỉ ký hiệu viết hoa:
+- Bảng dạng cột theo id CoinGecko: giá, vốn hóa, khối lượng, hạng, thay đổi 24h trong
+  array('d') / array('q'), giá trị thiếu là NaN (hạng thiếu là 0)
+- Chỉ mục ký hiệu -> các dòng: nhiều coin trùng ký hiệu, id_của() chọn coin đứng trước
+  theo thứ tự vốn hóa, các_id_của() trả tất cả; top_coin() chỉ trả coin id_của() chọn
+  vì bên gọi khóa giá và điểm theo ký hiệu
+- Làm mới theo trang, đồng thời (CẤU_HÌNH["UNIVERSE_CONCURRENCY"]); làm mới tăng dần chỉ lấy
+  lại trang quá hạn, dòng đã có được cập nhật tại chỗ, dòng rơi khỏi mọi trang bị loại bỏ
+- lọc() sàng theo khối lượng tối thiểu / khoảng vốn hóa trên các cột trước khi gọi các
+  nhà cung cấp theo mã tốn kém
+"""
+
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from alpha_signal_checker_plus import CẤU_HÌNH, _yêu_cầu_an_toàn
+from metrics import ĐO_LƯỜNG
+
+# Cột số -> trường trong phản hồi CoinGecko
+CỘT_SỐ = {
+    "giá": "current_price",
+    "vốn_hóa": "market_cap",
+    "khối_lượng": "total_volume",
+    "thay_đổi_24h": "price_change_percentage_24h",
+}
+
+def _số(giá_trị: Any) -> float:
+    """Số thực từ phản hồi; None / không hợp lệ thành NaN"""
+    try:
+        return float(giá_trị) if giá_trị is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+def _hoặc_none(giá_trị: float) -> Optional[float]:
+    return None if giá_trị != giá_trị else giá_trị
+
+def lấy_trang_thị_trường(trang: int, số_mỗi_trang: int = None) -> Optional[List[Dict[str, Any]]]:
+    """Một trang /coins/markets theo vốn hóa giảm dần; None khi lỗi"""
+    dữ_liệu = _yêu_cầu_an_toàn(CẤU_HÌNH["COINGECKO_MARKETS_URL"], {
+        "vs_currency": "usd", "order": "market_cap_desc",
+        "per_page": số_mỗi_trang or CẤU_HÌNH["UNIVERSE_PER_PAGE"], "page": trang,
+    })
+    return dữ_liệu if isinstance(dữ_liệu, list) else None
+
+class BảngUniverse:
+    """Các dòng thị trường CoinGecko dạng cột, khóa theo id"""
+
+    def __init__(self, số_mỗi_trang: int = None):
+        self.số_mỗi_trang = số_mỗi_trang or CẤU_HÌNH["UNIVERSE_PER_PAGE"]
+        self.id: List[str] = []
+        self.mã: List[str] = []
+        self.tên: List[str] = []
+        self.giá = array("d")
+        self.vốn_hóa = array("d")
+        self.khối_lượng = array("d")
+        self.thay_đổi_24h = array("d")
+        self.hạng = array("q")
+        # Vị trí trong kết quả API ((trang - 1) * số_mỗi_trang + vị trí trong trang) và lúc thấy dòng gần nhất
+        self.thứ_tự = array("q")
+        self.lúc_cập_nhật = array("d")
+        self._vị_trí: Dict[str, int] = {}
+        self._theo_mã: Dict[str, List[int]] = {}
+        self._lúc_trang: Dict[int, float] = {}
+        # Chỉ số dòng theo thứ_tự, dựng lại khi có ghi
+        self._đã_sắp: Optional[List[int]] = None
+        self._khóa = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    # ---------- ghi ----------
+
+    def cập_nhật_trang(self, trang: int, các_dòng: Iterable[Dict[str, Any]], lúc: float = None) -> int:
+        """Ghi một trang API: dòng đã có (cùng id) được cập nhật tại chỗ, dòng mới thêm vào cuối"""
+        lúc = time.time() if lúc is None else lúc
+        gốc = (trang - 1) * self.số_mỗi_trang
+        số_dòng = 0
+        with self._khóa:
+            for vị_trí_trang, dòng in enumerate(các_dòng):
+                ký_hiệu = dòng.get("symbol")
+                if not ký_hiệu:
+                    continue
+                mã = sys.intern(str(ký_hiệu).upper())
+                # Server không trả id (bản giả lập, bản cũ): dùng ký hiệu làm khóa
+                id_coin = sys.intern(str(dòng.get("id") or ký_hiệu.lower()))
+                i = self._vị_trí.get(id_coin)
+                if i is None:
+                    i = self._vị_trí[id_coin] = len(self.id)
+                    self.id.append(id_coin)
+                    self.mã.append(mã)
+                    self.tên.append(dòng.get("name") or mã)
+                    for tên_cột in CỘT_SỐ:
+                        getattr(self, tên_cột).append(math.nan)
+                    self.hạng.append(0)
+                    self.thứ_tự.append(0)
+                    self.lúc_cập_nhật.append(0.0)
+                    self._theo_mã.setdefault(mã, []).append(i)
+                elif self.mã[i] != mã:
+                    self._theo_mã[self.mã[i]].remove(i)
+                    self._theo_mã.setdefault(mã, []).append(i)
+                    self.mã[i] = mã
+                for tên_cột, trường in CỘT_SỐ.items():
+                    getattr(self, tên_cột)[i] = _số(dòng.get(trường))
+                self.hạng[i] = int(dòng.get("market_cap_rank") or 0)
+                self.thứ_tự[i] = gốc + vị_trí_trang
+                self.lúc_cập_nhật[i] = lúc
+                số_dòng += 1
+            self._lúc_trang[trang] = lúc
+            self._đã_sắp = None
+        return số_dòng
+
+    def loại_bỏ_cũ(self, trước: float) -> int:
+        """Bỏ các dòng không xuất hiện trong trang nào từ thời điểm `trước`; dựng lại cột và chỉ mục"""
+        with self._khóa:
+            giữ = [i for i, lúc in enumerate(self.lúc_cập_nhật) if lúc >= trước]
+            số_bỏ = len(self.id) - len(giữ)
+            if not số_bỏ:
+                return 0
+            for tên_cột in ("id", "mã", "tên"):
+                cột = getattr(self, tên_cột)
+                setattr(self, tên_cột, [cột[i] for i in giữ])
+            for tên_cột in (*CỘT_SỐ, "hạng", "thứ_tự", "lúc_cập_nhật"):
+                cột = getattr(self, tên_cột)
+                setattr(self, tên_cột, array(cột.typecode, (cột[i] for i in giữ)))
+            self._vị_trí = {id_coin: i for i, id_coin in enumerate(self.id)}
+            self._theo_mã = {}
+            self._đã_sắp = None
+            for i, mã in enumerate(self.mã):
+                self._theo_mã.setdefault(mã, []).append(i)
+            return số_bỏ
+
+    def làm_mới(self, số_trang: int = None, ttl: float = None, bắt_buộc: bool = False,
+                đồng_thời: int = None, hàm_lấy_trang=None) -> List[int]:
+        """Lấy lại các trang quá hạn (mọi trang nếu bắt_buộc) đồng thời; trả về các trang đã cập nhật"""
+        số_trang = số_trang or CẤU_HÌNH["UNIVERSE_PAGES"]
+        ttl = CẤU_HÌNH["CACHE_TTL"]["top_coin"] if ttl is None else ttl
+        hàm_lấy_trang = hàm_lấy_trang or (lambda trang: lấy_trang_thị_trường(trang, self.số_mỗi_trang))
+        bây_giờ = time.time()
+        with self._khóa:
+            cần_lấy = [trang for trang in range(1, số_trang + 1)
+                       if bắt_buộc or bây_giờ - self._lúc_trang.get(trang, -math.inf) >= ttl]
+        if not cần_lấy:
+            return []
+
+        đã_cập_nhật = []
+        with ĐO_LƯỜNG.đo("universe"):
+            đồng_thời = max(1, min(đồng_thời or CẤU_HÌNH["UNIVERSE_CONCURRENCY"], len(cần_lấy)))
+            if đồng_thời == 1:
+                kết_quả = ((trang, hàm_lấy_trang(trang)) for trang in cần_lấy)
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                pool = ThreadPoolExecutor(max_workers=đồng_thời, thread_name_prefix="universe")
+                kết_quả = zip(cần_lấy, pool.map(hàm_lấy_trang, cần_lấy))
+            try:
+                for trang, các_dòng in kết_quả:
+                    # Trang lỗi giữ nguyên dòng cũ và hạn cũ, lần sau lấy lại
+                    if các_dòng is not None:
+                        self.cập_nhật_trang(trang, các_dòng, bây_giờ)
+                        đã_cập_nhật.append(trang)
+            finally:
+                if đồng_thời > 1:
+                    pool.shutdown()
+        with self._khóa:
+            # Chỉ khi mọi trang đều mới hơn lúc dòng được thấy lần cuối thì dòng đó đã rơi khỏi universe
+            if all(trang in self._lúc_trang for trang in range(1, số_trang + 1)):
+                self.loại_bỏ_cũ(min(self._lúc_trang[trang] for trang in range(1, số_trang + 1)))
+        return đã_cập_nhật
+
+    # ---------- đọc ----------
+
+    def _theo_thứ_tự(self) -> List[int]:
+        if self._đã_sắp is None:
+            self._đã_sắp = sorted(range(len(self.id)), key=self.thứ_tự.__getitem__)
+        return self._đã_sắp
+
+    def id_của(self, mã: str) -> Optional[str]:
+        """Id của coin mang ký hiệu này đứng đầu theo vốn hóa; None nếu không có"""
+        with self._khóa:
+            các_dòng = self._theo_mã.get(mã.upper())
+            if not các_dòng:
+                return None
+            return self.id[min(các_dòng, key=self.thứ_tự.__getitem__)]
+
+    def các_id_của(self, mã: str) -> List[str]:
+        """Mọi id trùng ký hiệu, theo thứ tự vốn hóa"""
+        with self._khóa:
+            return [self.id[i] for i in sorted(self._theo_mã.get(mã.upper(), ()), key=self.thứ_tự.__getitem__)]
+
+    def dòng(self, id_coin: str) -> Optional[Dict[str, Any]]:
+        with self._khóa:
+            i = self._vị_trí.get(id_coin)
+            if i is None:
+                return None
+            kết_quả = {"id": self.id[i], "mã": self.mã[i], "tên": self.tên[i], "hạng": self.hạng[i] or None}
+            kết_quả.update((tên_cột, _hoặc_none(getattr(self, tên_cột)[i])) for tên_cột in CỘT_SỐ)
+            return kết_quả
+
+    def lọc(self, khối_lượng_tối_thiểu: float = None, vốn_hóa_tối_thiểu: float = None,
+            vốn_hóa_tối_đa: float = None, giới_hạn: int = None) -> List[int]:
+        """Chỉ số dòng thỏa điều kiện theo thứ tự vốn hóa; điều kiện None thì bỏ qua (kể cả giá trị NaN)"""
+        with self._khóa:
+            chỉ_số: Sequence[int] = self._theo_thứ_tự()
+            khối_lượng, vốn_hóa = self.khối_lượng, self.vốn_hóa
+            thấp = -math.inf if vốn_hóa_tối_thiểu is None else vốn_hóa_tối_thiểu
+            cao = math.inf if vốn_hóa_tối_đa is None else vốn_hóa_tối_đa
+            lọc_vốn_hóa = vốn_hóa_tối_thiểu is not None or vốn_hóa_tối_đa is not None
+            # Một lượt duyệt cho mỗi tổ hợp điều kiện; NaN chỉ bị loại bởi điều kiện trên cột đó
+            if khối_lượng_tối_thiểu is not None and lọc_vốn_hóa:
+                chỉ_số = [i for i in chỉ_số if khối_lượng[i] >= khối_lượng_tối_thiểu and thấp <= vốn_hóa[i] <= cao]
+            elif khối_lượng_tối_thiểu is not None:
+                chỉ_số = [i for i in chỉ_số if khối_lượng[i] >= khối_lượng_tối_thiểu]
+            elif lọc_vốn_hóa:
+                chỉ_số = [i for i in chỉ_số if thấp <= vốn_hóa[i] <= cao]
+            return list(chỉ_số[:giới_hạn] if giới_hạn is not None else chỉ_số)
+
+    def top_coin(self, giới_hạn: int = None, **điều_kiện) -> List[Dict[str, Any]]:
+        """[{"mã", "giá"}] theo thứ tự vốn hóa, cùng dạng lấy_thị_trường_top_coin(); mỗi ký hiệu một dòng"""
+        kết_quả = []
+        with self._khóa:
+            for i in self.lọc(**điều_kiện):
+                # Bên gọi khóa theo ký hiệu: trùng ký hiệu thì chỉ giữ coin id_của() chọn, coin vốn hóa
+                # nhỏ hơn không được ghi đè giá hay bị chấm điểm lần hai
+                các_dòng = self._theo_mã[self.mã[i]]
+                if len(các_dòng) > 1 and i != min(các_dòng, key=self.thứ_tự.__getitem__):
+                    continue
+                kết_quả.append({"mã": self.mã[i], "giá": _hoặc_none(self.giá[i])})
+                if giới_hạn is not None and len(kết_quả) >= giới_hạn:
+                    break
+        return kết_quả
+
+    def lấy_thống_kê(self) -> Dict[str, Any]:
+        with self._khóa:
+            return {
+                "số_coin": len(self.id),
+                "ký_hiệu_trùng": sum(1 for các_dòng in self._theo_mã.values() if len(các_dòng) > 1),
+                "số_trang": len(self._lúc_trang),
+                "trang_cũ_nhất_giây": round(time.time() - min(self._lúc_trang.values()), 1) if self._lúc_trang else None,
+            }
+
+# Universe dùng chung của tiến trình (CLI, tiến trình nền, mọi phiên dashboard)
+UNIVERSE = BảngUniverse()